@@ -1,7 +1,9 @@
 """BTC Scalping Scanner - Main application entry point."""
+import time
+_STARTED = time.perf_counter()
+
 import signal
 import sys
-import time
 import threading
 from datetime import datetime
 import logging
@@ -22,10 +24,15 @@ from src.alerter import EmailAlerter, TelegramAlerter, MultiAlerter
 from src.health_monitor import HealthMonitor, setup_logging
 from src.excel_reporter import ExcelReporter
 from src.trade_tracker import TradeTracker
+from src.event_store import get_event_store
+from src.state_checkpoint import StateCheckpointer, buffer_is_fresh
+from src.email_dispatcher import stop_all_dispatchers
 from src.news_calendar import NewsCalendar
 from src.signal_diagnostics import SignalDiagnostics
 from src.config_validator import ConfigValidator
 from src.bypass_mode import BypassMode
+from src.lazy_import import log_startup
+from src import latency_trace
 
 
 logger = logging.getLogger(__name__)
@@ -211,6 +218,7 @@ class BTCScalpingScanner:
         
         # WebSocket streamer
         self.ws_streamer = None
+        self.trade_update_lock = threading.Lock()  # Polling loop and streamed prices both update trades
         
         # Control flags
         self.running = False
@@ -219,8 +227,20 @@ class BTCScalpingScanner:
         # Health monitoring thread
         self.health_thread = None
         
+        # Event log of scans, signals, rejections and trades
+        self.event_store = get_event_store()
+        
         # Trade tracker
-        self.trade_tracker = TradeTracker(alerter=self.alerter)
+        self.trade_tracker = TradeTracker(alerter=self.alerter, events=self.event_store)
+        
+        # Warm restarts: duplicate windows, open trades and candle buffers are checkpointed
+        self.checkpointer = StateCheckpointer.for_components(self.config.checkpoint, {
+            'signal_detector': self.signal_detector,
+            'quality_filter': self.quality_filter,
+            'trade_tracker': self.trade_tracker,
+            'market_client': self.market_client,
+            'diagnostics': self.diagnostics
+        })
         
         # Data freshness tracking
         self.last_fresh_data_time: dict[str, datetime] = {}
@@ -275,18 +295,45 @@ class BTCScalpingScanner:
             
             self.health_monitor.set_connection_status("connected")
             
+            # Restore the last checkpoint; fresh restored buffers need no warm-up fetch
+            restored = self.checkpointer.restore() if self.checkpointer is not None else []
+            
             # Fetch initial historical data
             logger.info("Fetching initial candlestick data...")
+            history = {}
             for timeframe in self.config.exchange.timeframes:
-                _, _ = self.market_client.get_latest_candles(timeframe, 500, validate_freshness=False)
-                logger.info(f"Loaded {timeframe} data")
+                if 'market_client' in restored and buffer_is_fresh(self.market_client, timeframe):
+                    history[timeframe] = self.market_client.get_buffer_data(timeframe)
+                    logger.info(f"Using restored {timeframe} data")
+                else:
+                    history[timeframe], _ = self.market_client.get_latest_candles(timeframe, 500, validate_freshness=False)
+                    logger.info(f"Loaded {timeframe} data")
                 # Initialize state tracking
                 self.stale_data_count[timeframe] = 0
                 self.last_fresh_data_time[timeframe] = datetime.now()
             
-            # Use polling mode instead of WebSocket for better compatibility
-            logger.info("Using polling mode for data updates (more reliable across exchanges)...")
-            self.ws_streamer = None  # Disabled for compatibility
+            stream_mode = self.config.exchange.stream_mode
+            if stream_mode:
+                # Streamed bars are scanned as they close; polling takes over while disconnected
+                logger.info(f"Streaming candles over WebSocket ({stream_mode} mode)...")
+                self.ws_streamer = BinanceWebSocketStreamer(
+                    self.config.exchange.symbol,
+                    self.config.exchange.timeframes,
+                    on_candle_callback=self._on_candle_update,
+                    mode=stream_mode,
+                    on_price_callback=self._on_stream_price
+                )
+                # Streamed bars are kept in the streamer's own buffers, seeded with the warm-up history
+                for timeframe, candles in history.items():
+                    self.ws_streamer.seed(timeframe, candles)
+                self.ws_streamer.start()
+            else:
+                # Use polling mode instead of WebSocket for better compatibility
+                logger.info("Using polling mode for data updates (more reliable across exchanges)...")
+                self.ws_streamer = None
+            
+            if self.checkpointer is not None:
+                self.checkpointer.start()
             
             # Start health monitoring thread
             self.health_thread = threading.Thread(target=self._health_monitoring_loop, daemon=True)
@@ -326,6 +373,7 @@ class BTCScalpingScanner:
                     logger.warning(f"Failed to send startup message: {e}")
             
             logger.info("Scanner is now running. Press Ctrl+C to stop.")
+            log_startup(_STARTED, "BTC Scalping Scanner")
             
             # Track last heartbeat time
             last_heartbeat = time.time()
@@ -359,39 +407,54 @@ class BTCScalpingScanner:
                     
                     # Fetch latest data for each timeframe with freshness validation
                     for timeframe in self.config.exchange.timeframes:
-                        try:
-                            df, is_fresh = self.market_client.get_latest_candles(timeframe, 500)
-                            
-                            if df.empty:
-                                logger.error(f"Received empty DataFrame for {timeframe} - skipping this iteration")
-                                continue
-                            
-                            # Check data freshness
-                            if not is_fresh:
-                                logger.warning(f"Stale data detected for {timeframe}, attempting retry...")
-                                
-                                # Increment stale counter
-                                self.stale_data_count[timeframe] = self.stale_data_count.get(timeframe, 0) + 1
-                                
-                                # Get data age for alert
-                                _, age_seconds = self.market_client.validate_data_freshness(df, timeframe)
+                        if self.ws_streamer and self.ws_streamer.is_connected():
+                            continue  # Scanned in _on_candle_update as streamed bars close
+                        
+                        with latency_trace.tracing(self.config.exchange.symbol, timeframe):
+                            try:
+                                df, is_fresh = self.market_client.get_latest_candles(timeframe, 500)
                                 
-                                # Retry with backoff
-                                df, is_fresh = self._retry_fetch_with_backoff(timeframe)
+                                if df.empty:
+                                    logger.error(f"Received empty DataFrame for {timeframe} - skipping this iteration")
+                                    continue
                                 
-                                if not is_fresh or df is None:
-                                    logger.error(f"Failed to get fresh data for {timeframe} after retries")
+                                # Check data freshness
+                                if not is_fresh:
+                                    logger.warning(f"Stale data detected for {timeframe}, attempting retry...")
                                     
-                                    # Send stale data alert after 3 consecutive failures
-                                    self._send_stale_data_alert(timeframe, age_seconds)
+                                    # Increment stale counter
+                                    self.stale_data_count[timeframe] = self.stale_data_count.get(timeframe, 0) + 1
                                     
-                                    # Skip signal detection for this timeframe but continue loop
-                                    continue
-                                else:
-                                    # Fresh data obtained after retry
-                                    logger.info(f"Fresh data restored for {timeframe}")
+                                    # Get data age for alert
+                                    _, age_seconds = self.market_client.validate_data_freshness(df, timeframe)
                                     
-                                    # Send recovery alert if data was stale for a while
+                                    # Retry with backoff
+                                    df, is_fresh = self._retry_fetch_with_backoff(timeframe)
+                                    
+                                    if not is_fresh or df is None:
+                                        logger.error(f"Failed to get fresh data for {timeframe} after retries")
+                                        
+                                        # Send stale data alert after 3 consecutive failures
+                                        self._send_stale_data_alert(timeframe, age_seconds)
+                                        
+                                        # Skip signal detection for this timeframe but continue loop
+                                        continue
+                                    else:
+                                        # Fresh data obtained after retry
+                                        logger.info(f"Fresh data restored for {timeframe}")
+                                        
+                                        # Send recovery alert if data was stale for a while
+                                        if self.stale_data_count.get(timeframe, 0) >= 3:
+                                            last_fresh = self.last_fresh_data_time.get(timeframe)
+                                            if last_fresh:
+                                                stale_duration = (datetime.now() - last_fresh).total_seconds()
+                                                self._send_recovery_alert(timeframe, stale_duration)
+                                        
+                                        self.stale_data_count[timeframe] = 0
+                                        self.last_fresh_data_time[timeframe] = datetime.now()
+                                else:
+                                    # Data is fresh
+                                    # Check if we're recovering from stale data
                                     if self.stale_data_count.get(timeframe, 0) >= 3:
                                         last_fresh = self.last_fresh_data_time.get(timeframe)
                                         if last_fresh:
@@ -400,106 +463,104 @@ class BTCScalpingScanner:
                                     
                                     self.stale_data_count[timeframe] = 0
                                     self.last_fresh_data_time[timeframe] = datetime.now()
-                            else:
-                                # Data is fresh
-                                # Check if we're recovering from stale data
-                                if self.stale_data_count.get(timeframe, 0) >= 3:
-                                    last_fresh = self.last_fresh_data_time.get(timeframe)
-                                    if last_fresh:
-                                        stale_duration = (datetime.now() - last_fresh).total_seconds()
-                                        self._send_recovery_alert(timeframe, stale_duration)
                                 
-                                self.stale_data_count[timeframe] = 0
-                                self.last_fresh_data_time[timeframe] = datetime.now()
+                            except Exception as e:
+                                logger.error(f"Failed to fetch data for {timeframe}: {e}")
+                                continue
                             
-                        except Exception as e:
-                            logger.error(f"Failed to fetch data for {timeframe}: {e}")
-                            continue
-                        
-                        # Process data (we know it's not empty and fresh here)
-                        # Update health monitor
-                        self.health_monitor.update_data_timestamp(df.iloc[-1]['timestamp'])
-                        
-                        # Calculate indicators
-                        data_with_indicators = self.indicator_calculator.calculate_all_indicators(
-                            df,
-                            ema_periods=[
-                                self.config.indicators.ema_fast,
-                                self.config.indicators.ema_slow,
-                                self.config.indicators.ema_trend,
-                                100,
-                                200
-                            ],
-                            atr_period=self.config.indicators.atr_period,
-                            rsi_period=self.config.indicators.rsi_period,
-                            volume_ma_period=self.config.indicators.volume_ma_period
-                        )
-                        
-                        if not data_with_indicators.empty:
-                            # Detect signals
-                            signal = self.signal_detector.detect_signals(data_with_indicators, timeframe)
+                            # Process data (we know it's not empty and fresh here)
+                            latency_trace.mark_received('fetch', df, timeframe)
+                            # Update health monitor
+                            self.health_monitor.update_data_timestamp(df.iloc[-1]['timestamp'])
                             
-                            # Log scan result to Excel
-                            if self.excel_reporter:
-                                last_row = data_with_indicators.iloc[-1]
-                                # Determine scanner name based on strategy
-                                scanner_name = 'BTC-Scalp'
-                                if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
-                                    scanner_name = 'BTC-Scalp-H4HVG'
-                                
-                                scan_data = {
-                                    'timestamp': datetime.now(),
-                                    'scanner': scanner_name,
-                                    'symbol': self.config.exchange.symbol,
-                                    'timeframe': timeframe,
-                                    'price': last_row['close'],
-                                    'volume': last_row['volume'],
-                                    'indicators': {
-                                        'ema_9': last_row.get('ema_9', None),
-                                        'ema_21': last_row.get('ema_21', None),
-                                        'ema_50': last_row.get('ema_50', None),
-                                        'ema_100': last_row.get('ema_100', None),
-                                        'ema_200': last_row.get('ema_200', None),
-                                        'rsi': last_row.get('rsi', None),
-                                        'atr': last_row.get('atr', None),
-                                        'volume_ma': last_row.get('volume_ma', None)
-                                    },
-                                    'signal_detected': signal is not None,
-                                    'signal_type': signal.signal_type if signal else None,
-                                    'signal_details': {
-                                        'entry_price': signal.entry_price,
-                                        'stop_loss': signal.stop_loss,
-                                        'take_profit': signal.take_profit,
-                                        'risk_reward': signal.risk_reward,
-                                        'strategy': getattr(signal, 'strategy', 'N/A'),
-                                        'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
-                                        'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
-                                        'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
-                                    } if signal else {}
-                                }
-                                self.excel_reporter.log_scan_result(scan_data)
+                            # Calculate indicators
+                            data_with_indicators = self.indicator_calculator.calculate_all_indicators(
+                                df,
+                                ema_periods=[
+                                    self.config.indicators.ema_fast,
+                                    self.config.indicators.ema_slow,
+                                    self.config.indicators.ema_trend,
+                                    100,
+                                    200
+                                ],
+                                atr_period=self.config.indicators.atr_period,
+                                rsi_period=self.config.indicators.rsi_period,
+                                volume_ma_period=self.config.indicators.volume_ma_period
+                            )
                             
-                            if signal:
-                                logger.info(f"🎯 Signal detected: {signal.signal_type} on {timeframe}")
-                                
-                                # Record signal
-                                self.health_monitor.record_signal(signal.signal_type)
-                                
-                                # Send alerts
-                                alert_success = self.alerter.send_signal_alert(signal)
+                            if not data_with_indicators.empty:
+                                # Detect signals
+                                signal = self.signal_detector.detect_signals(data_with_indicators, timeframe)
+                                self.event_store.record(
+                                    'scan', symbol=self.config.exchange.symbol, timeframe=timeframe,
+                                    strategy=getattr(signal, 'strategy', None) or None,
+                                    direction=signal.signal_type if signal else None,
+                                    price=data_with_indicators.iloc[-1]['close']
+                                )
                                 
-                                if alert_success:
-                                    logger.info("Alert sent successfully")
+                                # Log scan result to Excel
+                                if self.excel_reporter:
+                                    last_row = data_with_indicators.iloc[-1]
+                                    # Determine scanner name based on strategy
+                                    scanner_name = 'BTC-Scalp'
+                                    if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
+                                        scanner_name = 'BTC-Scalp-H4HVG'
                                     
-                                    # Add trade to tracker
-                                    self.trade_tracker.add_trade(signal)
-                                else:
-                                    logger.error("Failed to send alert")
+                                    scan_data = {
+                                        'timestamp': datetime.now(),
+                                        'scanner': scanner_name,
+                                        'symbol': self.config.exchange.symbol,
+                                        'timeframe': timeframe,
+                                        'price': last_row['close'],
+                                        'volume': last_row['volume'],
+                                        'indicators': {
+                                            'ema_9': last_row.get('ema_9', None),
+                                            'ema_21': last_row.get('ema_21', None),
+                                            'ema_50': last_row.get('ema_50', None),
+                                            'ema_100': last_row.get('ema_100', None),
+                                            'ema_200': last_row.get('ema_200', None),
+                                            'rsi': last_row.get('rsi', None),
+                                            'atr': last_row.get('atr', None),
+                                            'volume_ma': last_row.get('volume_ma', None)
+                                        },
+                                        'signal_detected': signal is not None,
+                                        'signal_type': signal.signal_type if signal else None,
+                                        'signal_details': {
+                                            'entry_price': signal.entry_price,
+                                            'stop_loss': signal.stop_loss,
+                                            'take_profit': signal.take_profit,
+                                            'risk_reward': signal.risk_reward,
+                                            'strategy': getattr(signal, 'strategy', 'N/A'),
+                                            'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
+                                            'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
+                                            'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
+                                        } if signal else {}
+                                    }
+                                    self.excel_reporter.log_scan_result(scan_data)
                                 
-                                # Update email success rate
-                                if hasattr(self.alerter, 'email_alerter') and self.alerter.email_alerter:
-                                    rate = self.alerter.email_alerter.get_success_rate()
-                                    self.health_monitor.set_email_success_rate(rate)
+                                if signal:
+                                    logger.info(f"🎯 Signal detected: {signal.signal_type} on {timeframe}")
+                                    
+                                    # Record signal
+                                    self.health_monitor.record_signal(signal.signal_type)
+                                    self.event_store.record_signal('signal', signal, symbol=self.config.exchange.symbol)
+                                    
+                                    # Send alerts
+                                    alert_success = self.alerter.send_signal_alert(signal)
+                                    
+                                    if alert_success:
+                                        logger.info("Alert sent successfully")
+                                        self.event_store.record_signal('alert', signal, symbol=self.config.exchange.symbol)
+                                        
+                                        # Add trade to tracker
+                                        self.trade_tracker.add_trade(signal)
+                                    else:
+                                        logger.error("Failed to send alert")
+                                    
+                                    # Update email success rate
+                                    if hasattr(self.alerter, 'email_alerter') and self.alerter.email_alerter:
+                                        rate = self.alerter.email_alerter.get_success_rate()
+                                        self.health_monitor.set_email_success_rate(rate)
                                 
                     
                     # ALWAYS update active trades (independent of signal detection)
@@ -525,7 +586,8 @@ class BTCScalpingScanner:
                                 logger.warning(f"Failed to get indicators for trade updates: {e}")
                             
                             # Update trades
-                            self.trade_tracker.update_trades(current_price, indicators)
+                            with self.trade_update_lock:
+                                self.trade_tracker.update_trades(current_price, indicators)
                             self.last_trade_update_time = datetime.now()
                             self.trade_update_failure_count = 0
                         else:
@@ -786,6 +848,13 @@ Trade monitoring has resumed normally.
         if self.excel_reporter:
             self.excel_reporter.stop()
         
+        # Flush buffered events
+        self.event_store.close()
+        
+        # Write a final checkpoint
+        if self.checkpointer is not None:
+            self.checkpointer.stop()
+        
         # Stop WebSocket (if enabled)
         if self.ws_streamer:
             self.ws_streamer.stop()
@@ -800,6 +869,9 @@ Trade monitoring has resumed normally.
         # Log final health summary
         self.health_monitor.log_health_summary(logger)
         
+        # Deliver queued emails before the process exits
+        stop_all_dispatchers()
+        
         logger.info("Scanner stopped successfully")
     
     def _on_candle_update(self, timeframe: str, candle: dict) -> None:
@@ -811,20 +883,24 @@ Trade monitoring has resumed normally.
             candle: Candle data dictionary
         """
         try:
-            # Update buffer
-            self.market_client.update_buffer(timeframe, candle)
-            
             # Update health monitor
             self.health_monitor.update_data_timestamp(candle['timestamp'])
             
+            # A late trade amended a bar that was already scanned
+            if candle.get('is_correction'):
+                logger.debug(f"Corrected closed candle: {timeframe} @ {candle['close']}")
+                return
+            
             # Only process closed candles for signal detection
             if not candle.get('is_closed', False):
                 return
             
             logger.debug(f"Processing closed candle: {timeframe} @ {candle['close']}")
             
-            # Get buffer data
-            data = self.market_client.get_buffer_data(timeframe)
+            # Streamed candles up to the closed one (trade mode may already hold the next forming bar)
+            data = self.ws_streamer.get_buffer_data(timeframe)
+            if not data.empty:
+                data = data[data['timestamp'] <= candle['timestamp']].drop(columns='is_closed')
             
             if data.empty or len(data) < 50:
                 logger.debug(f"Insufficient data for {timeframe}: {len(data)} candles")
@@ -860,23 +936,28 @@ Trade monitoring has resumed normally.
             
             if signal:
                 logger.info(f"🎯 Preliminary signal detected: {signal.signal_type} on {timeframe} - {signal.strategy}")
+                self.event_store.record_signal('signal', signal, symbol=self.config.exchange.symbol)
                 
                 # Apply Signal Quality Filter
                 filter_result = self.quality_filter.evaluate_signal(signal, data_with_indicators)
                 
                 if not filter_result.passed:
                     logger.info(f"❌ Signal rejected by quality filter: {filter_result.rejection_reason}")
+                    self.event_store.record_signal('rejection', signal, reason=filter_result.rejection_reason,
+                                                   symbol=self.config.exchange.symbol, filter='quality')
                     return
                 
                 # Apply Liquidity Filter
                 asset_symbol = 'BTC'  # For BTC scanner
                 asset_config = self.signal_detector.config.get('asset_specific', {}).get(asset_symbol, {})
                 liquidity_ok, liquidity_reason = self.liquidity_filter.filter_signal(
-                    signal.timestamp, asset_symbol, asset_config, data_with_indicators
+                    signal.timestamp, asset_symbol, asset_config, data_with_indicators, signal=signal
                 )
                 
                 if not liquidity_ok:
                     logger.info(f"❌ Signal rejected by liquidity filter: {liquidity_reason}")
+                    self.event_store.record_signal('rejection', signal, reason=liquidity_reason,
+                                                   symbol=self.config.exchange.symbol, filter='liquidity')
                     return
                 
                 # Signal passed all filters!
@@ -903,6 +984,8 @@ Trade monitoring has resumed normally.
                 
                 if alert_success:
                     logger.info("Alert sent successfully")
+                    latency_trace.complete(signal)
+                    self.event_store.record_signal('alert', signal, symbol=self.config.exchange.symbol)
                 else:
                     logger.error("Failed to send alert")
                 
@@ -915,6 +998,25 @@ Trade monitoring has resumed normally.
             logger.error(f"Error processing candle update: {e}", exc_info=True)
             self.health_monitor.record_error(e)
     
+    def _on_stream_price(self, price: float) -> None:
+        """
+        Callback for streamed trades that make a new high or low of the forming bar.
+        
+        Args:
+            price: Trade price
+        """
+        self.last_known_price = price
+        self.last_known_price_time = datetime.now()
+        if self.trade_tracker.get_active_count() == 0:
+            return
+        
+        try:
+            with self.trade_update_lock:
+                self.trade_tracker.update_trades(price)
+            self.last_trade_update_time = datetime.now()
+        except Exception as e:
+            logger.error(f"Error updating trades from streamed price: {e}")
+    
     def _health_monitoring_loop(self) -> None:
         """Background thread for periodic health monitoring."""
         while self.running and not self.shutdown_event.is_set():
@@ -2,6 +2,9 @@
 Multi-Symbol Scanner - Main Entry Point
 Scans multiple cryptocurrencies and FX pairs simultaneously.
 """
+import time
+_STARTED = time.perf_counter()
+
 import sys
 import os
 import signal
@@ -16,6 +19,7 @@ from src.alerter import TelegramAlerter, EmailAlerter, MultiAlerter
 from src.signal_diagnostics import SignalDiagnostics
 from src.config_validator import ConfigValidator
 from src.bypass_mode import BypassMode
+from src.lazy_import import log_startup
 
 
 def setup_logging(log_level: str = "INFO") -> None:
@@ -136,6 +140,7 @@ def main():
         
         # Start orchestrator
         orchestrator.start()
+        log_startup(_STARTED, "Multi-Symbol Scanner")
         
         logger.info("=" * 80)
         logger.info("Multi-Symbol Scanner is now running")
@@ -21,6 +21,9 @@ from src.excel_reporter import ExcelReporter
 from src.signal_diagnostics import SignalDiagnostics
 from src.config_validator import ConfigValidator
 from src.bypass_mode import BypassMode
+from src.state_checkpoint import StateCheckpointer, buffer_is_fresh
+from src.email_dispatcher import stop_all_dispatchers
+from src import latency_trace
 
 
 def setup_logging(log_file: str, log_level: str) -> None:
@@ -178,6 +181,15 @@ def main():
         except Exception as e:
             logger.error(f"Failed to initialize Excel reporter: {e}")
     
+    # Warm restarts: duplicate windows, open trades and candle buffers are checkpointed
+    checkpointer = StateCheckpointer.for_components(config.get('checkpoint'), {
+        'market_client': market_client,
+        'signal_detector': signal_detector,
+        'quality_filter': quality_filter,
+        'trade_tracker': trade_tracker,
+        'diagnostics': diagnostics
+    })
+    
     logger.info("All components initialized successfully")
     
     # Connect to data source
@@ -185,11 +197,18 @@ def main():
     market_client.connect()
     logger.info(f"Successfully connected to Yahoo Finance for {config['symbol']}")
     
+    # Restore the last checkpoint; fresh restored buffers need no warm-up fetch
+    restored = checkpointer.restore() if checkpointer is not None else []
+    
     # Fetch initial data for all timeframes
     candle_data = {}
     for timeframe in config['timeframes']:
-        logger.info(f"Fetching initial candlestick data for {timeframe}...")
-        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
+        if 'market_client' in restored and buffer_is_fresh(market_client, timeframe):
+            logger.info(f"Using restored candlestick data for {timeframe}")
+            candles = market_client.get_buffer_data(timeframe)
+        else:
+            logger.info(f"Fetching initial candlestick data for {timeframe}...")
+            candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
         
         # Calculate indicators
         candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
@@ -213,6 +232,9 @@ def main():
         candle_data[timeframe] = candles
         logger.info(f"Loaded {timeframe} data with indicators")
     
+    if checkpointer is not None:
+        checkpointer.start()
+    
     # Send startup notification
     if alerter:
         try:
@@ -247,94 +269,96 @@ def main():
         while True:
             # Update data for each timeframe
             for timeframe in config['timeframes']:
-                try:
-                    # Fetch latest candles
-                    candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
+                with latency_trace.tracing(config['symbol'], timeframe):
+                    try:
+                        # Fetch latest candles
+                        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
+                        latency_trace.mark_received('fetch', candles, timeframe)
                     
-                    # Calculate indicators
-                    candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
-                    candles['ema_21'] = indicator_calc.calculate_ema(candles, 21)
-                    candles['ema_50'] = indicator_calc.calculate_ema(candles, 50)
-                    candles['ema_100'] = indicator_calc.calculate_ema(candles, 100)
-                    candles['ema_200'] = indicator_calc.calculate_ema(candles, 200)
-                    candles['vwap'] = indicator_calc.calculate_vwap(candles)
-                    candles['atr'] = indicator_calc.calculate_atr(candles, 14)
-                    candles['rsi'] = indicator_calc.calculate_rsi(candles, 14)
-                    candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, 20)
+                        # Calculate indicators
+                        candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
+                        candles['ema_21'] = indicator_calc.calculate_ema(candles, 21)
+                        candles['ema_50'] = indicator_calc.calculate_ema(candles, 50)
+                        candles['ema_100'] = indicator_calc.calculate_ema(candles, 100)
+                        candles['ema_200'] = indicator_calc.calculate_ema(candles, 200)
+                        candles['vwap'] = indicator_calc.calculate_vwap(candles)
+                        candles['atr'] = indicator_calc.calculate_atr(candles, 14)
+                        candles['rsi'] = indicator_calc.calculate_rsi(candles, 14)
+                        candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, 20)
                     
-                    # Calculate Stochastic
-                    stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
-                    candles['stoch_k'] = stoch_k
-                    candles['stoch_d'] = stoch_d
+                        # Calculate Stochastic
+                        stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
+                        candles['stoch_k'] = stoch_k
+                        candles['stoch_d'] = stoch_d
                     
-                    # Calculate ADX
-                    candles['adx'] = indicator_calc.calculate_adx(candles, period=14)
+                        # Calculate ADX
+                        candles['adx'] = indicator_calc.calculate_adx(candles, period=14)
                     
-                    candle_data[timeframe] = candles
+                        candle_data[timeframe] = candles
                     
-                    # Detect signals
-                    detected_signal = signal_detector.detect_signals(candles, timeframe)
+                        # Detect signals
+                        detected_signal = signal_detector.detect_signals(candles, timeframe)
                     
-                    # Log scan result to Excel
-                    if excel_reporter and not candles.empty:
-                        last_row = candles.iloc[-1]
-                        # Determine scanner name based on strategy
-                        scanner_name = 'BTC-Swing'
-                        if detected_signal and getattr(detected_signal, 'strategy', '') == 'H4 HVG':
-                            scanner_name = 'BTC-Swing-H4HVG'
+                        # Log scan result to Excel
+                        if excel_reporter and not candles.empty:
+                            last_row = candles.iloc[-1]
+                            # Determine scanner name based on strategy
+                            scanner_name = 'BTC-Swing'
+                            if detected_signal and getattr(detected_signal, 'strategy', '') == 'H4 HVG':
+                                scanner_name = 'BTC-Swing-H4HVG'
                         
-                        scan_data = {
-                            'timestamp': datetime.now(),
-                            'scanner': scanner_name,
-                            'symbol': config['symbol'],
-                            'timeframe': timeframe,
-                            'price': last_row['close'],
-                            'volume': last_row['volume'],
-                            'indicators': {
-                                'ema_9': last_row.get('ema_9', None),
-                                'ema_21': last_row.get('ema_21', None),
-                                'ema_50': last_row.get('ema_50', None),
-                                'ema_100': last_row.get('ema_100', None),
-                                'ema_200': last_row.get('ema_200', None),
-                                'rsi': last_row.get('rsi', None),
-                                'atr': last_row.get('atr', None),
-                                'volume_ma': last_row.get('volume_ma', None),
-                                'vwap': last_row.get('vwap', None)
-                            },
-                            'signal_detected': detected_signal is not None,
-                            'signal_type': detected_signal.signal_type if detected_signal else None,
-                            'signal_details': {
-                                'entry_price': detected_signal.entry_price,
-                                'stop_loss': detected_signal.stop_loss,
-                                'take_profit': detected_signal.take_profit,
-                                'risk_reward': detected_signal.risk_reward,
-                                'strategy': getattr(detected_signal, 'strategy', 'EMA Crossover'),
-                                'confidence': getattr(detected_signal, 'confidence', None),
-                                'market_bias': getattr(detected_signal, 'market_bias', None),
-                                'trend_direction': getattr(detected_signal, 'trend_direction', None),
-                                'swing_points': getattr(detected_signal, 'swing_points', None),
-                                'pullback_depth': getattr(detected_signal, 'pullback_depth', None),
-                                'gap_size_percent': getattr(detected_signal, 'gap_info', {}).gap_percent if detected_signal and hasattr(detected_signal, 'gap_info') and detected_signal.gap_info else None,
-                                'volume_spike_ratio': getattr(detected_signal, 'volume_spike_ratio', None) if detected_signal else None,
-                                'confluence_factors': len(getattr(detected_signal, 'confluence_factors', [])) if detected_signal and hasattr(detected_signal, 'confluence_factors') and detected_signal.confluence_factors else None
-                            } if detected_signal else {}
-                        }
-                        excel_reporter.log_scan_result(scan_data)
+                            scan_data = {
+                                'timestamp': datetime.now(),
+                                'scanner': scanner_name,
+                                'symbol': config['symbol'],
+                                'timeframe': timeframe,
+                                'price': last_row['close'],
+                                'volume': last_row['volume'],
+                                'indicators': {
+                                    'ema_9': last_row.get('ema_9', None),
+                                    'ema_21': last_row.get('ema_21', None),
+                                    'ema_50': last_row.get('ema_50', None),
+                                    'ema_100': last_row.get('ema_100', None),
+                                    'ema_200': last_row.get('ema_200', None),
+                                    'rsi': last_row.get('rsi', None),
+                                    'atr': last_row.get('atr', None),
+                                    'volume_ma': last_row.get('volume_ma', None),
+                                    'vwap': last_row.get('vwap', None)
+                                },
+                                'signal_detected': detected_signal is not None,
+                                'signal_type': detected_signal.signal_type if detected_signal else None,
+                                'signal_details': {
+                                    'entry_price': detected_signal.entry_price,
+                                    'stop_loss': detected_signal.stop_loss,
+                                    'take_profit': detected_signal.take_profit,
+                                    'risk_reward': detected_signal.risk_reward,
+                                    'strategy': getattr(detected_signal, 'strategy', 'EMA Crossover'),
+                                    'confidence': getattr(detected_signal, 'confidence', None),
+                                    'market_bias': getattr(detected_signal, 'market_bias', None),
+                                    'trend_direction': getattr(detected_signal, 'trend_direction', None),
+                                    'swing_points': getattr(detected_signal, 'swing_points', None),
+                                    'pullback_depth': getattr(detected_signal, 'pullback_depth', None),
+                                    'gap_size_percent': getattr(detected_signal, 'gap_info', {}).gap_percent if detected_signal and hasattr(detected_signal, 'gap_info') and detected_signal.gap_info else None,
+                                    'volume_spike_ratio': getattr(detected_signal, 'volume_spike_ratio', None) if detected_signal else None,
+                                    'confluence_factors': len(getattr(detected_signal, 'confluence_factors', [])) if detected_signal and hasattr(detected_signal, 'confluence_factors') and detected_signal.confluence_factors else None
+                                } if detected_signal else {}
+                            }
+                            excel_reporter.log_scan_result(scan_data)
                     
-                    if detected_signal:
-                        logger.info(f"🚨 {detected_signal.signal_type} SIGNAL on {timeframe}!")
-                        logger.info(f"Entry: ${detected_signal.entry_price:.2f}, SL: ${detected_signal.stop_loss:.2f}, TP: ${detected_signal.take_profit:.2f}")
-                        logger.info(f"Confidence: {detected_signal.confidence}/5, R:R = {detected_signal.risk_reward:.2f}")
+                        if detected_signal:
+                            logger.info(f"🚨 {detected_signal.signal_type} SIGNAL on {timeframe}!")
+                            logger.info(f"Entry: ${detected_signal.entry_price:.2f}, SL: ${detected_signal.stop_loss:.2f}, TP: ${detected_signal.take_profit:.2f}")
+                            logger.info(f"Confidence: {detected_signal.confidence}/5, R:R = {detected_signal.risk_reward:.2f}")
                         
-                        # Send alert
-                        if alerter:
-                            alerter.send_signal_alert(detected_signal)
+                            # Send alert
+                            if alerter:
+                                alerter.send_signal_alert(detected_signal)
                         
-                        # Track trade
-                        trade_tracker.add_trade(detected_signal)
+                            # Track trade
+                            trade_tracker.add_trade(detected_signal)
                 
-                except Exception as e:
-                    logger.error(f"Error processing {timeframe}: {e}")
+                    except Exception as e:
+                        logger.error(f"Error processing {timeframe}: {e}")
             
             # Check for trade updates
             try:
@@ -393,6 +417,14 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error in main loop: {e}", exc_info=True)
         sys.exit(1)
+    
+    finally:
+        # Write a final checkpoint
+        if checkpointer is not None:
+            checkpointer.stop()
+        
+        # Deliver queued emails before the process exits
+        stop_all_dispatchers()
 
 
 if __name__ == "__main__":
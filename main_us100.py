@@ -18,9 +18,13 @@ from src.signal_quality_filter import SignalQualityFilter, QualityConfig
 from src.alerter import TelegramAlerter
 from src.trade_tracker import TradeTracker
 from src.excel_reporter import ExcelReporter
+from src.scan_engine import ScanEngine
+from src.event_store import get_event_store
 from src.signal_diagnostics import SignalDiagnostics
 from src.config_validator import ConfigValidator
 from src.bypass_mode import BypassMode
+from src.state_checkpoint import StateCheckpointer, warm_start_fetch
+from src.email_dispatcher import stop_all_dispatchers
 
 
 def setup_logging(log_file: str, log_level: str) -> None:
@@ -149,7 +153,8 @@ def main():
     bypass_mode = BypassMode(config, alerter)
     
     # Initialize trade tracker
-    trade_tracker = TradeTracker(alerter=alerter)
+    event_store = get_event_store()
+    trade_tracker = TradeTracker(alerter=alerter, events=event_store)
     
     # Initialize Excel reporter
     excel_reporter = None
@@ -169,6 +174,15 @@ def main():
         except Exception as e:
             logger.error(f"Failed to initialize Excel reporter: {e}")
     
+    # Warm restarts: duplicate windows, open trades and candle buffers are checkpointed
+    checkpointer = StateCheckpointer.for_components(config.get('checkpoint'), {
+        'market_client': market_client,
+        'signal_detector': signal_detector,
+        'quality_filter': quality_filter,
+        'trade_tracker': trade_tracker,
+        'diagnostics': diagnostics
+    })
+    
     logger.info("All components initialized successfully")
     
     # Connect to data source
@@ -176,22 +190,113 @@ def main():
     market_client.connect()
     logger.info(f"Successfully connected for {config['symbol']}")
     
-    # Fetch initial data
-    candle_data = {}
-    for timeframe in config['timeframes']:
-        logger.info(f"Fetching initial data for {timeframe}...")
-        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
-        
-        # Calculate indicators
-        candles = indicator_calc.calculate_all_indicators(
+    # Scan pipeline stages
+    def fetch_candles(timeframe):
+        candles, _ = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
+        return candles
+    
+    def add_indicators(candles):
+        return indicator_calc.calculate_all_indicators(
             candles,
             ema_periods=[9, 21, 50, 100, 200],
             atr_period=14,
             rsi_period=14,
             volume_ma_period=20
         )
+    
+    def detect_signal(ctx):
+        return signal_detector.detect_signals(ctx.candles, ctx.timeframe, "US100")
+    
+    def log_scan(ctx):
+        # Log scan result to Excel
+        candles, timeframe, detected_signal = ctx.candles, ctx.timeframe, ctx.detected
+        last_row = candles.iloc[-1]
+        scanner_name = 'US100'
+        if detected_signal and getattr(detected_signal, 'strategy', '') == 'H4 HVG':
+            scanner_name = 'US100-H4HVG'
+        
+        scan_data = {
+            'timestamp': datetime.now(),
+            'scanner': scanner_name,
+            'symbol': config['symbol'],
+            'timeframe': timeframe,
+            'price': last_row['close'],
+            'volume': last_row['volume'],
+            'indicators': {
+                'ema_9': last_row.get('ema_9', None),
+                'ema_21': last_row.get('ema_21', None),
+                'ema_50': last_row.get('ema_50', None),
+                'rsi': last_row.get('rsi', None),
+                'atr': last_row.get('atr', None),
+                'adx': last_row.get('adx', None)
+            },
+            'signal_detected': detected_signal is not None,
+            'signal_type': detected_signal.signal_type if detected_signal else None,
+            'signal_details': {
+                'entry_price': detected_signal.entry_price,
+                'stop_loss': detected_signal.stop_loss,
+                'take_profit': detected_signal.take_profit,
+                'risk_reward': detected_signal.risk_reward,
+                'strategy': detected_signal.strategy,
+                'confidence': detected_signal.confidence
+            } if detected_signal else {}
+        }
+        excel_reporter.log_scan_result(scan_data)
+    
+    def apply_quality_filter(ctx):
+        detected_signal, timeframe = ctx.signal, ctx.timeframe
         
-        candle_data[timeframe] = candles
+        logger.info(f"🚨 {detected_signal.signal_type} SIGNAL on {timeframe}!")
+        logger.info(f"Strategy: {detected_signal.strategy}")
+        logger.info(f"Entry: ${detected_signal.entry_price:.2f}, SL: ${detected_signal.stop_loss:.2f}, TP: ${detected_signal.take_profit:.2f}")
+        logger.info(f"Confidence: {detected_signal.confidence}/5, R:R = {detected_signal.risk_reward:.2f}")
+        
+        # Apply quality filter (unless bypass mode)
+        if bypass_mode.should_bypass_filters():
+            logger.warning("⚠️ BYPASS MODE - Skipping quality filter")
+            return True
+        
+        filter_result = quality_filter.evaluate_signal(detected_signal, ctx.candles)
+        
+        if filter_result.passed:
+            logger.info(f"✓ Signal passed quality filter")
+            return True
+        
+        logger.info(f"✗ Signal rejected by quality filter: {filter_result.rejection_reason}")
+        ctx.rejection_reason = filter_result.rejection_reason
+        return False
+    
+    def send_alert(ctx):
+        # Send alert if signal passed
+        signal_to_send = ctx.signal
+        if alerter:
+            alerter.send_signal_alert(signal_to_send)
+            quality_filter.add_signal_to_history(signal_to_send)
+            
+            # Track trade
+            trade_tracker.add_trade(signal_to_send)
+    
+    scan_engine = ScanEngine(
+        config['timeframes'],
+        fetch=fetch_candles,
+        indicators=add_indicators,
+        detect=detect_signal,
+        report=log_scan if excel_reporter else None,
+        filters=[apply_quality_filter],
+        alert=send_alert,
+        name="us100",
+        events=event_store,
+        symbol=config['symbol']
+    )
+    
+    # Fetch initial data
+    logger.info(f"Fetching initial data for {', '.join(config['timeframes'])}...")
+    restored = checkpointer.restore() if checkpointer is not None else []
+    scan_engine.prepare_all(warm_start_fetch(market_client, fetch_candles) if 'market_client' in restored else None)
+    if checkpointer is not None:
+        checkpointer.start()
+    candle_data = scan_engine.candle_data
+    for timeframe in candle_data:
         logger.info(f"Loaded {timeframe} data with indicators")
     
     # Main polling loop
@@ -225,92 +330,8 @@ def main():
             # Check bypass mode auto-disable
             bypass_mode.check_auto_disable()
             
-            # Update data for each timeframe
-            for timeframe in config['timeframes']:
-                try:
-                    # Fetch latest candles
-                    candles, is_fresh = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
-                    
-                    # Calculate indicators
-                    candles = indicator_calc.calculate_all_indicators(
-                        candles,
-                        ema_periods=[9, 21, 50, 100, 200],
-                        atr_period=14,
-                        rsi_period=14,
-                        volume_ma_period=20
-                    )
-                    
-                    candle_data[timeframe] = candles
-                    
-                    # Detect signals
-                    detected_signal = signal_detector.detect_signals(candles, timeframe, "US100")
-                    
-                    # Log scan result to Excel
-                    if excel_reporter and not candles.empty:
-                        last_row = candles.iloc[-1]
-                        scanner_name = 'US100'
-                        if detected_signal and getattr(detected_signal, 'strategy', '') == 'H4 HVG':
-                            scanner_name = 'US100-H4HVG'
-                        
-                        scan_data = {
-                            'timestamp': datetime.now(),
-                            'scanner': scanner_name,
-                            'symbol': config['symbol'],
-                            'timeframe': timeframe,
-                            'price': last_row['close'],
-                            'volume': last_row['volume'],
-                            'indicators': {
-                                'ema_9': last_row.get('ema_9', None),
-                                'ema_21': last_row.get('ema_21', None),
-                                'ema_50': last_row.get('ema_50', None),
-                                'rsi': last_row.get('rsi', None),
-                                'atr': last_row.get('atr', None),
-                                'adx': last_row.get('adx', None)
-                            },
-                            'signal_detected': detected_signal is not None,
-                            'signal_type': detected_signal.signal_type if detected_signal else None,
-                            'signal_details': {
-                                'entry_price': detected_signal.entry_price,
-                                'stop_loss': detected_signal.stop_loss,
-                                'take_profit': detected_signal.take_profit,
-                                'risk_reward': detected_signal.risk_reward,
-                                'strategy': detected_signal.strategy,
-                                'confidence': detected_signal.confidence
-                            } if detected_signal else {}
-                        }
-                        excel_reporter.log_scan_result(scan_data)
-                    
-                    if detected_signal:
-                        logger.info(f"🚨 {detected_signal.signal_type} SIGNAL on {timeframe}!")
-                        logger.info(f"Strategy: {detected_signal.strategy}")
-                        logger.info(f"Entry: ${detected_signal.entry_price:.2f}, SL: ${detected_signal.stop_loss:.2f}, TP: ${detected_signal.take_profit:.2f}")
-                        logger.info(f"Confidence: {detected_signal.confidence}/5, R:R = {detected_signal.risk_reward:.2f}")
-                        
-                        # Apply quality filter (unless bypass mode)
-                        if bypass_mode.should_bypass_filters():
-                            logger.warning("⚠️ BYPASS MODE - Skipping quality filter")
-                            signal_to_send = detected_signal
-                        else:
-                            filter_result = quality_filter.evaluate_signal(detected_signal, candles)
-                            
-                            if filter_result.passed:
-                                logger.info(f"✓ Signal passed quality filter")
-                                signal_to_send = detected_signal
-                            else:
-                                logger.info(f"✗ Signal rejected by quality filter: {filter_result.rejection_reason}")
-                                signal_to_send = None
-                        
-                        # Send alert if signal passed
-                        if signal_to_send and alerter:
-                            prefix = bypass_mode.format_signal_prefix()
-                            alerter.send_signal_alert(signal_to_send)
-                            quality_filter.add_signal_to_history(signal_to_send)
-                            
-                            # Track trade
-                            trade_tracker.add_trade(signal_to_send)
-                
-                except Exception as e:
-                    logger.error(f"Error processing {timeframe}: {e}")
+            # Fetch, compute indicators and detect across timeframes
+            scan_engine.run_cycle()
             
             # Check for trade updates
             try:
@@ -365,6 +386,9 @@ def main():
         logger.info("Scanner stopped by user")
         logger.info("=" * 60)
         
+        scan_engine.shutdown()
+        event_store.close()
+        
         # Stop Excel reporter
         if excel_reporter:
             excel_reporter.stop()
@@ -375,6 +399,14 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error in main loop: {e}", exc_info=True)
         sys.exit(1)
+    
+    finally:
+        # Write a final checkpoint
+        if checkpointer is not None:
+            checkpointer.stop()
+        
+        # Deliver queued emails before the process exits
+        stop_all_dispatchers()
 
 
 if __name__ == "__main__":
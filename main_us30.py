@@ -18,9 +18,13 @@ from src.signal_quality_filter import SignalQualityFilter, QualityConfig
 from src.alerter import TelegramAlerter
 from src.trade_tracker import TradeTracker
 from src.excel_reporter import ExcelReporter
+from src.scan_engine import ScanEngine
+from src.event_store import get_event_store
 from src.signal_diagnostics import SignalDiagnostics
 from src.config_validator import ConfigValidator
 from src.bypass_mode import BypassMode
+from src.state_checkpoint import StateCheckpointer, warm_start_fetch
+from src.email_dispatcher import stop_all_dispatchers
 
 
 def setup_logging(log_file: str, log_level: str) -> None:
@@ -132,7 +136,8 @@ def main():
     logger.info("Signal Quality Filter initialized")
     
     # Initialize trade tracker
-    trade_tracker = TradeTracker(alerter=alerter)
+    event_store = get_event_store()
+    trade_tracker = TradeTracker(alerter=alerter, events=event_store)
     
     # Initialize Excel reporter
     excel_reporter = None
@@ -152,6 +157,15 @@ def main():
         except Exception as e:
             logger.error(f"Failed to initialize Excel reporter: {e}")
     
+    # Warm restarts: duplicate windows, open trades and candle buffers are checkpointed
+    checkpointer = StateCheckpointer.for_components(config.get('checkpoint'), {
+        'market_client': market_client,
+        'us30_strategy': us30_strategy,
+        'quality_filter': quality_filter,
+        'trade_tracker': trade_tracker,
+        'diagnostics': diagnostics
+    })
+    
     logger.info("All components initialized successfully")
     
     # Connect to data source
@@ -159,12 +173,13 @@ def main():
     market_client.connect()
     logger.info(f"Successfully connected for {config['symbol']}")
     
-    # Fetch initial data
-    candle_data = {}
-    for timeframe in config['timeframes']:
-        logger.info(f"Fetching initial data for {timeframe}...")
-        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
-        
+    # Scan pipeline stages
+    def fetch_candles(timeframe):
+        # Disable freshness validation - yfinance data may be delayed
+        candles, _ = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
+        return candles
+    
+    def add_indicators(candles):
         # Calculate indicators
         candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
         candles['ema_21'] = indicator_calc.calculate_ema(candles, 21)
@@ -181,8 +196,79 @@ def main():
         stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
         candles['stoch_k'] = stoch_k
         candles['stoch_d'] = stoch_d
+        return candles
+    
+    def detect_signal(ctx):
+        # Detect signals using US30 strategy
+        return us30_strategy.detect_signal(ctx.candles, ctx.timeframe)
+    
+    def log_scan(ctx):
+        # Log scan result to Excel
+        candles, timeframe, detected_signal = ctx.candles, ctx.timeframe, ctx.signal
+        last_row = candles.iloc[-1]
         
-        candle_data[timeframe] = candles
+        scan_data = {
+            'timestamp': datetime.now(),
+            'scanner': 'US30-Momentum',
+            'symbol': config['symbol'],
+            'timeframe': timeframe,
+            'price': last_row['close'],
+            'volume': last_row['volume'],
+            'indicators': {
+                'ema_50': last_row.get('ema_50', None),
+                'rsi': last_row.get('rsi', None),
+                'atr': last_row.get('atr', None),
+                'adx': last_row.get('adx', None),
+                'volume_ma': last_row.get('volume_ma', None)
+            },
+            'signal_detected': detected_signal is not None,
+            'signal_type': detected_signal.signal_type if detected_signal else None,
+            'signal_details': {
+                'entry_price': detected_signal.entry_price,
+                'stop_loss': detected_signal.stop_loss,
+                'take_profit': detected_signal.take_profit,
+                'risk_reward': detected_signal.risk_reward,
+                'strategy': detected_signal.strategy,
+                'confidence': detected_signal.confidence,
+                'reasoning': detected_signal.reasoning
+            } if detected_signal else {}
+        }
+        excel_reporter.log_scan_result(scan_data)
+    
+    def send_alert(ctx):
+        detected_signal, timeframe = ctx.signal, ctx.timeframe
+        
+        logger.info(f"🚨 {detected_signal.signal_type} SIGNAL on {timeframe}!")
+        logger.info(f"Entry: ${detected_signal.entry_price:.2f}, SL: ${detected_signal.stop_loss:.2f}, TP: ${detected_signal.take_profit:.2f}")
+        logger.info(f"Confidence: {detected_signal.confidence}/5, R:R = {detected_signal.risk_reward:.2f}")
+        
+        # Send alert
+        if alerter:
+            alerter.send_signal_alert(detected_signal)
+        
+        # Track trade
+        trade_tracker.add_trade(detected_signal)
+    
+    scan_engine = ScanEngine(
+        config['timeframes'],
+        fetch=fetch_candles,
+        indicators=add_indicators,
+        detect=detect_signal,
+        report=log_scan if excel_reporter else None,
+        alert=send_alert,
+        name="us30",
+        events=event_store,
+        symbol=config['symbol']
+    )
+    
+    # Fetch initial data
+    logger.info(f"Fetching initial data for {', '.join(config['timeframes'])}...")
+    restored = checkpointer.restore() if checkpointer is not None else []
+    scan_engine.prepare_all(warm_start_fetch(market_client, fetch_candles) if 'market_client' in restored else None)
+    if checkpointer is not None:
+        checkpointer.start()
+    candle_data = scan_engine.candle_data
+    for timeframe in candle_data:
         logger.info(f"Loaded {timeframe} data with indicators")
     
     # Send startup notification
@@ -213,79 +299,8 @@ def main():
     
     try:
         while True:
-            # Update data for each timeframe
-            for timeframe in config['timeframes']:
-                try:
-                    # Fetch latest candles (disable freshness validation)
-                    candles, is_fresh = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
-                    
-                    # Calculate indicators
-                    candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
-                    candles['ema_21'] = indicator_calc.calculate_ema(candles, 21)
-                    candles['ema_50'] = indicator_calc.calculate_ema(candles, 50)
-                    candles['ema_100'] = indicator_calc.calculate_ema(candles, 100)
-                    candles['ema_200'] = indicator_calc.calculate_ema(candles, 200)
-                    candles['vwap'] = indicator_calc.calculate_vwap(candles)
-                    candles['atr'] = indicator_calc.calculate_atr(candles, 14)
-                    candles['rsi'] = indicator_calc.calculate_rsi(candles, 14)
-                    candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, 20)
-                    candles['adx'] = indicator_calc.calculate_adx(candles, period=14)
-                    
-                    stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
-                    candles['stoch_k'] = stoch_k
-                    candles['stoch_d'] = stoch_d
-                    
-                    candle_data[timeframe] = candles
-                    
-                    # Detect signals using US30 strategy
-                    detected_signal = us30_strategy.detect_signal(candles, timeframe)
-                    
-                    # Log scan result to Excel
-                    if excel_reporter and not candles.empty:
-                        last_row = candles.iloc[-1]
-                        
-                        scan_data = {
-                            'timestamp': datetime.now(),
-                            'scanner': 'US30-Momentum',
-                            'symbol': config['symbol'],
-                            'timeframe': timeframe,
-                            'price': last_row['close'],
-                            'volume': last_row['volume'],
-                            'indicators': {
-                                'ema_50': last_row.get('ema_50', None),
-                                'rsi': last_row.get('rsi', None),
-                                'atr': last_row.get('atr', None),
-                                'adx': last_row.get('adx', None),
-                                'volume_ma': last_row.get('volume_ma', None)
-                            },
-                            'signal_detected': detected_signal is not None,
-                            'signal_type': detected_signal.signal_type if detected_signal else None,
-                            'signal_details': {
-                                'entry_price': detected_signal.entry_price,
-                                'stop_loss': detected_signal.stop_loss,
-                                'take_profit': detected_signal.take_profit,
-                                'risk_reward': detected_signal.risk_reward,
-                                'strategy': detected_signal.strategy,
-                                'confidence': detected_signal.confidence,
-                                'reasoning': detected_signal.reasoning
-                            } if detected_signal else {}
-                        }
-                        excel_reporter.log_scan_result(scan_data)
-                    
-                    if detected_signal:
-                        logger.info(f"🚨 {detected_signal.signal_type} SIGNAL on {timeframe}!")
-                        logger.info(f"Entry: ${detected_signal.entry_price:.2f}, SL: ${detected_signal.stop_loss:.2f}, TP: ${detected_signal.take_profit:.2f}")
-                        logger.info(f"Confidence: {detected_signal.confidence}/5, R:R = {detected_signal.risk_reward:.2f}")
-                        
-                        # Send alert
-                        if alerter:
-                            alerter.send_signal_alert(detected_signal)
-                        
-                        # Track trade
-                        trade_tracker.add_trade(detected_signal)
-                
-                except Exception as e:
-                    logger.error(f"Error processing {timeframe}: {e}")
+            # Fetch, compute indicators and detect across timeframes
+            scan_engine.run_cycle()
             
             # Check for trade updates
             try:
@@ -335,12 +350,23 @@ def main():
         logger.info("Scanner stopped by user")
         logger.info("=" * 60)
         
+        scan_engine.shutdown()
+        event_store.close()
+        
         if excel_reporter:
             excel_reporter.stop()
     
     except Exception as e:
         logger.error(f"Fatal error in main loop: {e}", exc_info=True)
         sys.exit(1)
+    
+    finally:
+        # Write a final checkpoint
+        if checkpointer is not None:
+            checkpointer.stop()
+        
+        # Deliver queued emails before the process exits
+        stop_all_dispatchers()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,11 @@
 """Alert delivery via Email and Telegram."""
-import smtplib
 import time
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 import logging
 
+from src.email_dispatcher import EmailDispatcher, OutgoingEmail, get_dispatcher
 from src.signal_detector import Signal
+from src import latency_trace
 
 
 logger = logging.getLogger(__name__)
@@ -23,7 +22,8 @@ class EmailAlerter:
         smtp_password: str,
         from_email: str,
         to_email: str,
-        use_ssl: bool = True
+        use_ssl: bool = True,
+        dispatcher: Optional[EmailDispatcher] = None
     ):
         """
         Initialize email alerter.
@@ -36,6 +36,7 @@ class EmailAlerter:
             from_email: From email address
             to_email: Recipient email address
             use_ssl: Use SSL connection
+            dispatcher: Optional dispatcher (defaults to the shared one for this account)
         """
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
@@ -44,6 +45,9 @@ class EmailAlerter:
         self.from_email = from_email
         self.to_email = to_email
         self.use_ssl = use_ssl
+        self.dispatcher = dispatcher or get_dispatcher(
+            smtp_server, smtp_port, smtp_user, smtp_password, use_ssl
+        )
         
         self.success_count = 0
         self.failure_count = 0
@@ -146,7 +150,11 @@ Automated alert from BTC Scalping Scanner
     
     def _send_email(self, subject: str, body: str, max_retries: int = 3) -> bool:
         """
-        Send email with retry logic.
+        Queue email for background delivery.
+        
+        Delivery (with retries) happens on the dispatcher thread, so this
+        never blocks on SMTP; success/failure counts are updated when the
+        dispatcher reports the outcome.
         
         Args:
             subject: Email subject
@@ -154,42 +162,29 @@ Automated alert from BTC Scalping Scanner
             max_retries: Maximum retry attempts
             
         Returns:
-            True if sent successfully, False otherwise
+            True if queued successfully, False otherwise
         """
-        for attempt in range(max_retries):
-            try:
-                # Create message
-                msg = MIMEMultipart()
-                msg['From'] = self.from_email
-                msg['To'] = self.to_email
-                msg['Subject'] = subject
-                msg.attach(MIMEText(body, 'plain'))
-                
-                # Connect and send
-                if self.use_ssl:
-                    server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=10)
-                else:
-                    server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10)
-                    server.starttls()
-                
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-                server.quit()
-                
-                self.success_count += 1
-                logger.info(f"Email sent successfully: {subject}")
-                return True
-                
-            except Exception as e:
-                logger.error(f"Email send attempt {attempt + 1}/{max_retries} failed: {e}")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(5)  # Wait 5 seconds before retry
-                else:
-                    self.failure_count += 1
-                    return False
-        
-        return False
+        try:
+            self.dispatcher.submit(OutgoingEmail(
+                subject=subject,
+                body=body,
+                from_email=self.from_email,
+                to_email=self.to_email,
+                max_retries=max_retries,
+                on_result=self._record_result
+            ))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to queue email: {e}")
+            self.failure_count += 1
+            return False
+    
+    def _record_result(self, success: bool) -> None:
+        """Update delivery counters from the dispatcher thread."""
+        if success:
+            self.success_count += 1
+        else:
+            self.failure_count += 1
     
     def get_success_rate(self) -> float:
         """Calculate email delivery success rate."""
@@ -243,7 +238,10 @@ class TelegramAlerter:
             return False
         
         message = self._format_signal_message(signal)
-        return self._send_message(message)
+        sent = self._send_message(message)
+        if sent:
+            latency_trace.complete(signal)
+        return sent
     
     def send_error_alert(self, error: Exception, context: str = "") -> bool:
         """
@@ -447,6 +445,10 @@ class MultiAlerter:
         if self.telegram_alerter and self.telegram_alerter.enabled:
             telegram_success = self.telegram_alerter.send_signal_alert(signal)
         
+        # Telegram completes the trace on delivery; an email is only queued by now
+        if email_success and not telegram_success:
+            latency_trace.complete(signal, hop='alert_queued')
+        
         return email_success or telegram_success
     
     def send_error_alert(self, error: Exception, context: str = "") -> bool:
@@ -7,7 +7,8 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, List
-import time
+
+from src.rate_limiter import Priority, get_broker, priority_for_timeframe
 
 logger = logging.getLogger(__name__)
 
@@ -58,14 +59,16 @@ class AlphaVantageClient:
         self.is_forex = symbol in ['XAU/USD', 'XAUUSD', 'GOLD/USD']
         
         self.connected = False
-        self.last_call_time = 0
-        self.min_call_interval = 12  # 5 calls/min = 12 seconds between calls
+        self.rate_limiter = get_broker()  # Shared with every client using this provider/key
         
         logger.info(f"Initialized AlphaVantageClient for {symbol} (mapped to {self.av_symbol})")
     
     def connect(self) -> bool:
         """Test connection to Alpha Vantage"""
         try:
+            if not self._rate_limit_wait(Priority.BACKFILL):
+                return False
+            
             # Test with a simple quote request
             params = {
                 'function': 'GLOBAL_QUOTE',
@@ -84,6 +87,7 @@ class AlphaVantageClient:
                 
                 if 'Note' in data:
                     logger.warning(f"Alpha Vantage rate limit: {data['Note']}")
+                    self._report_throttled(response)
                     return False
                 
                 self.connected = True
@@ -97,14 +101,25 @@ class AlphaVantageClient:
             logger.error(f"Failed to connect to Alpha Vantage: {e}")
             return False
     
-    def _rate_limit_wait(self):
-        """Wait if needed to respect rate limits"""
-        elapsed = time.time() - self.last_call_time
-        if elapsed < self.min_call_interval:
-            wait_time = self.min_call_interval - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.1f}s")
-            time.sleep(wait_time)
-        self.last_call_time = time.time()
+    def _rate_limit_wait(self, priority: Priority = Priority.SCAN) -> bool:
+        """
+        Wait for the shared Alpha Vantage request budget.
+        
+        Args:
+            priority: Request priority class
+            
+        Returns:
+            False if the request must not be sent (daily quota spent)
+        """
+        return self.rate_limiter.acquire('alpha_vantage', priority, api_key=self.api_key)
+    
+    def _report_throttled(self, response) -> None:
+        """Tell the rate limiter the provider rejected a request for exceeding limits."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        self.rate_limiter.report_throttled(
+            'alpha_vantage', api_key=self.api_key,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else 60.0
+        )
     
     def get_latest_candles(self, timeframe: str, count: int = 100) -> pd.DataFrame:
         """
@@ -118,7 +133,8 @@ class AlphaVantageClient:
             DataFrame with OHLCV data
         """
         try:
-            self._rate_limit_wait()
+            if not self._rate_limit_wait(priority_for_timeframe(timeframe)):
+                return pd.DataFrame()
             
             av_interval = self.INTERVAL_MAP.get(timeframe, '5min')
             
@@ -145,6 +161,8 @@ class AlphaVantageClient:
             
             response = requests.get(self.base_url, params=params, timeout=30)
             
+            if response.status_code == 429:
+                self._report_throttled(response)
             if response.status_code != 200:
                 logger.error(f"HTTP {response.status_code} from Alpha Vantage")
                 return pd.DataFrame()
@@ -158,6 +176,7 @@ class AlphaVantageClient:
             
             if 'Note' in data:
                 logger.warning(f"Rate limit hit: {data['Note']}")
+                self._report_throttled(response)
                 return pd.DataFrame()
             
             # Extract time series data
@@ -203,7 +222,8 @@ class AlphaVantageClient:
     def get_current_price(self) -> Optional[float]:
         """Get current price"""
         try:
-            self._rate_limit_wait()
+            if not self._rate_limit_wait(Priority.TRADE):
+                return None
             
             params = {
                 'function': 'GLOBAL_QUOTE',
@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Optional, List, Dict
 import pandas as pd
 
+from src import latency_trace
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,11 +68,13 @@ class BaseScanner:
         # Initialize components
         self.data_client = None
         self.indicator_calculator = None
+        self.indicator_plan = None
         self.strategy_detector = None
         self.signal_quality_filter = None
         self.alerter = None
         self.trade_tracker = None
         self.health_monitor = None
+        self.checkpointer = None
         
         # Control flags
         self.running = False
@@ -82,6 +86,7 @@ class BaseScanner:
         
         # Initialize all components
         self._initialize_components()
+        self._initialize_checkpointer()
         
         logger.info(f"{scanner_name} scanner initialized successfully")
     
@@ -90,13 +95,18 @@ class BaseScanner:
         try:
             # Initialize data client
             from src.unified_data_source import UnifiedDataSource, DataSourceConfig
+            from src.timeframe_resampler import timeframe_to_timedelta
             
+            # Higher timeframes are resampled from the finest one: one fetch per cycle
+            base_timeframe = min(self.timeframes, key=timeframe_to_timedelta)
             data_config = DataSourceConfig(
                 primary_source="binance",
                 fallback_sources=["twelve_data", "alpha_vantage", "mt5"],
                 alpha_vantage_key=self.config.data_providers.alpha_vantage_key if self.config.data_providers else None,
                 twelve_data_key=self.config.data_providers.twelve_data_key if self.config.data_providers else None,
-                freshness_threshold_seconds=300
+                freshness_threshold_seconds=300,
+                resample_timeframes=self.asset_config.get('resample_timeframes', True),
+                base_timeframes={self.symbol: base_timeframe}
             )
             self.data_client = UnifiedDataSource(data_config)
             logger.info("Data client initialized")
@@ -109,6 +119,7 @@ class BaseScanner:
             # Initialize strategy detector
             from src.strategy_detector import StrategyDetector
             self.strategy_detector = StrategyDetector()
+            self._register_strategies()
             logger.info("Strategy detector initialized")
             
             # Initialize signal quality filter
@@ -120,6 +131,14 @@ class BaseScanner:
             self.signal_quality_filter = SignalQualityFilter(quality_config)
             logger.info("Signal quality filter initialized")
             
+            # Plan only the indicators detection and filtering read
+            from src.indicator_planner import IndicatorPlanner, required_columns
+            self.indicator_plan = IndicatorPlanner(rsi_period=6).plan(required_columns(
+                self.strategy_detector.required_columns(),
+                SignalQualityFilter.REQUIRED_INDICATORS
+            ))
+            logger.info(f"Indicator plan: {', '.join(self.indicator_plan.outputs)}")
+            
             # Initialize alerter
             from src.alerter import EmailAlerter, TelegramAlerter, MultiAlerter
             
@@ -165,6 +184,33 @@ class BaseScanner:
             logger.error(f"Error initializing components: {e}", exc_info=True)
             raise
     
+    def _register_strategies(self):
+        """Register the strategies the detector's priority table names; each declares the columns it reads"""
+        from src.strategies import (FibonacciRetracement, MeanReversion, MomentumShift, SupportResistance,
+                                    TrendAlignment)
+        
+        volume_thresholds = self.asset_config.get('volume_thresholds', {})
+        for name, strategy_class in (
+            ('momentum_shift', MomentumShift),
+            ('trend_alignment', TrendAlignment),
+            ('mean_reversion', MeanReversion),
+            ('support_resistance_bounce', SupportResistance),
+            ('fibonacci_retracement', FibonacciRetracement),
+        ):
+            if strategy_class is None:
+                continue
+            config = {'volume_threshold': volume_thresholds[name]} if name in volume_thresholds else {}
+            self.strategy_detector.register_strategy(name, strategy_class(config).detect_signal)
+    
+    def _initialize_checkpointer(self):
+        """Checkpoint duplicate windows, open trades and candle stores (opt-in via asset_config['checkpoint'])"""
+        from src.state_checkpoint import StateCheckpointer
+        self.checkpointer = StateCheckpointer.for_components(self.asset_config.get('checkpoint'), {
+            'signal_quality_filter': self.signal_quality_filter,
+            'trade_tracker': self.trade_tracker,
+            'data_client': self.data_client
+        })
+    
     def start(self) -> bool:
         """
         Start the scanner.
@@ -175,9 +221,21 @@ class BaseScanner:
         try:
             logger.info(f"Starting {self.scanner_name} scanner")
             
+            # Warm restart from the last checkpoint (strategies may be registered after construction)
+            restored = False
+            if self.checkpointer is not None:
+                for name, detector in self.strategy_detector.checkpoint_components().items():
+                    self.checkpointer.register(name, detector)
+                restored = 'data_client' in self.checkpointer.restore()
+            
             # Fetch initial data
             logger.info("Fetching initial market data...")
             for timeframe in self.timeframes:
+                if restored and self.data_client.has_fresh_candles(self.symbol, timeframe):
+                    logger.info(f"Using restored {timeframe} candles")
+                    self.stale_data_count[timeframe] = 0
+                    self.last_fresh_data_time[timeframe] = datetime.now()
+                    continue
                 try:
                     df, is_fresh = self.data_client.get_latest_candles(
                         self.symbol,
@@ -201,6 +259,9 @@ class BaseScanner:
             # Set running flag
             self.running = True
             
+            if self.checkpointer is not None:
+                self.checkpointer.start()
+            
             # Send startup notification
             if self.alerter:
                 try:
@@ -227,6 +288,9 @@ class BaseScanner:
         self.running = False
         self.shutdown_event.set()
         
+        if self.checkpointer is not None:
+            self.checkpointer.stop()
+        
         # Send shutdown notification
         if self.alerter:
             try:
@@ -238,6 +302,10 @@ class BaseScanner:
             except Exception as e:
                 logger.warning(f"Failed to send shutdown message: {e}")
         
+        # Deliver queued emails before the process exits
+        from src.email_dispatcher import stop_all_dispatchers
+        stop_all_dispatchers()
+        
         logger.info(f"{self.scanner_name} scanner stopped")
     
     def run_polling_loop(self, interval_seconds: int = 10):
@@ -254,7 +322,8 @@ class BaseScanner:
                 # Process each timeframe
                 for timeframe in self.timeframes:
                     try:
-                        self._process_timeframe(timeframe)
+                        with latency_trace.tracing(self.symbol, timeframe):
+                            self._process_timeframe(timeframe)
                     except Exception as e:
                         logger.error(f"Error processing {timeframe}: {e}")
                         continue
@@ -288,6 +357,7 @@ class BaseScanner:
             if df.empty:
                 logger.error(f"Empty data for {timeframe}")
                 return
+            latency_trace.mark_received('fetch', df, timeframe)
             
             # Update freshness tracking
             if not is_fresh:
@@ -297,14 +367,8 @@ class BaseScanner:
                 self.stale_data_count[timeframe] = 0
                 self.last_fresh_data_time[timeframe] = datetime.now()
             
-            # Calculate indicators
-            data_with_indicators = self.indicator_calculator.calculate_all_indicators(
-                df,
-                ema_periods=[9, 21, 50, 100, 200],
-                atr_period=14,
-                rsi_period=6,
-                volume_ma_period=20
-            )
+            # Calculate the planned indicators (detection and filtering only read the frame)
+            data_with_indicators = self.indicator_plan.compute(df, view=True)
             
             if data_with_indicators.empty:
                 logger.error(f"No valid data after indicator calculation for {timeframe}")
@@ -0,0 +1,375 @@
+"""
+Batched Indicator Calculation
+Computes indicators for many symbols at once over 2-D (time x symbol) price matrices
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.indicator_kernels import ewm_alpha
+
+
+logger = logging.getLogger(__name__)
+
+
+def ewm_matrix(values: np.ndarray, alpha) -> np.ndarray:
+    """
+    Exponentially weighted mean down axis 0 of a (time x symbol) matrix.
+
+    Replicates pandas ``ewm(alpha=alpha, adjust=False).mean()`` exactly,
+    including its NaN handling (``ignore_na=False``), so leading NaN padding
+    of shorter series does not change their results.
+
+    Args:
+        values: 2-D float64 array, one column per symbol
+        alpha: Smoothing factor, scalar or one per column
+
+    Returns:
+        2-D array of the same shape
+    """
+    out = np.empty_like(values)
+    weighted = values[0].copy()
+    old_wt = np.ones(values.shape[1])
+    out[0] = weighted
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), weighted.shape)
+    decay = 1.0 - alpha
+
+    for i in range(1, len(values)):
+        cur = values[i]
+        observed = cur == cur
+        has_weight = weighted == weighted
+
+        old_wt = np.where(has_weight, old_wt * decay, old_wt)
+        update = has_weight & observed & (weighted != cur)
+        blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update, blended, weighted)
+        old_wt = np.where(has_weight & observed, 1.0, old_wt)
+        weighted = np.where(~has_weight & observed, cur, weighted)
+
+        out[i] = weighted
+
+    return out
+
+
+def shift_matrix(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift a matrix down axis 0, filling the gap with NaN."""
+    out = np.full_like(values, np.nan)
+    out[periods:] = values[:-periods]
+    return out
+
+
+def rolling_matrix(values: np.ndarray, window: int, how: str = 'mean') -> np.ndarray:
+    """
+    Rolling window reduction down axis 0 (NaN until the window is full).
+
+    Args:
+        values: 2-D float64 array
+        window: Window length
+        how: 'mean', 'min' or 'max'
+
+    Returns:
+        2-D array of the same shape
+    """
+    out = np.full_like(values, np.nan)
+    if len(values) < window:
+        return out
+    windows = sliding_window_view(values, window, axis=0)
+    out[window - 1:] = getattr(windows, how)(axis=-1)
+    return out
+
+
+def true_range_matrix(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range (max of H-L, |H-prevC|, |L-prevC|, skipping NaN)."""
+    prev_close = shift_matrix(close)
+    ranges = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    with np.errstate(invalid='ignore'):
+        all_nan = np.isnan(ranges).all(axis=0)
+        tr = np.fmax(np.fmax(ranges[0], ranges[1]), ranges[2])
+    tr[all_nan] = np.nan
+    return tr
+
+
+def segmented_vwap_matrix(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    segment_ids: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    VWAP down axis 0, restarting wherever ``segment_ids`` changes.
+
+    Args:
+        high, low, close, volume: 2-D float64 arrays
+        segment_ids: 2-D int64 array (e.g. day number); None for no reset
+
+    Returns:
+        2-D VWAP array
+    """
+    typical = (high + low + close) / 3
+    tp_volume = np.nan_to_num(typical * volume)
+    vol = np.nan_to_num(volume)
+
+    cum_tpv = np.cumsum(tp_volume, axis=0)
+    cum_vol = np.cumsum(vol, axis=0)
+
+    if segment_ids is not None:
+        rows = np.arange(len(high))[:, None]
+        starts = np.ones(high.shape, dtype=bool)
+        starts[1:] = segment_ids[1:] != segment_ids[:-1]
+        # Row index of the segment start, forward-filled down each column
+        start_rows = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+        cols = np.arange(high.shape[1])[None, :]
+        base_tpv = np.where(start_rows > 0, cum_tpv[start_rows - 1, cols], 0.0)
+        base_vol = np.where(start_rows > 0, cum_vol[start_rows - 1, cols], 0.0)
+        cum_tpv = cum_tpv - base_tpv
+        cum_vol = cum_vol - base_vol
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = cum_tpv / cum_vol
+    vwap[np.isnan(close)] = np.nan
+    return vwap
+
+
+@dataclass
+class BatchIndicatorResult:
+    """
+    Indicator matrices for a batch of symbols.
+
+    Rows are right-aligned: symbol j occupies the last ``lengths[j]`` rows of
+    column j, and earlier rows are NaN padding.
+    """
+    symbols: List[str]
+    lengths: np.ndarray
+    columns: Dict[str, np.ndarray] = field(repr=False)
+    sources: Dict[str, pd.DataFrame] = field(repr=False)
+
+    def arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Per-symbol indicator arrays as views into the batch matrices (no copy).
+
+        Args:
+            symbol: Symbol in the batch
+
+        Returns:
+            Dictionary of column name -> 1-D array view
+        """
+        j = self.symbols.index(symbol)
+        start = len(next(iter(self.columns.values()))) - int(self.lengths[j])
+        return {name: matrix[start:, j] for name, matrix in self.columns.items()}
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Symbol's source DataFrame with the indicator columns attached.
+
+        Args:
+            symbol: Symbol in the batch
+
+        Returns:
+            DataFrame equivalent to SymbolScanner._calculate_indicators output
+        """
+        source = self.sources[symbol]
+        indicators = pd.DataFrame(self.arrays(symbol), index=source.index)
+        return pd.concat([source.drop(columns=indicators.columns, errors='ignore'), indicators], axis=1)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """All per-symbol frames."""
+        return {symbol: self.frame(symbol) for symbol in self.symbols}
+
+
+class BatchIndicatorCalculator:
+    """
+    Calculate indicators for many symbols in single vectorized recurrences.
+
+    Each OHLCV column of all symbols on one timeframe is stacked into a
+    (time x symbol) float64 matrix, so EMA/ATR/RSI/ADX/VWAP/volume MA are
+    computed once per batch instead of once per symbol DataFrame.
+    """
+
+    def __init__(
+        self,
+        ema_periods: List[int] = [9, 21, 50, 100, 200],
+        atr_period: int = 14,
+        rsi_period: int = 14,
+        volume_ma_period: int = 20,
+        include_stochastic: bool = True,
+        stoch_k_period: int = 14,
+        stoch_d_period: int = 3,
+        stoch_smooth: int = 3,
+        include_adx: bool = True,
+        adx_period: int = 14
+    ):
+        """
+        Initialize batch calculator.
+
+        Args:
+            ema_periods: EMA periods to calculate
+            atr_period: ATR period
+            rsi_period: RSI period
+            volume_ma_period: Volume MA period
+            include_stochastic: Whether to calculate Stochastic
+            stoch_k_period: Stochastic %K period
+            stoch_d_period: Stochastic %D period
+            stoch_smooth: Stochastic smoothing period
+            include_adx: Whether to calculate ADX
+            adx_period: ADX period
+        """
+        self.ema_periods = list(ema_periods)
+        self.atr_period = atr_period
+        self.rsi_period = rsi_period
+        self.volume_ma_period = volume_ma_period
+        self.include_stochastic = include_stochastic
+        self.stoch_k_period = stoch_k_period
+        self.stoch_d_period = stoch_d_period
+        self.stoch_smooth = stoch_smooth
+        self.include_adx = include_adx
+        self.adx_period = adx_period
+
+    @staticmethod
+    def stack(frames: Dict[str, pd.DataFrame], columns: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Stack a column of every frame into right-aligned (time x symbol) matrices.
+
+        Args:
+            frames: Symbol -> DataFrame
+            columns: Columns to stack
+
+        Returns:
+            Column name -> 2-D float64 matrix padded with leading NaN
+        """
+        depth = max(len(df) for df in frames.values())
+        matrices = {}
+        for column in columns:
+            matrix = np.full((depth, len(frames)), np.nan)
+            for j, df in enumerate(frames.values()):
+                matrix[depth - len(df):, j] = df[column].to_numpy(dtype=np.float64)
+            matrices[column] = matrix
+        return matrices
+
+    @staticmethod
+    def _day_ids(frames: Dict[str, pd.DataFrame], depth: int) -> np.ndarray:
+        """Calendar day number of every row, right-aligned like the price matrices."""
+        day_ids = np.full((depth, len(frames)), -1, dtype=np.int64)
+        for j, df in enumerate(frames.values()):
+            timestamps = pd.to_datetime(df['timestamp'])
+            if timestamps.dt.tz is not None:
+                timestamps = timestamps.dt.tz_localize(None)
+            day_ids[depth - len(df):, j] = timestamps.to_numpy().astype('datetime64[D]').astype(np.int64)
+        return day_ids
+
+    def calculate(self, frames: Dict[str, pd.DataFrame]) -> BatchIndicatorResult:
+        """
+        Calculate indicators for every symbol in the batch.
+
+        Args:
+            frames: Symbol -> OHLCV DataFrame (same timeframe)
+
+        Returns:
+            BatchIndicatorResult with per-symbol views
+
+        Raises:
+            ValueError: If no frames are given
+        """
+        frames = {symbol: df for symbol, df in frames.items() if not df.empty}
+        if not frames:
+            raise ValueError("Cannot calculate batch indicators without data")
+
+        stacked = self.stack(frames, ['high', 'low', 'close', 'volume'])
+        high, low, close, volume = stacked['high'], stacked['low'], stacked['close'], stacked['volume']
+        depth = len(close)
+
+        # Every independent EWM (EMAs, Wilder TR/gains/losses/DM) in one sweep
+        true_range = true_range_matrix(high, low, close)
+        gains, losses = self._gains_losses(close)
+        plus_dm, minus_dm = self._directional_movement(high, low)
+
+        blocks = [(f'ema_{period}', close, ewm_alpha(span=period)) for period in self.ema_periods]
+        blocks += [
+            ('atr', true_range, ewm_alpha(alpha=1 / self.atr_period)),
+            ('avg_gain', gains, ewm_alpha(alpha=1 / self.rsi_period)),
+            ('avg_loss', losses, ewm_alpha(alpha=1 / self.rsi_period)),
+        ]
+        if self.include_adx:
+            blocks += [
+                ('adx_atr', true_range, ewm_alpha(alpha=1 / self.adx_period)),
+                ('plus_dm', plus_dm, ewm_alpha(alpha=1 / self.adx_period)),
+                ('minus_dm', minus_dm, ewm_alpha(alpha=1 / self.adx_period)),
+            ]
+        width = close.shape[1]
+        smoothed = ewm_matrix(
+            np.hstack([values for _, values, _ in blocks]),
+            np.repeat([alpha for _, _, alpha in blocks], width)
+        )
+        smoothed = {name: smoothed[:, i * width:(i + 1) * width] for i, (name, _, _) in enumerate(blocks)}
+
+        columns: Dict[str, np.ndarray] = {}
+        for period in self.ema_periods:
+            columns[f'ema_{period}'] = smoothed[f'ema_{period}']
+
+        has_timestamp = all('timestamp' in df.columns for df in frames.values())
+        columns['vwap'] = segmented_vwap_matrix(
+            high, low, close, volume,
+            self._day_ids(frames, depth) if has_timestamp else None
+        )
+
+        columns['atr'] = smoothed['atr']
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rs = smoothed['avg_gain'] / smoothed['avg_loss']
+            columns['rsi'] = 100 - (100 / (1 + rs))
+
+        columns['volume_ma'] = rolling_matrix(volume, self.volume_ma_period)
+
+        if self.include_stochastic:
+            lowest = rolling_matrix(low, self.stoch_k_period, 'min')
+            highest = rolling_matrix(high, self.stoch_k_period, 'max')
+            with np.errstate(invalid='ignore', divide='ignore'):
+                raw_k = 100 * (close - lowest) / (highest - lowest)
+            stoch_k = rolling_matrix(raw_k, self.stoch_smooth)
+            columns['stoch_k'] = stoch_k
+            columns['stoch_d'] = rolling_matrix(stoch_k, self.stoch_d_period)
+
+        if self.include_adx:
+            atr = smoothed['adx_atr']
+            with np.errstate(invalid='ignore', divide='ignore'):
+                plus_di = 100 * (smoothed['plus_dm'] / atr)
+                minus_di = 100 * (smoothed['minus_dm'] / atr)
+                dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            columns['adx'] = ewm_matrix(dx, ewm_alpha(alpha=1 / self.adx_period))
+
+        lengths = np.array([len(df) for df in frames.values()])
+        return BatchIndicatorResult(
+            symbols=list(frames.keys()),
+            lengths=lengths,
+            columns=columns,
+            sources=frames
+        )
+
+    @staticmethod
+    def _gains_losses(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-bar gains and losses, NaN on padding rows and 0 on the first bar."""
+        valid = ~np.isnan(close)
+        delta = close - shift_matrix(close)
+        with np.errstate(invalid='ignore'):
+            gains = np.where(delta > 0, delta, 0.0)
+            losses = np.where(delta < 0, -delta, 0.0)
+        gains[~valid] = np.nan
+        losses[~valid] = np.nan
+        return gains, losses
+
+    @staticmethod
+    def _directional_movement(high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """+DM and -DM, NaN on padding rows and 0 on the first bar."""
+        valid = ~np.isnan(high)
+        high_diff = high - shift_matrix(high)
+        low_diff = shift_matrix(low) - low
+        with np.errstate(invalid='ignore'):
+            plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+            minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+        plus_dm[~valid] = np.nan
+        minus_dm[~valid] = np.nan
+        return plus_dm, minus_dm
@@ -0,0 +1,247 @@
+"""
+Candle Cache
+Thread-safe LRU + TTL cache for candle fetches with single-flight request coalescing
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# A cached fetch result: the candle frame plus whatever the client returned with it
+CandleResult = Tuple[pd.DataFrame, Any]
+
+
+def frame_fingerprint(frame: pd.DataFrame) -> tuple:
+    """Cheap identity of a candle frame (length, first timestamp and the last bar)."""
+    if frame.empty:
+        return (0,)
+    last = frame.iloc[-1]
+    return (len(frame), frame.iloc[0].get('timestamp'), last.get('timestamp'),
+            last.get('open'), last.get('high'), last.get('low'), last.get('close'), last.get('volume'))
+
+
+class _CacheEntry:
+    __slots__ = ('count', 'frame', 'extra', 'stored_at')
+
+    def __init__(self, count: int, frame: pd.DataFrame, extra: Any, stored_at: float):
+        self.count = count
+        self.frame = frame
+        self.extra = extra
+        self.stored_at = stored_at
+
+
+class _Flight:
+    """A fetch in progress that other callers can wait on."""
+    __slots__ = ('count', 'done', 'result', 'error')
+
+    def __init__(self, count: int):
+        self.count = count
+        self.done = threading.Event()
+        self.result: Optional[CandleResult] = None
+        self.error: Optional[BaseException] = None
+
+
+class CandleCache:
+    """
+    Size-bounded LRU cache of candle frames with a time-to-live.
+
+    Entries are keyed by (provider, symbol, timeframe, ...) and remember the
+    candle count they were fetched with, so a request for fewer candles is
+    served by slicing the tail of a larger cached frame. Concurrent misses for
+    the same key share one in-flight fetch (single-flight). Callers always
+    receive their own copy of the frame, so adding indicator columns never
+    touches the cached data.
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 256, clock=time.monotonic):
+        """
+        Initialize candle cache.
+
+        Args:
+            ttl_seconds: Maximum age of an entry before it expires
+            max_entries: Maximum number of entries (least recently used go first)
+            clock: Monotonic time source
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._flights: Dict[Hashable, List[_Flight]] = {}
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.slice_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, extra: Any, count: int) -> CandleResult:
+        if len(frame) > count:
+            return frame.iloc[-count:].copy(), extra
+        return frame.copy(), extra
+
+    def _lookup(self, key: Hashable, count: int, max_age: float) -> Optional[CandleResult]:
+        """Find a usable entry (lock held)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        age = self._clock() - entry.stored_at
+        if age > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        if age > max_age or entry.count < count:
+            return None
+
+        self._entries.move_to_end(key)
+        if count < entry.count:
+            self.slice_hits += 1
+        else:
+            self.hits += 1
+        return self._slice(entry.frame, entry.extra, count)
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop entries older than the TTL (lock held)."""
+        expired = [key for key, entry in self._entries.items() if now - entry.stored_at > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+
+    def get(self, key: Hashable, count: int, max_age: Optional[float] = None) -> Optional[CandleResult]:
+        """
+        Get cached candles without fetching.
+
+        Args:
+            key: Cache key, e.g. (provider, symbol, timeframe)
+            count: Number of candles wanted
+            max_age: Maximum acceptable age in seconds (defaults to the TTL)
+
+        Returns:
+            (frame, extra) or None
+        """
+        with self._lock:
+            return self._lookup(key, count, self.ttl_seconds if max_age is None else max_age)
+
+    def put(self, key: Hashable, count: int, frame: pd.DataFrame, extra: Any = None) -> None:
+        """
+        Store a fetch result. Empty frames are not cached.
+
+        Args:
+            key: Cache key
+            count: Candle count the frame was fetched with
+            frame: Candle frame
+            extra: Extra value returned alongside the frame (e.g. is_fresh)
+        """
+        if frame is None or frame.empty:
+            return
+        with self._lock:
+            now = self._clock()
+            self._purge_expired(now)
+            self._entries[key] = _CacheEntry(count, frame.copy(), extra, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key: Hashable, count: int, fetch: Callable[[], CandleResult],
+                     max_age: Optional[float] = None) -> CandleResult:
+        """
+        Get candles from the cache or fetch them once for all concurrent callers.
+
+        Args:
+            key: Cache key, e.g. (provider, symbol, timeframe)
+            count: Number of candles wanted
+            fetch: Callable returning (frame, extra) for ``count`` candles
+            max_age: Maximum acceptable age in seconds (defaults to the TTL)
+
+        Returns:
+            (frame, extra)
+
+        Raises:
+            Whatever ``fetch`` raised (shared by every waiting caller)
+        """
+        max_age = self.ttl_seconds if max_age is None else max_age
+        with self._lock:
+            cached = self._lookup(key, count, max_age)
+            if cached is not None:
+                return cached
+
+            flight = next((f for f in self._flights.get(key, ()) if f.count >= count), None)
+            leader = flight is None
+            if leader:
+                flight = _Flight(count)
+                self._flights.setdefault(key, []).append(flight)
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return self._slice(flight.result[0], flight.result[1], count)
+
+        try:
+            frame, extra = fetch()
+            # Followers slice their own copy while the caller may already be adding columns to frame
+            flight.result = (frame.copy() if frame is not None else frame, extra)
+            self.put(key, count, frame, extra)
+            return frame, extra
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                flights = self._flights.get(key, [])
+                if flight in flights:
+                    flights.remove(flight)
+                if not flights:
+                    self._flights.pop(key, None)
+            flight.done.set()
+
+    def clear(self, match: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """
+        Remove entries.
+
+        Args:
+            match: Predicate selecting keys to remove, or None to clear all
+        """
+        with self._lock:
+            if match is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if match(key)]:
+                    del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with hit/miss counters, hit rate and current size
+        """
+        with self._lock:
+            served = self.hits + self.slice_hits + self.coalesced
+            requests = served + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'slice_hits': self.slice_hits,
+                'coalesced': self.coalesced,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(served / requests * 100, 1) if requests else 0.0,
+            }
@@ -12,6 +12,7 @@ class ExchangeConfig:
     name: str
     symbol: str
     timeframes: List[str]
+    stream_mode: Optional[str] = None  # 'kline' or 'trade' to stream Binance candles instead of polling
 
 
 @dataclass
@@ -170,6 +171,7 @@ class Config:
     asset_specific: Optional[dict] = None  # Dict[symbol, AssetSpecificConfig]
     strategies: Optional[StrategyConfig] = None
     quality_filter: Optional[dict] = None
+    checkpoint: Optional[dict] = None  # StateCheckpointer block: {path, interval_seconds, max_age_seconds}
 
 
 class ConfigLoader:
@@ -253,6 +255,9 @@ class ConfigLoader:
             # Quality filter configuration is optional
             quality_filter = config_data.get('quality_filter', {})
             
+            # Warm-restart checkpointing is optional
+            checkpoint = config_data.get('checkpoint')
+            
             config = Config(
                 exchange=exchange,
                 indicators=indicators,
@@ -264,7 +269,8 @@ class ConfigLoader:
                 h4_hvg=h4_hvg,
                 asset_specific=asset_specific,
                 strategies=strategies,
-                quality_filter=quality_filter
+                quality_filter=quality_filter,
+                checkpoint=checkpoint
             )
             
             # Validate configuration
@@ -319,6 +325,9 @@ class ConfigLoader:
         if not config.exchange.timeframes:
             raise ValueError("At least one timeframe must be specified")
         
+        if config.exchange.stream_mode not in (None, 'kline', 'trade'):
+            raise ValueError(f"Unsupported stream mode: {config.exchange.stream_mode}")
+        
         # Validate indicators
         if config.indicators.ema_fast >= config.indicators.ema_slow:
             raise ValueError("Fast EMA period must be less than slow EMA period")
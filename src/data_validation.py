@@ -5,8 +5,10 @@ Centralized validation for market data and signals
 import logging
 from datetime import datetime, timedelta
 from typing import Tuple, List, Optional
+import numpy as np
 import pandas as pd
-import math
+
+from src.price_validator import compute_candle_masks
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,8 @@ logger = logging.getLogger(__name__)
 class DataValidator:
     """Validates market data and handles errors"""
     
+    INDICATOR_COLUMNS = ['rsi', 'adx', 'ema_9', 'ema_21', 'ema_50', 'atr', 'vwap', 'volume_ma']
+    
     def __init__(self, max_consecutive_errors: int = 10):
         """
         Initialize data validator
@@ -55,31 +59,33 @@ class DataValidator:
             self._record_error()
             return False, errors
         
-        # Check for NaN values in indicators
-        indicator_columns = ['rsi', 'adx', 'ema_9', 'ema_21', 'ema_50', 'atr', 'vwap', 'volume_ma']
-        for col in indicator_columns:
-            if col in last.index:
-                value = last[col]
-                if pd.isna(value) or (isinstance(value, float) and math.isnan(value)):
+        # Check for NaN / non-positive values in indicators (one vectorized pass)
+        indicator_columns = [col for col in self.INDICATOR_COLUMNS if col in data.columns]
+        if indicator_columns:
+            values = data[indicator_columns].iloc[-1].to_numpy(dtype=np.float64)
+            nan_mask = np.isnan(values)
+            with np.errstate(invalid='ignore'):
+                nonpositive_mask = ~nan_mask & (values <= 0)
+            for col, value, is_nan, is_nonpositive in zip(indicator_columns, values, nan_mask, nonpositive_mask):
+                if is_nan:
                     errors.append(f"NaN value in {col}")
-                elif value <= 0 and col != 'rsi':  # RSI can be any value
+                elif is_nonpositive and col != 'rsi':  # RSI can be any value
                     errors.append(f"Invalid {col} value: {value}")
         
         # Check for stale data (>5 minutes old)
-        if 'timestamp' in last.index:
-            try:
-                data_age = datetime.now() - last['timestamp']
-                if data_age > timedelta(minutes=5):
-                    errors.append(f"Stale data: {data_age.seconds // 60} minutes old")
-            except Exception as e:
-                logger.debug(f"Could not check data age: {e}")
-        
-        # Check price data validity
-        if last['close'] <= 0 or last['high'] <= 0 or last['low'] <= 0:
+        try:
+            data_age = datetime.now() - last['timestamp']
+            if data_age > timedelta(minutes=5):
+                errors.append(f"Stale data: {data_age.seconds // 60} minutes old")
+        except Exception as e:
+            logger.debug(f"Could not check data age: {e}")
+        
+        # Check price and volume validity with the shared candle mask engine
+        masks = compute_candle_masks(data.iloc[-1:])
+        if masks['nonpositive_price'][0]:
             errors.append(f"Invalid price data: close={last['close']}, high={last['high']}, low={last['low']}")
         
-        # Check volume
-        if last['volume'] < 0:
+        if masks['negative_volume'][0]:
             errors.append(f"Invalid volume: {last['volume']}")
         
         if errors:
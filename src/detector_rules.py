@@ -0,0 +1,138 @@
+"""
+Detector Rules
+Entry conditions of the SignalDetector strategies as compiled rules
+"""
+from functools import lru_cache
+
+from src.strategy_rules import StrategyRules
+
+
+# Reversal candles (as SignalDetector._is_pin_bar, _is_doji and _is_engulfing)
+PIN_BAR = ("high - low != 0"
+           " and (high - max(close, open) >= abs(close - open) * 2"
+           " or min(close, open) - low >= abs(close - open) * 2)"
+           " and ((min(close, open) - low) / (high - low) < 0.33"
+           " or (min(close, open) - low) / (high - low) > 0.67)")
+DOJI = "high - low != 0 and abs(close - open) / (high - low) < 0.10"
+ENGULFING = ("(close > open) != (close[1] > open[1])"
+             " and min(close, open) < min(close[1], open[1])"
+             " and max(close, open) > max(close[1], open[1])")
+
+# Breakout range: the ten bars before the current one
+RANGE_HIGH = f"max({', '.join(f'high[{lag}]' for lag in range(1, 11))})"
+RANGE_LOW = f"min({', '.join(f'low[{lag}]' for lag in range(1, 11))})"
+
+# A NaN volume ratio passes, as in the if-chains
+VOLUME = "not volume / volume_ma < volume_threshold"
+
+
+@lru_cache(maxsize=None)
+def mean_reversion_rules(volume_threshold: float) -> StrategyRules:
+    """
+    Overextended price at an RSI extreme with a reversal candle.
+    
+    Args:
+        volume_threshold: Minimum volume ratio
+    
+    Returns:
+        Compiled rules (LONG below VWAP when oversold, SHORT above it when overbought)
+    """
+    return StrategyRules(
+        name="Mean Reversion",
+        long="close < vwap and rsi < 20",
+        short="close > vwap and rsi > 80",
+        filters=[
+            "vwap == vwap and rsi == rsi and atr == atr",
+            "not abs(close - vwap) < atr * 1.8",
+            VOLUME,
+            f"({PIN_BAR}) or ({ENGULFING}) or ({DOJI})",
+        ],
+        params={'volume_threshold': volume_threshold},
+        min_bars=3,
+    )
+
+
+@lru_cache(maxsize=None)
+def ema_cloud_breakout_rules(volume_threshold: float) -> StrategyRules:
+    """
+    EMA 21/50 alignment with price on the same side of VWAP breaking the 10-bar range by 0.2%.
+    
+    Args:
+        volume_threshold: Minimum volume ratio
+    
+    Returns:
+        Compiled rules
+    """
+    return StrategyRules(
+        name="EMA Cloud Breakout",
+        long=f"ema_21 > ema_50 and close > vwap and close > {RANGE_HIGH} * 1.002",
+        short=f"ema_21 < ema_50 and close < vwap and close < {RANGE_LOW} * 0.998",
+        filters=[
+            "not (rsi < 30 or rsi > 70)",
+            VOLUME,
+        ],
+        params={'volume_threshold': volume_threshold},
+        min_bars=11,
+    )
+
+
+@lru_cache(maxsize=None)
+def trend_alignment_rules(adx_threshold: float, volume_threshold: float) -> StrategyRules:
+    """
+    Price > EMA9 > EMA21 > EMA50 (or the reverse) with RSI past 50 and moving the same way.
+    
+    Args:
+        adx_threshold: Minimum ADX
+        volume_threshold: Minimum volume ratio
+    
+    Returns:
+        Compiled rules
+    """
+    return StrategyRules(
+        name="Trend Alignment",
+        long="close > ema_9 > ema_21 > ema_50 and rsi > 50 and rsi > rsi[1]",
+        short="close < ema_9 < ema_21 < ema_50 and rsi < 50 and rsi < rsi[1]",
+        filters=[
+            "not adx < adx_threshold",
+            VOLUME,
+        ],
+        params={'adx_threshold': adx_threshold, 'volume_threshold': volume_threshold},
+        min_bars=3,
+    )
+
+
+@lru_cache(maxsize=None)
+def adx_rsi_momentum_rules(adx_min: float, rsi_momentum_threshold: float, volume_threshold: float,
+                           require_adx_rising: bool) -> StrategyRules:
+    """
+    Trending ADX, RSI accelerating past 50 and two closes in the same direction.
+    
+    Args:
+        adx_min: Minimum ADX
+        rsi_momentum_threshold: Minimum RSI change over two bars
+        volume_threshold: Minimum volume ratio (a missing or zero volume MA counts as 0)
+        require_adx_rising: Require ADX above its previous value
+    
+    Returns:
+        Compiled rules
+    """
+    filters = [
+        "not adx < adx_min and not adx < 18",
+        "not abs(rsi - rsi[2]) < rsi_momentum_threshold",
+    ]
+    if require_adx_rising:
+        filters.append("adx > adx[1]")
+    if volume_threshold > 0:
+        filters.append("volume_ma > 0 and " + VOLUME)
+    return StrategyRules(
+        name="ADX+RSI+Momentum",
+        # RSI extremes need 1.5x the momentum
+        long=("rsi > 50 and rsi > rsi[1] and not (close <= close[1] or close[1] <= close[2])"
+              " and not (rsi > 70 and abs(rsi - rsi[2]) < rsi_momentum_threshold * 1.5)"),
+        short=("rsi < 50 and rsi < rsi[1] and not (close >= close[1] or close[1] >= close[2])"
+               " and not (rsi < 30 and abs(rsi - rsi[2]) < rsi_momentum_threshold * 1.5)"),
+        filters=filters,
+        params={'adx_min': adx_min, 'rsi_momentum_threshold': rsi_momentum_threshold,
+                'volume_threshold': volume_threshold},
+        min_bars=5,
+    )
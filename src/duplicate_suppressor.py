@@ -0,0 +1,245 @@
+"""
+Duplicate Signal Suppression
+Shared, indexed duplicate detection used by every signal detector and filter
+"""
+import heapq
+import logging
+from bisect import insort
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+SignalKey = Tuple[str, str, str]
+
+
+@dataclass(order=True)
+class SuppressionEntry:
+    """Compact record of a previously accepted signal"""
+    timestamp: datetime
+    seq: int
+    entry_price: float = field(compare=False)
+    rsi: Optional[float] = field(default=None, compare=False)
+
+
+class DuplicateSuppressor:
+    """
+    Duplicate-signal index keyed by (symbol, timeframe, direction).
+
+    Accepted signals are stored in per-key buckets ordered by timestamp, and a
+    global min-heap of (timestamp, seq, key) drives expiry, so pruning costs
+    O(1) amortized per recorded signal and a lookup only walks the entries of
+    one key that are still inside the duplicate window.
+
+    A candidate is a duplicate of a prior signal with the same key when it is
+    within ``window_minutes`` of it and its entry price is within the price
+    tolerance (``price_threshold_percent`` of the prior entry, or
+    ``atr_tolerance_multiplier`` x the candidate ATR when that is set). A large
+    RSI change (``rsi_reset_points``) or a price move of at least
+    ``significant_move_percent`` always lets the candidate through.
+    """
+
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('_buckets', '_expiry_heap', '_seq', '_clock')
+
+    def __init__(
+        self,
+        window_minutes: float = 5,
+        price_threshold_percent: float = 0.3,
+        retention_minutes: Optional[float] = None,
+        max_per_key: int = 50,
+        atr_tolerance_multiplier: Optional[float] = None,
+        significant_move_percent: Optional[float] = None,
+        rsi_reset_points: Optional[float] = None,
+        strategy: Optional[str] = None
+    ):
+        """
+        Initialize duplicate suppressor
+
+        Args:
+            window_minutes: Time window in which a similar signal is a duplicate
+            price_threshold_percent: Entry price tolerance as % of previous entry
+            retention_minutes: How long accepted signals are kept (defaults to window)
+            max_per_key: Maximum signals retained per (symbol, timeframe, direction)
+            atr_tolerance_multiplier: Use candidate ATR x multiplier as price tolerance
+            significant_move_percent: Price move % that always allows a new signal
+            rsi_reset_points: RSI change that always allows a new signal
+            strategy: Only track and check signals of this strategy (None = all)
+        """
+        self.window = timedelta(minutes=window_minutes)
+        self.retention = max(self.window, timedelta(minutes=retention_minutes or 0))
+        self.price_threshold_percent = price_threshold_percent
+        self.max_per_key = max_per_key
+        self.atr_tolerance_multiplier = atr_tolerance_multiplier
+        self.significant_move_percent = significant_move_percent
+        self.rsi_reset_points = rsi_reset_points
+        self.strategy = strategy
+
+        self._buckets: Dict[SignalKey, Deque[SuppressionEntry]] = {}
+        self._expiry_heap: List[Tuple[datetime, int, SignalKey]] = []
+        self._seq = 0
+        self._clock: Optional[datetime] = None
+
+    @staticmethod
+    def key_for(signal) -> SignalKey:
+        """
+        Build the index key for a signal
+
+        Args:
+            signal: Signal (or subclass) with symbol, timeframe and signal_type
+
+        Returns:
+            (symbol, timeframe, direction) tuple
+        """
+        symbol = getattr(signal, 'symbol', '') or ''
+        symbol_context = getattr(signal, 'symbol_context', None)
+        if symbol_context is not None and getattr(symbol_context, 'symbol', None):
+            symbol = symbol_context.symbol
+        return (symbol, getattr(signal, 'timeframe', '') or '', signal.signal_type)
+
+    def _applies_to(self, signal) -> bool:
+        return self.strategy is None or getattr(signal, 'strategy', None) == self.strategy
+
+    def _advance_clock(self, timestamp: datetime) -> None:
+        """Move the expiry reference forward to the newest timestamp seen"""
+        if self._clock is None or timestamp > self._clock:
+            self._clock = timestamp
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop entries older than the retention period
+
+        Args:
+            now: Reference time (defaults to the newest signal timestamp seen)
+
+        Returns:
+            Number of entries removed
+        """
+        reference = now or self._clock
+        if reference is None:
+            return 0
+
+        cutoff = reference - self.retention
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= cutoff:
+            _, seq, key = heapq.heappop(heap)
+            bucket = self._buckets.get(key)
+            # Entries already evicted by max_per_key leave stale heap items
+            if bucket and bucket[0].seq == seq:
+                bucket.popleft()
+                removed += 1
+                if not bucket:
+                    del self._buckets[key]
+        return removed
+
+    def is_duplicate(self, signal) -> bool:
+        """
+        Check whether a signal duplicates a recently accepted one
+
+        Args:
+            signal: Candidate signal
+
+        Returns:
+            True if duplicate, False otherwise
+        """
+        if not self._applies_to(signal):
+            return False
+
+        self._advance_clock(signal.timestamp)
+        self.expire()
+
+        bucket = self._buckets.get(self.key_for(signal))
+        if not bucket:
+            return False
+
+        cutoff = signal.timestamp - self.window
+        candidate_rsi = self._rsi_of(signal)
+
+        # Newest first; stop as soon as entries fall outside the window
+        for prev in reversed(bucket):
+            if prev.timestamp <= cutoff:
+                break
+
+            price_change_percent = abs(signal.entry_price - prev.entry_price) / prev.entry_price * 100
+
+            if self.significant_move_percent is not None and price_change_percent >= self.significant_move_percent:
+                continue
+
+            if (self.rsi_reset_points is not None and candidate_rsi is not None
+                    and prev.rsi is not None and abs(candidate_rsi - prev.rsi) >= self.rsi_reset_points):
+                continue
+
+            if self.atr_tolerance_multiplier is not None:
+                is_close = abs(signal.entry_price - prev.entry_price) < signal.atr * self.atr_tolerance_multiplier
+            else:
+                is_close = price_change_percent < self.price_threshold_percent
+
+            if is_close:
+                logger.debug(f"Duplicate signal blocked: {self.key_for(signal)} within "
+                             f"{(signal.timestamp - prev.timestamp).total_seconds():.0f}s, "
+                             f"price change {price_change_percent:.4f}%")
+                return True
+
+        return False
+
+    def record(self, signal) -> None:
+        """
+        Record an accepted signal
+
+        Args:
+            signal: Signal that was emitted
+        """
+        if not self._applies_to(signal):
+            return
+
+        self._advance_clock(signal.timestamp)
+        key = self.key_for(signal)
+        self._seq += 1
+        entry = SuppressionEntry(signal.timestamp, self._seq, signal.entry_price, self._rsi_of(signal))
+
+        bucket = self._buckets.setdefault(key, deque())
+        if bucket and entry.timestamp < bucket[-1].timestamp:
+            insort(bucket, entry)
+        else:
+            bucket.append(entry)
+        if len(bucket) > self.max_per_key:
+            bucket.popleft()
+
+        heapq.heappush(self._expiry_heap, (entry.timestamp, entry.seq, key))
+        self.expire()
+
+    def check_and_record(self, signal) -> bool:
+        """
+        Check a signal and record it when it is not a duplicate
+
+        Args:
+            signal: Candidate signal
+
+        Returns:
+            True if the signal is new (and was recorded), False if duplicate
+        """
+        if self.is_duplicate(signal):
+            return False
+        self.record(signal)
+        return True
+
+    def clear(self) -> None:
+        """Forget all recorded signals"""
+        self._buckets.clear()
+        self._expiry_heap.clear()
+        self._clock = None
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    @staticmethod
+    def _rsi_of(signal) -> Optional[float]:
+        indicators = getattr(signal, 'indicators', None)
+        if indicators:
+            return indicators.get('rsi')
+        return None
@@ -0,0 +1,346 @@
+"""Background SMTP delivery with a persistent connection and digest batching."""
+import atexit
+import queue
+import smtplib
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingEmail:
+    """Email waiting in the dispatch queue."""
+    subject: str
+    body: str
+    from_email: str
+    to_email: str
+    subtype: str = 'plain'
+    attachments: List[Tuple[str, bytes]] = field(default_factory=list)
+    max_retries: int = 3
+    digest: bool = True
+    on_result: Optional[Callable[[bool], None]] = None
+    queued_at: float = field(default_factory=time.time)
+
+
+class EmailDispatcher:
+    """
+    Deliver emails from a queue on a background thread.
+
+    The dispatcher keeps one authenticated SMTP connection open and
+    reconnects when it has been idle longer than ``idle_timeout_seconds``
+    (servers typically drop idle sessions after a few minutes) or when the
+    server rejects a NOOP. Emails arriving within ``digest_window_seconds``
+    of each other are combined into a single digest per recipient. Callers
+    never block on SMTP: ``submit`` only enqueues. Queued emails are
+    delivered at interpreter exit (see stop_all_dispatchers).
+    """
+
+    def __init__(
+        self,
+        smtp_server: str,
+        smtp_port: int,
+        smtp_user: str,
+        smtp_password: str,
+        use_ssl: bool = True,
+        timeout: float = 30,
+        idle_timeout_seconds: float = 120,
+        digest_window_seconds: float = 5.0,
+        max_digest_size: int = 20,
+        retry_delay_seconds: float = 5.0
+    ):
+        """
+        Initialize email dispatcher.
+
+        Args:
+            smtp_server: SMTP server hostname
+            smtp_port: SMTP server port
+            smtp_user: SMTP username
+            smtp_password: SMTP password
+            use_ssl: Use SSL connection (STARTTLS otherwise)
+            timeout: Socket timeout for SMTP operations
+            idle_timeout_seconds: Reconnect when the connection was idle this long
+            digest_window_seconds: Wait this long for more emails before sending
+            max_digest_size: Maximum number of emails combined into one digest
+            retry_delay_seconds: Base delay between send attempts
+        """
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.smtp_user = smtp_user
+        self.smtp_password = smtp_password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.digest_window_seconds = digest_window_seconds
+        self.max_digest_size = max_digest_size
+        self.retry_delay_seconds = retry_delay_seconds
+
+        self._queue: "queue.Queue[OutgoingEmail]" = queue.Queue()
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+
+        # Statistics
+        self.sent_count = 0
+        self.failed_count = 0
+        self.digest_count = 0
+        self.connect_count = 0
+
+        _instances.add(self)
+
+    def submit(self, email: OutgoingEmail) -> None:
+        """
+        Queue an email for delivery (non-blocking).
+
+        Args:
+            email: Email to send
+        """
+        with self._lock:
+            self._pending += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="EmailDispatcher", daemon=True)
+                self._thread.start()
+        self._queue.put(email)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued email has been delivered or given up on.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained in time
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float = 30) -> None:
+        """
+        Deliver what is queued, then stop the worker and close the connection.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+        """
+        self.flush(timeout)
+        self._stop_event.set()
+        self._queue.put(None)  # Wake the worker
+        if self._thread:
+            self._thread.join(timeout=self.digest_window_seconds + 5)
+            self._thread = None
+        self._disconnect()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._server and time.time() - self._last_used > self.idle_timeout_seconds:
+                    self._disconnect()
+                continue
+            if first is None:
+                continue
+
+            batch = [first]
+            try:
+                deadline = time.time() + self.digest_window_seconds
+                while len(batch) < self.max_digest_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        email = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if email is None:
+                        break
+                    batch.append(email)
+
+                for group in self._group(batch):
+                    self._deliver(group)
+            except Exception as e:
+                # Keep the worker alive; the batch counts as handled so flush() cannot hang
+                self.failed_count += len(batch)
+                logger.error(f"Email dispatch failed for {len(batch)} message(s): {e}", exc_info=True)
+            finally:
+                with self._idle:
+                    self._pending -= len(batch)
+                    self._idle.notify_all()
+
+    @staticmethod
+    def _group(batch: List[OutgoingEmail]) -> List[List[OutgoingEmail]]:
+        """Group digestible emails per sender/recipient; others go alone."""
+        groups: Dict[Tuple[str, str], List[OutgoingEmail]] = {}
+        singles = []
+        for email in batch:
+            if email.digest:
+                groups.setdefault((email.from_email, email.to_email), []).append(email)
+            else:
+                singles.append([email])
+        return list(groups.values()) + singles
+
+    def _build_message(self, emails: List[OutgoingEmail]) -> MIMEMultipart:
+        """Build one MIME message (a digest when given several emails)."""
+        msg = MIMEMultipart()
+        msg['From'] = emails[0].from_email
+        msg['To'] = emails[0].to_email
+
+        if len(emails) == 1:
+            msg['Subject'] = emails[0].subject
+        else:
+            msg['Subject'] = f"[Digest] {len(emails)} messages - {emails[0].subject}"
+            contents = "\n".join(f"{i}. {email.subject}" for i, email in enumerate(emails, 1))
+            msg.attach(MIMEText(f"{len(emails)} messages in this digest:\n\n{contents}\n", 'plain'))
+
+        for email in emails:
+            msg.attach(MIMEText(email.body, email.subtype))
+            for filename, payload in email.attachments:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(payload)
+                encoders.encode_base64(part)
+                part.add_header('Content-Disposition', f'attachment; filename={filename}')
+                msg.attach(part)
+
+        return msg
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+            server.starttls()
+        server.login(self.smtp_user, self.smtp_password)
+        self.connect_count += 1
+        logger.debug(f"SMTP connection opened: {self.smtp_server}:{self.smtp_port}")
+        return server
+
+    def _connection(self) -> smtplib.SMTP:
+        """Return a live connection, reconnecting after idle timeout."""
+        if self._server is not None:
+            if time.time() - self._last_used > self.idle_timeout_seconds:
+                self._disconnect()
+            else:
+                try:
+                    if self._server.noop()[0] != 250:
+                        self._disconnect()
+                except (smtplib.SMTPException, OSError):
+                    self._disconnect()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def _disconnect(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
+
+    def _deliver(self, emails: List[OutgoingEmail]) -> bool:
+        msg = self._build_message(emails)
+        max_retries = max(email.max_retries for email in emails)
+        success = False
+
+        for attempt in range(max_retries):
+            try:
+                self._connection().send_message(msg)
+                self._last_used = time.time()
+                success = True
+                break
+            except Exception as e:
+                logger.error(f"Email send attempt {attempt + 1}/{max_retries} failed: {e}")
+                self._disconnect()
+                if attempt < max_retries - 1:
+                    self._stop_event.wait(self.retry_delay_seconds * (2 ** attempt))
+
+        if success:
+            self.sent_count += len(emails)
+            if len(emails) > 1:
+                self.digest_count += 1
+            logger.info(f"Email sent successfully: {msg['Subject']}")
+        else:
+            self.failed_count += len(emails)
+
+        for email in emails:
+            if email.on_result:
+                try:
+                    email.on_result(success)
+                except Exception as e:
+                    logger.error(f"Email result callback failed: {e}")
+        return success
+
+
+_dispatchers: Dict[Tuple, EmailDispatcher] = {}
+_dispatchers_lock = threading.Lock()
+_instances: "weakref.WeakSet[EmailDispatcher]" = weakref.WeakSet()
+
+
+def stop_all_dispatchers(timeout: float = 30) -> None:
+    """
+    Deliver every queued email and stop all dispatchers.
+
+    Called from the entrypoints' shutdown and registered with atexit, so
+    alerts queued just before the process exits are not dropped with the
+    daemon worker thread.
+
+    Args:
+        timeout: Maximum seconds to wait per dispatcher
+    """
+    for dispatcher in list(_instances):
+        try:
+            dispatcher.stop(timeout)
+        except Exception as e:
+            logger.error(f"Failed to stop email dispatcher: {e}")
+
+
+atexit.register(stop_all_dispatchers)
+
+
+def get_dispatcher(
+    smtp_server: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+    use_ssl: bool = True,
+    **kwargs
+) -> EmailDispatcher:
+    """
+    Get the shared dispatcher for an SMTP account.
+
+    Alerters and reporters using the same account share one connection and
+    one digest queue.
+
+    Args:
+        smtp_server: SMTP server hostname
+        smtp_port: SMTP server port
+        smtp_user: SMTP username
+        smtp_password: SMTP password
+        use_ssl: Use SSL connection
+        **kwargs: Extra EmailDispatcher options (used on first creation only)
+
+    Returns:
+        EmailDispatcher instance
+    """
+    key = (smtp_server, smtp_port, smtp_user, use_ssl)
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(key)
+        if dispatcher is None:
+            dispatcher = EmailDispatcher(smtp_server, smtp_port, smtp_user, smtp_password, use_ssl, **kwargs)
+            _dispatchers[key] = dispatcher
+        return dispatcher
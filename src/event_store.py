@@ -0,0 +1,448 @@
+"""
+Event Store
+Append-only columnar log of scans, signals, filter rejections and trade lifecycle events
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Event types written by the scanners
+SCAN = 'scan'
+SIGNAL = 'signal'
+REJECTION = 'rejection'
+ALERT = 'alert'
+TRADE_OPEN = 'trade_open'
+TRADE_CLOSE = 'trade_close'
+
+# Column order of every segment; anything else goes into the JSON payload
+COLUMNS = ['ts', 'event', 'symbol', 'strategy', 'timeframe', 'direction', 'price', 'confidence', 'reason', 'payload']
+
+_EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow', 'jsonl': '.jsonl'}
+
+TimeLike = Union[datetime, pd.Timestamp, int, float, str]
+
+
+def _to_ms(value: TimeLike) -> int:
+    """Convert a datetime/Timestamp/epoch-ms to epoch milliseconds (naive = UTC)."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.value // 1_000_000)
+
+
+def _hour_of(ts_ms: int) -> str:
+    """Partition directory of an event time."""
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime('date=%Y-%m-%d/hour=%H')
+
+
+class EventStore:
+    """
+    Append-only event store partitioned by hour.
+
+    Events are buffered in memory and flushed as one batch (one Parquet row
+    group, Arrow IPC record batch or block of JSON lines) per segment file
+    under ``<root>/date=YYYY-MM-DD/hour=HH/``. A background flusher writes
+    the buffer when ``batch_size`` events are buffered or when the oldest
+    buffered event is ``flush_interval`` seconds old, so record() never
+    blocks on disk; close() writes what is left. Events of a batch that
+    fails to write go back into the buffer and are retried after
+    ``retry_interval`` seconds; beyond ``max_buffered`` events the oldest
+    are dropped. Queries prune hourly partitions by time range before
+    reading any file.
+
+    Parquet (or Arrow IPC) needs pyarrow; without it segments are written
+    as JSON lines with the same columns.
+    """
+
+    def __init__(self,
+                 root: Union[str, Path] = "logs/events",
+                 batch_size: int = 1000,
+                 flush_interval: float = 60.0,
+                 format: Optional[str] = None,
+                 clock=time.time,
+                 retry_interval: float = 5.0,
+                 max_buffered: int = 100_000):
+        """
+        Initialize event store.
+
+        Args:
+            root: Directory holding the hourly partitions
+            batch_size: Events per flushed batch
+            flush_interval: Maximum seconds an event stays buffered
+            format: 'parquet', 'arrow' or 'jsonl' (default: parquet if pyarrow is installed)
+            clock: Wall-clock time source (epoch seconds)
+            retry_interval: Seconds before retrying a failed write
+            max_buffered: Events kept in memory while writes keep failing
+
+        Raises:
+            ValueError: If the format is unknown or needs pyarrow
+        """
+        format = format or ('parquet' if PYARROW_AVAILABLE else 'jsonl')
+        if format not in _EXTENSIONS:
+            raise ValueError(f"Unknown event store format: {format}")
+        if format != 'jsonl' and not PYARROW_AVAILABLE:
+            raise ValueError(f"{format} event store needs pyarrow (pip install pyarrow)")
+
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.format = format
+        self.retry_interval = retry_interval
+        self.max_buffered = max_buffered
+        self._clock = clock
+
+        self._buffer: List[tuple] = []
+        self._buffer_started = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._sequence = 0
+        self._write_failed = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self.events_recorded = 0
+        self.segments_written = 0
+        self.write_errors = 0
+        self.events_dropped = 0
+
+    def record(self,
+               event: str,
+               symbol: Optional[str] = None,
+               strategy: Optional[str] = None,
+               timeframe: Optional[str] = None,
+               direction: Optional[str] = None,
+               price: Optional[float] = None,
+               confidence: Optional[float] = None,
+               reason: Optional[str] = None,
+               timestamp: Optional[TimeLike] = None,
+               **payload: Any) -> None:
+        """
+        Append an event.
+
+        Args:
+            event: Event type (scan, signal, rejection, alert, trade_open, trade_close)
+            symbol: Trading symbol
+            strategy: Strategy name
+            timeframe: Timeframe
+            direction: LONG/SHORT
+            price: Price at the event
+            confidence: Signal confidence
+            reason: Rejection/close reason or skip reason
+            timestamp: Event time (defaults to now)
+            **payload: Extra fields, stored as JSON
+        """
+        now = self._clock()
+        ts = _to_ms(timestamp) if timestamp is not None else int(now * 1000)
+        row = (
+            ts, event, symbol, strategy, timeframe, direction,
+            float(price) if price is not None else np.nan,
+            float(confidence) if confidence is not None else np.nan,
+            reason,
+            json.dumps(payload, default=str) if payload else None,
+        )
+
+        with self._wake:
+            if not self._buffer:
+                self._buffer_started = now
+            self._buffer.append(row)
+            self.events_recorded += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="EventStoreFlusher", daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= self.batch_size:
+                self._wake.notify()
+
+    def record_signal(self, event: str, signal: Any, reason: Optional[str] = None,
+                      symbol: Optional[str] = None, **payload: Any) -> None:
+        """
+        Append an event describing a Signal.
+
+        Args:
+            event: Event type
+            signal: Signal (or any object with the same attributes)
+            reason: Rejection or close reason
+            symbol: Symbol (defaults to the signal's own)
+            **payload: Extra fields
+        """
+        for name in ('stop_loss', 'take_profit', 'risk_reward'):
+            value = getattr(signal, name, None)
+            if value is not None:
+                payload.setdefault(name, value)
+        self.record(
+            event,
+            symbol=symbol or getattr(signal, 'symbol', None),
+            strategy=getattr(signal, 'strategy', None) or None,
+            timeframe=getattr(signal, 'timeframe', None),
+            direction=getattr(signal, 'signal_type', None),
+            price=getattr(signal, 'entry_price', None),
+            confidence=getattr(signal, 'confidence', None),
+            reason=reason,
+            **payload
+        )
+
+    def flush(self) -> int:
+        """
+        Write buffered events now.
+
+        Events that fail to write stay buffered for the next flush.
+
+        Returns:
+            Number of events written
+        """
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            started = self._buffer_started
+        if not rows:
+            return 0
+
+        frame = pd.DataFrame.from_records(rows, columns=COLUMNS)
+        hours = frame['ts'].map(_hour_of)
+        written = 0
+        failed: List[tuple] = []
+        with self._write_lock:
+            for hour, batch in frame.groupby(hours, sort=True):
+                try:
+                    self._write_segment(self.root / hour, batch.reset_index(drop=True))
+                    written += len(batch)
+                except Exception as e:
+                    self.write_errors += 1
+                    failed.extend(rows[i] for i in batch.index)
+                    logger.error(f"Failed to write {len(batch)} events to {self.root / hour}, keeping them buffered: {e}")
+
+        with self._lock:
+            self._write_failed = bool(failed)
+            if failed:
+                self._buffer[:0] = failed
+                self._buffer_started = started
+                excess = len(self._buffer) - self.max_buffered
+                if excess > 0:
+                    del self._buffer[:excess]
+                    self.events_dropped += excess
+                    logger.error(f"Event buffer full, dropped the {excess} oldest events")
+        return written
+
+    def _run(self) -> None:
+        """Flusher thread: write the buffer when it is full or old enough."""
+        while not self._stop_event.is_set():
+            with self._wake:
+                self._wake.wait_for(lambda: self._stop_event.is_set() or self._due(), timeout=1.0)
+                if self._stop_event.is_set() or not self._due():
+                    continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Event flush failed: {e}", exc_info=True)
+            if self._write_failed:
+                self._stop_event.wait(self.retry_interval)
+
+    def _due(self) -> bool:
+        """Whether the buffer should be written now (lock held)."""
+        if not self._buffer:
+            return False
+        return (len(self._buffer) >= self.batch_size
+                or self._clock() - self._buffer_started >= self.flush_interval)
+
+    def _write_segment(self, directory: Path, batch: pd.DataFrame) -> None:
+        """Write one batch as a new segment file (write lock held)."""
+        directory.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        name = f"part-{os.getpid()}-{int(self._clock() * 1000)}-{self._sequence:06d}{_EXTENSIONS[self.format]}"
+        path = directory / name
+        tmp = directory / (name + '.tmp')
+
+        if self.format == 'jsonl':
+            batch.to_json(tmp, orient='records', lines=True)
+        else:
+            table = pa.Table.from_pandas(batch, preserve_index=False)
+            if self.format == 'parquet':
+                pq.write_table(table, tmp, compression='zstd')
+            else:
+                with pa_ipc.new_file(str(tmp), table.schema) as writer:
+                    writer.write_table(table)
+
+        # Readers only see complete segments
+        os.replace(tmp, path)
+        self.segments_written += 1
+
+    def _segments(self, start_ms: Optional[int], end_ms: Optional[int]) -> List[Path]:
+        """Segment files of the partitions overlapping a time range."""
+        lower = _hour_of(start_ms) if start_ms is not None else None
+        upper = _hour_of(end_ms) if end_ms is not None else None
+        paths = []
+        for date_dir in sorted(self.root.glob('date=*')):
+            for hour_dir in sorted(date_dir.glob('hour=*')):
+                partition = f"{date_dir.name}/{hour_dir.name}"
+                if (lower and partition < lower) or (upper and partition > upper):
+                    continue
+                paths.extend(sorted(hour_dir.glob('part-*' + _EXTENSIONS[self.format])))
+        return paths
+
+    def _read_segment(self, path: Path) -> pd.DataFrame:
+        if self.format == 'jsonl':
+            return pd.read_json(path, orient='records', lines=True, dtype=False, convert_dates=False)
+        if self.format == 'parquet':
+            return pq.read_table(path).to_pandas()
+        with pa.memory_map(str(path)) as source:
+            return pa_ipc.open_file(source).read_all().to_pandas()
+
+    def query(self,
+              symbols: Optional[Union[str, Iterable[str]]] = None,
+              strategies: Optional[Union[str, Iterable[str]]] = None,
+              events: Optional[Union[str, Iterable[str]]] = None,
+              start: Optional[TimeLike] = None,
+              end: Optional[TimeLike] = None) -> pd.DataFrame:
+        """
+        Read events matching the given filters.
+
+        Buffered events are flushed first so the result is complete.
+
+        Args:
+            symbols: Symbol or symbols to keep
+            strategies: Strategy or strategies to keep
+            events: Event type or types to keep
+            start: Inclusive start time
+            end: Inclusive end time
+
+        Returns:
+            DataFrame with the store columns plus a ``time`` column (UTC), ordered by time
+        """
+        self.flush()
+        start_ms = _to_ms(start) if start is not None else None
+        end_ms = _to_ms(end) if end is not None else None
+
+        frames = []
+        for path in self._segments(start_ms, end_ms):
+            try:
+                frames.append(self._read_segment(path))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable event segment {path}: {e}")
+
+        if not frames:
+            df = pd.DataFrame({column: pd.Series(dtype=object) for column in COLUMNS})
+            df['ts'] = df['ts'].astype('int64')
+        else:
+            df = pd.concat(frames, ignore_index=True)
+
+        mask = np.ones(len(df), dtype=bool)
+        if start_ms is not None:
+            mask &= df['ts'].to_numpy() >= start_ms
+        if end_ms is not None:
+            mask &= df['ts'].to_numpy() <= end_ms
+        for column, wanted in (('symbol', symbols), ('strategy', strategies), ('event', events)):
+            if wanted is not None:
+                values = [wanted] if isinstance(wanted, str) else list(wanted)
+                mask &= df[column].isin(values).to_numpy()
+
+        df = df.loc[mask].sort_values('ts', kind='stable').reset_index(drop=True)
+        df['time'] = pd.to_datetime(df['ts'], unit='ms', utc=True)
+        return df
+
+    def rejection_summary(self, **filters: Any) -> pd.DataFrame:
+        """
+        Count filter rejections by strategy and reason.
+
+        Args:
+            **filters: Same filters as query() (except events)
+
+        Returns:
+            DataFrame with strategy, reason and count, most frequent first
+        """
+        df = self.query(events=REJECTION, **filters)
+        if df.empty:
+            return pd.DataFrame(columns=['strategy', 'reason', 'count'])
+        counts = df.fillna({'strategy': '', 'reason': ''}).groupby(['strategy', 'reason']).size()
+        return counts.rename('count').reset_index().sort_values('count', ascending=False, kind='stable')
+
+    def strategy_stats(self, **filters: Any) -> pd.DataFrame:
+        """
+        Per-strategy signal funnel.
+
+        Args:
+            **filters: Same filters as query() (except events)
+
+        Returns:
+            DataFrame indexed by strategy with signal, rejection and alert
+            counts and hit_rate (alerts / signals)
+        """
+        df = self.query(events=[SIGNAL, REJECTION, ALERT], **filters)
+        counts = (df.fillna({'strategy': ''})
+                  .groupby(['strategy', 'event']).size()
+                  .unstack(fill_value=0)
+                  .reindex(columns=[SIGNAL, REJECTION, ALERT], fill_value=0))
+        counts.columns = ['signals', 'rejections', 'alerts']
+        counts['hit_rate'] = (counts['alerts'] / counts['signals'].where(counts['signals'] > 0)).fillna(0.0)
+        return counts
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write statistics."""
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            'format': self.format,
+            'events_recorded': self.events_recorded,
+            'buffered': buffered,
+            'segments_written': self.segments_written,
+            'write_errors': self.write_errors,
+            'events_dropped': self.events_dropped,
+        }
+
+    def close(self) -> None:
+        """Stop the flusher and write remaining events."""
+        with self._wake:
+            self._stop_event.set()
+            self._wake.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._buffer:
+                logger.error(f"{len(self._buffer)} events could not be written at close")
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> EventStore:
+    """
+    Get the process-wide event store.
+
+    Set SCANNER_EVENT_DIR to change the directory (default logs/events).
+    Buffered events are flushed at interpreter exit.
+
+    Returns:
+        Shared EventStore
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EventStore(os.getenv('SCANNER_EVENT_DIR', 'logs/events'))
+            atexit.register(_store.close)
+        return _store
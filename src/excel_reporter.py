@@ -5,17 +5,12 @@ import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 
-try:
-    from openpyxl import Workbook, load_workbook
-    from openpyxl.utils import get_column_letter
-except ImportError:
-    raise ImportError("openpyxl is required. Install with: pip install openpyxl>=3.1.0")
+from src.email_dispatcher import OutgoingEmail, get_dispatcher
+from src.lazy_import import lazy_module
+
+# openpyxl is only loaded once the first workbook is opened
+openpyxl = lazy_module('openpyxl', install_hint='pip install openpyxl>=3.1.0')
 
 
 logger = logging.getLogger(__name__)
@@ -47,6 +42,13 @@ class ExcelReporter:
         self.report_interval_seconds = report_interval_seconds
         self.initial_report_delay_seconds = initial_report_delay_seconds
         self.scanner_name = scanner_name
+        self.dispatcher = get_dispatcher(
+            smtp_config['server'],
+            smtp_config['port'],
+            smtp_config['user'],
+            smtp_config['password'],
+            smtp_config.get('use_ssl', True)
+        )
         
         # Thread control
         self.running = False
@@ -83,7 +85,7 @@ class ExcelReporter:
             return
         
         try:
-            wb = Workbook()
+            wb = openpyxl.Workbook()
             ws = wb.active
             ws.title = "Scan Results"
             
@@ -113,7 +115,7 @@ class ExcelReporter:
             
             # Auto-fit columns
             for col_num in range(1, len(headers) + 1):
-                ws.column_dimensions[get_column_letter(col_num)].width = 15
+                ws.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = 15
             
             # Enable filters
             ws.auto_filter.ref = ws.dimensions
@@ -126,7 +128,7 @@ class ExcelReporter:
             logger.error(f"Failed to create Excel file: {e}")
             self.excel_disabled = True
     
-    def _ensure_symbol_sheet(self, wb: Workbook, symbol: str) -> None:
+    def _ensure_symbol_sheet(self, wb: "openpyxl.Workbook", symbol: str) -> None:
         """
         Ensure a sheet exists for the given symbol.
         
@@ -162,7 +164,7 @@ class ExcelReporter:
             
             # Auto-fit columns
             for col_num in range(1, len(headers) + 1):
-                ws.column_dimensions[get_column_letter(col_num)].width = 15
+                ws.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = 15
             
             # Enable filters
             ws.auto_filter.ref = ws.dimensions
@@ -199,7 +201,7 @@ class ExcelReporter:
                 # Retry logic for locked files
                 for attempt in range(3):
                     try:
-                        wb = load_workbook(self.excel_file_path)
+                        wb = openpyxl.load_workbook(self.excel_file_path)
                         ws = wb.active
                         break
                     except Exception as e:
@@ -418,81 +420,48 @@ class ExcelReporter:
     
     def _send_email_report(self, is_initial: bool = False) -> bool:
         """
-        Send email report with Excel file attached.
+        Queue email report with Excel file attached.
+        
+        The report is delivered by the shared email dispatcher, so the
+        timer thread never blocks on SMTP.
         
         Args:
             is_initial: Whether this is the initial startup report
         
         Returns:
-            True if successful, False otherwise
+            True if queued successfully, False otherwise
         """
         if not self.excel_file_path.exists():
             logger.warning("Excel file doesn't exist, skipping email report")
             return False
         
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.smtp_config['from_email']
-            msg['To'] = self.smtp_config['to_email']
-            
             report_type = "Initial Verification" if is_initial else "Hourly"
-            msg['Subject'] = f"[{self.scanner_name}] {report_type} Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-            
-            # Attach body
+            subject = f"[{self.scanner_name}] {report_type} Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
             body = self._generate_email_body(is_initial)
-            msg.attach(MIMEText(body, 'html'))
             
-            # Attach Excel file
-            with open(self.excel_file_path, 'rb') as f:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
-                encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename={self.excel_file_path.name}'
-                )
-                msg.attach(part)
+            # Snapshot the workbook now so later scans don't race the send
+            with self.file_lock:
+                with open(self.excel_file_path, 'rb') as f:
+                    payload = f.read()
             
-            # Send email with retry logic
-            for attempt in range(3):
-                try:
-                    if self.smtp_config.get('use_ssl', True):
-                        server = smtplib.SMTP_SSL(
-                            self.smtp_config['server'],
-                            self.smtp_config['port'],
-                            timeout=30
-                        )
-                    else:
-                        server = smtplib.SMTP(
-                            self.smtp_config['server'],
-                            self.smtp_config['port'],
-                            timeout=30
-                        )
-                        server.starttls()
-                    
-                    server.login(self.smtp_config['user'], self.smtp_config['password'])
-                    server.send_message(msg)
-                    server.quit()
-                    
+            def record_result(success: bool) -> None:
+                if success:
                     logger.info(f"Email report sent successfully ({report_type})")
                     self.last_report_time = datetime.now()
-                    return True
-                    
-                except (smtplib.SMTPAuthenticationError, smtplib.SMTPException) as e:
-                    logger.error(f"SMTP error sending email (attempt {attempt + 1}/3): {e}")
-                    if attempt < 2:
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                    else:
-                        return False
-                except Exception as e:
-                    logger.error(f"Error sending email (attempt {attempt + 1}/3): {e}")
-                    if attempt < 2:
-                        time.sleep(2 ** attempt)
-                    else:
-                        return False
+                else:
+                    logger.error(f"Failed to send email report ({report_type})")
             
-            return False
+            self.dispatcher.submit(OutgoingEmail(
+                subject=subject,
+                body=body,
+                from_email=self.smtp_config['from_email'],
+                to_email=self.smtp_config['to_email'],
+                subtype='html',
+                attachments=[(self.excel_file_path.name, payload)],
+                on_result=record_result
+            ))
+            return True
             
         except Exception as e:
             logger.error(f"Failed to send email report: {e}", exc_info=True)
@@ -0,0 +1,315 @@
+"""
+Execution Engine
+Bounded worker pool, admission control and shared candle/indicator cache for periodic scan jobs
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional
+import logging
+
+import pandas as pd
+
+from src.candle_cache import CandleCache, frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PerformanceSettings:
+    """Execution engine settings, read from the symbol config's global_settings."""
+    thread_pool_size: int = 4
+    max_concurrent_symbols: int = 10
+    cache_ttl_seconds: float = 300.0
+    signal_conflict_window_minutes: int = 5
+    duplicate_signal_window_minutes: int = 10
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]]) -> 'PerformanceSettings':
+        """
+        Build settings from a config mapping, ignoring unknown keys.
+
+        Args:
+            config: e.g. AssetConfigManager.global_settings
+
+        Returns:
+            PerformanceSettings
+
+        Raises:
+            ValueError: If a pool or admission size is below 1 or the TTL is negative
+        """
+        names = {f.name for f in fields(cls)}
+        settings = cls(**{k: v for k, v in (config or {}).items() if k in names and v is not None})
+        settings.validate()
+        return settings
+
+    def validate(self) -> None:
+        """Raise ValueError for unusable values."""
+        if int(self.thread_pool_size) < 1:
+            raise ValueError(f"thread_pool_size must be at least 1 (got {self.thread_pool_size})")
+        if int(self.max_concurrent_symbols) < 1:
+            raise ValueError(f"max_concurrent_symbols must be at least 1 (got {self.max_concurrent_symbols})")
+        if float(self.cache_ttl_seconds) < 0:
+            raise ValueError(f"cache_ttl_seconds must not be negative (got {self.cache_ttl_seconds})")
+
+
+class _Job:
+    """A periodic job and its run statistics."""
+
+    def __init__(self, key: str, func: Callable[[], Any], interval: float):
+        self.key = key
+        self.func = func
+        self.interval = interval
+        self.active = False      # Waiting for admission or running
+        self.cancelled = False
+        self.ready_at = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0        # Ticks skipped because the previous run was still active
+        self.last_duration = 0.0
+
+
+class ExecutionEngine:
+    """
+    Runs periodic scan jobs on a bounded worker pool.
+
+    Each job (one per symbol scanner) is due every ``interval`` seconds.
+    Due jobs wait in a FIFO until admitted: at most ``max_concurrent_symbols``
+    run at once, on ``thread_pool_size`` workers. A job never overlaps
+    itself; a tick that comes while its previous run is still active is
+    skipped and counted as an overrun. Scanners share fetched candles and
+    computed indicators through one cache bounded by ``cache_ttl_seconds``.
+    """
+
+    def __init__(self, settings: Optional[PerformanceSettings] = None, name: str = "scan"):
+        """
+        Initialize execution engine.
+
+        Args:
+            settings: Pool, admission and cache settings
+            name: Prefix of worker thread names
+        """
+        self.settings = settings or PerformanceSettings()
+        self.settings.validate()
+        self.name = name
+        self.max_concurrent = int(self.settings.max_concurrent_symbols)
+
+        self.pool = ThreadPoolExecutor(max_workers=int(self.settings.thread_pool_size),
+                                       thread_name_prefix=f"{name}-worker")
+        self.cache = CandleCache(ttl_seconds=float(self.settings.cache_ttl_seconds), max_entries=1024)
+
+        self._jobs: Dict[str, _Job] = {}
+        self._schedule: List[tuple] = []  # (due, sequence, job)
+        self._ready: deque = deque()
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Statistics
+        self.running = 0
+        self.peak_running = 0
+        self.deferred = 0
+        self.total_wait = 0.0
+        self.admitted = 0
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run_scheduler, name=f"{self.name}-scheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"Execution engine started: {self.settings.thread_pool_size} workers, "
+                    f"{self.max_concurrent} concurrent scans, cache TTL {self.settings.cache_ttl_seconds}s")
+
+    def schedule(self, key: str, func: Callable[[], Any], interval: float, delay: float = 0.0) -> None:
+        """
+        Run a job every ``interval`` seconds (replaces a job with the same key).
+
+        Args:
+            key: Job identifier (e.g. the symbol)
+            func: Callable run on a worker
+            interval: Seconds between runs
+            delay: Seconds before the first run
+        """
+        with self._cond:
+            old = self._jobs.get(key)
+            if old is not None:
+                old.cancelled = True
+            job = _Job(key, func, interval)
+            self._jobs[key] = job
+            heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._sequence), job))
+            self._cond.notify()
+
+    def cancel(self, key: str) -> bool:
+        """
+        Stop scheduling a job (a run in progress finishes).
+
+        Returns:
+            True if the job existed
+        """
+        with self._cond:
+            job = self._jobs.pop(key, None)
+            if job is None:
+                return False
+            job.cancelled = True
+            return True
+
+    def _run_scheduler(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                while self._schedule and self._schedule[0][0] <= now:
+                    due, _, job = heapq.heappop(self._schedule)
+                    if job.cancelled:
+                        continue
+                    if job.active:
+                        job.overruns += 1
+                    else:
+                        if self.running + len(self._ready) >= self.max_concurrent:
+                            self.deferred += 1
+                        job.active = True
+                        job.ready_at = now
+                        self._ready.append(job)
+                    # Fixed rate; missed ticks are dropped rather than bunched up
+                    next_due = due + job.interval
+                    if next_due <= now:
+                        next_due = now + job.interval
+                    heapq.heappush(self._schedule, (next_due, next(self._sequence), job))
+
+                while self._ready and self.running < self.max_concurrent:
+                    job = self._ready.popleft()
+                    if job.cancelled:
+                        job.active = False
+                        continue
+                    self.running += 1
+                    self.peak_running = max(self.peak_running, self.running)
+                    self.admitted += 1
+                    self.total_wait += now - job.ready_at
+                    try:
+                        self.pool.submit(self._execute, job)
+                    except RuntimeError:
+                        self.running -= 1
+                        job.active = False
+                        self._stopped = True
+                        break
+
+                timeout = self._schedule[0][0] - now if self._schedule else None
+                self._cond.wait(timeout)
+
+    def _execute(self, job: _Job) -> None:
+        started = time.monotonic()
+        try:
+            job.func()
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"Scan job {job.key} failed: {e}")
+        finally:
+            with self._cond:
+                job.runs += 1
+                job.last_duration = time.monotonic() - started
+                job.active = False
+                self.running -= 1
+                self._cond.notify()
+
+    def candles(self, key: tuple, count: int, fetch: Callable[[], pd.DataFrame],
+                max_age: Optional[float] = None) -> pd.DataFrame:
+        """
+        Get candles through the shared cache.
+
+        Args:
+            key: (symbol, timeframe, ...) identifying the request
+            count: Number of candles
+            fetch: Callable fetching ``count`` candles
+            max_age: Maximum acceptable age in seconds (defaults to the TTL)
+
+        Returns:
+            Candle DataFrame (the caller's own copy)
+        """
+        if self.cache.ttl_seconds <= 0:
+            return fetch()
+        frame, _ = self.cache.get_or_fetch(('candles',) + tuple(key), count, lambda: (fetch(), None), max_age)
+        return frame
+
+    def indicators(self, key: tuple, candles: pd.DataFrame,
+                   calculate: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Get indicators through the shared cache.
+
+        One entry is kept per series, tagged with the fingerprint of the
+        candles it was computed from: indicators are recomputed only when the
+        candles changed, and the new result replaces the stale one.
+
+        Args:
+            key: (symbol, timeframe, ...) identifying the series
+            candles: Candle DataFrame
+            calculate: Indicator calculation
+
+        Returns:
+            DataFrame with indicators (the caller's own copy)
+        """
+        if self.cache.ttl_seconds <= 0 or candles.empty:
+            return calculate(candles)
+        cache_key: Hashable = ('indicators',) + tuple(key)
+        fingerprint = frame_fingerprint(candles)
+        cached = self.cache.get(cache_key, len(candles))
+        if cached is not None and cached[1] == fingerprint:
+            return cached[0]
+        frame = calculate(candles.copy())
+        self.cache.put(cache_key, len(candles), frame, fingerprint)
+        return frame
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine statistics.
+
+        Returns:
+            Dict with pool settings, admission counters, per-job stats and cache stats
+        """
+        with self._cond:
+            jobs = {
+                key: {
+                    'interval': job.interval,
+                    'runs': job.runs,
+                    'failures': job.failures,
+                    'overruns': job.overruns,
+                    'last_duration_ms': round(job.last_duration * 1000, 1),
+                    'active': job.active,
+                }
+                for key, job in self._jobs.items()
+            }
+            stats = {
+                'thread_pool_size': self.settings.thread_pool_size,
+                'max_concurrent_symbols': self.max_concurrent,
+                'running': self.running,
+                'peak_running': self.peak_running,
+                'queued': len(self._ready),
+                'admitted': self.admitted,
+                'deferred': self.deferred,  # Jobs that had to wait for a free slot
+                'avg_queue_wait_ms': round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+                'jobs': jobs,
+            }
+        stats['cache'] = self.cache.get_stats()
+        return stats
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop scheduling and shut the worker pool down.
+
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        with self._cond:
+            self._stopped = True
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.pool.shutdown(wait=wait, cancel_futures=True)
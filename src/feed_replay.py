@@ -0,0 +1,368 @@
+"""
+Feed Replay
+Records raw provider responses and websocket messages, and replays them through the live pipeline under a virtual clock
+"""
+import gzip
+import heapq
+import json
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import logging
+
+from src import virtual_clock
+from src.virtual_clock import VirtualClock
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _dumps = lambda obj: json.dumps(obj, separators=(',', ':')).encode()  # noqa: E731
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+
+SEGMENT_PATTERN = 'feed-*.ndjson.gz'
+
+
+class FeedRecord(NamedTuple):
+    """One recorded provider response or websocket message."""
+    t: float            # Epoch seconds when it was received
+    kind: str           # 'rest' or 'ws'
+    key: Tuple          # ('fetch_ohlcv', symbol, timeframe), ('fetch_ticker', symbol) or (stream symbol,)
+    payload: Any        # Decoded response, or the raw websocket message text
+
+
+class FeedRecorder:
+    """
+    Appends raw feed data to gzip-compressed NDJSON segment files.
+
+    Each line is ``[t, kind, key, payload]``. A new segment is started every
+    ``segment_seconds`` so a long recording can be trimmed or copied by hour;
+    a segment cut short by a crash stays readable up to its last full line.
+    """
+
+    def __init__(self, directory: Union[str, Path], segment_seconds: float = 3600):
+        """
+        Initialize recorder.
+
+        Args:
+            directory: Directory for segment files (created if missing)
+            segment_seconds: Time span of one segment
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_seconds = segment_seconds
+        self.records_written = 0
+        self._file = None
+        self._segment_end = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, key: Union[str, Iterable[str]], payload: Any) -> None:
+        """
+        Append one record stamped with the current clock time.
+
+        Args:
+            kind: 'rest' or 'ws'
+            key: Request or stream identity
+            payload: JSON-serializable response, or a raw message (str or bytes)
+        """
+        if isinstance(payload, bytes):
+            payload = payload.decode()
+        key = [key] if isinstance(key, str) else list(key)
+        with self._lock:
+            now = virtual_clock.time()
+            if self._file is None or now >= self._segment_end:
+                self._rotate(now)
+            self._file.write(_dumps([now, kind, key, payload]) + b'\n')
+            self.records_written += 1
+
+    def _rotate(self, now: float) -> None:
+        """Close the current segment and open the one ``now`` falls in (lock held)."""
+        if self._file is not None:
+            self._file.close()
+        path = self.directory / f"feed-{int(now * 1000):013d}.ndjson.gz"
+        self._file = gzip.open(path, 'ab', compresslevel=6)
+        self._segment_end = now + self.segment_seconds
+        logger.info(f"Recording feed to {path}")
+
+    def attach_client(self, client) -> None:
+        """Record the REST responses of a connected MarketDataClient."""
+        client.exchange = RecordingExchange(client.exchange, self)
+
+    def attach_streamer(self, streamer) -> None:
+        """Record the raw messages of a BinanceWebSocketStreamer."""
+        streamer.recorder = self
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> 'FeedRecorder':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RecordingExchange:
+    """ccxt exchange wrapper that records the responses the scanners consume."""
+
+    def __init__(self, exchange, recorder: FeedRecorder):
+        self._exchange = exchange
+        self._recorder = recorder
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', **kwargs) -> List[List[float]]:
+        rows = self._exchange.fetch_ohlcv(symbol, timeframe, **kwargs)
+        self._recorder.record('rest', ('fetch_ohlcv', symbol, timeframe), rows)
+        return rows
+
+    def fetch_ticker(self, symbol: str, **kwargs) -> Dict[str, Any]:
+        ticker = self._exchange.fetch_ticker(symbol, **kwargs)
+        self._recorder.record('rest', ('fetch_ticker', symbol), ticker)
+        return ticker
+
+    def __getattr__(self, name: str):
+        return getattr(self._exchange, name)
+
+
+def read_feed(directory: Union[str, Path], start: Optional[float] = None,
+              end: Optional[float] = None) -> Iterator[FeedRecord]:
+    """
+    Read recorded segments in time order.
+
+    Args:
+        directory: Directory with segment files
+        start: Skip records before this epoch time
+        end: Stop at records after this epoch time
+
+    Yields:
+        FeedRecord
+    """
+    for path in sorted(Path(directory).glob(SEGMENT_PATTERN)):
+        with gzip.open(path, 'rb') as segment:
+            try:
+                for line in segment:
+                    if not line.endswith(b'\n'):
+                        break  # Last line of a segment cut short
+                    t, kind, key, payload = _loads(line)
+                    if start is not None and t < start:
+                        continue
+                    if end is not None and t > end:
+                        return
+                    yield FeedRecord(t, kind, tuple(key), payload)
+            except (EOFError, zlib.error, OSError) as e:
+                logger.warning(f"Feed segment {path.name} is truncated: {e}")
+
+
+class ReplayExchange:
+    """
+    ccxt stand-in serving recorded responses.
+
+    A request is answered with the newest response recorded for the same
+    method, symbol and timeframe up to the current replay time, so the
+    pipeline sees exactly what the exchange returned at that moment.
+    """
+
+    def __init__(self):
+        self._responses: Dict[Tuple, Any] = {}
+        self.markets: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+
+    def feed(self, record: FeedRecord) -> None:
+        """Make a recorded response current."""
+        self._responses[record.key] = record.payload
+        self.markets.setdefault(record.key[1], {'symbol': record.key[1]})
+
+    def _response(self, key: Tuple) -> Any:
+        self.requests += 1
+        try:
+            return self._responses[key]
+        except KeyError:
+            raise LookupError(f"No recorded response for {'/'.join(key)} yet")
+
+    def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        return self.markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None,
+                    limit: Optional[int] = None, params: Optional[dict] = None) -> List[List[float]]:
+        rows = self._response(('fetch_ohlcv', symbol, timeframe))
+        return rows[-limit:] if limit else rows
+
+    def fetch_ticker(self, symbol: str, params: Optional[dict] = None) -> Dict[str, Any]:
+        return self._response(('fetch_ticker', symbol))
+
+
+class _Unthrottled:
+    """Rate limiter stand-in: a replay makes no provider requests."""
+
+    def acquire(self, *args, **kwargs) -> bool:
+        return True
+
+    def report_throttled(self, *args, **kwargs) -> None:
+        pass
+
+
+@dataclass
+class ReplayStats:
+    """Outcome of a replay run."""
+    events: int = 0
+    rest_responses: int = 0
+    ws_messages: int = 0
+    callbacks: int = 0
+    errors: int = 0
+    virtual_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.virtual_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class FeedReplayer:
+    """
+    Replays a recording through the live components on one thread.
+
+    The process-wide clock is a VirtualClock set to each record's time, so
+    freshness checks, trade timers, news pauses and duplicate windows behave
+    as they did when the data was recorded. REST responses are served to
+    attached MarketDataClients, websocket messages go through the
+    ``_on_message`` path of attached streamers, and ``every()`` schedules
+    scan cycles on virtual time. With everything on one thread the run is
+    deterministic.
+    """
+
+    def __init__(self, records: Iterable[FeedRecord], speed: Optional[float] = 1.0):
+        """
+        Initialize replayer.
+
+        Args:
+            records: Records in time order (e.g. from read_feed)
+            speed: Replay speed as a multiple of real time (1-1000); None replays as fast as possible
+
+        Raises:
+            ValueError: If speed is not positive
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}")
+        self.records = records
+        self.speed = speed
+        self.exchange = ReplayExchange()
+        self.clock: Optional[VirtualClock] = None
+        self._streamers: Dict[str, List[Any]] = {}
+        self._intervals: List[Tuple[float, Callable[[], None]]] = []
+        self._schedule: List[Tuple[float, int, float, Callable[[], None]]] = []
+
+    def attach_client(self, client) -> None:
+        """Serve a MarketDataClient from the recording instead of the exchange."""
+        client.exchange = self.exchange
+        client.rate_limiter = _Unthrottled()
+        client._connected = True
+
+    def attach_streamer(self, streamer) -> None:
+        """Deliver recorded messages of the streamer's symbol to it."""
+        self._streamers.setdefault(streamer.symbol, []).append(streamer)
+
+    def every(self, seconds: float, callback: Callable[[], None]) -> None:
+        """
+        Run ``callback`` every ``seconds`` of virtual time (first run one interval after the first record).
+
+        Raises:
+            ValueError: If seconds is not positive
+        """
+        if seconds <= 0:
+            raise ValueError(f"Interval must be positive, got {seconds}")
+        self._intervals.append((seconds, callback))
+
+    def run(self, until: Optional[float] = None) -> ReplayStats:
+        """
+        Replay the records.
+
+        Args:
+            until: Stop at this epoch time (default: after the last record)
+
+        Returns:
+            ReplayStats
+        """
+        stats = ReplayStats()
+        iterator = iter(self.records)
+        first = next(iterator, None)
+        if first is None:
+            return stats
+
+        self.clock = VirtualClock(first.t)
+        # The sequence number keeps callbacks due at the same time in registration order
+        self._schedule = [(first.t + seconds, n, seconds, callback)
+                          for n, (seconds, callback) in enumerate(self._intervals)]
+        heapq.heapify(self._schedule)
+        wall_start = time.perf_counter()
+
+        with virtual_clock.use_clock(self.clock):
+            for record in _chain(first, iterator):
+                if until is not None and record.t > until:
+                    break
+                self._run_timers(record.t, wall_start, first.t, stats)
+                self._pace(record.t, wall_start, first.t)
+                self.clock.advance_to(record.t)
+                self._dispatch(record, stats)
+            if until is not None:
+                self._run_timers(until, wall_start, first.t, stats)
+                self.clock.advance_to(until)
+
+        stats.virtual_seconds = self.clock.time() - first.t
+        stats.wall_seconds = time.perf_counter() - wall_start
+        logger.info(
+            f"Replayed {stats.events} events ({stats.virtual_seconds:.0f}s of feed) in "
+            f"{stats.wall_seconds:.2f}s: {stats.events_per_second:,.0f} events/s, {stats.callbacks} callbacks"
+        )
+        return stats
+
+    def _run_timers(self, t: float, wall_start: float, origin: float, stats: ReplayStats) -> None:
+        """Run the callbacks due up to ``t``, in due-time order."""
+        while self._schedule and self._schedule[0][0] <= t:
+            due, n, seconds, callback = heapq.heappop(self._schedule)
+            self._pace(due, wall_start, origin)
+            self.clock.advance_to(due)
+            try:
+                callback()
+            except Exception as e:
+                stats.errors += 1
+                logger.error(f"Replay callback failed at {self.clock.now()}: {e}", exc_info=True)
+            stats.callbacks += 1
+            heapq.heappush(self._schedule, (due + seconds, n, seconds, callback))
+
+    def _pace(self, t: float, wall_start: float, origin: float) -> None:
+        """Sleep until ``t`` is due at the replay speed."""
+        if self.speed is None:
+            return
+        delay = wall_start + (t - origin) / self.speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _dispatch(self, record: FeedRecord, stats: ReplayStats) -> None:
+        stats.events += 1
+        if record.kind == 'rest':
+            stats.rest_responses += 1
+            self.exchange.feed(record)
+            return
+        stats.ws_messages += 1
+        for streamer in self._streamers.get(record.key[0], ()):
+            streamer._on_message(None, record.payload)
+
+
+def _chain(first: FeedRecord, rest: Iterator[FeedRecord]) -> Iterator[FeedRecord]:
+    yield first
+    yield from rest
@@ -31,6 +31,9 @@ class FVGZone:
 class FVGDetector:
     """Detects Fair Value Gaps and liquidity voids."""
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('active_fvgs',)
+    
     def __init__(self, min_gap_percent: float = 0.2):
         """
         Initialize FVG detector.
@@ -1,12 +1,14 @@
 """H4 HVG (4-Hour High Volume Gap) Detection Module."""
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict, List, Tuple
 from collections import deque
 import pandas as pd
 import logging
 
+from src.duplicate_suppressor import DuplicateSuppressor
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +30,9 @@ class GapInfo:
 class H4HVGDetector:
     """Detects High Volume Gap patterns on 4-hour timeframes."""
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('signal_history', 'duplicate_suppressor')
+    
     # Market-specific configurations - Updated with stricter requirements
     MARKET_CONFIGS = {
         'BTC': {
@@ -77,6 +82,12 @@ class H4HVGDetector:
         self.duplicate_time_window_minutes = config.get('duplicate_time_window_minutes', 240)  # 4 hours
         self.duplicate_price_threshold_percent = config.get('duplicate_price_threshold_percent', 0.5)
         self.signal_history: deque = deque(maxlen=50)
+        self.duplicate_suppressor = DuplicateSuppressor(
+            window_minutes=self.duplicate_time_window_minutes,
+            price_threshold_percent=self.duplicate_price_threshold_percent,
+            retention_minutes=24 * 60,
+            strategy="H4 HVG"
+        )
         
         logger.info(f"H4HVGDetector initialized for {self.market_type} market")
         logger.info(f"Min gap: {self.min_gap_percent}%, Volume threshold: {self.volume_spike_threshold}x")
@@ -526,34 +537,7 @@ class H4HVGDetector:
             True if duplicate, False otherwise
         """
         try:
-            # Clean expired signals first
-            self._clean_expired_signals()
-            
-            time_threshold = timedelta(minutes=self.duplicate_time_window_minutes)
-            
-            for prev_signal in self.signal_history:
-                # Check same signal type
-                if prev_signal.signal_type != signal.signal_type:
-                    continue
-                
-                # Check same strategy
-                if prev_signal.strategy != "H4 HVG":
-                    continue
-                
-                # Check time window
-                time_diff = signal.timestamp - prev_signal.timestamp
-                if time_diff < time_threshold:
-                    # Check price movement
-                    price_change_percent = abs(
-                        signal.entry_price - prev_signal.entry_price
-                    ) / prev_signal.entry_price * 100
-                    
-                    if price_change_percent < self.duplicate_price_threshold_percent:
-                        logger.debug(f"Duplicate H4 HVG signal blocked: {signal.signal_type} within {time_diff.total_seconds()/60:.1f} minutes")
-                        return True
-            
-            return False
-            
+            return self.duplicate_suppressor.is_duplicate(signal)
         except Exception as e:
             logger.error(f"Error checking duplicate signal: {e}")
             return False
@@ -568,19 +552,7 @@ class H4HVGDetector:
         try:
             if signal.strategy == "H4 HVG":
                 self.signal_history.append(signal)
+                self.duplicate_suppressor.record(signal)
                 logger.debug(f"Added H4 HVG signal to history: {signal.signal_type} at {signal.entry_price}")
         except Exception as e:
             logger.error(f"Error adding signal to history: {e}")
-    
-    def _clean_expired_signals(self) -> None:
-        """Remove signals older than 24 hours from history."""
-        try:
-            cutoff_time = datetime.now() - timedelta(hours=24)
-            
-            # Filter out expired signals
-            self.signal_history = deque(
-                [s for s in self.signal_history if s.timestamp > cutoff_time],
-                maxlen=50
-            )
-        except Exception as e:
-            logger.error(f"Error cleaning expired signals: {e}")
\ No newline at end of file
@@ -7,6 +7,8 @@ from collections import deque
 from typing import Dict, Optional
 from dataclasses import dataclass
 
+from src.latency_trace import get_latency_tracker
+
 
 @dataclass
 class HealthStatus:
@@ -133,7 +135,8 @@ class HealthMonitor:
             'last_data_update': status.last_data_update.isoformat() if status.last_data_update else None,
             'connection_status': status.connection_status,
             'errors_last_hour': status.errors_last_hour,
-            'email_success_rate': f"{status.email_success_rate:.1f}%"
+            'email_success_rate': f"{status.email_success_rate:.1f}%",
+            'signal_latency': get_latency_tracker().summary()
         }
     
     def log_health_summary(self, logger: logging.Logger) -> None:
@@ -153,6 +156,9 @@ class HealthMonitor:
         logger.info(f"Last Data Update: {metrics['last_data_update']}")
         logger.info(f"Errors (1h): {metrics['errors_last_hour']}")
         logger.info(f"Email Success Rate: {metrics['email_success_rate']}")
+        for key, latency in metrics['signal_latency'].items():
+            logger.info(f"Signal latency {key}: p50 {latency['p50_ms']:.0f}ms, p99 {latency['p99_ms']:.0f}ms "
+                        f"(n={latency['count']})")
         logger.info("=" * 60)
     
     def _count_errors_last_hour(self) -> int:
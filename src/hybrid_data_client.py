@@ -4,17 +4,28 @@ Routes to best available provider with automatic fallback:
 - Alpha Vantage (primary for US30/XAU) - 5 calls/min, 500/day
 - Twelve Data (secondary) - 8 calls/min, 800/day  
 - yfinance (fallback) - Unlimited but delayed
+
+Providers are ranked by rolling health (latency, errors, staleness and
+unanswered requests). When the best provider runs past its p95 latency a
+hedged request goes to the next one with spare request budget and the first
+valid response wins; every request is abandoned after a hard timeout.
 """
 import logging
+import threading
 import pandas as pd
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Optional, List, Dict
 import time
 
+from src.candle_cache import CandleCache
+from src.provider_health import ProviderHealthTracker
+from src.rate_limiter import get_broker
+
 logger = logging.getLogger(__name__)
 
 
 class HybridDataClient:
-    """Multi-provider client with automatic fallback and rate limiting"""
+    """Multi-provider client with health-ranked, hedged failover"""
     
     # Provider priority by asset type
     PROVIDER_PRIORITY = {
@@ -23,10 +34,18 @@ class HybridDataClient:
         'XAU': ['yfinance', 'twelve_data', 'alpha_vantage'],   # yfinance first (fresh, no limits)
     }
     
+    # Candle buffers of the active provider, kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('buffers',)
+    
     def __init__(self, symbol: str, timeframes: List[str], buffer_size: int = 100,
                  alpha_vantage_key: Optional[str] = None,
                  twelve_data_key: Optional[str] = None,
-                 preferred_provider: Optional[str] = None):
+                 preferred_provider: Optional[str] = None,
+                 cache_ttl_seconds: float = 5.0,
+                 cache: Optional[CandleCache] = None,
+                 hedge_requests: bool = True,
+                 health: Optional[ProviderHealthTracker] = None,
+                 request_timeout_seconds: float = 15.0):
         """
         Initialize multi-provider hybrid client
         
@@ -37,6 +56,11 @@ class HybridDataClient:
             alpha_vantage_key: Alpha Vantage API key (optional)
             twelve_data_key: Twelve Data API key (optional)
             preferred_provider: Force specific provider (optional)
+            cache_ttl_seconds: How long fetched candles are reused (0 disables caching)
+            cache: Shared CandleCache (optional, one per client by default)
+            hedge_requests: Send a backup request when the best provider is slow
+            health: Shared ProviderHealthTracker (optional, one per client by default)
+            request_timeout_seconds: Time after which a provider request is abandoned
         """
         self.symbol = symbol
         self.timeframes = timeframes
@@ -52,9 +76,40 @@ class HybridDataClient:
         self.provider_last_call = {}
         self.provider_call_count = {}
         
+        # One client per provider, created on first use; self.client is the
+        # provider that served the last successful request
         self.client = None
         self.client_type = None
+        self.clients: Dict[str, Any] = {}
         self.providers_tried = []
+        self._connected_providers = set()
+        self._client_lock = threading.RLock()
+        
+        if preferred_provider:
+            self.providers = [preferred_provider]
+        else:
+            self.providers = list(self.PROVIDER_PRIORITY.get(self.asset_type, ['yfinance']))
+        if 'yfinance' not in self.providers:
+            self.providers.append('yfinance')
+        
+        self.health = health or ProviderHealthTracker()
+        self.hedge_requests = hedge_requests
+        self.request_timeout_seconds = request_timeout_seconds
+        self.hedged_count = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.rate_limiter = get_broker()  # Checked before spending budget on a hedge
+        # A hung provider holds at most max_in_flight workers (it is skipped once
+        # saturated), so the others always have workers left
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, self.health.max_in_flight * len(self.providers)),
+            thread_name_prefix=f"hybrid-{symbol.replace('/', '')}"
+        )
+        
+        # Heartbeat, trade updates and detection often ask for the same
+        # timeframe within a second; they share one fetch through the cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache = cache or CandleCache(ttl_seconds=cache_ttl_seconds)
         
         self._initialize_client()
     
@@ -72,154 +127,162 @@ class HybridDataClient:
     def _initialize_client(self):
         """Initialize client with provider priority"""
         
-        # Get provider priority for this asset
-        if self.preferred_provider:
-            providers = [self.preferred_provider]
-        else:
-            providers = self.PROVIDER_PRIORITY.get(self.asset_type, ['yfinance'])
-        
         # Try each provider in order
-        for provider in providers:
+        for provider in self.providers:
             if self._try_provider(provider):
                 return
         
-        # If all fail, use yfinance as last resort
-        logger.warning(f"All preferred providers failed, using yfinance as fallback")
-        self._use_yfinance()
+        logger.error(f"No data provider could be initialized for {self.symbol}")
     
     def _try_provider(self, provider: str) -> bool:
-        """Try to initialize a specific provider"""
-        self.providers_tried.append(provider)
-        
-        try:
-            if provider == 'kraken':
-                return self._use_kraken()
-            elif provider == 'alpha_vantage' and self.alpha_vantage_key:
-                return self._use_alpha_vantage()
-            elif provider == 'twelve_data' and self.twelve_data_key:
-                return self._use_twelve_data()
-            elif provider == 'yfinance':
-                return self._use_yfinance()
-            else:
-                logger.debug(f"Provider {provider} not available (missing API key or not supported)")
-                return False
-        except Exception as e:
-            logger.warning(f"Failed to initialize {provider}: {e}")
+        """Make a provider the active client, creating it if needed"""
+        client = self._get_client(provider)
+        if client is None:
             return False
+        
+        self.client = client
+        self.client_type = provider
+        return True
     
-    def _use_kraken(self) -> bool:
-        """Use Kraken via CCXT (for BTC only)"""
-        try:
-            from src.market_data_client import MarketDataClient
+    def _get_client(self, provider: str):
+        """Get the client of a provider, creating it on first use"""
+        with self._client_lock:
+            if provider in self.clients:
+                return self.clients[provider]
             
-            # Map symbol to Kraken format
-            kraken_symbol = 'BTC/USD' if 'BTC' in self.symbol.upper() else self.symbol
+            if provider not in self.providers_tried:
+                self.providers_tried.append(provider)
             
-            self.client = MarketDataClient(
-                exchange_name='kraken',
-                symbol=kraken_symbol,
-                timeframes=self.timeframes,
-                buffer_size=self.buffer_size
-            )
-            self.client_type = 'kraken'
-            logger.info(f"Using Kraken (CCXT) for {self.symbol}")
-            return True
-        except Exception as e:
-            logger.warning(f"Kraken not available: {e}")
-            return False
-    
-    def _use_alpha_vantage(self) -> bool:
-        """Use Alpha Vantage"""
-        try:
-            from src.alpha_vantage_client import AlphaVantageClient
+            try:
+                if provider == 'kraken':
+                    client = self._create_kraken()
+                elif provider == 'alpha_vantage' and self.alpha_vantage_key:
+                    client = self._create_alpha_vantage()
+                elif provider == 'twelve_data' and self.twelve_data_key:
+                    client = self._create_twelve_data()
+                elif provider == 'yfinance':
+                    client = self._create_yfinance()
+                else:
+                    logger.debug(f"Provider {provider} not available (missing API key or not supported)")
+                    client = None
+            except Exception as e:
+                logger.warning(f"Failed to initialize {provider}: {e}")
+                client = None
             
-            self.client = AlphaVantageClient(
-                api_key=self.alpha_vantage_key,
-                symbol=self.symbol,
-                timeframes=self.timeframes,
-                buffer_size=self.buffer_size
-            )
-            self.client_type = 'alpha_vantage'
-            logger.info(f"Using Alpha Vantage for {self.symbol}")
-            return True
-        except ImportError:
-            logger.warning("Alpha Vantage client not available")
-            return False
+            # Unavailable providers are remembered too, so they are not retried
+            self.clients[provider] = client
+            return client
     
-    def _use_twelve_data(self) -> bool:
-        """Use Twelve Data"""
-        try:
-            from src.twelve_data_client import TwelveDataClient
-            
-            self.client = TwelveDataClient(
-                api_key=self.twelve_data_key,
-                symbol=self.symbol,
-                timeframes=self.timeframes,
-                buffer_size=self.buffer_size
-            )
-            self.client_type = 'twelve_data'
-            logger.info(f"Using Twelve Data for {self.symbol}")
-            return True
-        except ImportError:
-            logger.warning("Twelve Data client not available")
-            return False
+    def _create_kraken(self):
+        """Create Kraken client via CCXT (for BTC only)"""
+        from src.market_data_client import MarketDataClient
+        
+        # Map symbol to Kraken format
+        kraken_symbol = 'BTC/USD' if 'BTC' in self.symbol.upper() else self.symbol
+        
+        client = MarketDataClient(
+            exchange_name='kraken',
+            symbol=kraken_symbol,
+            timeframes=self.timeframes,
+            buffer_size=self.buffer_size
+        )
+        logger.info(f"Using Kraken (CCXT) for {self.symbol}")
+        return client
+    
+    def _create_alpha_vantage(self):
+        """Create Alpha Vantage client"""
+        from src.alpha_vantage_client import AlphaVantageClient
+        
+        client = AlphaVantageClient(
+            api_key=self.alpha_vantage_key,
+            symbol=self.symbol,
+            timeframes=self.timeframes,
+            buffer_size=self.buffer_size
+        )
+        logger.info(f"Using Alpha Vantage for {self.symbol}")
+        return client
+    
+    def _create_twelve_data(self):
+        """Create Twelve Data client"""
+        from src.twelve_data_client import TwelveDataClient
+        
+        client = TwelveDataClient(
+            api_key=self.twelve_data_key,
+            symbol=self.symbol,
+            timeframes=self.timeframes,
+            buffer_size=self.buffer_size
+        )
+        logger.info(f"Using Twelve Data for {self.symbol}")
+        return client
     
-    def _use_yfinance(self) -> bool:
-        """Use yfinance (always available fallback)"""
+    def _create_yfinance(self):
+        """Create yfinance client (always available fallback)"""
+        from src.yfinance_client import YFinanceClient
+        
+        # Symbol mappings
+        symbol_map = {
+            'BTC/USD': 'BTC-USD',
+            'BTCUSD': 'BTC-USD',
+            'US30/USD': '^DJI',
+            'US30': '^DJI',
+            'XAU/USD': 'GC=F',
+            'XAUUSD': 'GC=F',
+        }
+        
+        yf_symbol = symbol_map.get(self.symbol, self.symbol)
+        
+        client = YFinanceClient(
+            symbol=yf_symbol,
+            timeframes=self.timeframes,
+            buffer_size=self.buffer_size
+        )
+        logger.info(f"Using yfinance for {self.symbol} (ticker: {yf_symbol})")
+        return client
+    
+    def _connect_provider(self, provider: str):
+        """Get a connected client for a provider, or None"""
+        client = self._get_client(provider)
+        if client is None:
+            return None
+        
+        with self._client_lock:
+            if provider in self._connected_providers:
+                return client
+        
+        started = time.monotonic()
         try:
-            from src.yfinance_client import YFinanceClient
-            
-            # Symbol mappings
-            symbol_map = {
-                'BTC/USD': 'BTC-USD',
-                'BTCUSD': 'BTC-USD',
-                'US30/USD': '^DJI',
-                'US30': '^DJI',
-                'XAU/USD': 'GC=F',
-                'XAUUSD': 'GC=F',
-            }
-            
-            yf_symbol = symbol_map.get(self.symbol, self.symbol)
-            
-            self.client = YFinanceClient(
-                symbol=yf_symbol,
-                timeframes=self.timeframes,
-                buffer_size=self.buffer_size
-            )
-            self.client_type = 'yfinance'
-            logger.info(f"Using yfinance for {self.symbol} (ticker: {yf_symbol})")
-            return True
+            connected = client.connect()
         except Exception as e:
-            logger.error(f"Failed to initialize yfinance: {e}")
-            return False
-    
-    def connect(self) -> bool:
-        """Connect to the data provider"""
-        if not self.client:
-            logger.error("No client initialized")
-            return False
+            logger.warning(f"Failed to connect with {provider}: {e}")
+            connected = False
         
-        success = self.client.connect()
+        if not connected:
+            self.health.record_failure(provider, time.monotonic() - started, "connect failed")
+            return None
         
-        if not success:
-            logger.warning(f"Failed to connect with {self.client_type}, trying fallback...")
-            # Try next provider in priority list
-            remaining_providers = [p for p in self.PROVIDER_PRIORITY.get(self.asset_type, ['yfinance']) 
-                                 if p not in self.providers_tried]
-            
-            for provider in remaining_providers:
-                if self._try_provider(provider):
-                    return self.client.connect()
-            
-            logger.error("All providers failed to connect")
-            return False
+        with self._client_lock:
+            self._connected_providers.add(provider)
+        return client
+    
+    def connect(self) -> bool:
+        """Connect to the healthiest available data provider"""
+        for provider in self.health.rank(self.providers):
+            if self._connect_provider(provider) is not None:
+                self._try_provider(provider)
+                return True
+            logger.warning(f"Failed to connect with {provider}, trying fallback...")
         
-        return True
+        logger.error("All providers failed to connect")
+        return False
     
     def get_latest_candles(self, timeframe: str, count: int = 100, validate_freshness: bool = True) -> tuple:
         """
         Get latest candles with automatic fallback and optional freshness validation
         
+        Results are cached for ``cache_ttl_seconds``; smaller requests are
+        sliced from a larger cached fetch and concurrent callers share one
+        request to the provider.
+        
         Args:
             timeframe: Timeframe (e.g., '5m', '1h')
             count: Number of candles
@@ -232,64 +295,182 @@ class HybridDataClient:
             logger.error("No client initialized")
             return pd.DataFrame(), False
         
+        if self.cache_ttl_seconds <= 0:
+            return self._fetch_candles(timeframe, count, validate_freshness)
+        
+        key = (self.symbol, timeframe, validate_freshness)
+        return self.cache.get_or_fetch(
+            key, count, lambda: self._fetch_candles(timeframe, count, validate_freshness),
+            max_age=self.cache_ttl_seconds
+        )
+    
+    @property
+    def buffers(self) -> Dict[str, Any]:
+        """Candle buffers (timeframe -> candle dicts) of the active provider, if it keeps any"""
+        return getattr(self.client, 'buffers', {})
+    
+    def get_buffer_data(self, timeframe: str) -> pd.DataFrame:
+        """Get the active provider's buffered candles for a timeframe"""
+        if not hasattr(self.client, 'get_buffer_data'):
+            return pd.DataFrame()
+        return self.client.get_buffer_data(timeframe)
+    
+    def get_cache_stats(self) -> dict:
+        """Get candle cache hit/miss statistics"""
+        return self.cache.get_stats()
+    
+    def get_provider_health(self) -> dict:
+        """Get rolling health metrics and current ranking of the providers"""
+        return {
+            'ranking': self.health.rank(self.providers),
+            'active': self.client_type,
+            'hedged_requests': self.hedged_count,
+            'hedge_wins': self.hedge_wins,
+            'timeouts': self.timeouts,
+            'providers': self.health.snapshot(),
+        }
+    
+    def _fetch_candles(self, timeframe: str, count: int, validate_freshness: bool = True) -> tuple:
+        """
+        Fetch candles from the healthiest provider, hedging when it is slow.
+        
+        The best-ranked provider gets the request first. If it has not
+        answered within its p95 latency, the next provider with spare request
+        budget is asked as well and the first non-empty response wins; a
+        provider that fails, returns nothing or runs past
+        ``request_timeout_seconds`` is replaced by the next one immediately.
+        Providers already holding ``max_in_flight`` unanswered requests are
+        skipped. Slow responses that lose the race still feed the health
+        statistics.
+        """
+        ranked = [p for p in self.health.rank(self.providers)
+                  if self._get_client(p) is not None and not self.health.saturated(p)]
+        if not ranked:
+            logger.error(f"No data provider available for {self.symbol} {timeframe}")
+            return pd.DataFrame(), False
+        
+        pending = {}  # future -> (provider, deadline)
+        
+        def launch(provider):
+            ranked.remove(provider)
+            token = self.health.begin(provider)
+            deadline = time.monotonic() + self.request_timeout_seconds
+            future = self._executor.submit(self._fetch_from, provider, timeframe, count,
+                                           validate_freshness, token, deadline)
+            pending[future] = (provider, deadline)
+        
+        primary = ranked[0]
+        launch(primary)
+        hedge_at = time.monotonic() + self.health.hedge_delay(primary) if self.hedge_requests else None
+        hedged = False
+        
+        while pending:
+            now = time.monotonic()
+            wake_at = min(deadline for _, deadline in pending.values())
+            if hedge_at is not None and ranked:
+                wake_at = min(wake_at, hedge_at)
+            done, _ = wait(list(pending), timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                provider, _ = pending.pop(future)
+                result = future.result()
+                if result is not None:
+                    if provider != primary:
+                        logger.info(f"Got {self.symbol} {timeframe} from fallback provider {provider}")
+                        if hedged:
+                            self.hedge_wins += 1
+                    self._try_provider(provider)
+                    return result
+            
+            failed = bool(done)
+            now = time.monotonic()
+            for future, (provider, deadline) in list(pending.items()):
+                if now >= deadline:
+                    # The worker cannot be interrupted; it stays counted as in flight
+                    del pending[future]
+                    failed = True
+                    self.timeouts += 1
+                    logger.warning(f"{provider} did not answer {self.symbol} {timeframe} within "
+                                   f"{self.request_timeout_seconds:.0f}s, abandoning request")
+            
+            if failed:
+                # Fail over straight away instead of waiting out the hedge delay
+                if ranked:
+                    launch(ranked[0])
+                continue
+            
+            if hedge_at is not None and ranked and now >= hedge_at:
+                hedge_at = None
+                provider = next((p for p in ranked if self._has_budget(p)), None)
+                if provider is None:
+                    logger.debug(f"No provider with spare budget to hedge {primary} for {self.symbol} {timeframe}")
+                    continue
+                launch(provider)
+                hedged = True
+                self.hedged_count += 1
+                logger.info(f"{primary} slower than {self.health.hedge_delay(primary):.2f}s for "
+                            f"{self.symbol} {timeframe}, hedging with {provider}")
+        
+        logger.error("All providers failed")
+        return pd.DataFrame(), False
+    
+    def _has_budget(self, provider: str) -> bool:
+        """Whether a hedge to a provider can go out now without spending a scarce quota"""
+        api_key = {'alpha_vantage': self.alpha_vantage_key, 'twelve_data': self.twelve_data_key}.get(provider)
+        return self.rate_limiter.has_budget(provider, api_key)
+    
+    def _fetch_from(self, provider: str, timeframe: str, count: int, validate_freshness: bool,
+                    token: int, deadline: float) -> Optional[tuple]:
+        """
+        Fetch candles from one provider and record the outcome.
+        
+        Args:
+            provider: Provider name
+            timeframe: Timeframe
+            count: Number of candles
+            validate_freshness: Passed to the provider client
+            token: In-flight token from ProviderHealthTracker.begin()
+            deadline: Monotonic time after which the caller has given up
+        
+        Returns:
+            Tuple of (DataFrame, is_fresh), or None if the provider failed, timed out or returned no data
+        """
+        started = time.monotonic()
         try:
-            # Check if underlying client supports freshness validation
-            if hasattr(self.client, 'get_latest_candles'):
-                # Try to call with validate_freshness parameter
-                try:
-                    result = self.client.get_latest_candles(timeframe, count, validate_freshness=validate_freshness)
-                    # If it returns a tuple, use it
-                    if isinstance(result, tuple):
-                        data, is_fresh = result
-                    else:
-                        # Old-style client that returns just DataFrame
-                        data = result
-                        is_fresh = True  # Assume fresh if no validation
-                except TypeError:
-                    # Client doesn't support validate_freshness parameter
-                    data = self.client.get_latest_candles(timeframe, count)
-                    is_fresh = True  # Assume fresh if no validation
+            client = self._connect_provider(provider)
+            if client is None:
+                return None
+            
+            try:
+                result = client.get_latest_candles(timeframe, count, validate_freshness=validate_freshness)
+            except TypeError:
+                # Client doesn't support validate_freshness parameter
+                result = client.get_latest_candles(timeframe, count)
+            
+            if isinstance(result, tuple):
+                data, is_fresh = result
             else:
-                logger.error(f"Client {self.client_type} doesn't have get_latest_candles method")
-                return pd.DataFrame(), False
+                # Old-style client that returns just DataFrame
+                data, is_fresh = result, True
             
-            # If data is empty, try fallback
-            if data.empty:
-                logger.warning(f"{self.client_type} returned empty data, trying fallback...")
-                return self._try_fallback_data(timeframe, count, validate_freshness)
+            latency = time.monotonic() - started
+            if time.monotonic() > deadline:
+                self.health.record_failure(provider, latency, "timed out")
+                return None
+            if data is None or data.empty:
+                logger.warning(f"{provider} returned empty data for {self.symbol} {timeframe}")
+                self.health.record_failure(provider, latency, "empty data")
+                return None
             
+            self.health.record_success(provider, latency, stale=not is_fresh)
             return data, is_fresh
             
         except Exception as e:
-            logger.error(f"Error fetching data from {self.client_type}: {e}")
-            return self._try_fallback_data(timeframe, count, validate_freshness)
-    
-    def _try_fallback_data(self, timeframe: str, count: int, validate_freshness: bool = True) -> tuple:
-        """Try to get data from fallback provider"""
-        remaining_providers = [p for p in self.PROVIDER_PRIORITY.get(self.asset_type, ['yfinance']) 
-                             if p not in self.providers_tried]
-        
-        for provider in remaining_providers:
-            logger.info(f"Trying fallback provider: {provider}")
-            if self._try_provider(provider):
-                if self.client.connect():
-                    try:
-                        result = self.client.get_latest_candles(timeframe, count, validate_freshness=validate_freshness)
-                        if isinstance(result, tuple):
-                            data, is_fresh = result
-                        else:
-                            data = result
-                            is_fresh = True
-                    except TypeError:
-                        data = self.client.get_latest_candles(timeframe, count)
-                        is_fresh = True
-                    
-                    if not data.empty:
-                        logger.info(f"Successfully got data from fallback provider {provider}")
-                        return data, is_fresh
-        
-        logger.error("All fallback providers failed")
-        return pd.DataFrame(), False
+            logger.error(f"Error fetching data from {provider}: {e}")
+            self.health.record_failure(provider, time.monotonic() - started, str(e))
+            return None
+        finally:
+            self.health.end(provider, token)
     
     def get_current_price(self) -> Optional[float]:
         """Get current price"""
@@ -301,7 +482,7 @@ class HybridDataClient:
                 return self.client.get_current_price()
             
             # Fallback: get from latest candle
-            df = self.get_latest_candles(self.timeframes[0], 1)
+            df, _ = self.get_latest_candles(self.timeframes[0], 1)
             if not df.empty:
                 return float(df.iloc[-1]['close'])
             
@@ -377,7 +558,19 @@ class HybridDataClient:
             'asset_type': self.asset_type,
             'client_type': self.client_type,
             'providers_tried': self.providers_tried,
+            'provider_health': self.get_provider_health(),
             'connected': connected,
             'has_alpha_vantage': self.alpha_vantage_key is not None,
             'has_twelve_data': self.twelve_data_key is not None,
+            'cache': self.cache.get_stats(),
         }
+    
+    def close(self):
+        """Close provider clients and stop the request pool"""
+        self._executor.shutdown(wait=False)
+        for provider, client in self.clients.items():
+            if client is not None and hasattr(client, 'close'):
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.warning(f"Error closing {provider} client: {e}")
@@ -1,71 +1,93 @@
 """
 Consolidated imports for the scanner system.
 Provides a single location for importing all core modules and utilities.
+
+Names are resolved lazily (PEP 562): ``from src.imports import HybridDataClient``
+only imports the modules behind HybridDataClient, so entry points do not pay
+for data clients, SDKs and reporters their config never uses.
 """
+import importlib
+
+# Exported name -> "module" or "module:attribute" when the name is an alias
+_LAZY_IMPORTS = {
+    # Core utilities
+    'setup_logging': 'src.scanner_utils',
+    'load_json_config': 'src.scanner_utils',
+    'create_signal_handler': 'src.scanner_utils',
+    'register_signal_handlers': 'src.scanner_utils',
+
+    # Configuration
+    'ConfigLoader': 'src.config_loader',
+    'ConfigValidator': 'src.config_validator',
+    'AssetConfigManager': 'src.asset_config_manager',
+
+    # Data sources
+    'UnifiedDataSource': 'src.unified_data_source',
+    'MarketDataClient': 'src.market_data_client',
+    'YFinanceClient': 'src.yfinance_client',
+    'HybridDataClient': 'src.hybrid_data_client',
+
+    # Indicators
+    'IndicatorCalculator': 'src.indicator_calculator',
+
+    # Strategies
+    'FibonacciRetracement': 'src.strategies',
+    'H4HVG': 'src.strategies',
+    'SupportResistance': 'src.strategies',
+    'EMACrossover': 'src.strategies',
+    'MomentumShift': 'src.strategies',
+    'TrendAlignment': 'src.strategies',
+    'MeanReversion': 'src.strategies',
+
+    # Signal detection
+    'SignalDetector': 'src.signal_detector',
+    'Signal': 'src.signal_detector',
+    'SignalQualityFilter': 'src.signal_quality_filter',
+    'QualityConfig': 'src.signal_quality_filter',
+    'StrategyDetector': 'src.strategy_detector',
+
+    # Alerting and reporting
+    'EmailAlerter': 'src.alerter',
+    'TelegramAlerter': 'src.alerter',
+    'MultiAlerter': 'src.alerter',
+    'ExcelReporter': 'src.excel_reporter',
+    'TradeTracker': 'src.trade_tracker',
+
+    # Monitoring and diagnostics
+    'HealthMonitor': 'src.health_monitor',
+    'setup_logging_health': 'src.health_monitor:setup_logging',
+    'SignalDiagnostics': 'src.signal_diagnostics',
+
+    # Scanners
+    'BaseScanner': 'src.base_scanner',
+    'BTCScalpScanner': 'src.scanners',
+    'BTCSwingScanner': 'src.scanners',
+    'GoldScalpScanner': 'src.scanners',
+    'GoldSwingScanner': 'src.scanners',
+    'US30ScalpScanner': 'src.scanners',
+    'US30SwingScanner': 'src.scanners',
+    'US100Scanner': 'src.scanners',
+    'MultiCryptoScanner': 'src.scanners',
+
+    # Orchestration
+    'ScannerOrchestrator': 'src.scanner_orchestrator',
+    'SymbolOrchestrator': 'src.symbol_orchestrator',
+}
+
+
+def __getattr__(name):
+    target = _LAZY_IMPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, _, attribute = target.partition(':')
+    value = getattr(importlib.import_module(module_name), attribute or name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# Core utilities
-from src.scanner_utils import (
-    setup_logging,
-    load_json_config,
-    create_signal_handler,
-    register_signal_handlers
-)
-
-# Configuration
-from src.config_loader import ConfigLoader
-from src.config_validator import ConfigValidator
-from src.asset_config_manager import AssetConfigManager
-
-# Data sources
-from src.unified_data_source import UnifiedDataSource
-from src.market_data_client import MarketDataClient
-from src.yfinance_client import YFinanceClient
-from src.hybrid_data_client import HybridDataClient
-
-# Indicators
-from src.indicator_calculator import IndicatorCalculator
-
-# Strategies
-from src.strategies import (
-    FibonacciRetracement,
-    H4HVG,
-    SupportResistance,
-    EMACrossover,
-    MomentumShift,
-    TrendAlignment,
-    MeanReversion
-)
-
-# Signal detection
-from src.signal_detector import SignalDetector, Signal
-from src.signal_quality_filter import SignalQualityFilter, QualityConfig
-from src.strategy_detector import StrategyDetector
-
-# Alerting and reporting
-from src.alerter import EmailAlerter, TelegramAlerter, MultiAlerter
-from src.excel_reporter import ExcelReporter
-from src.trade_tracker import TradeTracker
-
-# Monitoring and diagnostics
-from src.health_monitor import HealthMonitor, setup_logging as setup_logging_health
-from src.signal_diagnostics import SignalDiagnostics
-
-# Scanners
-from src.base_scanner import BaseScanner
-from src.scanners import (
-    BTCScalpScanner,
-    BTCSwingScanner,
-    GoldScalpScanner,
-    GoldSwingScanner,
-    US30ScalpScanner,
-    US30SwingScanner,
-    US100Scanner,
-    MultiCryptoScanner
-)
-
-# Orchestration
-from src.scanner_orchestrator import ScannerOrchestrator
-from src.symbol_orchestrator import SymbolOrchestrator
 
 __all__ = [
     # Utilities
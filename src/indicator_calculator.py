@@ -4,6 +4,10 @@ import numpy as np
 from typing import Optional, Tuple, List
 import logging
 
+from src import indicator_kernels
+from src import latency_trace
+from src import sr_levels
+
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +57,31 @@ class IndicatorCalculator:
         
         return True, ""
     
+    @staticmethod
+    def _day_ids(timestamps: pd.Series) -> Optional[np.ndarray]:
+        """
+        Calendar day number per row for the VWAP kernel.
+        
+        Args:
+            timestamps: Timestamp column
+            
+        Returns:
+            int64 day numbers, or None when days are missing or out of order
+            (left to the groupby path)
+        """
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps)
+        if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+            # Local calendar day, as .dt.date gives
+            timestamps = timestamps.dt.tz_localize(None)
+        values = timestamps.to_numpy()
+        if np.isnat(values).any():
+            return None
+        day_ids = values.astype('datetime64[D]').astype(np.int64)
+        if len(day_ids) > 1 and (np.diff(day_ids) < 0).any():
+            return None
+        return day_ids
+    
     @staticmethod
     def calculate_ema(data: pd.DataFrame, period: int, column: str = 'close') -> pd.Series:
         """
@@ -84,7 +113,14 @@ class IndicatorCalculator:
             # Don't raise error, but log warning - EMA can still be calculated with fewer rows
         
         try:
-            ema = data[column].ewm(span=period, adjust=False).mean()
+            if indicator_kernels.get_backend() != 'pandas':
+                ema = pd.Series(
+                    indicator_kernels.ewm_mean(data[column], indicator_kernels.ewm_alpha(span=period)),
+                    index=data.index,
+                    name=data[column].name
+                )
+            else:
+                ema = data[column].ewm(span=period, adjust=False).mean()
             
             # Validate output
             if ema.isna().all():
@@ -125,10 +161,18 @@ class IndicatorCalculator:
             raise KeyError(f"Missing required columns for VWAP: {', '.join(missing_cols)}")
         
         try:
-            # Typical price
-            typical_price = (data['high'] + data['low'] + data['close']) / 3
-            
-            if reset_daily and 'timestamp' in data.columns:
+            use_kernel = indicator_kernels.get_backend() != 'pandas'
+            day_ids = None
+            if use_kernel and reset_daily and 'timestamp' in data.columns:
+                day_ids = IndicatorCalculator._day_ids(data['timestamp'])
+                use_kernel = day_ids is not None
+            
+            if use_kernel:
+                result = pd.Series(
+                    indicator_kernels.vwap(data['high'], data['low'], data['close'], data['volume'], day_ids),
+                    index=data.index
+                )
+            elif reset_daily and 'timestamp' in data.columns:
                 # Reset VWAP daily
                 data_copy = data.copy()
                 data_copy['date'] = pd.to_datetime(data_copy['timestamp']).dt.date
@@ -144,6 +188,7 @@ class IndicatorCalculator:
                 result = pd.Series(vwap_values, index=data.index)
             else:
                 # Simple VWAP without daily reset
+                typical_price = (data['high'] + data['low'] + data['close']) / 3
                 cumulative_tp_volume = (typical_price * data['volume']).cumsum()
                 cumulative_volume = data['volume'].cumsum()
                 result = cumulative_tp_volume / cumulative_volume
@@ -190,15 +235,21 @@ class IndicatorCalculator:
             logger.warning(f"ATR({period}): Insufficient data (need {period} rows, got {len(data)})")
         
         try:
-            # Calculate True Range
-            high_low = data['high'] - data['low']
-            high_close = np.abs(data['high'] - data['close'].shift())
-            low_close = np.abs(data['low'] - data['close'].shift())
-            
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            
-            # Wilder's smoothing (similar to EMA with alpha = 1/period)
-            atr = true_range.ewm(alpha=1/period, adjust=False).mean()
+            if indicator_kernels.get_backend() != 'pandas':
+                atr = pd.Series(
+                    indicator_kernels.atr(data['high'], data['low'], data['close'], period),
+                    index=data.index
+                )
+            else:
+                # Calculate True Range
+                high_low = data['high'] - data['low']
+                high_close = np.abs(data['high'] - data['close'].shift())
+                low_close = np.abs(data['low'] - data['close'].shift())
+                
+                true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+                
+                # Wilder's smoothing (similar to EMA with alpha = 1/period)
+                atr = true_range.ewm(alpha=1/period, adjust=False).mean()
             
             # Validate output
             if atr.isna().all():
@@ -241,20 +292,27 @@ class IndicatorCalculator:
             logger.warning(f"RSI({period}): Insufficient data (need {period + 1} rows, got {len(data)})")
         
         try:
-            # Calculate price changes
-            delta = data[column].diff()
-            
-            # Separate gains and losses
-            gains = delta.where(delta > 0, 0)
-            losses = -delta.where(delta < 0, 0)
-            
-            # Wilder's smoothing
-            avg_gains = gains.ewm(alpha=1/period, adjust=False).mean()
-            avg_losses = losses.ewm(alpha=1/period, adjust=False).mean()
-            
-            # Calculate RS and RSI
-            rs = avg_gains / avg_losses
-            rsi = 100 - (100 / (1 + rs))
+            if indicator_kernels.get_backend() != 'pandas':
+                rsi = pd.Series(
+                    indicator_kernels.rsi(data[column], period),
+                    index=data.index,
+                    name=data[column].name
+                )
+            else:
+                # Calculate price changes
+                delta = data[column].diff()
+                
+                # Separate gains and losses
+                gains = delta.where(delta > 0, 0)
+                losses = -delta.where(delta < 0, 0)
+                
+                # Wilder's smoothing
+                avg_gains = gains.ewm(alpha=1/period, adjust=False).mean()
+                avg_losses = losses.ewm(alpha=1/period, adjust=False).mean()
+                
+                # Calculate RS and RSI
+                rs = avg_gains / avg_losses
+                rsi = 100 - (100 / (1 + rs))
             
             # Validate output
             if rsi.isna().all():
@@ -325,6 +383,12 @@ class IndicatorCalculator:
             Tuple of (stoch_k, stoch_d) Series
         """
         try:
+            if indicator_kernels.get_backend() != 'pandas':
+                stoch_k, stoch_d = indicator_kernels.stochastic(
+                    data['high'], data['low'], data['close'], k_period, d_period, smooth_k
+                )
+                return pd.Series(stoch_k, index=data.index), pd.Series(stoch_d, index=data.index)
+            
             # Calculate raw %K
             lowest_low = data['low'].rolling(window=k_period).min()
             highest_high = data['high'].rolling(window=k_period).max()
@@ -394,6 +458,12 @@ class IndicatorCalculator:
             Series with ADX values
         """
         try:
+            if indicator_kernels.get_backend() != 'pandas':
+                return pd.Series(
+                    indicator_kernels.adx(data['high'], data['low'], data['close'], period),
+                    index=data.index
+                )
+            
             # Calculate True Range
             high_low = data['high'] - data['low']
             high_close = np.abs(data['high'] - data['close'].shift())
@@ -443,11 +513,15 @@ class IndicatorCalculator:
         include_macd: bool = False,
         macd_fast: int = 12,
         macd_slow: int = 26,
-        macd_signal: int = 9
+        macd_signal: int = 9,
+        view: bool = False
     ) -> pd.DataFrame:
         """
         Calculate all indicators and append to DataFrame with validation.
         
+        All float columns (source and indicators) are written into one
+        preallocated 2-D block and the output frame is assembled from it once.
+        
         Args:
             data: DataFrame with OHLCV data
             ema_periods: List of EMA periods to calculate
@@ -462,6 +536,8 @@ class IndicatorCalculator:
             macd_fast: MACD fast period
             macd_slow: MACD slow period
             macd_signal: MACD signal period
+            view: Return the warm-up-trimmed rows as a view of the block instead
+                of a compact copy (read-only use; the warm-up rows stay allocated)
             
         Returns:
             DataFrame with all indicator columns added
@@ -505,12 +581,17 @@ class IndicatorCalculator:
         logger.info(f"Calculating indicators on {len(data)} candles with EMA periods: {ema_periods}")
         
         try:
-            result = data.copy()
+            # Parse timestamps and day boundaries once for the whole pipeline
+            day_ids = None
+            if 'timestamp' in data.columns and indicator_kernels.get_backend() != 'pandas':
+                day_ids = IndicatorCalculator._day_ids(data['timestamp'])
+            
+            indicators = {}
             
             # Calculate EMAs
             for period in ema_periods:
                 try:
-                    result[f'ema_{period}'] = IndicatorCalculator.calculate_ema(data, period)
+                    indicators[f'ema_{period}'] = IndicatorCalculator.calculate_ema(data, period)
                     logger.debug(f"Calculated EMA({period})")
                 except Exception as e:
                     logger.error(f"Failed to calculate EMA({period}): {e}")
@@ -518,7 +599,14 @@ class IndicatorCalculator:
             
             # Calculate VWAP
             try:
-                result['vwap'] = IndicatorCalculator.calculate_vwap(data)
+                if day_ids is not None:
+                    indicators['vwap'] = indicator_kernels.vwap(
+                        data['high'], data['low'], data['close'], data['volume'], day_ids
+                    )
+                    if np.isnan(indicators['vwap']).all():
+                        raise ValueError("VWAP calculation produced all NaN values")
+                else:
+                    indicators['vwap'] = IndicatorCalculator.calculate_vwap(data)
                 logger.debug("Calculated VWAP")
             except Exception as e:
                 logger.error(f"Failed to calculate VWAP: {e}")
@@ -526,7 +614,7 @@ class IndicatorCalculator:
             
             # Calculate ATR
             try:
-                result['atr'] = IndicatorCalculator.calculate_atr(data, atr_period)
+                indicators['atr'] = IndicatorCalculator.calculate_atr(data, atr_period)
                 logger.debug(f"Calculated ATR({atr_period})")
             except Exception as e:
                 logger.error(f"Failed to calculate ATR: {e}")
@@ -534,7 +622,7 @@ class IndicatorCalculator:
             
             # Calculate RSI
             try:
-                result['rsi'] = IndicatorCalculator.calculate_rsi(data, rsi_period)
+                indicators['rsi'] = IndicatorCalculator.calculate_rsi(data, rsi_period)
                 logger.debug(f"Calculated RSI({rsi_period})")
             except Exception as e:
                 logger.error(f"Failed to calculate RSI: {e}")
@@ -542,7 +630,7 @@ class IndicatorCalculator:
             
             # Calculate Volume MA
             try:
-                result['volume_ma'] = IndicatorCalculator.calculate_volume_ma(data, volume_ma_period)
+                indicators['volume_ma'] = IndicatorCalculator.calculate_volume_ma(data, volume_ma_period)
                 logger.debug(f"Calculated Volume MA({volume_ma_period})")
             except Exception as e:
                 logger.error(f"Failed to calculate Volume MA: {e}")
@@ -554,8 +642,8 @@ class IndicatorCalculator:
                     stoch_k, stoch_d = IndicatorCalculator.calculate_stochastic(
                         data, stoch_k_period, stoch_d_period, stoch_smooth
                     )
-                    result['stoch_k'] = stoch_k
-                    result['stoch_d'] = stoch_d
+                    indicators['stoch_k'] = stoch_k
+                    indicators['stoch_d'] = stoch_d
                     logger.debug(f"Calculated Stochastic({stoch_k_period},{stoch_d_period},{stoch_smooth})")
                 except Exception as e:
                     logger.warning(f"Failed to calculate Stochastic (optional): {e}")
@@ -566,27 +654,15 @@ class IndicatorCalculator:
                     macd, signal, histogram = IndicatorCalculator.calculate_macd(
                         data, macd_fast, macd_slow, macd_signal
                     )
-                    result['macd'] = macd
-                    result['macd_signal'] = signal
-                    result['macd_histogram'] = histogram
+                    indicators['macd'] = macd
+                    indicators['macd_signal'] = signal
+                    indicators['macd_histogram'] = histogram
                     logger.debug(f"Calculated MACD({macd_fast},{macd_slow},{macd_signal})")
                 except Exception as e:
                     logger.warning(f"Failed to calculate MACD (optional): {e}")
             
-            # Drop rows with NaN values in critical indicators
-            # (first few rows will have NaN due to indicator warmup)
-            critical_indicators = ['ema_9', 'ema_21', 'vwap', 'atr', 'rsi']
-            before_count = len(result)
-            result = result.dropna(subset=critical_indicators)
-            after_count = len(result)
-            
-            if after_count == 0:
-                logger.error("All rows dropped after removing NaN values in critical indicators")
-                raise ValueError("All rows contain NaN values in critical indicators")
-            
-            dropped_count = before_count - after_count
-            if dropped_count > 0:
-                logger.info(f"Dropped {dropped_count} rows with NaN values (indicator warmup period)")
+            result = IndicatorCalculator._assemble_indicator_frame(data, indicators, view)
+            latency_trace.mark('indicators')
             
             logger.info(f"Successfully calculated all indicators, {len(result)} valid rows")
             return result
@@ -595,6 +671,64 @@ class IndicatorCalculator:
             logger.error(f"Error in calculate_all_indicators: {e}", exc_info=True)
             raise
     
+    @staticmethod
+    def _assemble_indicator_frame(data: pd.DataFrame, indicators: dict, view: bool = False) -> pd.DataFrame:
+        """
+        Build the output frame from one float64 block and trim the warm-up rows.
+        
+        Args:
+            data: Source OHLCV DataFrame
+            indicators: Indicator name -> Series/array aligned with data
+            view: Return the trimmed rows as a view of the block
+            
+        Returns:
+            DataFrame with source columns followed by indicator columns
+            
+        Raises:
+            ValueError: If every row has NaN in a critical indicator
+        """
+        # Source columns that already are float64 share the block; others keep their dtype
+        source_columns = [col for col in data.columns if col not in indicators]
+        float_columns = [col for col in source_columns if data[col].dtype == np.float64]
+        block_columns = float_columns + list(indicators)
+        
+        block = np.empty((len(data), len(block_columns)), dtype=np.float64)
+        for j, col in enumerate(float_columns):
+            block[:, j] = data[col].to_numpy()
+        for j, values in enumerate(indicators.values(), start=len(float_columns)):
+            block[:, j] = np.asarray(values, dtype=np.float64)
+        
+        # Drop rows with NaN values in critical indicators
+        # (first few rows will have NaN due to indicator warmup)
+        critical_indicators = ['ema_9', 'ema_21', 'vwap', 'atr', 'rsi']
+        critical = [block_columns.index(col) for col in critical_indicators if col in indicators]
+        valid = ~np.isnan(block[:, critical]).any(axis=1)
+        
+        if not valid.any():
+            logger.error("All rows dropped after removing NaN values in critical indicators")
+            raise ValueError("All rows contain NaN values in critical indicators")
+        
+        first = int(valid.argmax())
+        if valid[first:].all():
+            # Warm-up NaNs form a prefix: a plain slice, no boolean copy
+            rows = slice(first, None)
+            trimmed = block[first:]
+            if not view:
+                trimmed = trimmed.copy()
+        else:
+            rows = valid
+            trimmed = block[valid]
+        
+        dropped_count = len(data) - len(trimmed)
+        if dropped_count > 0:
+            logger.info(f"Dropped {dropped_count} rows with NaN values (indicator warmup period)")
+        
+        result = pd.DataFrame(trimmed, index=data.index[rows], columns=block_columns, copy=False)
+        for loc, col in enumerate(source_columns):
+            if col not in float_columns:
+                result.insert(loc, col, data[col].array[rows])
+        return result
+    
     @staticmethod
     def calculate_fibonacci_levels(
         data: pd.DataFrame,
@@ -672,50 +806,12 @@ class IndicatorCalculator:
             
             recent = data.tail(lookback)
             
-            # Find local highs and lows
-            highs = []
-            lows = []
-            
-            for i in range(1, len(recent) - 1):
-                # Local high
-                if recent.iloc[i]['high'] > recent.iloc[i-1]['high'] and \
-                   recent.iloc[i]['high'] > recent.iloc[i+1]['high']:
-                    highs.append(recent.iloc[i]['high'])
-                
-                # Local low
-                if recent.iloc[i]['low'] < recent.iloc[i-1]['low'] and \
-                   recent.iloc[i]['low'] < recent.iloc[i+1]['low']:
-                    lows.append(recent.iloc[i]['low'])
-            
-            # Group nearby levels using tolerance
-            def group_levels(levels, tolerance_pct):
-                if not levels:
-                    return []
-                
-                levels = sorted(levels)
-                grouped = []
-                current_group = [levels[0]]
-                
-                for level in levels[1:]:
-                    # Check if within tolerance of current group average
-                    group_avg = sum(current_group) / len(current_group)
-                    tolerance = group_avg * (tolerance_pct / 100)
-                    
-                    if abs(level - group_avg) <= tolerance:
-                        current_group.append(level)
-                    else:
-                        # Start new group
-                        grouped.append(sum(current_group) / len(current_group))
-                        current_group = [level]
-                
-                # Add last group
-                if current_group:
-                    grouped.append(sum(current_group) / len(current_group))
-                
-                return grouped
-            
-            support_levels = group_levels(lows, tolerance_percent)
-            resistance_levels = group_levels(highs, tolerance_percent)
+            # Local highs/lows grouped into levels by sorted binning
+            support, resistance = sr_levels.find_levels(
+                recent['high'].to_numpy(dtype=float), recent['low'].to_numpy(dtype=float), tolerance_percent
+            )
+            support_levels = support.price.tolist()
+            resistance_levels = resistance.price.tolist()
             
             logger.debug(f"Identified {len(support_levels)} support and {len(resistance_levels)} resistance levels")
             
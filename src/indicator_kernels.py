@@ -0,0 +1,655 @@
+"""
+Indicator Kernels
+Fused single-pass kernels for recursive and segmented indicators with selectable backends
+"""
+import importlib.util
+import logging
+import math
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# numba is imported (and the kernels compiled) only when the numba backend
+# is first used; importing it costs ~250 ms of startup time
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+
+logger = logging.getLogger(__name__)
+
+
+# 'pandas' keeps the original Series-based implementations in IndicatorCalculator
+BACKENDS = ('pandas', 'numpy', 'numba')
+
+_backend: Optional[str] = None
+
+
+def available_backends() -> List[str]:
+    """Backends that can be selected in this environment."""
+    return [name for name in BACKENDS if name != 'numba' or NUMBA_AVAILABLE]
+
+
+def set_backend(name: str) -> str:
+    """
+    Select the kernel backend used by IndicatorCalculator.
+
+    Args:
+        name: 'auto', 'pandas', 'numpy' or 'numba' ('auto' picks numba when
+            installed, otherwise numpy)
+
+    Returns:
+        Name of the backend now in use
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global _backend
+
+    name = name.lower()
+    if name == 'auto':
+        name = 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend '{name}' (choose from {', '.join(BACKENDS)} or auto)")
+    if name == 'numba' and not NUMBA_AVAILABLE:
+        raise ValueError("Indicator backend 'numba' requires numba. Install with: pip install numba")
+
+    _backend = name
+    logger.debug(f"Indicator kernel backend: {name}")
+    return name
+
+
+def get_backend() -> str:
+    """Backend in use (initialised from INDICATOR_BACKEND, default 'auto')."""
+    if _backend is None:
+        try:
+            return set_backend(os.getenv('INDICATOR_BACKEND', 'auto'))
+        except ValueError as e:
+            logger.warning(f"{e}; falling back to numpy indicator kernels")
+            return set_backend('numpy')
+    return _backend
+
+
+def ewm_alpha(span: Optional[float] = None, alpha: Optional[float] = None) -> float:
+    """
+    Smoothing factor exactly as pandas derives it (via the center of mass).
+
+    ``1 / (1 + com)`` is not always bit-equal to ``2 / (span + 1)`` or the
+    given alpha, so kernels use this to stay identical to ``Series.ewm``.
+
+    Args:
+        span: EMA span
+        alpha: Smoothing factor (e.g. 1/period for Wilder smoothing)
+
+    Returns:
+        Alpha used by pandas
+    """
+    if span is not None:
+        com = (span - 1) / 2
+    else:
+        com = (1 - alpha) / alpha
+    return 1.0 / (1.0 + float(com))
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Scalar building blocks (plain Python, also compiled by Numba)
+# ---------------------------------------------------------------------------
+
+def _ewm_step(weighted, old_wt, cur, alpha):
+    """One step of pandas' ewm(adjust=False, ignore_na=False) recurrence."""
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if cur == cur:
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif cur == cur:
+        weighted = cur
+    return weighted, old_wt
+
+
+def _ewm_loop(values, alpha):
+    """EWM over a sequence of floats (used directly by the numpy backend)."""
+    out = [0.0] * len(values)
+    if not out:
+        return out
+    decay = 1.0 - alpha
+    weighted = values[0]
+    old_wt = 1.0
+    out[0] = weighted
+    # Same recurrence as _ewm_step, inlined to keep the interpreted loop fast
+    for i in range(1, len(values)):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= decay
+            if cur == cur:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+def _true_range_at(high, low, close, i):
+    """max(H-L, |H-prevC|, |L-prevC|) skipping NaN, like DataFrame.max(axis=1)."""
+    tr = high[i] - low[i]
+    if i > 0:
+        prev_close = close[i - 1]
+        for candidate in (abs(high[i] - prev_close), abs(low[i] - prev_close)):
+            if candidate == candidate and (tr != tr or candidate > tr):
+                tr = candidate
+    return tr
+
+
+def _ewm_kernel(values, alpha):
+    out = np.empty(values.shape[0])
+    if values.shape[0] == 0:
+        return out
+    weighted = values[0]
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, values.shape[0]):
+        weighted, old_wt = _ewm_step(weighted, old_wt, values[i], alpha)
+        out[i] = weighted
+    return out
+
+
+def _atr_kernel(high, low, close, alpha):
+    n = high.shape[0]
+    out = np.empty(n)
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        tr = _true_range_at(high, low, close, i)
+        if i == 0:
+            weighted = tr
+        else:
+            weighted, old_wt = _ewm_step(weighted, old_wt, tr, alpha)
+        out[i] = weighted
+    return out
+
+
+def _rsi_kernel(values, alpha):
+    n = values.shape[0]
+    out = np.empty(n)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    gain_wt = 1.0
+    loss_wt = 1.0
+    for i in range(n):
+        delta = values[i] - values[i - 1] if i > 0 else np.nan
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        if i == 0:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain, gain_wt = _ewm_step(avg_gain, gain_wt, gain, alpha)
+            avg_loss, loss_wt = _ewm_step(avg_loss, loss_wt, loss, alpha)
+        rs = avg_gain / avg_loss
+        out[i] = 100 - (100 / (1 + rs))
+    return out
+
+
+def _adx_kernel(high, low, close, alpha):
+    n = high.shape[0]
+    out = np.empty(n)
+    atr = plus_sm = minus_sm = adx = np.nan
+    atr_wt = plus_wt = minus_wt = adx_wt = 1.0
+    for i in range(n):
+        tr = _true_range_at(high, low, close, i)
+        if i > 0:
+            high_diff = high[i] - high[i - 1]
+            low_diff = low[i - 1] - low[i]
+        else:
+            high_diff = low_diff = np.nan
+        plus_dm = high_diff if high_diff > low_diff else 0.0
+        if plus_dm < 0:
+            plus_dm = 0.0
+        minus_dm = low_diff if low_diff > high_diff else 0.0
+        if minus_dm < 0:
+            minus_dm = 0.0
+
+        if i == 0:
+            atr = tr
+            plus_sm = plus_dm
+            minus_sm = minus_dm
+        else:
+            atr, atr_wt = _ewm_step(atr, atr_wt, tr, alpha)
+            plus_sm, plus_wt = _ewm_step(plus_sm, plus_wt, plus_dm, alpha)
+            minus_sm, minus_wt = _ewm_step(minus_sm, minus_wt, minus_dm, alpha)
+
+        plus_di = 100 * (plus_sm / atr)
+        minus_di = 100 * (minus_sm / atr)
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+
+        if i == 0:
+            adx = dx
+        else:
+            adx, adx_wt = _ewm_step(adx, adx_wt, dx, alpha)
+        out[i] = adx
+    return out
+
+
+def _rolling_mean_kernel(values, window):
+    """pandas' fixed-window rolling mean (Kahan remove/add, min_periods=window)."""
+    n = len(values)
+    out = np.empty(n)
+    if window == 1:
+        # pandas restarts every window, which reduces to the value itself
+        for i in range(n):
+            out[i] = values[i]
+        return out
+
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_count = 0
+    prev_value = values[0] if n > 0 else np.nan
+    for i in range(n):
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                nobs -= 1
+                y = -old - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if math.copysign(1.0, old) < 0:
+                    neg_ct -= 1
+
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if math.copysign(1.0, val) < 0:
+                neg_ct += 1
+            if val == prev_value:
+                same_count += 1
+            else:
+                same_count = 1
+            prev_value = val
+
+        if nobs >= window:
+            result = sum_x / nobs
+            if same_count >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+    return out
+
+
+def _rolling_extreme_kernel(values, window, take_max):
+    n = values.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        if i < window - 1:
+            out[i] = np.nan
+            continue
+        best = values[i]
+        for j in range(i - window + 1, i):
+            val = values[j]
+            if val != val:
+                best = val
+                break
+            if take_max:
+                if val > best:
+                    best = val
+            elif val < best:
+                best = val
+        out[i] = best
+    return out
+
+
+def _stochastic_kernel(high, low, close, k_period, d_period, smooth_k):
+    lowest = _rolling_extreme_kernel(low, k_period, False)
+    highest = _rolling_extreme_kernel(high, k_period, True)
+    raw_k = np.empty(close.shape[0])
+    for i in range(close.shape[0]):
+        value = 100 * (close[i] - lowest[i]) / (highest[i] - lowest[i])
+        # Rolling windows treat +/-inf as missing
+        raw_k[i] = value if abs(value) != np.inf else np.nan
+    stoch_k = _rolling_mean_kernel(raw_k, smooth_k)
+    stoch_d = _rolling_mean_kernel(stoch_k, d_period)
+    return stoch_k, stoch_d
+
+
+def _vwap_kernel(high, low, close, volume, day_ids):
+    n = high.shape[0]
+    out = np.empty(n)
+    cum_tpv = 0.0
+    cum_vol = 0.0
+    for i in range(n):
+        if i > 0 and day_ids[i] != day_ids[i - 1]:
+            cum_tpv = 0.0
+            cum_vol = 0.0
+        tp_volume = (high[i] + low[i] + close[i]) / 3 * volume[i]
+        # cumsum skips NaN but leaves NaN at that position
+        if tp_volume == tp_volume:
+            cum_tpv += tp_volume
+        if volume[i] == volume[i]:
+            cum_vol += volume[i]
+        tpv_out = cum_tpv if tp_volume == tp_volume else np.nan
+        vol_out = cum_vol if volume[i] == volume[i] else np.nan
+        out[i] = tpv_out / vol_out
+    return out
+
+
+_rolling_mean_py = _rolling_mean_kernel
+
+_numba_lock = threading.Lock()
+_numba_ready = False
+
+
+def _load_numba_kernels() -> None:
+    """Import numba and wrap the scalar kernels (once, on first use)."""
+    global _numba_ready, _ewm_step, _true_range_at, _rolling_mean_kernel, _rolling_extreme_kernel
+    global _ewm_kernel_nb, _atr_kernel_nb, _rsi_kernel_nb, _adx_kernel_nb
+    global _stochastic_kernel_nb, _vwap_kernel_nb
+
+    with _numba_lock:
+        if _numba_ready:
+            return
+        import numba
+
+        _jit = numba.njit(cache=True, error_model='numpy')
+        _ewm_step = _jit(_ewm_step)
+        _true_range_at = _jit(_true_range_at)
+        _ewm_kernel_nb = _jit(_ewm_kernel)
+        _atr_kernel_nb = _jit(_atr_kernel)
+        _rsi_kernel_nb = _jit(_rsi_kernel)
+        _adx_kernel_nb = _jit(_adx_kernel)
+        _rolling_mean_kernel = _jit(_rolling_mean_kernel)
+        _rolling_extreme_kernel = _jit(_rolling_extreme_kernel)
+        _stochastic_kernel_nb = _jit(_stochastic_kernel)
+        _vwap_kernel_nb = _jit(_vwap_kernel)
+        _numba_ready = True
+
+
+def _use_numba() -> bool:
+    if get_backend() != 'numba':
+        return False
+    if not _numba_ready:
+        _load_numba_kernels()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# NumPy backend helpers: vectorized element-wise parts, scalar EWM loop
+# ---------------------------------------------------------------------------
+
+def _ewm_numpy(values: np.ndarray, alpha: float) -> np.ndarray:
+    return np.array(_ewm_loop(values.tolist(), alpha), dtype=np.float64)
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    shifted = np.empty_like(values)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _true_range_numpy(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = _shift(close)
+    tr = high - low
+    for candidate in (np.abs(high - prev_close), np.abs(low - prev_close)):
+        # NaN-skipping max, keeping the first operand on ties like DataFrame.max
+        take = (candidate == candidate) & ((tr != tr) | (candidate > tr))
+        tr = np.where(take, candidate, tr)
+    return tr
+
+
+def _rolling_mean_numpy(values: np.ndarray, window: int) -> np.ndarray:
+    # The Kahan-compensated running sum is inherently sequential
+    return _rolling_mean_py(values.tolist(), window)
+
+
+def _rolling_extreme_numpy(values: np.ndarray, window: int, take_max: bool) -> np.ndarray:
+    out = np.full_like(values, np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[window - 1:] = windows.max(axis=-1) if take_max else windows.min(axis=-1)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Public kernels
+# ---------------------------------------------------------------------------
+
+def ewm_mean(values, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean identical to ``Series.ewm(adjust=False).mean()``.
+
+    Args:
+        values: 1-D values
+        alpha: Smoothing factor as returned by ewm_alpha
+
+    Returns:
+        EWM array
+    """
+    values = _as_float_array(values)
+    if _use_numba():
+        return _ewm_kernel_nb(values, alpha)
+    return _ewm_numpy(values, alpha)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    True range, max(H-L, |H-prevC|, |L-prevC|) skipping NaN.
+
+    Args:
+        high, low, close: 1-D price arrays
+
+    Returns:
+        True range array
+    """
+    return _true_range_numpy(_as_float_array(high), _as_float_array(low), _as_float_array(close))
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Wilder ATR in one pass over the true range.
+
+    Args:
+        high, low, close: 1-D price arrays
+        period: ATR period
+
+    Returns:
+        ATR array
+    """
+    high, low, close = _as_float_array(high), _as_float_array(low), _as_float_array(close)
+    alpha = ewm_alpha(alpha=1 / period)
+    if _use_numba():
+        return _atr_kernel_nb(high, low, close, alpha)
+    return _ewm_numpy(_true_range_numpy(high, low, close), alpha)
+
+
+def rsi(values, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI with gains and losses smoothed in the same pass.
+
+    Args:
+        values: 1-D price array
+        period: RSI period
+
+    Returns:
+        RSI array (0-100)
+    """
+    values = _as_float_array(values)
+    alpha = ewm_alpha(alpha=1 / period)
+    if _use_numba():
+        return _rsi_kernel_nb(values, alpha)
+
+    delta = values - _shift(values)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = -np.where(delta < 0, delta, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = _ewm_numpy(gains, alpha) / _ewm_numpy(losses, alpha)
+        return 100 - (100 / (1 + rs))
+
+
+def adx(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    ADX with true range, directional movement and all four Wilder
+    smoothings fused into one pass.
+
+    Args:
+        high, low, close: 1-D price arrays
+        period: ADX period
+
+    Returns:
+        ADX array
+    """
+    high, low, close = _as_float_array(high), _as_float_array(low), _as_float_array(close)
+    alpha = ewm_alpha(alpha=1 / period)
+    if _use_numba():
+        return _adx_kernel_nb(high, low, close, alpha)
+
+    high_diff = high - _shift(high)
+    low_diff = _shift(low) - low
+    plus_dm = np.where(high_diff > low_diff, high_diff, 0.0)
+    plus_dm[plus_dm < 0] = 0.0
+    minus_dm = np.where(low_diff > high_diff, low_diff, 0.0)
+    minus_dm[minus_dm < 0] = 0.0
+
+    smoothed_tr = _ewm_numpy(_true_range_numpy(high, low, close), alpha)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = 100 * (_ewm_numpy(plus_dm, alpha) / smoothed_tr)
+        minus_di = 100 * (_ewm_numpy(minus_dm, alpha) / smoothed_tr)
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return _ewm_numpy(dx, alpha)
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3,
+               smooth_k: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic %K and %D.
+
+    Args:
+        high, low, close: 1-D price arrays
+        k_period: Period for %K calculation
+        d_period: Period for %D (signal line) calculation
+        smooth_k: Smoothing period for %K
+
+    Returns:
+        Tuple of (stoch_k, stoch_d) arrays
+    """
+    high, low, close = _as_float_array(high), _as_float_array(low), _as_float_array(close)
+    if _use_numba():
+        return _stochastic_kernel_nb(high, low, close, k_period, d_period, smooth_k)
+
+    lowest = _rolling_extreme_numpy(low, k_period, take_max=False)
+    highest = _rolling_extreme_numpy(high, k_period, take_max=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw_k = 100 * (close - lowest) / (highest - lowest)
+    raw_k[np.isinf(raw_k)] = np.nan
+    stoch_k = _rolling_mean_numpy(raw_k, smooth_k)
+    return stoch_k, _rolling_mean_numpy(stoch_k, d_period)
+
+
+def vwap(high, low, close, volume, day_ids: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    VWAP restarting whenever ``day_ids`` changes (no reset when None).
+
+    Args:
+        high, low, close, volume: 1-D arrays
+        day_ids: Integer session/day number per row, in ascending order
+
+    Returns:
+        VWAP array
+    """
+    high, low, close, volume = (_as_float_array(high), _as_float_array(low),
+                                _as_float_array(close), _as_float_array(volume))
+    if day_ids is None:
+        day_ids = np.zeros(len(high), dtype=np.int64)
+    day_ids = np.ascontiguousarray(day_ids, dtype=np.int64)
+
+    if _use_numba():
+        return _vwap_kernel_nb(high, low, close, volume, day_ids)
+
+    tp_volume = (high + low + close) / 3 * volume
+    boundaries = np.flatnonzero(np.diff(day_ids)) + 1
+    out = np.empty_like(high)
+    for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(high)]):
+        # nancumsum continues past NaN like Series.cumsum; NaN positions stay NaN
+        cum_tpv = np.nancumsum(tp_volume[start:end])
+        cum_vol = np.nancumsum(volume[start:end])
+        cum_tpv[np.isnan(tp_volume[start:end])] = np.nan
+        cum_vol[np.isnan(volume[start:end])] = np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[start:end] = cum_tpv / cum_vol
+    return out
+
+
+def benchmark(bars: int = 500, repeat: int = 50) -> dict:
+    """
+    Time every available backend against the pandas implementations.
+
+    Args:
+        bars: Number of candles
+        repeat: Calls per indicator
+
+    Returns:
+        Dictionary of backend -> indicator -> milliseconds per call
+    """
+    import time
+    import pandas as pd
+    from src.indicator_calculator import IndicatorCalculator
+
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, bars))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=bars, freq='5min'),
+        'high': close + rng.uniform(0, 1, bars),
+        'low': close - rng.uniform(0, 1, bars),
+        'close': close,
+        'volume': rng.uniform(1, 100, bars),
+    })
+    indicators = {
+        'atr': lambda: IndicatorCalculator.calculate_atr(df, 14),
+        'rsi': lambda: IndicatorCalculator.calculate_rsi(df, 14),
+        'adx': lambda: IndicatorCalculator.calculate_adx(df, 14),
+        'stochastic': lambda: IndicatorCalculator.calculate_stochastic(df, 14, 3, 3),
+        'vwap': lambda: IndicatorCalculator.calculate_vwap(df),
+    }
+
+    previous = get_backend()
+    results = {}
+    try:
+        for backend in available_backends():
+            set_backend(backend)
+            timings = {}
+            for name, func in indicators.items():
+                func()  # Warm up (JIT compilation)
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    func()
+                timings[name] = (time.perf_counter() - start) / repeat * 1000
+            results[backend] = timings
+    finally:
+        set_backend(previous)
+    return results
+
+
+if __name__ == "__main__":
+    # Import through the package so the backend switch reaches IndicatorCalculator
+    from src.indicator_kernels import benchmark
+
+    for backend, timings in benchmark().items():
+        print(f"{backend:>6}: " + "  ".join(f"{name} {ms:.3f}ms" for name, ms in timings.items()))
@@ -0,0 +1,243 @@
+"""
+Indicator Planner
+Computes exactly the indicator columns the enabled strategies declare, sharing intermediates
+"""
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src import indicator_kernels
+from src import latency_trace
+from src.indicator_calculator import IndicatorCalculator
+
+logger = logging.getLogger(__name__)
+
+
+SOURCE_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# What calculate_all_indicators produces with its defaults
+DEFAULT_COLUMNS = ('ema_9', 'ema_21', 'ema_50', 'ema_100', 'ema_200', 'vwap', 'atr', 'rsi', 'volume_ma')
+
+# A node computes one array from the arrays of its dependencies
+_Compute = Callable[[Dict[str, np.ndarray], pd.DataFrame], np.ndarray]
+
+
+class IndicatorPlan:
+    """
+    An ordered list of indicator computations for a fixed set of columns.
+
+    Built once per scanner by IndicatorPlanner.plan(); compute() runs it on
+    each candle frame.
+    """
+
+    def __init__(self, outputs: Tuple[str, ...], steps: List[Tuple[str, Tuple[str, ...], _Compute]],
+                 max_period: int):
+        self.outputs = outputs
+        self.steps = steps
+        self.max_period = max_period
+
+    @property
+    def step_names(self) -> List[str]:
+        """Computed nodes in order, intermediates included."""
+        return [name for name, _, _ in self.steps]
+
+    def compute(self, data: pd.DataFrame, view: bool = False) -> pd.DataFrame:
+        """
+        Compute the planned columns and trim the indicator warm-up rows.
+
+        Args:
+            data: DataFrame with OHLCV data
+            view: Return the trimmed rows as a view (read-only use)
+
+        Returns:
+            DataFrame with source columns followed by the planned columns
+
+        Raises:
+            ValueError: If data is empty or misses a source column
+        """
+        if data.empty:
+            raise ValueError("Cannot calculate indicators on empty DataFrame")
+        missing = [col for col in SOURCE_COLUMNS if col not in data.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        if len(data) < self.max_period:
+            logger.warning(f"Indicator plan: {len(data)} rows for a longest period of {self.max_period}")
+
+        values: Dict[str, np.ndarray] = {}
+        for name, _, compute in self.steps:
+            values[name] = compute(values, data)
+
+        indicators = {name: values[name] for name in self.outputs}
+        frame = IndicatorCalculator._assemble_indicator_frame(data, indicators, view)
+        latency_trace.mark('indicators')
+        return frame
+
+
+class IndicatorPlanner:
+    """
+    Resolves indicator columns to a dependency-ordered computation plan.
+
+    Columns: ``ema_<n>``, ``atr``/``atr_<n>``, ``rsi``/``rsi_<n>``,
+    ``adx``/``adx_<n>``, ``volume_ma``/``volume_ma_<n>``, ``vwap``,
+    ``stoch_k``, ``stoch_d``, ``macd``, ``macd_signal`` and
+    ``macd_histogram``. Unsuffixed names use the planner's default periods.
+    Shared intermediates (true range, price gains and losses, directional
+    movement, Wilder-smoothed true range) are computed once per plan: ADX
+    reuses the ATR of the same period and every RSI period reuses one set
+    of gains and losses.
+    """
+
+    def __init__(self, atr_period: int = 14, rsi_period: int = 14, adx_period: int = 14,
+                 volume_ma_period: int = 20, stoch_k_period: int = 14, stoch_d_period: int = 3,
+                 stoch_smooth: int = 3, macd_fast: int = 12, macd_slow: int = 26, macd_signal: int = 9):
+        """
+        Initialize planner.
+
+        Args:
+            atr_period: Period of the ``atr`` column
+            rsi_period: Period of the ``rsi`` column
+            adx_period: Period of the ``adx`` column
+            volume_ma_period: Period of the ``volume_ma`` column
+            stoch_k_period, stoch_d_period, stoch_smooth: Stochastic settings
+            macd_fast, macd_slow, macd_signal: MACD settings
+        """
+        self.defaults = {'atr': atr_period, 'rsi': rsi_period, 'adx': adx_period, 'volume_ma': volume_ma_period}
+        self.stochastic = (stoch_k_period, stoch_d_period, stoch_smooth)
+        self.macd = (macd_fast, macd_slow, macd_signal)
+
+    def plan(self, columns: Iterable[str]) -> IndicatorPlan:
+        """
+        Plan the computation of ``columns``.
+
+        Args:
+            columns: Indicator columns to produce (source columns are ignored)
+
+        Returns:
+            IndicatorPlan
+
+        Raises:
+            ValueError: If a column is not an indicator the planner knows
+        """
+        outputs = tuple(dict.fromkeys(c for c in columns if c not in SOURCE_COLUMNS))
+        unknown = [c for c in outputs if self._node(c) is None]
+        if unknown:
+            raise ValueError(f"No indicator produces column(s): {', '.join(unknown)}")
+
+        steps: List[Tuple[str, Tuple[str, ...], _Compute]] = []
+        done = set(SOURCE_COLUMNS)
+        periods = [1]
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            deps, compute, period = self._node(name)
+            for dep in deps:
+                visit(dep)
+            done.add(name)
+            periods.append(period)
+            steps.append((name, deps, compute))
+
+        for column in outputs:
+            visit(column)
+
+        plan = IndicatorPlan(outputs, steps, max(periods))
+        logger.debug(f"Indicator plan for {list(outputs)}: {plan.step_names}")
+        return plan
+
+    def _node(self, name: str) -> Optional[Tuple[Tuple[str, ...], _Compute, int]]:
+        """(dependencies, compute, period) of a node, or None if unknown."""
+        if name in self.defaults:
+            alias = f"{name}_{self.defaults[name]}"
+            return (alias,), lambda v, d: v[alias], 1
+
+        match = re.fullmatch(r'(ema|atr|rsi|adx|volume_ma)_(\d+)', name)
+        if match:
+            kind, period = match.group(1), int(match.group(2))
+            if period < 1:
+                return None
+            alpha = indicator_kernels.ewm_alpha(alpha=1 / period)
+            if kind == 'ema':
+                return ('close',), lambda v, d: IndicatorCalculator.calculate_ema(d, period).to_numpy(), period
+            if kind == 'atr':
+                return ('true_range',), lambda v, d: indicator_kernels.ewm_mean(v['true_range'], alpha), period
+            if kind == 'rsi':
+                return ('price_moves',), lambda v, d: _rsi(v['price_moves'], alpha), period + 1
+            if kind == 'adx':
+                atr_node = f'atr_{period}'
+                return (atr_node, 'directional_movement'), \
+                    lambda v, d: _adx(v[atr_node], v['directional_movement'], alpha), period * 2
+            return ('volume',), lambda v, d: d['volume'].rolling(window=period).mean().to_numpy(), period
+
+        if name == 'true_range':
+            return ('high', 'low', 'close'), \
+                lambda v, d: indicator_kernels.true_range(d['high'], d['low'], d['close']), 1
+        if name == 'price_moves':
+            return ('close',), lambda v, d: _price_moves(d['close'].to_numpy(dtype=np.float64)), 1
+        if name == 'directional_movement':
+            return ('high', 'low'), lambda v, d: _directional_movement(d), 1
+        if name == 'vwap':
+            return ('high', 'low', 'close', 'volume'), \
+                lambda v, d: IndicatorCalculator.calculate_vwap(d).to_numpy(), 1
+        if name in ('stoch_k', 'stoch_d'):
+            return ('stochastic',), lambda v, d: v['stochastic'][int(name == 'stoch_d')], 1
+        if name == 'stochastic':
+            k_period, d_period, smooth = self.stochastic
+            return ('high', 'low', 'close'), lambda v, d: np.vstack(indicator_kernels.stochastic(
+                d['high'], d['low'], d['close'], k_period, d_period, smooth)), k_period + d_period + smooth
+        if name in ('macd', 'macd_signal', 'macd_histogram'):
+            fast, slow, signal = self.macd
+            if name == 'macd':
+                return (f'ema_{fast}', f'ema_{slow}'), lambda v, d: v[f'ema_{fast}'] - v[f'ema_{slow}'], slow
+            if name == 'macd_signal':
+                signal_alpha = indicator_kernels.ewm_alpha(span=signal)
+                return ('macd',), lambda v, d: indicator_kernels.ewm_mean(v['macd'], signal_alpha), slow + signal
+            return ('macd', 'macd_signal'), lambda v, d: v['macd'] - v['macd_signal'], slow + signal
+        return None
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    diff = np.empty_like(values)
+    diff[:1] = np.nan
+    diff[1:] = values[1:] - values[:-1]
+    return diff
+
+
+def _price_moves(close: np.ndarray) -> np.ndarray:
+    """Gains and losses of the close, stacked as rows."""
+    delta = _diff(close)
+    return np.vstack((np.where(delta > 0, delta, 0.0), -np.where(delta < 0, delta, 0.0)))
+
+
+def _rsi(moves: np.ndarray, alpha: float) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = indicator_kernels.ewm_mean(moves[0], alpha) / indicator_kernels.ewm_mean(moves[1], alpha)
+        return 100 - (100 / (1 + rs))
+
+
+def _directional_movement(data: pd.DataFrame) -> np.ndarray:
+    """+DM and -DM, stacked as rows."""
+    high = data['high'].to_numpy(dtype=np.float64)
+    low = data['low'].to_numpy(dtype=np.float64)
+    high_diff = _diff(high)
+    low_diff = -_diff(low)
+    plus_dm = np.where(high_diff > low_diff, high_diff, 0.0)
+    plus_dm[plus_dm < 0] = 0.0
+    minus_dm = np.where(low_diff > high_diff, low_diff, 0.0)
+    minus_dm[minus_dm < 0] = 0.0
+    return np.vstack((plus_dm, minus_dm))
+
+
+def _adx(smoothed_tr: np.ndarray, movement: np.ndarray, alpha: float) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = 100 * (indicator_kernels.ewm_mean(movement[0], alpha) / smoothed_tr)
+        minus_di = 100 * (indicator_kernels.ewm_mean(movement[1], alpha) / smoothed_tr)
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return indicator_kernels.ewm_mean(dx, alpha)
+
+
+def required_columns(*sources: Iterable[str]) -> List[str]:
+    """Union of several column declarations, in first-seen order."""
+    return list(dict.fromkeys(column for source in sources for column in source))
@@ -0,0 +1,307 @@
+"""
+Signal Latency Tracing
+Per-signal hop timestamps from candle close to alert delivery, summarized per symbol and timeframe
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src import virtual_clock
+from src.timeframe_resampler import timeframe_to_timedelta
+
+logger = logging.getLogger(__name__)
+
+
+class SignalTrace:
+    """
+    Timeline of one candle update through the pipeline.
+
+    Hops are (name, time.monotonic()) pairs appended as the update passes
+    each stage. ``source_time`` is the epoch time the data became final at
+    the exchange (the bar close, or the exchange event time of an update to
+    a forming bar); the gap between it and ``received_at`` is the provider
+    publish lag, which the monotonic hops cannot measure.
+    """
+
+    def __init__(self, symbol: str, timeframe: str):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.started = time.monotonic()
+        self.source_time: Optional[float] = None
+        self.received_at: Optional[float] = None
+        self.received_mono: Optional[float] = None
+        self.hops: List[Tuple[str, float]] = []
+        self.completed = False
+
+    def mark(self, hop: str) -> None:
+        """Record that the update has passed ``hop``."""
+        self.hops.append((hop, time.monotonic()))
+
+    def received(self, hop: str, source_time: Optional[float]) -> None:
+        """Record data arrival and the exchange time it was final at."""
+        self.source_time = source_time
+        self.received_at = virtual_clock.time()
+        self.mark(hop)
+        self.received_mono = self.hops[-1][1]
+
+    @property
+    def publish_lag(self) -> Optional[float]:
+        """Seconds from the exchange source time to arrival here."""
+        if self.source_time is None or self.received_at is None:
+            return None
+        return max(0.0, self.received_at - self.source_time)
+
+    @property
+    def processing_seconds(self) -> float:
+        """Seconds from the start of the trace to the last hop."""
+        return self.hops[-1][1] - self.started if self.hops else 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        """Source time to the last hop: publish lag plus the time since arrival."""
+        if self.publish_lag is None:
+            return self.processing_seconds
+        return self.publish_lag + self.hops[-1][1] - self.received_mono
+
+    def durations(self) -> Dict[str, float]:
+        """Seconds spent reaching each hop from the previous one."""
+        result = {}
+        previous = self.started
+        for hop, t in self.hops:
+            result[hop] = result.get(hop, 0.0) + t - previous
+            previous = t
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'total_ms': round(self.total_seconds * 1000, 1),
+            'publish_lag_ms': round(self.publish_lag * 1000, 1) if self.publish_lag is not None else None,
+            'hops_ms': {hop: round(s * 1000, 2) for hop, s in self.durations().items()}
+        }
+
+
+_current: ContextVar[Optional[SignalTrace]] = ContextVar('signal_trace', default=None)
+
+
+@contextmanager
+def tracing(symbol: str, timeframe: str, trace: Optional[SignalTrace] = None) -> Iterator[SignalTrace]:
+    """
+    Trace one candle update on the current thread.
+
+    Signals created inside the block carry the trace, and hops marked
+    without a signal go to it.
+
+    Args:
+        symbol: Symbol of the update
+        timeframe: Timeframe of the update
+        trace: Trace to resume, e.g. one opened on a fetch worker thread
+            (a new trace is started when None)
+    """
+    if trace is None:
+        trace = SignalTrace(symbol, timeframe)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def current_trace() -> Optional[SignalTrace]:
+    """The trace of the update being processed on this thread, if any."""
+    return _current.get()
+
+
+def mark(hop: str, signal: Any = None) -> None:
+    """
+    Record a hop on a signal's trace, or on the current trace.
+
+    Args:
+        hop: Stage name
+        signal: Signal whose trace to mark (default: the current trace)
+    """
+    trace = getattr(signal, 'trace', None) if signal is not None else _current.get()
+    if trace is not None:
+        trace.mark(hop)
+
+
+def mark_received(hop: str, candles: pd.DataFrame, timeframe: str) -> None:
+    """
+    Record arrival of polled candles on the current trace.
+
+    The source time is the close of the newest bar that has closed. A
+    forming bar is skipped, and so is its start: after a gap in the data
+    it is not the close of any bar that was received.
+    """
+    trace = _current.get()
+    if trace is None:
+        return
+    trace.received(hop, last_closed_bar_time(candles, timeframe))
+
+
+def last_closed_bar_time(candles: pd.DataFrame, timeframe: str) -> Optional[float]:
+    """
+    Epoch close time of the newest closed bar in ``candles``.
+
+    Args:
+        candles: Bars with a 'timestamp' (open time) column, oldest first
+        timeframe: Bar timeframe
+
+    Returns:
+        Close time in epoch seconds, or None if no bar has closed yet
+    """
+    if candles is None or candles.empty or 'timestamp' not in candles:
+        return None
+    try:
+        period = timeframe_to_timedelta(timeframe).total_seconds()
+        now = virtual_clock.time()
+        # Only the last row can still be forming
+        for ts in candles['timestamp'].iloc[-2:][::-1]:
+            close = pd.Timestamp(ts).timestamp() + period
+            if close <= now:
+                return close
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+def complete(signal: Any, hop: str = 'alert') -> None:
+    """
+    Record delivery of a signal and hand its trace to the latency tracker.
+
+    Only the first delivery counts when several channels send the same signal.
+    """
+    trace = getattr(signal, 'trace', None)
+    if trace is None or trace.completed:
+        return
+    trace.completed = True
+    trace.mark(hop)
+    get_latency_tracker().record(trace)
+
+
+class LatencyTracker:
+    """
+    Latency percentiles of delivered signals per symbol and timeframe.
+
+    The slowest signals of each clock hour are kept in a small heap; when
+    the hour rolls over they are logged as a warning and added to
+    ``flagged``.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, window: int = 500, slowest_per_hour: int = 5):
+        """
+        Initialize tracker.
+
+        Args:
+            window: Traces kept per symbol and timeframe
+            slowest_per_hour: Signals flagged per hour
+        """
+        self.window = window
+        self.slowest_per_hour = slowest_per_hour
+        self.flagged: Deque[Dict[str, Any]] = deque(maxlen=24 * slowest_per_hour)
+        self._traces: Dict[Tuple[str, str], Deque[SignalTrace]] = {}
+        self._hour: Optional[int] = None
+        self._slowest: List[Tuple[float, int, SignalTrace]] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def record(self, trace: SignalTrace) -> None:
+        """Add a delivered signal's trace."""
+        with self._lock:
+            self._roll_hour()
+            key = (trace.symbol, trace.timeframe)
+            traces = self._traces.get(key)
+            if traces is None:
+                traces = self._traces[key] = deque(maxlen=self.window)
+            traces.append(trace)
+
+            self._seq += 1
+            entry = (trace.total_seconds, self._seq, trace)
+            if len(self._slowest) < self.slowest_per_hour:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def _roll_hour(self) -> None:
+        """Flag the previous hour's slowest signals once its hour has passed (lock held)."""
+        hour = int(virtual_clock.time() // 3600)
+        if self._hour is not None and hour != self._hour and self._slowest:
+            slowest = [trace for _, _, trace in sorted(self._slowest, reverse=True)]
+            label = time.strftime('%Y-%m-%d %H:00', time.gmtime(self._hour * 3600))
+            logger.warning(f"Slowest signals {label} UTC: " + "; ".join(
+                f"{t.symbol} {t.timeframe} {t.total_seconds * 1000:.0f}ms" for t in slowest))
+            for trace in slowest:
+                self.flagged.append(dict(trace.to_dict(), hour=label))
+            self._slowest = []
+        self._hour = hour
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latency percentiles per symbol and timeframe.
+
+        Returns:
+            "SYMBOL TIMEFRAME" -> count, total/publish-lag percentiles and median ms per hop
+        """
+        with self._lock:
+            self._roll_hour()
+            groups = {key: list(traces) for key, traces in self._traces.items()}
+
+        result = {}
+        for (symbol, timeframe), traces in sorted(groups.items()):
+            totals = np.array([t.total_seconds for t in traces]) * 1000
+            stats = {'count': len(traces)}
+            for p, value in zip(self.PERCENTILES, np.percentile(totals, self.PERCENTILES)):
+                stats[f'p{p}_ms'] = round(float(value), 1)
+            stats['max_ms'] = round(float(totals.max()), 1)
+
+            lags = [t.publish_lag for t in traces if t.publish_lag is not None]
+            stats['publish_lag_p50_ms'] = round(float(np.median(lags)) * 1000, 1) if lags else None
+
+            hops: Dict[str, List[float]] = {}
+            for trace in traces:
+                for hop, seconds in trace.durations().items():
+                    hops.setdefault(hop, []).append(seconds)
+            stats['hop_p50_ms'] = {hop: round(float(np.median(v)) * 1000, 2) for hop, v in hops.items()}
+            result[f"{symbol} {timeframe}"] = stats
+        return result
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        """The slowest signals of the current hour so far, slowest first."""
+        with self._lock:
+            return [trace.to_dict() for _, _, trace in sorted(self._slowest, reverse=True)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self._slowest = []
+            self.flagged.clear()
+            self._hour = None
+
+
+_tracker: Optional[LatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """
+    Get the process-wide latency tracker.
+
+    Returns:
+        Shared LatencyTracker
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker()
+        return _tracker
@@ -0,0 +1,272 @@
+"""
+Lazy Imports
+Deferred loading of heavy optional SDKs and import-time profiling for startup budgets
+"""
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds spent importing each module loaded through a LazyModule
+_load_times: Dict[str, float] = {}
+_load_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module proxy that imports the real module on first attribute access.
+
+    ``yf = lazy_module('yfinance')`` costs nothing at import time; the first
+    ``yf.Ticker`` imports yfinance and every later access goes straight to
+    the loaded module.
+    """
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__['_lazy_install_hint'] = install_hint
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+
+        with _load_lock:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                started = time.perf_counter()
+                try:
+                    module = importlib.import_module(self.__name__)
+                except ImportError as e:
+                    hint = self.__dict__['_lazy_install_hint']
+                    if hint:
+                        raise ImportError(f"{self.__name__} is required. Install with: {hint}") from e
+                    raise
+                elapsed = time.perf_counter() - started
+                _load_times[self.__name__] = elapsed
+                self.__dict__['_lazy_module'] = module
+                logger.debug(f"Lazy import of {self.__name__} took {elapsed * 1000:.0f}ms")
+        return module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str, install_hint: Optional[str] = None) -> types.ModuleType:
+    """
+    Get a module, deferring the import until it is first used.
+
+    Returns the real module if it has already been imported elsewhere.
+
+    Args:
+        name: Fully qualified module name
+        install_hint: Install command shown when the module is missing
+
+    Returns:
+        The module or a LazyModule proxy
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, install_hint)
+
+
+def get_lazy_load_times() -> Dict[str, float]:
+    """
+    Get the time spent in lazy imports so far.
+
+    Returns:
+        Dict of module name -> seconds
+    """
+    with _load_lock:
+        return dict(_load_times)
+
+
+def log_startup(started: float, label: str, budget_ms: Optional[float] = None) -> float:
+    """
+    Log the time from process start until the first scan cycle can begin.
+
+    Args:
+        started: ``time.perf_counter()`` taken before the entry point's imports
+        label: Scanner name used in the log line
+        budget_ms: Startup budget (defaults to SCANNER_STARTUP_BUDGET_MS or 5000)
+
+    Returns:
+        Startup time in milliseconds
+    """
+    if budget_ms is None:
+        budget_ms = float(os.getenv('SCANNER_STARTUP_BUDGET_MS', '5000'))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    lazy = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in get_lazy_load_times().items())
+    message = f"{label} ready for first scan after {elapsed_ms:.0f}ms (budget {budget_ms:.0f}ms)"
+    if lazy:
+        message += f"; lazy imports: {lazy}"
+    if elapsed_ms > budget_ms:
+        logger.warning(message)
+    else:
+        logger.info(message)
+    return elapsed_ms
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``python -X importtime`` output."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    parent: Optional[str] = None
+
+
+@dataclass
+class ImportProfile:
+    """Parsed import-time profile of one target module."""
+    target: str
+    records: List[ImportRecord] = field(default_factory=list)
+    wall_ms: Optional[float] = None
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of all top-level imports."""
+        return sum(r.cumulative_us for r in self.records if r.depth == 0) / 1000
+
+    def top(self, count: int = 15) -> List[ImportRecord]:
+        """
+        Heaviest imports sorted by cumulative time.
+
+        The target itself is broken down into its direct imports, so the
+        report shows which dependency makes the entry point slow.
+        """
+        entries = [r for r in self.records
+                   if (r.depth == 0 and r.module != self.target)
+                   or (r.depth == 1 and r.parent == self.target)]
+        return sorted(entries, key=lambda r: r.cumulative_us, reverse=True)[:count]
+
+    def loaded(self, module: str) -> bool:
+        """Whether a module (or any of its submodules) was imported."""
+        prefix = module + '.'
+        return any(r.module == module or r.module.startswith(prefix) for r in self.records)
+
+    def format_report(self, count: int = 15, budget_ms: Optional[float] = None) -> str:
+        """
+        Format a human-readable report.
+
+        Args:
+            count: Number of top-level imports to list
+            budget_ms: Optional startup budget to compare against
+
+        Returns:
+            Report text
+        """
+        lines = [f"Import profile for {self.target}: {self.total_ms:.0f}ms"
+                 + (f" (process {self.wall_ms:.0f}ms)" if self.wall_ms is not None else "")]
+        for record in self.top(count):
+            lines.append(f"  {record.cumulative_us / 1000:8.1f}ms  {record.module}")
+        if budget_ms is not None:
+            status = "OK" if self.total_ms <= budget_ms else "OVER BUDGET"
+            lines.append(f"Budget {budget_ms:.0f}ms: {status}")
+        return "\n".join(lines)
+
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(output: str, target: str = "") -> ImportProfile:
+    """
+    Parse ``python -X importtime`` stderr output.
+
+    Args:
+        output: Captured stderr
+        target: Name of the profiled module
+
+    Returns:
+        ImportProfile
+    """
+    profile = ImportProfile(target=target)
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        profile.records.append(ImportRecord(
+            module=module,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=max(0, (len(indent) - 1) // 2)
+        ))
+
+    # Children are printed before their parent: walk backwards to link them
+    parents: List[str] = []
+    for record in reversed(profile.records):
+        del parents[record.depth:]
+        record.parent = parents[-1] if parents else None
+        parents.append(record.module)
+    return profile
+
+
+def profile_imports(target: str, python: str = sys.executable, cwd: Optional[str] = None) -> ImportProfile:
+    """
+    Profile the import of a module in a fresh interpreter.
+
+    Args:
+        target: Module to import (e.g. 'main_multi_symbol')
+        python: Interpreter to use
+        cwd: Working directory (defaults to the current one)
+
+    Returns:
+        ImportProfile
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, cwd=cwd
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"Importing {target} failed: {' '.join(errors[-3:])}")
+
+    profile = parse_importtime(result.stderr, target)
+    profile.wall_ms = wall_ms
+    return profile
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry: python -m src.lazy_import main_multi_symbol --budget-ms 1500"""
+    parser = argparse.ArgumentParser(description="Report import time of a scanner entry point")
+    parser.add_argument("target", help="Module to profile, e.g. main_multi_symbol")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if imports exceed this budget")
+    parser.add_argument("--top", type=int, default=15, help="Number of imports to list")
+    args = parser.parse_args(argv)
+
+    profile = profile_imports(args.target)
+    print(profile.format_report(args.top, args.budget_ms))
+    if args.budget_ms is not None and profile.total_ms > args.budget_ms:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
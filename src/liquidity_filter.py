@@ -4,9 +4,11 @@ Filters signals based on trading hours and liquidity conditions
 """
 import logging
 from datetime import datetime, time
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List
 import pandas as pd
 
+from src import latency_trace
+
 logger = logging.getLogger(__name__)
 
 
@@ -180,7 +182,8 @@ class LiquidityFilter:
         logger.info(f"Outside high-liquidity sessions for {asset_symbol} - increasing confluence requirement to 5")
         return True
     
-    def filter_signal(self, timestamp: datetime, asset_symbol: str, asset_config: Dict, market_data: Optional[pd.DataFrame] = None) -> tuple[bool, Optional[str]]:
+    def filter_signal(self, timestamp: datetime, asset_symbol: str, asset_config: Dict, market_data: Optional[pd.DataFrame] = None,
+                      signal: Optional[Any] = None) -> tuple[bool, Optional[str]]:
         """
         Filter signal based on liquidity conditions
         
@@ -189,6 +192,7 @@ class LiquidityFilter:
             asset_symbol: Asset symbol
             asset_config: Asset-specific configuration
             market_data: Optional market data for volume check
+            signal: The signal being filtered, whose latency trace is marked
             
         Returns:
             Tuple of (allow_signal: bool, rejection_reason: Optional[str])
@@ -207,4 +211,5 @@ class LiquidityFilter:
                 return False, "Insufficient volume liquidity"
         
         # Signal passes all liquidity checks
+        latency_trace.mark('liquidity_filter', signal)
         return True, None
@@ -0,0 +1,562 @@
+"""
+Load Test Harness
+Drives SymbolOrchestrator against in-process fake exchanges at increasing symbol counts and reports capacity
+"""
+import argparse
+import copy
+import json
+import os
+import queue
+import random
+import re
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src import latency_trace, virtual_clock
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TEMPLATE = 'config/multi_crypto_scalp.json'
+
+# Candles one fake request returns at most (the clients keep the last 500)
+MAX_BARS = 600
+
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'wk': 604800, 'mo': 2592000, 'y': 31536000}
+
+
+def _span_seconds(span: str) -> int:
+    """Seconds of a ccxt/yfinance interval or period ('5m', '1h', '1wk', '2mo', '1y')."""
+    match = re.fullmatch(r'(\d+)(m|h|d|wk|mo|y)', span)
+    if not match:
+        raise ValueError(f"Unsupported interval or period: {span!r}")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+class FakeNetworkError(Exception):
+    """Injected provider failure."""
+
+
+@dataclass
+class FaultProfile:
+    """Latency and failures injected into every fake provider request."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def apply(self, what: str) -> None:
+        """
+        Wait out the request latency, then fail with probability ``error_rate``.
+
+        Raises:
+            FakeNetworkError: For an injected failure
+        """
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            raise FakeNetworkError(f"Injected failure for {what}")
+
+
+class SyntheticMarket:
+    """
+    Random-walk OHLCV for any number of symbols and timeframes.
+
+    Each (symbol, timeframe) series is generated once and extended as the
+    clock moves on, so consecutive requests see a consistent history whose
+    newest bar is the one forming now.
+    """
+
+    def __init__(self, seed: int = 0, volatility: float = 0.002):
+        """
+        Initialize market.
+
+        Args:
+            seed: Base random seed (each series derives its own from its key)
+            volatility: Standard deviation of the per-bar log return
+        """
+        self.seed = seed
+        self.volatility = volatility
+        self.requests = 0
+        self._series: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def candles(self, symbol: str, period_seconds: int, count: int) -> np.ndarray:
+        """
+        Get the newest ``count`` bars.
+
+        Returns:
+            Array of shape (count, 6): open time (epoch ms), open, high, low, close, volume
+        """
+        count = min(count, MAX_BARS)
+        last = int(virtual_clock.time() // period_seconds)
+        key = (symbol, period_seconds)
+        with self._lock:
+            self.requests += 1
+            series = self._series.get(key)
+            if series is None:
+                crc = zlib.crc32(symbol.encode())
+                rng = np.random.default_rng([self.seed, crc, period_seconds])
+                series = self._series[key] = {
+                    'rng': rng, 'first': last - MAX_BARS + 1, 'rows': np.empty((0, 5)),
+                    'price': 10.0 + crc % 990,
+                }
+            missing = last - series['first'] + 1 - len(series['rows'])
+            if missing > 0:
+                series['rows'] = np.vstack((series['rows'], self._walk(series, missing)))[-MAX_BARS:]
+                series['first'] = last - len(series['rows']) + 1
+            rows = series['rows'][-count:]
+        open_times = (np.arange(last - len(rows) + 1, last + 1, dtype=np.int64) * period_seconds * 1000)
+        return np.column_stack((open_times, rows))
+
+    def _walk(self, series: Dict[str, Any], bars: int) -> np.ndarray:
+        """Extend a series by ``bars`` bars (lock held)."""
+        rng = series['rng']
+        closes = series['price'] * np.exp(np.cumsum(rng.normal(0, self.volatility, bars)))
+        opens = np.concatenate(([series['price']], closes[:-1]))
+        spread = np.abs(rng.normal(0, self.volatility, (2, bars)))
+        highs = np.maximum(opens, closes) * (1 + spread[0])
+        lows = np.minimum(opens, closes) * (1 - spread[1])
+        volumes = rng.lognormal(3, 0.5, bars)
+        series['price'] = closes[-1]
+        return np.column_stack((opens, highs, lows, closes, volumes))
+
+
+class _AllMarkets(dict):
+    """Market table that lists every symbol."""
+
+    def __contains__(self, symbol) -> bool:
+        return True
+
+    def __missing__(self, symbol: str) -> Dict[str, Any]:
+        return {'symbol': symbol}
+
+
+class FakeExchange:
+    """ccxt exchange stand-in serving a SyntheticMarket."""
+
+    def __init__(self, market: SyntheticMarket, faults: FaultProfile, name: str = 'fake'):
+        self.id = name
+        self.market = market
+        self.faults = faults
+        self.markets = _AllMarkets()
+
+    def load_markets(self) -> Dict[str, Any]:
+        self.faults.apply('load_markets')
+        return self.markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None,
+                    limit: Optional[int] = None, params: Optional[dict] = None) -> List[List[float]]:
+        self.faults.apply(f"{symbol} {timeframe}")
+        return self.market.candles(symbol, _span_seconds(timeframe), limit or 500).tolist()
+
+    def fetch_ticker(self, symbol: str, params: Optional[dict] = None) -> Dict[str, Any]:
+        self.faults.apply(f"{symbol} ticker")
+        bar = self.market.candles(symbol, 60, 1)[-1]
+        return {'symbol': symbol, 'last': bar[4], 'bid': bar[4], 'ask': bar[4], 'timestamp': int(bar[0])}
+
+
+class FakeTicker:
+    """yfinance Ticker stand-in serving a SyntheticMarket."""
+
+    def __init__(self, symbol: str, market: SyntheticMarket, faults: FaultProfile):
+        self.symbol = symbol
+        self.market = market
+        self.faults = faults
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        self.faults.apply(f"{self.symbol} info")
+        return {'symbol': self.symbol}
+
+    def history(self, period: str = '1mo', interval: str = '1d', **kwargs) -> pd.DataFrame:
+        self.faults.apply(f"{self.symbol} {interval}")
+        interval_seconds = _span_seconds(interval)
+        count = MAX_BARS if period == 'max' else max(1, _span_seconds(period) // interval_seconds)
+        rows = self.market.candles(self.symbol, interval_seconds, count)
+        index = pd.DatetimeIndex(pd.to_datetime(rows[:, 0].astype(np.int64), unit='ms', utc=True), name='Datetime')
+        return pd.DataFrame(rows[:, 1:], index=index, columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+
+
+class _FakeCcxt:
+    """ccxt module stand-in: every exchange class is a FakeExchange."""
+
+    def __init__(self, market: SyntheticMarket, faults: FaultProfile):
+        self._market = market
+        self._faults = faults
+
+    def __getattr__(self, name: str):
+        return lambda config=None: FakeExchange(self._market, self._faults, name)
+
+
+class _FakeYFinance:
+    """yfinance module stand-in."""
+
+    def __init__(self, market: SyntheticMarket, faults: FaultProfile):
+        self._market = market
+        self._faults = faults
+
+    def Ticker(self, symbol: str) -> FakeTicker:
+        return FakeTicker(symbol, self._market, self._faults)
+
+
+@contextmanager
+def fake_providers(market: SyntheticMarket, faults: Optional[FaultProfile] = None) -> Iterator[None]:
+    """Point MarketDataClient (ccxt) and YFinanceClient (yfinance) at the fake providers."""
+    from src import market_data_client, yfinance_client
+
+    faults = faults or FaultProfile()
+    saved = market_data_client.ccxt, yfinance_client.yf
+    market_data_client.ccxt = _FakeCcxt(market, faults)
+    yfinance_client.yf = _FakeYFinance(market, faults)
+    try:
+        yield
+    finally:
+        market_data_client.ccxt, yfinance_client.yf = saved
+
+
+@contextmanager
+def log_files_in(directory: Path) -> Iterator[None]:
+    """Write scanner and suppressed-signal log files to ``directory`` instead of logs/."""
+    from src.signal_filter import SignalFilter
+    from src.symbol_scanner import SymbolScanner
+
+    saved = SymbolScanner.LOG_DIR, SignalFilter.LOG_DIR
+    SymbolScanner.LOG_DIR = SignalFilter.LOG_DIR = Path(directory)
+    try:
+        yield
+    finally:
+        SymbolScanner.LOG_DIR, SignalFilter.LOG_DIR = saved
+
+
+class QueueAlerter:
+    """
+    Alerter stand-in that delivers from a queue at a fixed rate.
+
+    Its queue depth shows whether alert delivery keeps up with signal volume.
+    """
+
+    def __init__(self, delivery_seconds: float = 0.05):
+        self.delivery_seconds = delivery_seconds
+        self.delivered = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._deliver, name="LoadTest-alerts", daemon=True)
+        self._thread.start()
+
+    def send_message(self, message: str) -> bool:
+        self._queue.put(message)
+        return True
+
+    def send_signal_alert(self, signal) -> bool:
+        self._queue.put(signal)
+        return True
+
+    def send_alert(self, *args, **kwargs) -> bool:
+        self._queue.put(args)
+        return True
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _deliver(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            time.sleep(self.delivery_seconds)
+            latency_trace.complete(item)
+            self.delivered += 1
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def generate_config(symbol_count: int, path: Path, template: str = DEFAULT_TEMPLATE,
+                    polling_interval: float = 10, thread_pool_size: Optional[int] = None,
+                    keep_rate_limits: bool = False) -> List[str]:
+    """
+    Write a multi_* config with ``symbol_count`` copies of the template's first symbol.
+
+    Args:
+        symbol_count: Number of symbols
+        path: Output path
+        template: multi_* config to copy settings and the symbol block from
+        polling_interval: polling_interval_seconds of the generated config
+        thread_pool_size: Execution engine pool size (None keeps the template's)
+        keep_rate_limits: Keep the template's provider rate limits (by default
+            they are lifted so the box, not the provider budget, is measured)
+
+    Returns:
+        Generated symbol names
+    """
+    with open(template) as f:
+        data = json.load(f)
+    symbol_block = next(iter(data['symbols'].values()))
+
+    settings = data.setdefault('global_settings', {})
+    settings['polling_interval_seconds'] = polling_interval
+    settings['max_concurrent_symbols'] = max(symbol_count, settings.get('max_concurrent_symbols', 10))
+    if thread_pool_size is not None:
+        settings['thread_pool_size'] = thread_pool_size
+    if not keep_rate_limits:
+        settings['provider_rate_limits'] = {
+            provider: {'rate': 1e6, 'burst': 1e6}
+            for provider in list(settings.get('provider_rate_limits') or {}) + ['yfinance']
+        }
+
+    symbols = [f"LOAD{i:04d}-USD" for i in range(1, symbol_count + 1)]
+    data['symbols'] = {}
+    for symbol in symbols:
+        block = copy.deepcopy(symbol_block)
+        block['enabled'] = True
+        block['display_name'] = symbol
+        data['symbols'][symbol] = block
+
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    return symbols
+
+
+@dataclass
+class LevelReport:
+    """Measurements of one symbol count."""
+    symbols: int
+    target_scans_per_sec: float
+    scans_per_sec: float
+    cycle_ms_p50: float
+    cycle_ms_p90: float
+    cycle_ms_p99: float
+    cycle_ms_max: float
+    bootstrap_seconds: float
+    cpu_percent: float
+    rss_mb_peak: float
+    alert_queue_max: int
+    alerts_delivered: int
+    provider_requests: int
+    overruns: int = 0
+    scan_errors: int = 0
+    samples: List[Dict[str, float]] = field(default_factory=list)
+
+    @property
+    def keeps_up(self) -> bool:
+        """True if every symbol is scanned at (nearly) its polling interval."""
+        return self.scans_per_sec >= 0.95 * self.target_scans_per_sec
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class LoadTest:
+    """
+    Ramps SymbolOrchestrator through increasing symbol counts.
+
+    Each level generates a config, starts an orchestrator against the fake
+    providers, measures a fixed window after bootstrap and shuts it down.
+    A scan is one SymbolScanner.scan_all_timeframes pass, whether it runs on
+    a scanner thread or as an execution engine job.
+    """
+
+    def __init__(self, polling_interval: float = 10, duration: float = 60, faults: Optional[FaultProfile] = None,
+                 template: str = DEFAULT_TEMPLATE, thread_pool_size: Optional[int] = None,
+                 alert_delivery_seconds: float = 0.05, keep_rate_limits: bool = False, seed: int = 0):
+        """
+        Initialize load test.
+
+        Args:
+            polling_interval: Polling interval of every symbol in seconds
+            duration: Measured seconds per level (after bootstrap)
+            faults: Latency and failures injected into provider requests
+            template: multi_* config the generated configs are based on
+            thread_pool_size: Execution engine pool size (None keeps the template's)
+            alert_delivery_seconds: Time the fake alerter takes per alert
+            keep_rate_limits: Keep the template's provider rate limits
+            seed: Random seed of the synthetic market
+        """
+        self.polling_interval = polling_interval
+        self.duration = duration
+        self.faults = faults or FaultProfile()
+        self.template = template
+        self.thread_pool_size = thread_pool_size
+        self.alert_delivery_seconds = alert_delivery_seconds
+        self.keep_rate_limits = keep_rate_limits
+        self.market = SyntheticMarket(seed)
+
+    def run(self, symbol_counts: Sequence[int]) -> List[LevelReport]:
+        """Run one level per symbol count, in order."""
+        reports = []
+        for count in symbol_counts:
+            report = self.run_level(count)
+            reports.append(report)
+            logger.info(f"Load level {count}: {report.scans_per_sec:.2f}/{report.target_scans_per_sec:.2f} scans/s, "
+                        f"p99 {report.cycle_ms_p99:.0f}ms, keeps up: {report.keeps_up}")
+        return reports
+
+    def run_level(self, symbol_count: int) -> LevelReport:
+        """Measure one symbol count."""
+        from src.asset_config_manager import AssetConfigManager
+        from src.symbol_orchestrator import SymbolOrchestrator
+
+        durations: List[float] = []
+        finished: List[float] = []
+        errors = [0]
+        lock = threading.Lock()
+        alerter = QueueAlerter(self.alert_delivery_seconds)
+        requests_before = self.market.requests
+
+        with tempfile.TemporaryDirectory() as tmp, fake_providers(self.market, self.faults), log_files_in(tmp):
+            config_path = Path(tmp) / f"multi_load_{symbol_count}.json"
+            symbols = generate_config(symbol_count, config_path, self.template, self.polling_interval,
+                                      self.thread_pool_size, self.keep_rate_limits)
+            orchestrator = SymbolOrchestrator(AssetConfigManager(str(config_path)), alerter,
+                                              max_concurrent_symbols=symbol_count)
+            for symbol in symbols:
+                orchestrator.add_symbol(symbol)
+                self._instrument(orchestrator.scanners[symbol], durations, finished, errors, lock)
+
+            started = time.monotonic()
+            orchestrator.start()
+            bootstrap_seconds = time.monotonic() - started
+
+            samples = []
+            window_start = time.monotonic()
+            cpu_start = time.process_time()
+            while time.monotonic() - window_start < self.duration:
+                time.sleep(min(1.0, self.duration))
+                samples.append({'t': time.monotonic() - window_start, 'rss_mb': _rss_mb(),
+                                'alert_queue': alerter.depth()})
+            window = time.monotonic() - window_start
+            cpu_seconds = time.process_time() - cpu_start
+
+            overruns = 0
+            if orchestrator.engine is not None:
+                overruns = sum(job['overruns'] for job in orchestrator.engine.get_stats()['jobs'].values())
+            orchestrator.stop()
+            loggers = [scanner.symbol_logger for scanner in orchestrator.scanners.values()]
+            loggers.append(getattr(orchestrator.signal_filter, 'suppressed_logger', None))
+            for run_logger in filter(None, loggers):
+                for handler in list(run_logger.handlers):
+                    run_logger.removeHandler(handler)
+                    handler.close()
+        alerter.close()
+
+        with lock:
+            in_window = [d for d, end in zip(durations, finished) if window_start <= end <= window_start + window]
+        cycle_ms = np.array(in_window) * 1000 if in_window else np.zeros(1)
+        return LevelReport(
+            symbols=symbol_count,
+            target_scans_per_sec=round(symbol_count / self.polling_interval, 3),
+            scans_per_sec=round(len(in_window) / window, 3),
+            cycle_ms_p50=round(float(np.percentile(cycle_ms, 50)), 1),
+            cycle_ms_p90=round(float(np.percentile(cycle_ms, 90)), 1),
+            cycle_ms_p99=round(float(np.percentile(cycle_ms, 99)), 1),
+            cycle_ms_max=round(float(cycle_ms.max()), 1),
+            bootstrap_seconds=round(bootstrap_seconds, 2),
+            cpu_percent=round(cpu_seconds / window * 100, 1),
+            rss_mb_peak=round(max((s['rss_mb'] for s in samples), default=_rss_mb()), 1),
+            alert_queue_max=max((int(s['alert_queue']) for s in samples), default=0),
+            alerts_delivered=alerter.delivered,
+            provider_requests=self.market.requests - requests_before,
+            overruns=overruns,
+            scan_errors=errors[0],
+            samples=samples,
+        )
+
+    @staticmethod
+    def _instrument(scanner, durations: List[float], finished: List[float], errors: List[int],
+                    lock: threading.Lock) -> None:
+        """Time every scan pass of a scanner."""
+        scan = scanner.scan_all_timeframes
+
+        def timed_scan(*args, **kwargs):
+            started = time.monotonic()
+            errors_before = scanner.error_count
+            try:
+                return scan(*args, **kwargs)
+            finally:
+                ended = time.monotonic()
+                with lock:
+                    durations.append(ended - started)
+                    finished.append(ended)
+                    errors[0] += max(0, scanner.error_count - errors_before)
+
+        scanner.scan_all_timeframes = timed_scan
+
+
+def format_report(reports: Sequence[LevelReport]) -> str:
+    """Render level reports as a fixed-width table."""
+    header = (f"{'symbols':>7} {'target/s':>8} {'scans/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+              f"{'cpu %':>6} {'rss MB':>7} {'alertq':>6} {'errors':>6} {'keeps up':>8}")
+    lines = [header, '-' * len(header)]
+    for r in reports:
+        lines.append(f"{r.symbols:>7} {r.target_scans_per_sec:>8.2f} {r.scans_per_sec:>8.2f} {r.cycle_ms_p50:>8.0f} "
+                     f"{r.cycle_ms_p90:>8.0f} {r.cycle_ms_p99:>8.0f} {r.cpu_percent:>6.0f} {r.rss_mb_peak:>7.0f} "
+                     f"{r.alert_queue_max:>6} {r.scan_errors:>6} {'yes' if r.keeps_up else 'NO':>8}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test SymbolOrchestrator against fake exchanges")
+    parser.add_argument('--symbols', type=int, nargs='+', default=[10, 25, 50, 100], help="Symbol counts to ramp through")
+    parser.add_argument('--interval', type=float, default=10, help="Polling interval in seconds")
+    parser.add_argument('--duration', type=float, default=60, help="Measured seconds per level")
+    parser.add_argument('--latency-ms', type=float, default=50, help="Provider request latency")
+    parser.add_argument('--jitter-ms', type=float, default=20, help="Provider latency jitter")
+    parser.add_argument('--error-rate', type=float, default=0.01, help="Fraction of provider requests that fail")
+    parser.add_argument('--pool', type=int, default=None, help="thread_pool_size (default: the template's)")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="multi_* config to base symbols on")
+    parser.add_argument('--keep-rate-limits', action='store_true', help="Keep the template's provider rate limits")
+    parser.add_argument('--output', help="Write the reports as JSON to this path")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+
+    load_test = LoadTest(
+        polling_interval=args.interval,
+        duration=args.duration,
+        faults=FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate),
+        template=args.template,
+        thread_pool_size=args.pool,
+        keep_rate_limits=args.keep_rate_limits,
+    )
+    reports = load_test.run(args.symbols)
+    print(format_report(reports))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([dict(asdict(r), keeps_up=r.keeps_up) for r in reports], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,4 @@
 """Market data client for fetching and streaming BTC/USD price data."""
-import ccxt
 import pandas as pd
 import threading
 import time
@@ -8,6 +7,11 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 
+from src import virtual_clock
+from src.lazy_import import lazy_module
+from src.rate_limiter import Priority, get_broker, is_rate_limit_error, priority_for_timeframe
+
+ccxt = lazy_module('ccxt', install_hint='pip install ccxt')
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +35,9 @@ class MarketDataClient:
     Supports both REST API (historical data) and WebSocket (real-time streaming).
     """
     
+    # Candle buffers kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('buffers',)
+    
     def __init__(self, exchange_name: str, symbol: str, timeframes: List[str], buffer_size: int = 500):
         """
         Initialize market data client.
@@ -58,6 +65,9 @@ class MarketDataClient:
             self.buffers[tf] = deque(maxlen=buffer_size)
             self.buffer_locks[tf] = threading.Lock()
         
+        # Request budget shared with every client of this exchange
+        self.rate_limiter = get_broker()
+        
         logger.info(f"Initialized MarketDataClient for {symbol} on {exchange_name}")
     
     def connect(self) -> bool:
@@ -78,6 +88,7 @@ class MarketDataClient:
             })
             
             # Test connection by fetching markets
+            self._throttle(Priority.BACKFILL)
             self.exchange.load_markets()
             
             # Verify symbol exists
@@ -91,9 +102,25 @@ class MarketDataClient:
             
         except Exception as e:
             logger.error(f"Failed to connect to {self.exchange_name}: {e}")
+            self._report_if_throttled(e)
             self._connected = False
             return False
     
+    def _throttle(self, priority: Priority) -> None:
+        """
+        Wait for the shared request budget of this exchange.
+        
+        Raises:
+            RuntimeError: If the request budget is exhausted
+        """
+        if not self.rate_limiter.acquire(self.exchange_name, priority):
+            raise RuntimeError(f"Request budget for {self.exchange_name} exhausted")
+    
+    def _report_if_throttled(self, error: Exception) -> None:
+        """Pass exchange rate-limit errors on to the shared rate limiter."""
+        if is_rate_limit_error(error):
+            self.rate_limiter.report_throttled(self.exchange_name)
+    
     def is_connected(self) -> bool:
         """Check if client is connected to exchange."""
         return self._connected
@@ -134,7 +161,7 @@ class MarketDataClient:
         # pd.to_datetime with unit='ms' creates UTC timestamps
         # So we need to use UTC time for comparison
         from datetime import timezone
-        current_time = datetime.now(timezone.utc)
+        current_time = virtual_clock.now(timezone.utc)
         
         # Ensure both timestamps are timezone-naive for comparison
         if latest_timestamp.tzinfo is not None:
@@ -194,6 +221,7 @@ class MarketDataClient:
         
         try:
             # Fetch OHLCV data
+            self._throttle(priority_for_timeframe(timeframe))
             ohlcv = self.exchange.fetch_ohlcv(
                 symbol=self.symbol,
                 timeframe=timeframe,
@@ -257,6 +285,7 @@ class MarketDataClient:
             
         except Exception as e:
             logger.error(f"Failed to fetch candles for {timeframe}: {e}")
+            self._report_if_throttled(e)
             raise
     
     def get_buffer_data(self, timeframe: str) -> pd.DataFrame:
@@ -348,6 +377,44 @@ class MarketDataClient:
                 return None
             return self.buffers[timeframe][-1]['timestamp']
     
+    def get_quote(self) -> Optional[Dict[str, float]]:
+        """
+        Get the latest top-of-book quote.
+        
+        Uses the ticker when the exchange reports bid/ask there and falls back
+        to the top level of the order book otherwise.
+        
+        Returns:
+            Dict with 'bid', 'ask' and 'timestamp' (epoch seconds), or None
+        """
+        if not self._connected or self.exchange is None:
+            return None
+        
+        try:
+            self._throttle(Priority.TRADE)
+            ticker = self.exchange.fetch_ticker(self.symbol)
+            bid, ask = ticker.get('bid'), ticker.get('ask')
+            timestamp = ticker.get('timestamp')
+            
+            if not bid or not ask:
+                self._throttle(Priority.TRADE)
+                book = self.exchange.fetch_order_book(self.symbol, limit=5)
+                if not book.get('bids') or not book.get('asks'):
+                    return None
+                bid, ask = book['bids'][0][0], book['asks'][0][0]
+                timestamp = book.get('timestamp')
+            
+            return {
+                'bid': float(bid),
+                'ask': float(ask),
+                'timestamp': timestamp / 1000 if timestamp else time.time()
+            }
+            
+        except Exception as e:
+            logger.debug(f"Failed to get quote: {e}")
+            self._report_if_throttled(e)
+            return None
+    
     def close(self) -> None:
         """Close exchange connection and cleanup resources."""
         self._connected = False
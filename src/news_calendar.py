@@ -8,6 +8,8 @@ from typing import List, Dict, Optional
 from pathlib import Path
 import logging
 
+from src import virtual_clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,7 +118,7 @@ class NewsCalendar:
         Returns:
             List of upcoming NewsEvent objects
         """
-        now = datetime.now(timezone.utc)
+        now = virtual_clock.now(timezone.utc)
         cutoff = now + timedelta(hours=hours)
         
         upcoming = [
@@ -152,7 +154,7 @@ class NewsCalendar:
             Tuple of (is_imminent, event) where event is the imminent NewsEvent or None
         """
         if current_time is None:
-            current_time = datetime.now(timezone.utc)
+            current_time = virtual_clock.now(timezone.utc)
         
         if current_time.tzinfo is None:
             current_time = current_time.replace(tzinfo=timezone.utc)
@@ -187,7 +189,7 @@ class NewsCalendar:
             Tuple of (should_pause, reason) where reason explains why
         """
         if current_time is None:
-            current_time = datetime.now(timezone.utc)
+            current_time = virtual_clock.now(timezone.utc)
         
         # Check for imminent high-impact news
         is_imminent, event = self.is_news_imminent(current_time, impact_filter=['high'])
@@ -222,7 +224,7 @@ class NewsCalendar:
             Dictionary with news status details
         """
         if current_time is None:
-            current_time = datetime.now(timezone.utc)
+            current_time = virtual_clock.now(timezone.utc)
         
         should_pause, reason = self.should_pause_trading(current_time)
         next_event = self.get_next_event()
@@ -277,7 +279,7 @@ class NewsCalendar:
         Returns:
             Number of events removed
         """
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days_old)
+        cutoff = virtual_clock.now(timezone.utc) - timedelta(days=days_old)
         
         original_count = len(self.events)
         self.events = [event for event in self.events if event.datetime_gmt >= cutoff]
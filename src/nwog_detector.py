@@ -30,6 +30,9 @@ class NWOGZone:
 class NWOGDetector:
     """Detects New Week Opening Gaps for indices."""
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('active_nwogs',)
+    
     def __init__(self, min_gap_percent: float = 0.1):
         """
         Initialize NWOG detector.
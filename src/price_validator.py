@@ -3,9 +3,11 @@ Price Validator
 Detects anomalous price data and ensures data quality
 """
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import List, Tuple, Optional
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Tuple, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -36,6 +38,214 @@ class ValidationResult:
             self.errors = []
 
 
+def compute_candle_masks(
+    df: pd.DataFrame,
+    config: Optional[ValidationConfig] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute all per-candle checks as column-wise boolean masks in one pass
+    
+    Every mask is True where the candle fails (or warns on) that check. The
+    comparisons mirror PriceValidator.validate_candle exactly, including its
+    NaN behaviour, so row i of the masks matches validate_candle(df.iloc[i],
+    df.iloc[i-1]).
+    
+    Args:
+        df: DataFrame with timestamp and OHLCV columns
+        config: ValidationConfig with thresholds (defaults used if None)
+        now: Reference time for future-timestamp checks (defaults to UTC now)
+        
+    Returns:
+        Dictionary of mask name -> boolean array, plus 'percent_change'
+        (float array, NaN for the first row)
+    """
+    config = config or ValidationConfig()
+    
+    open_ = df['open'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        nonpositive_price = (high <= 0) | (low <= 0) | (close <= 0)
+        ohlc_invalid = (
+            (high < low) | (high < open_) | (high < close) |
+            (low > open_) | (low > close) |
+            nonpositive_price | (open_ <= 0)
+        )
+        
+        previous_close = np.full_like(close, np.nan)
+        previous_close[1:] = close[:-1]
+        has_previous = np.arange(len(close)) > 0
+        previous_invalid = has_previous & (previous_close <= 0)
+        
+        percent_change = (close - previous_close) / previous_close * 100
+        percent_change[previous_invalid] = 0.0
+        abs_change = np.abs(percent_change)
+        
+        change_valid = (abs_change <= config.max_anomaly_price_change_percent) & ~previous_invalid
+        price_anomaly = has_previous & ~change_valid & (abs_change > config.max_anomaly_price_change_percent)
+        price_warning = has_previous & ~change_valid & ~price_anomaly
+    
+    timestamps = pd.to_datetime(df['timestamp'], utc=True)
+    reference = pd.Timestamp(now or datetime.now(timezone.utc))
+    if reference.tzinfo is None:
+        reference = reference.tz_localize(timezone.utc)
+    timestamp_future = (timestamps > reference).to_numpy()
+    timestamp_old = ((reference - timestamps) > pd.Timedelta(hours=config.max_timestamp_age_hours)).to_numpy()
+    
+    return {
+        'ohlc_invalid': ohlc_invalid,
+        'nonpositive_price': nonpositive_price,
+        'volume_invalid': ~(volume >= config.min_volume),
+        'negative_volume': volume < 0,
+        'timestamp_future': timestamp_future,
+        'timestamp_old': timestamp_old,
+        'price_anomaly': price_anomaly,
+        'price_warning': price_warning,
+        'percent_change': percent_change,
+    }
+
+
+class LazyResults(Sequence):
+    """
+    List-like view of per-row ValidationResults over a FrameValidation
+    
+    Results are built when a row is first read, so callers that only look
+    at the failing rows never pay for the valid ones.
+    """
+    
+    def __init__(self, validation: 'FrameValidation'):
+        self._validation = validation
+        self._cache: Dict[int, ValidationResult] = {}
+    
+    def __len__(self) -> int:
+        return self._validation.total
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("validation result index out of range")
+        result = self._cache.get(index)
+        if result is None:
+            result = self._cache[index] = self._validation.result(index)
+        return result
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, Sequence)):
+            return list(self) == list(other)
+        return NotImplemented
+
+
+@dataclass
+class FrameValidation:
+    """
+    Compact result of validating a whole DataFrame with masks
+    
+    Per-row ValidationResults are only built on request, so a clean frame
+    never materializes a single one.
+    """
+    total: int
+    invalid_rows: np.ndarray  # Positional indices of candles with errors
+    warning_rows: np.ndarray  # Positional indices of candles with warnings
+    masks: Dict[str, np.ndarray] = field(repr=False)
+    frame: pd.DataFrame = field(repr=False)
+    config: ValidationConfig = field(repr=False)
+    
+    @property
+    def all_valid(self) -> bool:
+        return self.total > 0 and len(self.invalid_rows) == 0
+    
+    @property
+    def invalid_index(self) -> pd.Index:
+        """Index labels of the invalid candles"""
+        return self.frame.index[self.invalid_rows]
+    
+    def result(self, row: int) -> ValidationResult:
+        """
+        Build the ValidationResult for one candle
+        
+        Args:
+            row: Positional row index
+            
+        Returns:
+            ValidationResult equivalent to validate_candle for that row
+        """
+        masks = self.masks
+        
+        def value(column):
+            return self.frame[column].iat[row]
+        
+        warnings = []
+        errors = []
+        
+        if masks['ohlc_invalid'][row]:
+            errors.append(f"Invalid OHLC relationships: H={value('high')}, L={value('low')}, O={value('open')}, C={value('close')}")
+        if masks['volume_invalid'][row]:
+            errors.append(f"Invalid volume: {value('volume')}")
+        if masks['timestamp_future'][row]:
+            errors.append(f"Invalid timestamp: {value('timestamp')}")
+        
+        percent_change = None
+        if row > 0:
+            percent_change = float(masks['percent_change'][row])
+            if masks['price_anomaly'][row]:
+                errors.append(f"Extreme price change: {percent_change:.2f}% (threshold: {self.config.max_anomaly_price_change_percent}%)")
+            elif masks['price_warning'][row]:
+                warnings.append(f"Large price change: {percent_change:.2f}% (normal threshold: {self.config.max_normal_price_change_percent}%)")
+        
+        return ValidationResult(
+            is_valid=len(errors) == 0,
+            warnings=warnings,
+            errors=errors,
+            percent_change=percent_change
+        )
+    
+    def failures(self) -> Iterator[Tuple[int, ValidationResult]]:
+        """Yield (row, ValidationResult) for every candle with errors"""
+        for row in self.invalid_rows:
+            yield int(row), self.result(int(row))
+    
+    def results(self) -> 'LazyResults':
+        """Per-row ValidationResults (legacy form), each built on first access"""
+        return LazyResults(self)
+    
+    def summary(self) -> dict:
+        """
+        Summary statistics computed directly from the masks
+        
+        Returns:
+            Dictionary in the same shape as PriceValidator.get_validation_summary
+        """
+        masks = self.masks
+        error_count = int(
+            masks['ohlc_invalid'].sum() + masks['volume_invalid'].sum() +
+            masks['timestamp_future'].sum() + masks['price_anomaly'].sum()
+        )
+        price_changes = masks['percent_change'][1:]
+        has_changes = len(price_changes) > 0
+        
+        return {
+            'total': self.total,
+            'valid': self.total - len(self.invalid_rows),
+            'invalid': len(self.invalid_rows),
+            'warnings': len(self.warning_rows),
+            'error_count': error_count,
+            'invalid_rows': self.invalid_rows.tolist(),
+            'price_changes': {
+                'count': len(price_changes),
+                'max': float(np.max(price_changes)) if has_changes else None,
+                'min': float(np.min(price_changes)) if has_changes else None,
+                'avg': float(np.mean(price_changes)) if has_changes else None
+            }
+        }
+
+
 class PriceValidator:
     """
     Validates price data for anomalies and quality issues
@@ -115,43 +325,60 @@ class PriceValidator:
             percent_change=percent_change
         )
     
-    def validate_dataframe(self, df: pd.DataFrame) -> Tuple[bool, List[ValidationResult]]:
+    def validate_frame(self, df: pd.DataFrame) -> FrameValidation:
         """
-        Validate entire DataFrame of candles
+        Validate entire DataFrame of candles in one vectorized pass
         
         Args:
             df: DataFrame with OHLCV data
             
         Returns:
-            Tuple of (all_valid, list of ValidationResults)
+            FrameValidation with invalid row indices; per-row results are lazy
         """
-        if df.empty:
-            logger.error("Cannot validate empty DataFrame")
-            return False, []
+        masks = compute_candle_masks(df, self.config)
+        
+        invalid = masks['ohlc_invalid'] | masks['volume_invalid'] | masks['timestamp_future'] | masks['price_anomaly']
+        warning = masks['price_warning'] & ~masks['price_anomaly']
+        
+        validation = FrameValidation(
+            total=len(df),
+            invalid_rows=np.flatnonzero(invalid),
+            warning_rows=np.flatnonzero(warning),
+            masks=masks,
+            frame=df,
+            config=self.config
+        )
         
-        results = []
-        all_valid = True
+        old_count = int(masks['timestamp_old'].sum())
+        if old_count:
+            logger.debug(f"{old_count}/{len(df)} candles older than {self.config.max_timestamp_age_hours}h")
         
-        for i in range(len(df)):
-            current = df.iloc[i]
-            previous = df.iloc[i-1] if i > 0 else None
-            
-            result = self.validate_candle(current, previous)
-            results.append(result)
-            
-            if not result.is_valid:
-                all_valid = False
+        if len(validation.invalid_rows) > 0:
+            for row, result in validation.failures():
+                logger.error(f"Validation failed for candle at {df['timestamp'].iat[row]}: {result.errors}")
+            logger.warning(f"Validation summary: {len(validation.invalid_rows)}/{len(df)} candles invalid, "
+                           f"{len(validation.warning_rows)} with warnings")
+        else:
+            logger.info(f"Validation summary: All {len(df)} candles valid, {len(validation.warning_rows)} with warnings")
         
-        # Summary
-        invalid_count = sum(1 for r in results if not r.is_valid)
-        warning_count = sum(1 for r in results if r.warnings)
+        return validation
+    
+    def validate_dataframe(self, df: pd.DataFrame) -> Tuple[bool, Sequence]:
+        """
+        Validate entire DataFrame of candles
         
-        if invalid_count > 0:
-            logger.warning(f"Validation summary: {invalid_count}/{len(results)} candles invalid, {warning_count} with warnings")
-        else:
-            logger.info(f"Validation summary: All {len(results)} candles valid, {warning_count} with warnings")
+        Args:
+            df: DataFrame with OHLCV data
+            
+        Returns:
+            Tuple of (all_valid, sequence of ValidationResults built lazily per row)
+        """
+        if df.empty:
+            logger.error("Cannot validate empty DataFrame")
+            return False, []
         
-        return all_valid, results
+        validation = self.validate_frame(df)
+        return validation.all_valid, validation.results()
     
     def check_price_change(self, current_price: float, previous_price: float) -> Tuple[bool, float]:
         """
@@ -0,0 +1,323 @@
+"""
+Provider Health
+Rolling latency, error-rate and staleness tracking used to rank data providers
+"""
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHealth:
+    """
+    Health of one data provider.
+
+    Error and staleness rates are exponentially weighted per request and also
+    decay with time, so a provider that failed earlier recovers its rank on
+    its own once the failures are ``half_life_seconds`` in the past. After
+    ``failure_threshold`` consecutive failures the provider cools down with
+    exponential backoff and is only used when nothing else is available.
+    Outstanding requests are tracked too: a hung request counts against the
+    provider's latency for as long as it stays unanswered.
+    """
+
+    def __init__(self,
+                 name: str,
+                 max_samples: int = 50,
+                 smoothing: float = 0.3,
+                 half_life_seconds: float = 300.0,
+                 failure_threshold: int = 3,
+                 cooldown_seconds: float = 30.0,
+                 max_cooldown_seconds: float = 300.0,
+                 clock=time.monotonic):
+        """
+        Initialize provider health.
+
+        Args:
+            name: Provider name
+            max_samples: Latency samples kept for percentiles
+            smoothing: Weight of the newest request in the error/stale rates
+            half_life_seconds: Time for error/stale rates to halve without traffic
+            failure_threshold: Consecutive failures before a cooldown
+            cooldown_seconds: First cooldown length (doubles on repeated failure)
+            max_cooldown_seconds: Cooldown cap
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.smoothing = smoothing
+        self.half_life_seconds = half_life_seconds
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._clock = clock
+
+        self.latencies: deque = deque(maxlen=max_samples)
+        self._error_rate = 0.0
+        self._stale_rate = 0.0
+        self._rates_updated = clock()
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self._outstanding: Dict[int, float] = {}  # Request token -> start time
+        self._tokens = itertools.count()
+
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def _decay(self) -> float:
+        """Time-decay factor since the rates were last updated."""
+        elapsed = self._clock() - self._rates_updated
+        return 0.5 ** (elapsed / self.half_life_seconds) if self.half_life_seconds > 0 else 1.0
+
+    def _update_rates(self, error: float, stale: float) -> None:
+        decay = self._decay()
+        self._error_rate = (1 - self.smoothing) * self._error_rate * decay + self.smoothing * error
+        self._stale_rate = (1 - self.smoothing) * self._stale_rate * decay + self.smoothing * stale
+        self._rates_updated = self._clock()
+
+    def record_success(self, latency: float, stale: bool = False) -> None:
+        """
+        Record a request that returned data.
+
+        Args:
+            latency: Request duration in seconds
+            stale: Whether the data failed the freshness check
+        """
+        self.requests += 1
+        self.latencies.append(latency)
+        self._update_rates(0.0, 1.0 if stale else 0.0)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record_failure(self, latency: Optional[float] = None, error: Optional[str] = None) -> None:
+        """
+        Record a failed or empty request.
+
+        Args:
+            latency: Request duration in seconds (timeouts count as latency too)
+            error: Error description
+        """
+        self.requests += 1
+        self.failures += 1
+        self.last_error = error
+        if latency is not None:
+            self.latencies.append(latency)
+        self._update_rates(1.0, self._stale_rate)
+        self.consecutive_failures += 1
+
+        if self.consecutive_failures >= self.failure_threshold:
+            backoff = self.cooldown_seconds * 2 ** (self.consecutive_failures - self.failure_threshold)
+            self.cooldown_until = self._clock() + min(self.max_cooldown_seconds, backoff)
+
+    def begin(self) -> int:
+        """
+        Record a request being sent.
+
+        Returns:
+            Token to pass to end() once the request finishes
+        """
+        token = next(self._tokens)
+        self._outstanding[token] = self._clock()
+        return token
+
+    def end(self, token: int) -> None:
+        """Record a request finishing (its outcome is recorded separately)."""
+        self._outstanding.pop(token, None)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests sent and not yet answered."""
+        return len(self._outstanding)
+
+    def oldest_in_flight(self) -> float:
+        """Age in seconds of the oldest unanswered request (0 if none)."""
+        if not self._outstanding:
+            return 0.0
+        return self._clock() - min(self._outstanding.values())
+
+    @property
+    def error_rate(self) -> float:
+        """Time-decayed error rate (0-1)."""
+        return self._error_rate * self._decay()
+
+    @property
+    def stale_rate(self) -> float:
+        """Time-decayed rate of stale responses (0-1)."""
+        return self._stale_rate * self._decay()
+
+    @property
+    def cooling_down(self) -> bool:
+        """Whether the provider is benched after repeated failures."""
+        return self._clock() < self.cooldown_until
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            q: Percentile (0-100)
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        if not self.latencies:
+            return None
+        return float(np.percentile(np.fromiter(self.latencies, dtype=float), q))
+
+    def score(self, default_latency: float = 1.0) -> float:
+        """
+        Expected cost of a request in seconds (lower is better).
+
+        Median latency (or the age of the oldest unanswered request, if
+        longer) inflated by the error and staleness rates.
+        """
+        latency = self.latency_percentile(50)
+        if latency is None:
+            latency = default_latency
+        latency = max(latency, self.oldest_in_flight())
+        return latency * (1 + 4 * self.error_rate + 2 * self.stale_rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get health metrics as a dict."""
+        p50, p95 = self.latency_percentile(50), self.latency_percentile(95)
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'error_rate': round(self.error_rate, 3),
+            'stale_rate': round(self.stale_rate, 3),
+            'latency_p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'latency_p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+            'consecutive_failures': self.consecutive_failures,
+            'cooling_down': self.cooling_down,
+            'in_flight': self.in_flight,
+            'last_error': self.last_error,
+        }
+
+
+class ProviderHealthTracker:
+    """
+    Health of a set of providers and their dynamic ranking.
+
+    Providers are ordered by health score plus a small bias per position in
+    the configured priority list, so the preferred provider wins unless
+    another is clearly healthier, and takes the lead again once it recovers.
+    A provider with ``max_in_flight`` unanswered requests is saturated and
+    ranks with the benched ones.
+    """
+
+    def __init__(self,
+                 priority_bias_seconds: float = 0.5,
+                 min_samples_for_hedge: int = 5,
+                 default_hedge_delay: float = 2.0,
+                 min_hedge_delay: float = 0.25,
+                 max_in_flight: int = 2,
+                 **health_options):
+        """
+        Initialize tracker.
+
+        Args:
+            priority_bias_seconds: Score added per position in the priority list
+            min_samples_for_hedge: Latency samples needed before using the p95
+            default_hedge_delay: Hedge delay while too few samples exist
+            min_hedge_delay: Lower bound for the hedge delay
+            max_in_flight: Unanswered requests after which a provider is saturated
+            **health_options: Options passed to each ProviderHealth
+        """
+        self.priority_bias_seconds = priority_bias_seconds
+        self.min_samples_for_hedge = min_samples_for_hedge
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_in_flight = max_in_flight
+        self.health_options = health_options
+        self._providers: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, provider: str) -> ProviderHealth:
+        """Get (or create) the health record of a provider (lock held)."""
+        health = self._providers.get(provider)
+        if health is None:
+            health = ProviderHealth(provider, **self.health_options)
+            self._providers[provider] = health
+        return health
+
+    def get(self, provider: str) -> ProviderHealth:
+        """Get (or create) the health record of a provider."""
+        with self._lock:
+            return self._get(provider)
+
+    def begin(self, provider: str) -> int:
+        """Record a request being sent; returns the token for end()."""
+        with self._lock:
+            return self._get(provider).begin()
+
+    def end(self, provider: str, token: int) -> None:
+        """Record a request finishing."""
+        with self._lock:
+            self._get(provider).end(token)
+
+    def saturated(self, provider: str) -> bool:
+        """Whether a provider already has ``max_in_flight`` unanswered requests."""
+        with self._lock:
+            health = self._providers.get(provider)
+            return health is not None and health.in_flight >= self.max_in_flight
+
+    def record_success(self, provider: str, latency: float, stale: bool = False) -> None:
+        """Record a request that returned data."""
+        with self._lock:
+            self._get(provider).record_success(latency, stale)
+
+    def record_failure(self, provider: str, latency: Optional[float] = None, error: Optional[str] = None) -> None:
+        """Record a failed or empty request."""
+        with self._lock:
+            health = self._get(provider)
+            health.record_failure(latency, error)
+            if health.cooling_down and health.consecutive_failures == health.failure_threshold:
+                logger.warning(f"Provider {provider} benched after {health.consecutive_failures} failures: {error}")
+
+    def rank(self, providers: List[str]) -> List[str]:
+        """
+        Order providers from best to worst.
+
+        Args:
+            providers: Providers in configured priority order
+
+        Returns:
+            Providers ordered by current health (benched and saturated providers last)
+        """
+        with self._lock:
+            def key(item):
+                position, provider = item
+                health = self._providers.get(provider)
+                if health is None:
+                    return (False, position * self.priority_bias_seconds)
+                unavailable = health.cooling_down or health.in_flight >= self.max_in_flight
+                return (unavailable, health.score() + position * self.priority_bias_seconds)
+
+            return [provider for _, provider in sorted(enumerate(providers), key=key)]
+
+    def hedge_delay(self, provider: str) -> float:
+        """
+        Time to wait for a provider before hedging to the next one.
+
+        Args:
+            provider: Provider handling the first request
+
+        Returns:
+            The provider's p95 latency (or the default while warming up)
+        """
+        with self._lock:
+            health = self._providers.get(provider)
+            if health is None or len(health.latencies) < self.min_samples_for_hedge:
+                return self.default_hedge_delay
+            return max(self.min_hedge_delay, health.latency_percentile(95))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get health metrics for every provider."""
+        with self._lock:
+            return {name: health.snapshot() for name, health in self._providers.items()}
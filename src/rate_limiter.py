@@ -0,0 +1,523 @@
+"""
+Rate Limiter
+Process-wide (optionally host-wide) request broker with token buckets per provider and API key
+"""
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority classes (lower value is served first)."""
+    TRADE = 0      # Price checks for open trades and quotes
+    SCAN = 1       # Regular polling of scanning timeframes
+    BACKFILL = 2   # Initial loads and higher-timeframe refreshes
+
+
+def priority_for_timeframe(timeframe: str) -> Priority:
+    """
+    Get the request priority for a candle fetch.
+
+    Args:
+        timeframe: Candle timeframe (e.g. '5m', '1d')
+
+    Returns:
+        BACKFILL for 4h and above, SCAN otherwise
+    """
+    return Priority.BACKFILL if timeframe in ('4h', '1d', '1w', '1wk') else Priority.SCAN
+
+
+_RATE_LIMIT_ERRORS = {'RateLimitExceeded', 'DDoSProtection', 'YFRateLimitError', 'TooManyRequests'}
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Check whether an SDK exception means the provider throttled us.
+
+    Matches by class name so ccxt and yfinance need not be imported here.
+
+    Args:
+        error: Exception raised by a data client SDK
+
+    Returns:
+        True for rate-limit errors (HTTP 429 and equivalents)
+    """
+    if any(cls.__name__ in _RATE_LIMIT_ERRORS for cls in type(error).__mro__):
+        return True
+    message = str(error)
+    return '429' in message or 'Too Many Requests' in message
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Holds up to ``capacity`` tokens and refills at ``rate`` tokens per second.
+    Callers block in ``acquire`` until enough tokens are available, so bursts
+    up to ``capacity`` go through immediately and sustained load is spread
+    at the provider's allowed rate.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+            clock: Monotonic time source
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens without blocking.
+
+        Args:
+            tokens: Tokens to take
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they will be available
+        """
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Empty the bucket and hold new tokens back for ``seconds``."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None,
+                cancel: Optional[threading.Event] = None) -> bool:
+        """
+        Take tokens, waiting until they are available.
+
+        Args:
+            tokens: Tokens to take
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            cancel: Event that aborts the wait when set
+
+        Returns:
+            True if the tokens were taken
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            if cancel is not None:
+                if cancel.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+class HostTokenBucket:
+    """
+    Token bucket whose state lives in a shared JSON file.
+
+    Every process on the host that points at the same file draws from the
+    same buckets; an exclusive ``flock`` serializes the read-modify-write.
+    Wall-clock time is used so that the state is meaningful across processes.
+    """
+
+    def __init__(self, path: str, key: str, rate: float, capacity: float):
+        """
+        Initialize host-wide token bucket.
+
+        Args:
+            path: Shared state file
+            key: Bucket key inside the file
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        if not FCNTL_AVAILABLE:
+            raise RuntimeError("Host-wide rate limiting requires fcntl (POSIX)")
+        self.path = path
+        self.key = key
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+
+    def _update(self, take: float = 0.0, penalty_seconds: float = 0.0) -> Tuple[float, float]:
+        """Refill, optionally take tokens or apply a penalty; returns (wait, tokens)."""
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw.strip() else {}
+                except ValueError:
+                    state = {}
+
+                now = time.time()
+                tokens, updated = state.get(self.key, (self.capacity, now))
+                tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+
+                wait = 0.0
+                if penalty_seconds:
+                    tokens = min(tokens, 0.0) - penalty_seconds * self.rate
+                elif take:
+                    take = min(take, self.capacity)
+                    if tokens >= take:
+                        tokens -= take
+                    else:
+                        wait = (take - tokens) / self.rate
+
+                state[self.key] = (tokens, now)
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait, tokens
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available."""
+        return self._update()[1]
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Take tokens without blocking (see TokenBucket.try_acquire)."""
+        return self._update(take=tokens)[0]
+
+    def penalize(self, seconds: float) -> None:
+        """Empty the bucket and hold new tokens back for ``seconds``."""
+        self._update(penalty_seconds=seconds)
+
+
+# Published limits (requests per second, burst, requests per UTC day) per provider
+DEFAULT_PROVIDER_LIMITS: Dict[str, Dict[str, Any]] = {
+    'yfinance': {'rate': 2.0, 'burst': 4},
+    'binance': {'rate': 10.0, 'burst': 20},
+    'kraken': {'rate': 1.0, 'burst': 3},
+    'twelve_data': {'rate': 8 / 60, 'burst': 1, 'daily_limit': 800},
+    'alpha_vantage': {'rate': 5 / 60, 'burst': 1, 'daily_limit': 500},
+}
+FALLBACK_LIMITS: Dict[str, Any] = {'rate': 1.0, 'burst': 2}
+
+
+class _Lane:
+    """Bucket, priority queue and counters for one provider/API key."""
+
+    def __init__(self, provider: str, key_id: Optional[str], bucket, daily_limit: Optional[int]):
+        self.provider = provider
+        self.key_id = key_id
+        self.bucket = bucket
+        self.daily_limit = daily_limit
+        self.cond = threading.Condition()
+        self.waiters: List[Tuple[int, int]] = []
+        self.sequence = itertools.count()
+
+        self.day = datetime.now(timezone.utc).date()
+        self.daily_used = 0
+        self.granted = 0
+        self.denied = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def roll_day(self) -> None:
+        today = datetime.now(timezone.utc).date()
+        if today != self.day:
+            self.day = today
+            self.daily_used = 0
+
+    @property
+    def daily_remaining(self) -> Optional[int]:
+        if self.daily_limit is None:
+            return None
+        return max(0, self.daily_limit - self.daily_used)
+
+
+class RateLimitBroker:
+    """
+    Shared request budget for every data client in the process.
+
+    Each (provider, API key) pair gets its own token bucket. Waiting callers
+    are served strictly by priority class and then in arrival order, so a
+    trade price check never queues behind a daily-candle refresh. Optional
+    daily quotas are enforced by refusing requests once spent, and a 429 from
+    the provider empties the bucket for the retry-after period. When a state
+    file is given, buckets are shared by all processes on the host.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 state_file: Optional[str] = None):
+        """
+        Initialize broker.
+
+        Args:
+            limits: Per-provider overrides of DEFAULT_PROVIDER_LIMITS
+            state_file: Optional shared file for host-wide buckets (POSIX only)
+        """
+        self.limits: Dict[str, Dict[str, Any]] = {k: dict(v) for k, v in DEFAULT_PROVIDER_LIMITS.items()}
+        for provider, overrides in (limits or {}).items():
+            self.limits.setdefault(provider, {}).update(overrides)
+
+        if state_file and not FCNTL_AVAILABLE:
+            logger.warning("fcntl not available, rate limits are per process only")
+            state_file = None
+        self.state_file = state_file
+
+        self._lanes: Dict[Tuple[str, Optional[str]], _Lane] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key_id(api_key: Optional[str]) -> Optional[str]:
+        """Short stable id so API keys never appear in metrics or state files."""
+        if not api_key:
+            return None
+        return hashlib.sha256(api_key.encode()).hexdigest()[:8]
+
+    def configure(self, provider: str, rate: Optional[float] = None, burst: Optional[float] = None,
+                  daily_limit: Optional[int] = None) -> None:
+        """
+        Set limits for a provider; existing buckets for it are rebuilt.
+
+        Args:
+            provider: Provider name
+            rate: Requests per second
+            burst: Bucket capacity
+            daily_limit: Requests per UTC day
+        """
+        with self._lock:
+            limits = self.limits.setdefault(provider, dict(FALLBACK_LIMITS))
+            if rate is not None:
+                limits['rate'] = rate
+            if burst is not None:
+                limits['burst'] = burst
+            if daily_limit is not None:
+                limits['daily_limit'] = daily_limit
+            for key in [key for key in self._lanes if key[0] == provider]:
+                del self._lanes[key]
+
+    def _lane(self, provider: str, api_key: Optional[str]) -> _Lane:
+        key_id = self._key_id(api_key)
+        with self._lock:
+            lane = self._lanes.get((provider, key_id))
+            if lane is None:
+                limits = self.limits.get(provider, FALLBACK_LIMITS)
+                rate, burst = limits.get('rate', 1.0), limits.get('burst', 1)
+                if self.state_file:
+                    bucket_key = f"{provider}:{key_id}" if key_id else provider
+                    bucket = HostTokenBucket(self.state_file, bucket_key, rate, burst)
+                else:
+                    bucket = TokenBucket(rate, burst)
+                lane = _Lane(provider, key_id, bucket, limits.get('daily_limit'))
+                self._lanes[(provider, key_id)] = lane
+            return lane
+
+    def acquire(self, provider: str, priority: Priority = Priority.SCAN, api_key: Optional[str] = None,
+                tokens: float = 1, timeout: Optional[float] = None,
+                cancel: Optional[threading.Event] = None) -> bool:
+        """
+        Wait for permission to send a request.
+
+        Args:
+            provider: Provider name
+            priority: Request priority class
+            api_key: API key the request is billed to
+            tokens: Request cost
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            cancel: Event that aborts the wait when set
+
+        Returns:
+            True if the request may be sent, False on timeout, cancel or an
+            exhausted daily quota
+        """
+        lane = self._lane(provider, api_key)
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        ticket = (int(priority), next(lane.sequence))
+
+        with lane.cond:
+            lane.roll_day()
+            if lane.daily_remaining is not None and lane.daily_remaining < tokens:
+                lane.denied += 1
+                logger.warning(f"Daily request budget for {provider} exhausted ({lane.daily_limit})")
+                return False
+
+            heapq.heappush(lane.waiters, ticket)
+            lane.cond.notify_all()  # A new head of queue re-evaluates
+            try:
+                while True:
+                    wait = None
+                    if lane.waiters[0] == ticket:
+                        wait = lane.bucket.try_acquire(tokens)
+                        if wait == 0:
+                            heapq.heappop(lane.waiters)
+                            waited = time.monotonic() - started
+                            lane.granted += 1
+                            lane.daily_used += tokens
+                            lane.wait_seconds += waited
+                            lane.max_wait_seconds = max(lane.max_wait_seconds, waited)
+                            lane.cond.notify_all()
+                            return True
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        wait = remaining if wait is None else min(wait, remaining)
+                    if cancel is not None:
+                        if cancel.is_set():
+                            break
+                        wait = 0.1 if wait is None else min(wait, 0.1)
+                    lane.cond.wait(wait)
+            except BaseException:
+                self._abandon(lane, ticket)
+                raise
+
+            self._abandon(lane, ticket)
+            lane.denied += 1
+            return False
+
+    def has_budget(self, provider: str, api_key: Optional[str] = None, tokens: float = 1) -> bool:
+        """
+        Check whether a request could be sent right now without queueing.
+
+        Used before optional requests (such as hedges) that should not spend
+        a scarce quota or wait behind other callers.
+
+        Args:
+            provider: Provider name
+            api_key: API key the request would be billed to
+            tokens: Request cost
+
+        Returns:
+            True if tokens are available, nobody is queued and the daily quota allows it
+        """
+        lane = self._lane(provider, api_key)
+        with lane.cond:
+            lane.roll_day()
+            if lane.daily_remaining is not None and lane.daily_remaining < tokens:
+                return False
+            return not lane.waiters and lane.bucket.available >= tokens
+
+    @staticmethod
+    def _abandon(lane: _Lane, ticket: Tuple[int, int]) -> None:
+        """Drop a ticket that is leaving without tokens (lane lock held)."""
+        if ticket in lane.waiters:
+            lane.waiters.remove(ticket)
+            heapq.heapify(lane.waiters)
+            lane.cond.notify_all()
+
+    def report_throttled(self, provider: str, api_key: Optional[str] = None,
+                         retry_after: Optional[float] = None) -> None:
+        """
+        Record a rate-limit response (HTTP 429 or equivalent) from a provider.
+
+        Args:
+            provider: Provider name
+            api_key: API key the request was billed to
+            retry_after: Seconds the provider asked us to wait (defaults to one refill period)
+        """
+        lane = self._lane(provider, api_key)
+        penalty = retry_after if retry_after is not None else 1.0 / lane.bucket.rate
+        with lane.cond:
+            lane.throttled += 1
+            lane.bucket.penalize(penalty)
+        logger.warning(f"{provider} rate limit hit, backing off {penalty:.1f}s")
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get remaining budget and queue metrics per provider/API key.
+
+        Returns:
+            Dict of 'provider' or 'provider:key_id' -> metrics
+        """
+        with self._lock:
+            lanes = list(self._lanes.values())
+
+        metrics = {}
+        for lane in lanes:
+            with lane.cond:
+                lane.roll_day()
+                queued = {priority.name: 0 for priority in Priority}
+                for priority, _ in lane.waiters:
+                    queued[Priority(priority).name] += 1
+                name = f"{lane.provider}:{lane.key_id}" if lane.key_id else lane.provider
+                metrics[name] = {
+                    'tokens_available': round(lane.bucket.available, 3),
+                    'rate_per_second': lane.bucket.rate,
+                    'burst': lane.bucket.capacity,
+                    'daily_limit': lane.daily_limit,
+                    'daily_used': lane.daily_used,
+                    'daily_remaining': lane.daily_remaining,
+                    'granted': lane.granted,
+                    'denied': lane.denied,
+                    'throttled': lane.throttled,
+                    'queued': queued,
+                    'avg_wait_ms': round(lane.wait_seconds / lane.granted * 1000, 1) if lane.granted else 0.0,
+                    'max_wait_ms': round(lane.max_wait_seconds * 1000, 1),
+                }
+        return metrics
+
+
+_broker: Optional[RateLimitBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> RateLimitBroker:
+    """
+    Get the process-wide rate limit broker.
+
+    Set SCANNER_RATE_LIMIT_FILE to share buckets with every scanner process
+    on the host.
+
+    Returns:
+        Shared RateLimitBroker
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = RateLimitBroker(state_file=os.getenv('SCANNER_RATE_LIMIT_FILE'))
+        return _broker
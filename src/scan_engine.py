@@ -0,0 +1,301 @@
+"""
+Scan Engine
+Shared pipelined fetch -> indicators -> detect -> filter -> alert loop for scanner entry points
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src import latency_trace
+from src.candle_cache import frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanContext:
+    """State of one timeframe passing through the pipeline."""
+    timeframe: str
+    candles: Optional[pd.DataFrame] = None
+    signal: Optional[Any] = None
+    detected: Optional[Any] = None
+    skipped: Optional[str] = None
+    rejection_reason: Optional[str] = None
+    error: Optional[Exception] = None
+    cached: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+    trace: Optional[latency_trace.SignalTrace] = None
+
+
+class StageTimer:
+    """Thread-safe per-stage timing statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(stage, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get timing summary.
+
+        Returns:
+            Dict of stage -> {'count', 'total_ms', 'avg_ms', 'max_ms'}
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': count,
+                    'total_ms': round(total * 1000, 2),
+                    'avg_ms': round(total / count * 1000, 2) if count else 0.0,
+                    'max_ms': round(peak * 1000, 2),
+                }
+                for stage, (count, total, peak) in self._stats.items()
+            }
+
+
+class ScanEngine:
+    """
+    Pipelined scan cycle over a set of timeframes.
+
+    Fetch and indicator stages run on a worker pool so that the I/O of one
+    timeframe overlaps with the computation of another. Detection, filters
+    and alerts then run on the calling thread in timeframe order as each
+    timeframe becomes ready, so stateful detectors and alerters are never
+    called concurrently. Indicator results are reused while the fetched
+    candles are unchanged.
+
+    Stage callables:
+        fetch(timeframe) -> DataFrame
+        indicators(candles) -> DataFrame
+        gate(ctx) -> bool            (False skips detection for this pass)
+        detect(ctx) -> signal or None
+        report(ctx)                   (every scanned timeframe, e.g. Excel logging)
+        filters: [filter(ctx) -> bool] (False drops the signal; may set ctx.rejection_reason)
+        alert(ctx)                    (only for signals that passed the filters)
+
+    With an ``events`` store every scan, detected signal, filter rejection
+    and alert is also appended to the event log. Each timeframe is
+    latency-traced from fetch to alert: the trace is opened on the worker
+    and resumed on the calling thread.
+    """
+
+    def __init__(self,
+                 timeframes: Sequence[str],
+                 fetch: Callable[[str], pd.DataFrame],
+                 indicators: Callable[[pd.DataFrame], pd.DataFrame],
+                 detect: Callable[[ScanContext], Any],
+                 gate: Optional[Callable[[ScanContext], bool]] = None,
+                 report: Optional[Callable[[ScanContext], None]] = None,
+                 filters: Sequence[Callable[[ScanContext], bool]] = (),
+                 alert: Optional[Callable[[ScanContext], None]] = None,
+                 max_workers: Optional[int] = None,
+                 cache_indicators: bool = True,
+                 name: str = "scanner",
+                 events: Optional[Any] = None,
+                 symbol: Optional[str] = None):
+        """
+        Initialize scan engine.
+
+        Args:
+            timeframes: Timeframes scanned each cycle (in processing order)
+            fetch: Fetch stage
+            indicators: Indicator stage
+            detect: Detection stage
+            gate: Optional pre-detection stage
+            report: Optional reporting stage
+            filters: Signal filter stages
+            alert: Optional alert stage
+            max_workers: Worker pool size (defaults to one per timeframe)
+            cache_indicators: Reuse indicators when candles are unchanged
+            name: Name used in log messages
+            events: Optional EventStore receiving scan/signal/rejection/alert events
+            symbol: Symbol recorded with events
+        """
+        self.timeframes = list(timeframes)
+        self.fetch = fetch
+        self.indicators = indicators
+        self.detect = detect
+        self.gate = gate
+        self.report = report
+        self.filters = list(filters)
+        self.alert = alert
+        self.cache_indicators = cache_indicators
+        self.name = name
+        self.events = events
+        self.symbol = symbol
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(self.timeframes)),
+            thread_name_prefix=f"{name}-scan"
+        )
+        self.timer = StageTimer()
+        self.candle_data: Dict[str, pd.DataFrame] = {}
+        self._indicator_cache: Dict[str, Tuple[tuple, pd.DataFrame]] = {}
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cycles = 0
+
+    def _timed(self, ctx: ScanContext, stage: str, func: Callable, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            ctx.timings[stage] = elapsed
+            self.timer.record(stage, elapsed)
+
+    def _prepare(self, timeframe: str, fetch: Optional[Callable[[str], pd.DataFrame]] = None) -> ScanContext:
+        """Fetch and indicator stages (worker thread)."""
+        ctx = ScanContext(timeframe=timeframe)
+        with latency_trace.tracing(self.symbol or self.name, timeframe) as ctx.trace:
+            try:
+                candles = self._timed(ctx, 'fetch', fetch or self.fetch, timeframe)
+                if candles is None or candles.empty:
+                    ctx.skipped = "no data"
+                    return ctx
+                latency_trace.mark_received('fetch', candles, timeframe)
+
+                key = frame_fingerprint(candles) if self.cache_indicators else None
+                with self._cache_lock:
+                    cached = self._indicator_cache.get(timeframe)
+                if key is not None and cached is not None and cached[0] == key:
+                    ctx.candles = cached[1]
+                    ctx.cached = True
+                    with self._cache_lock:
+                        self.cache_hits += 1
+                else:
+                    ctx.candles = self._timed(ctx, 'indicators', self.indicators, candles)
+                    if key is not None:
+                        with self._cache_lock:
+                            self._indicator_cache[timeframe] = (key, ctx.candles)
+            except Exception as e:
+                ctx.error = e
+        return ctx
+
+    def prepare_all(self, fetch: Optional[Callable[[str], pd.DataFrame]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Run only the fetch and indicator stages for every timeframe.
+
+        Args:
+            fetch: Fetch stage for this pass only (e.g. state_checkpoint.warm_start_fetch)
+
+        Returns:
+            Dict of timeframe -> candles with indicators
+        """
+        for ctx in self.executor.map(lambda timeframe: self._prepare(timeframe, fetch), self.timeframes):
+            if ctx.error:
+                raise ctx.error
+            if ctx.candles is not None:
+                self.candle_data[ctx.timeframe] = ctx.candles
+        return dict(self.candle_data)
+
+    def _process(self, ctx: ScanContext) -> None:
+        """Gate, detect, report, filter and alert stages (calling thread)."""
+        self.candle_data[ctx.timeframe] = ctx.candles
+
+        with latency_trace.tracing(self.symbol or self.name, ctx.timeframe, trace=ctx.trace):
+            if self.gate and not self._timed(ctx, 'gate', self.gate, ctx):
+                ctx.skipped = ctx.skipped or "gated"
+                self._record_scan(ctx)
+                return
+
+            ctx.detected = ctx.signal = self._timed(ctx, 'detect', self.detect, ctx)
+            self._record_scan(ctx)
+
+            if self.report:
+                self._timed(ctx, 'report', self.report, ctx)
+
+            if ctx.signal is None:
+                return
+
+            if self.events is not None:
+                self.events.record_signal('signal', ctx.signal, symbol=self.symbol)
+
+            for signal_filter in self.filters:
+                if not self._timed(ctx, 'filter', signal_filter, ctx):
+                    if self.events is not None:
+                        reason = ctx.rejection_reason or getattr(signal_filter, '__name__', type(signal_filter).__name__)
+                        self.events.record_signal('rejection', ctx.signal, reason=reason, symbol=self.symbol)
+                    ctx.signal = None
+                    return
+
+            if self.alert:
+                self._timed(ctx, 'alert', self.alert, ctx)
+                if self.events is not None:
+                    self.events.record_signal('alert', ctx.signal, symbol=self.symbol)
+
+    def _record_scan(self, ctx: ScanContext) -> None:
+        """Append the scan of one timeframe to the event log."""
+        if self.events is None:
+            return
+        last = ctx.candles.iloc[-1] if ctx.candles is not None and not ctx.candles.empty else None
+        self.events.record(
+            'scan',
+            symbol=self.symbol,
+            strategy=getattr(ctx.detected, 'strategy', None) or None,
+            timeframe=ctx.timeframe,
+            direction=getattr(ctx.detected, 'signal_type', None),
+            price=last['close'] if last is not None and 'close' in last else None,
+            reason=ctx.skipped,
+            scanner=self.name,
+            cached=ctx.cached
+        )
+
+    def run_cycle(self) -> Dict[str, ScanContext]:
+        """
+        Run one scan cycle over all timeframes.
+
+        Returns:
+            Dict of timeframe -> ScanContext
+        """
+        started = time.perf_counter()
+        futures = [self.executor.submit(self._prepare, timeframe) for timeframe in self.timeframes]
+        results: Dict[str, ScanContext] = {}
+
+        for future in futures:
+            ctx = future.result()
+            results[ctx.timeframe] = ctx
+            if ctx.error is None and ctx.candles is not None:
+                try:
+                    self._process(ctx)
+                except Exception as e:
+                    ctx.error = e
+            if ctx.error is not None:
+                logger.error(f"Error processing {ctx.timeframe}: {ctx.error}")
+
+        self.cycles += 1
+        self.timer.record('cycle', time.perf_counter() - started)
+        logger.debug(f"{self.name} scan cycle: " + ", ".join(
+            f"{tf} [" + " ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in ctx.timings.items()) + "]"
+            for tf, ctx in results.items()
+        ))
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine statistics.
+
+        Returns:
+            Dict with cycle count, indicator cache hits and per-stage timings
+        """
+        return {
+            'cycles': self.cycles,
+            'indicator_cache_hits': self.cache_hits,
+            'stages': self.timer.summary(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
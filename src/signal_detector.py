@@ -1,8 +1,8 @@
 """Signal detection with confluence-based trading logic."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from collections import deque
 
@@ -22,6 +22,14 @@ from src.sl_tp_calculator import SLTPCalculator
 
 from src.symbol_context import SymbolContext
 
+from src.duplicate_suppressor import DuplicateSuppressor
+
+from src import virtual_clock
+
+from src import latency_trace
+
+from src import detector_rules
+
 
 
 
@@ -67,8 +75,17 @@ class Signal:
     strategy_metadata: Optional[Dict] = None  # Strategy-specific data (e.g., Fib levels, SR levels)
 
     
+
+    # Latency trace of the candle update that produced the signal (shared by signals of one update)
+    trace: Optional[latency_trace.SignalTrace] = field(default=None, repr=False, compare=False)
+
+    
     def __post_init__(self):
         """Validate symbol context on creation"""
+        if self.trace is None:
+            self.trace = latency_trace.current_trace()
+        latency_trace.mark('detect_signals', self)
+        
         # If symbol_context not provided, create from legacy symbol field
         if self.symbol_context is None and self.symbol:
             # Try to extract internal symbol from legacy format
@@ -98,6 +115,7 @@ class Signal:
         """Convert signal to dictionary."""
 
         data = asdict(self)
+        data.pop('trace', None)
         # Convert symbol_context to dict if present
         if self.symbol_context:
             data['symbol_context'] = self.symbol_context.to_dict()
@@ -208,6 +226,12 @@ class SignalDetector:
 
     """
 
+    # State kept across restarts by StateCheckpointer
+
+    CHECKPOINT_ATTRS = ('signal_history', 'duplicate_suppressor', 'h4_hvg_detectors')
+
+    
+
     
 
     def __init__(
@@ -274,9 +298,19 @@ class SignalDetector:
 
         
 
-        # Signal history for duplicate detection
+        # Signal history (most recent emitted signals) and duplicate index
 
         self.signal_history: deque = deque(maxlen=50)
+
+        self.duplicate_suppressor = DuplicateSuppressor(
+
+            window_minutes=duplicate_time_window_minutes,
+
+            price_threshold_percent=duplicate_price_threshold_percent,
+
+            retention_minutes=30
+
+        )
         
         # H4 HVG detector - will be initialized per-symbol when needed
         # This allows it to work for BTC, Gold, US30, etc.
@@ -365,11 +399,11 @@ class SignalDetector:
         """
         Detect mean reversion signals.
         
-        Strategy:
-        - Price overextended (> 1.5 ATR from VWAP)
-        - RSI extremes (< 25 oversold or > 75 overbought)
+        Strategy (conditions in detector_rules.mean_reversion_rules):
+        - Price overextended (>= 1.8 ATR from VWAP)
+        - RSI extremes (< 20 oversold or > 80 overbought)
         - Reversal candle patterns (pin bar, doji, engulfing)
-        - Volume >= 1.3x average
+        - Volume >= 1.5x average
         - Target VWAP for mean reversion
         
         Args:
@@ -381,23 +415,6 @@ class SignalDetector:
             Signal if detected, None otherwise
         """
         try:
-            if len(data) < 3:
-                return None
-            
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
-            # Check for required indicators
-            required_indicators = ['vwap', 'rsi', 'atr', 'volume', 'volume_ma']
-            if not all(ind in last.index for ind in required_indicators):
-                logger.debug(f"[{timeframe}] Missing required indicators for mean reversion detection")
-                return None
-            
-            # Check for NaN values
-            if pd.isna(last['vwap']) or pd.isna(last['rsi']) or pd.isna(last['atr']):
-                logger.warning(f"[{timeframe}] NaN values in indicators, skipping mean reversion")
-                return None
-            
             # Get asset-specific configuration
             asset_symbol = self._get_asset_symbol(symbol)
             asset_config = self.config.get('asset_specific', {}).get(asset_symbol, {})
@@ -406,46 +423,33 @@ class SignalDetector:
             volume_threshold = asset_config.get('volume_thresholds', {}).get('mean_reversion',
                                self.config.get('signal_rules', {}).get('volume_mean_reversion', 1.5))
             
-            atr = last['atr']
-            vwap = last['vwap']
-            current_price = last['close']
-            
-            # Check overextension (> 1.8 ATR from VWAP) - Updated from 1.5
-            distance_from_vwap = abs(current_price - vwap)
+            rules = detector_rules.mean_reversion_rules(volume_threshold)
             
-            if distance_from_vwap < (atr * 1.8):
-                logger.debug(f"[{timeframe}] Price not overextended: distance {distance_from_vwap:.2f} < {atr * 1.8:.2f} (1.8 ATR)")
+            # Check for required indicators
+            if rules.missing_columns(data):
+                logger.debug(f"[{timeframe}] Missing required indicators for mean reversion detection")
                 return None
             
-            # Check RSI extremes - Updated to <20 or >80 (stricter)
-            rsi_overbought = last['rsi'] > 80
-            rsi_oversold = last['rsi'] < 20
-            
-            if not (rsi_overbought or rsi_oversold):
-                logger.debug(f"[{timeframe}] RSI not extreme: {last['rsi']:.1f} (need < 20 or > 80)")
+            signal_type = rules.last_signal(data)
+            if signal_type is None:
+                logger.debug(f"[{timeframe}] No mean reversion setup (overextension, RSI extreme, volume, reversal candle)")
                 return None
             
-            # Calculate volume ratio
-            volume_ratio = last['volume'] / last['volume_ma']
+            last = data.iloc[-1]
+            prev = data.iloc[-2]
             
-            # Check volume confirmation
-            if volume_ratio < volume_threshold:
-                logger.debug(f"[{timeframe}] Volume too low: {volume_ratio:.2f}x (need >= {volume_threshold}x)")
-                return None
+            atr = last['atr']
+            vwap = last['vwap']
+            current_price = last['close']
+            distance_from_vwap = abs(current_price - vwap)
+            volume_ratio = last['volume'] / last['volume_ma']
             
-            # Detect reversal candles
             is_pin_bar = self._is_pin_bar(last)
             is_engulfing = self._is_engulfing(last, prev)
-            is_doji = self._is_doji(last)
-            
-            if not (is_pin_bar or is_engulfing or is_doji):
-                logger.info(f"[{timeframe}] Mean reversion rejected - no clear reversal pattern (pin bar, engulfing, or doji)")
-                return None
-            
             pattern_name = "pin bar" if is_pin_bar else ("engulfing" if is_engulfing else "doji")
             
             # Bullish reversal (price below VWAP, oversold)
-            if current_price < vwap and rsi_oversold:
+            if signal_type == "LONG":
                 logger.info(f"[{timeframe}] Bullish mean reversion detected - Price ${current_price:.2f} < VWAP ${vwap:.2f}, RSI {last['rsi']:.1f}, {pattern_name} pattern")
                 logger.info(f"[{timeframe}] Overextension: {distance_from_vwap:.2f} ({distance_from_vwap/atr:.1f} ATR), Volume {volume_ratio:.2f}x")
                 
@@ -485,7 +489,7 @@ class SignalDetector:
                 return signal
             
             # Bearish reversal (price above VWAP, overbought)
-            elif current_price > vwap and rsi_overbought:
+            elif signal_type == "SHORT":
                 logger.info(f"[{timeframe}] Bearish mean reversion detected - Price ${current_price:.2f} > VWAP ${vwap:.2f}, RSI {last['rsi']:.1f}, {pattern_name} pattern")
                 logger.info(f"[{timeframe}] Overextension: {distance_from_vwap:.2f} ({distance_from_vwap/atr:.1f} ATR), Volume {volume_ratio:.2f}x")
                 
@@ -537,12 +541,12 @@ class SignalDetector:
         """
         Detect EMA cloud breakout signals.
         
-        Strategy:
+        Strategy (conditions in detector_rules.ema_cloud_breakout_rules):
         - EMA(21) and EMA(50) aligned (bullish: EMA21 > EMA50, bearish: EMA21 < EMA50)
         - Price vs VWAP (bullish: price > VWAP, bearish: price < VWAP)
-        - RSI in range 25-75 (avoid extremes)
+        - RSI in range 30-70 (avoid extremes)
         - Volume >= 1.5x average (strong breakout)
-        - Range breakout (price breaks recent 10-candle high/low)
+        - Range breakout (price breaks recent 10-candle high/low by 0.2%)
         
         Args:
             data: DataFrame with indicators
@@ -553,23 +557,6 @@ class SignalDetector:
             Signal if detected, None otherwise
         """
         try:
-            if len(data) < 11:  # Need 10 candles for range + current
-                return None
-            
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
-            # Check for required indicators
-            required_indicators = ['ema_21', 'ema_50', 'vwap', 'rsi', 'volume', 'volume_ma', 'atr']
-            if not all(ind in last.index for ind in required_indicators):
-                logger.debug(f"[{timeframe}] Missing required indicators for EMA cloud breakout detection")
-                return None
-            
-            # Check for NaN values
-            if pd.isna(last['ema_21']) or pd.isna(last['ema_50']) or pd.isna(last['vwap']):
-                logger.warning(f"[{timeframe}] NaN values in indicators, skipping EMA cloud breakout")
-                return None
-            
             # Get asset-specific configuration
             asset_symbol = self._get_asset_symbol(symbol)
             asset_config = self.config.get('asset_specific', {}).get(asset_symbol, {})
@@ -578,118 +565,96 @@ class SignalDetector:
             volume_threshold = asset_config.get('volume_thresholds', {}).get('breakout',
                                self.config.get('signal_rules', {}).get('volume_ema_cloud_breakout', 1.5))
             
-            # Check EMA alignment
-            bullish_alignment = last['ema_21'] > last['ema_50']
-            bearish_alignment = last['ema_21'] < last['ema_50']
+            rules = detector_rules.ema_cloud_breakout_rules(volume_threshold)
             
-            if not (bullish_alignment or bearish_alignment):
-                logger.debug(f"[{timeframe}] No EMA alignment: EMA21={last['ema_21']:.2f}, EMA50={last['ema_50']:.2f}")
+            # Check for required indicators
+            if rules.missing_columns(data):
+                logger.debug(f"[{timeframe}] Missing required indicators for EMA cloud breakout detection")
                 return None
             
-            # Check VWAP position
-            price_above_vwap = last['close'] > last['vwap']
-            price_below_vwap = last['close'] < last['vwap']
-            
-            # Check RSI range (avoid extremes) - Updated to 30-70
-            if last['rsi'] < 30 or last['rsi'] > 70:
-                logger.debug(f"[{timeframe}] RSI extreme: {last['rsi']:.1f} (need 30-70 for breakout)")
+            signal_type = rules.last_signal(data)
+            if signal_type is None:
+                logger.debug(f"[{timeframe}] No EMA cloud breakout (alignment, VWAP side, RSI range, volume, range break)")
                 return None
             
-            # Calculate volume ratio
+            last = data.iloc[-1]
             volume_ratio = last['volume'] / last['volume_ma']
             
-            # Check volume threshold
-            if volume_ratio < volume_threshold:
-                logger.debug(f"[{timeframe}] Volume too low: {volume_ratio:.2f}x (need >= {volume_threshold}x)")
-                return None
-            
             # Bullish setup
-            if bullish_alignment and price_above_vwap:
-                # Check for breakout (price breaking above recent 10-candle high by at least 0.2%)
+            if signal_type == "LONG":
                 recent_high = data['high'].iloc[-11:-1].max()
-                breakout_threshold = recent_high * 1.002  # 0.2% above
+                logger.info(f"[{timeframe}] Bullish EMA cloud breakout detected - Price {last['close']:.2f} > Recent high {recent_high:.2f}")
+                logger.info(f"[{timeframe}] EMA21 {last['ema_21']:.2f} > EMA50 {last['ema_50']:.2f}, Price > VWAP {last['vwap']:.2f}, RSI {last['rsi']:.1f}, Volume {volume_ratio:.2f}x")
                 
-                logger.debug(f"[{timeframe}] Bullish EMA cloud: checking breakout above {breakout_threshold:.2f} (0.2% above {recent_high:.2f}), current: {last['close']:.2f}")
+                entry = last['close']
+                stop_loss = entry - (last['atr'] * 1.2)
+                take_profit = entry + (last['atr'] * 1.5)
+                risk_reward = (take_profit - entry) / (entry - stop_loss)
                 
-                if last['close'] > breakout_threshold:
-                    logger.info(f"[{timeframe}] Bullish EMA cloud breakout detected - Price {last['close']:.2f} > Recent high {recent_high:.2f}")
-                    logger.info(f"[{timeframe}] EMA21 {last['ema_21']:.2f} > EMA50 {last['ema_50']:.2f}, Price > VWAP {last['vwap']:.2f}, RSI {last['rsi']:.1f}, Volume {volume_ratio:.2f}x")
-                    
-                    entry = last['close']
-                    stop_loss = entry - (last['atr'] * 1.2)
-                    take_profit = entry + (last['atr'] * 1.5)
-                    risk_reward = (take_profit - entry) / (entry - stop_loss)
-                    
-                    signal = Signal(
-                        timestamp=last['timestamp'],
-                        signal_type="LONG",
-                        timeframe=timeframe,
-                        symbol=symbol,
-                        symbol_context=self._create_symbol_context(symbol),
-                        entry_price=entry,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        atr=last['atr'],
-                        risk_reward=risk_reward,
-                        market_bias="bullish",
-                        confidence=4,
-                        indicators={
-                            'ema_21': last['ema_21'],
-                            'ema_50': last['ema_50'],
-                            'vwap': last['vwap'],
-                            'rsi': last['rsi'],
-                            'volume': last['volume'],
-                            'volume_ma': last['volume_ma']
-                        },
-                        reasoning=f"EMA Cloud Breakout: Bullish alignment, price > VWAP, breakout above {recent_high:.2f}, Volume {volume_ratio:.2f}x",
-                        strategy="EMA Cloud Breakout"
-                    )
-                    
-                    return signal
+                signal = Signal(
+                    timestamp=last['timestamp'],
+                    signal_type="LONG",
+                    timeframe=timeframe,
+                    symbol=symbol,
+                    symbol_context=self._create_symbol_context(symbol),
+                    entry_price=entry,
+                    stop_loss=stop_loss,
+                    take_profit=take_profit,
+                    atr=last['atr'],
+                    risk_reward=risk_reward,
+                    market_bias="bullish",
+                    confidence=4,
+                    indicators={
+                        'ema_21': last['ema_21'],
+                        'ema_50': last['ema_50'],
+                        'vwap': last['vwap'],
+                        'rsi': last['rsi'],
+                        'volume': last['volume'],
+                        'volume_ma': last['volume_ma']
+                    },
+                    reasoning=f"EMA Cloud Breakout: Bullish alignment, price > VWAP, breakout above {recent_high:.2f}, Volume {volume_ratio:.2f}x",
+                    strategy="EMA Cloud Breakout"
+                )
+                
+                return signal
             
             # Bearish setup
-            elif bearish_alignment and price_below_vwap:
-                # Check for breakdown (price breaking below recent 10-candle low by at least 0.2%)
+            elif signal_type == "SHORT":
                 recent_low = data['low'].iloc[-11:-1].min()
-                breakdown_threshold = recent_low * 0.998  # 0.2% below
+                logger.info(f"[{timeframe}] Bearish EMA cloud breakdown detected - Price {last['close']:.2f} < Recent low {recent_low:.2f}")
+                logger.info(f"[{timeframe}] EMA21 {last['ema_21']:.2f} < EMA50 {last['ema_50']:.2f}, Price < VWAP {last['vwap']:.2f}, RSI {last['rsi']:.1f}, Volume {volume_ratio:.2f}x")
                 
-                logger.debug(f"[{timeframe}] Bearish EMA cloud: checking breakdown below {breakdown_threshold:.2f} (0.2% below {recent_low:.2f}), current: {last['close']:.2f}")
+                entry = last['close']
+                stop_loss = entry + (last['atr'] * 1.2)
+                take_profit = entry - (last['atr'] * 1.5)
+                risk_reward = (entry - take_profit) / (stop_loss - entry)
                 
-                if last['close'] < breakdown_threshold:
-                    logger.info(f"[{timeframe}] Bearish EMA cloud breakdown detected - Price {last['close']:.2f} < Recent low {recent_low:.2f}")
-                    logger.info(f"[{timeframe}] EMA21 {last['ema_21']:.2f} < EMA50 {last['ema_50']:.2f}, Price < VWAP {last['vwap']:.2f}, RSI {last['rsi']:.1f}, Volume {volume_ratio:.2f}x")
-                    
-                    entry = last['close']
-                    stop_loss = entry + (last['atr'] * 1.2)
-                    take_profit = entry - (last['atr'] * 1.5)
-                    risk_reward = (entry - take_profit) / (stop_loss - entry)
-                    
-                    signal = Signal(
-                        timestamp=last['timestamp'],
-                        signal_type="SHORT",
-                        timeframe=timeframe,
-                        symbol=symbol,
-                        symbol_context=self._create_symbol_context(symbol),
-                        entry_price=entry,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        atr=last['atr'],
-                        risk_reward=risk_reward,
-                        market_bias="bearish",
-                        confidence=4,
-                        indicators={
-                            'ema_21': last['ema_21'],
-                            'ema_50': last['ema_50'],
-                            'vwap': last['vwap'],
-                            'rsi': last['rsi'],
-                            'volume': last['volume'],
-                            'volume_ma': last['volume_ma']
-                        },
-                        reasoning=f"EMA Cloud Breakout: Bearish alignment, price < VWAP, breakdown below {recent_low:.2f}, Volume {volume_ratio:.2f}x",
-                        strategy="EMA Cloud Breakout"
-                    )
-                    
-                    return signal
+                signal = Signal(
+                    timestamp=last['timestamp'],
+                    signal_type="SHORT",
+                    timeframe=timeframe,
+                    symbol=symbol,
+                    symbol_context=self._create_symbol_context(symbol),
+                    entry_price=entry,
+                    stop_loss=stop_loss,
+                    take_profit=take_profit,
+                    atr=last['atr'],
+                    risk_reward=risk_reward,
+                    market_bias="bearish",
+                    confidence=4,
+                    indicators={
+                        'ema_21': last['ema_21'],
+                        'ema_50': last['ema_50'],
+                        'vwap': last['vwap'],
+                        'rsi': last['rsi'],
+                        'volume': last['volume'],
+                        'volume_ma': last['volume_ma']
+                    },
+                    reasoning=f"EMA Cloud Breakout: Bearish alignment, price < VWAP, breakdown below {recent_low:.2f}, Volume {volume_ratio:.2f}x",
+                    strategy="EMA Cloud Breakout"
+                )
+                
+                return signal
             
             return None
             
@@ -704,7 +669,7 @@ class SignalDetector:
         """
         Detect trend alignment signals - cascade EMA alignment with RSI confirmation.
         
-        Strategy:
+        Strategy (conditions in detector_rules.trend_alignment_rules):
         - Bullish: Price > EMA9 > EMA21 > EMA50 (cascade alignment)
         - Bearish: Price < EMA9 < EMA21 < EMA50 (cascade alignment)
         - RSI > 50 (bullish) or < 50 (bearish)
@@ -721,23 +686,6 @@ class SignalDetector:
             Signal if detected, None otherwise
         """
         try:
-            if len(data) < 3:
-                return None
-            
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
-            # Check for required indicators
-            required_indicators = ['ema_9', 'ema_21', 'ema_50', 'rsi', 'adx', 'volume', 'volume_ma', 'atr']
-            if not all(ind in last.index for ind in required_indicators):
-                logger.debug(f"[{timeframe}] Missing required indicators for trend alignment detection")
-                return None
-            
-            # Check for NaN values
-            if pd.isna(last['ema_9']) or pd.isna(last['ema_21']) or pd.isna(last['ema_50']):
-                logger.warning(f"[{timeframe}] NaN values in EMA indicators, skipping trend alignment")
-                return None
-            
             # Get asset-specific configuration
             asset_symbol = self._get_asset_symbol(symbol)
             asset_config = self.config.get('asset_specific', {}).get(asset_symbol, {})
@@ -748,50 +696,23 @@ class SignalDetector:
             volume_threshold = asset_config.get('volume_thresholds', {}).get('trend_alignment',
                                self.config.get('signal_rules', {}).get('volume_trend_alignment', 0.8))
             
-            # Check ADX >= threshold (strong trend)
-            if last['adx'] < adx_threshold:
-                logger.info(f"[{timeframe}] Trend alignment rejected - ADX too low: {last['adx']:.1f} < {adx_threshold} (asset: {asset_symbol})")
-                return None
+            rules = detector_rules.trend_alignment_rules(adx_threshold, volume_threshold)
             
-            # Calculate volume ratio
-            volume_ratio = last['volume'] / last['volume_ma']
-            
-            # Check volume threshold
-            if volume_ratio < volume_threshold:
-                logger.debug(f"[{timeframe}] Volume too low: {volume_ratio:.2f}x (need >= {volume_threshold}x)")
+            # Check for required indicators
+            if rules.missing_columns(data):
+                logger.debug(f"[{timeframe}] Missing required indicators for trend alignment detection")
                 return None
             
-            # Check for bullish cascade alignment
-            is_bullish_cascade = (
-                last['close'] > last['ema_9'] and
-                last['ema_9'] > last['ema_21'] and
-                last['ema_21'] > last['ema_50']
-            )
-            
-            # Check for bearish cascade alignment
-            is_bearish_cascade = (
-                last['close'] < last['ema_9'] and
-                last['ema_9'] < last['ema_21'] and
-                last['ema_21'] < last['ema_50']
-            )
-            
-            # Log cascade status
-            logger.debug(f"[{timeframe}] Checking cascade: Price={last['close']:.2f}, EMA9={last['ema_9']:.2f}, EMA21={last['ema_21']:.2f}, EMA50={last['ema_50']:.2f}")
-            
-            if is_bullish_cascade:
-                logger.info(f"[{timeframe}] Bullish cascade detected: Price > EMA9 > EMA21 > EMA50")
-            elif is_bearish_cascade:
-                logger.info(f"[{timeframe}] Bearish cascade detected: Price < EMA9 < EMA21 < EMA50")
-            else:
-                logger.debug(f"[{timeframe}] No trend cascade detected")
+            signal_type = rules.last_signal(data)
+            if signal_type is None:
+                logger.debug(f"[{timeframe}] No trend alignment (ADX >= {adx_threshold}, volume, EMA cascade, RSI direction)")
                 return None
             
-            # Check RSI direction (rising for bullish, falling for bearish)
-            rsi_rising = last['rsi'] > prev['rsi']
-            rsi_falling = last['rsi'] < prev['rsi']
+            last = data.iloc[-1]
+            volume_ratio = last['volume'] / last['volume_ma']
             
             # Bullish Trend Alignment Signal
-            if is_bullish_cascade and last['rsi'] > 50 and rsi_rising:
+            if signal_type == "LONG":
                 logger.info(f"[{timeframe}] Bullish trend alignment conditions met - RSI: {last['rsi']:.1f} (rising), ADX: {last['adx']:.1f}, Volume: {volume_ratio:.2f}x")
                 
                 entry = last['close']
@@ -828,7 +749,7 @@ class SignalDetector:
                 return signal
             
             # Bearish Trend Alignment Signal
-            elif is_bearish_cascade and last['rsi'] < 50 and rsi_falling:
+            elif signal_type == "SHORT":
                 logger.info(f"[{timeframe}] Bearish trend alignment conditions met - RSI: {last['rsi']:.1f} (falling), ADX: {last['adx']:.1f}, Volume: {volume_ratio:.2f}x")
                 
                 entry = last['close']
@@ -864,19 +785,6 @@ class SignalDetector:
                 
                 return signal
             
-            else:
-                # Log why signal was not generated
-                if is_bullish_cascade:
-                    if last['rsi'] <= 50:
-                        logger.debug(f"[{timeframe}] Bullish cascade but RSI too low: {last['rsi']:.1f} (need > 50)")
-                    elif not rsi_rising:
-                        logger.debug(f"[{timeframe}] Bullish cascade but RSI not rising: {prev['rsi']:.1f} -> {last['rsi']:.1f}")
-                elif is_bearish_cascade:
-                    if last['rsi'] >= 50:
-                        logger.debug(f"[{timeframe}] Bearish cascade but RSI too high: {last['rsi']:.1f} (need < 50)")
-                    elif not rsi_falling:
-                        logger.debug(f"[{timeframe}] Bearish cascade but RSI not falling: {prev['rsi']:.1f} -> {last['rsi']:.1f}")
-            
             return None
             
         except KeyError as e:
@@ -1114,7 +1022,7 @@ class SignalDetector:
         # Check timestamp freshness
         if 'timestamp' in last.index:
             expected_interval = self._get_interval_seconds(timeframe)
-            age_seconds = (datetime.now() - last['timestamp']).total_seconds()
+            age_seconds = (virtual_clock.now() - last['timestamp']).total_seconds()
             
             if age_seconds > expected_interval * 2:
                 issues.append(f"Stale data: {age_seconds:.0f}s old (expected < {expected_interval * 2}s)")
@@ -1170,7 +1078,7 @@ class SignalDetector:
             True if signal is stale, False if fresh
         """
         try:
-            now = datetime.now()
+            now = virtual_clock.now()
             signal_age = now - signal.timestamp
             age_minutes = signal_age.total_seconds() / 60
             
@@ -1222,7 +1130,7 @@ class SignalDetector:
         # Check timestamp freshness
         try:
             expected_interval = self._get_interval_seconds(timeframe)
-            age_seconds = (datetime.now() - last['timestamp']).total_seconds()
+            age_seconds = (virtual_clock.now() - last['timestamp']).total_seconds()
             
             if age_seconds > expected_interval * 2:
                 issues.append(f"Stale data: {age_seconds:.0f}s old (expected < {expected_interval * 2}s)")
@@ -1368,7 +1276,7 @@ class SignalDetector:
 
                     # Valid signal found
 
-                    self.signal_history.append(signal)
+                    self._record_signal(signal)
 
                     logger.info(f"✓ {strategy_name} detected {signal.signal_type} signal on {timeframe}")
 
@@ -1416,7 +1324,7 @@ class SignalDetector:
 
                 if extreme_rsi_signal and not self._is_duplicate_signal(extreme_rsi_signal) and not self._is_signal_stale(extreme_rsi_signal):
 
-                    self.signal_history.append(extreme_rsi_signal)
+                    self._record_signal(extreme_rsi_signal)
 
                     logger.info(f"✓ Extreme RSI detected {extreme_rsi_signal.signal_type} signal on {timeframe}")
 
@@ -1452,7 +1360,7 @@ class SignalDetector:
 
                 if hvg_signal and not self._is_duplicate_signal(hvg_signal) and not self._is_signal_stale(hvg_signal):
 
-                    self.signal_history.append(hvg_signal)
+                    self._record_signal(hvg_signal)
 
                     logger.info(f"✓ H4 HVG detected {hvg_signal.signal_type} signal on {timeframe}")
 
@@ -2025,83 +1933,25 @@ class SignalDetector:
 
         """
 
-        time_threshold = timedelta(minutes=self.duplicate_time_window_minutes)
-
-        
-
-        logger.debug(f"Checking for duplicates: history has {len(self.signal_history)} signals, threshold={self.duplicate_time_window_minutes}min")
-
-        
-
-        for prev_signal in self.signal_history:
-
-            # Check same signal type
-
-            if prev_signal.signal_type != signal.signal_type:
-
-                continue
-
-            
-
-            # Check time window
-
-            time_diff = signal.timestamp - prev_signal.timestamp
-
-            if time_diff < time_threshold:
+        return self.duplicate_suppressor.is_duplicate(signal)
 
-                # Check price movement
-
-                price_change_percent = abs(
-
-                    signal.entry_price - prev_signal.entry_price
-
-                ) / prev_signal.entry_price * 100
-
-                
-
-                logger.debug(f"Checking duplicate: time_diff={time_diff.total_seconds()}s, price_change={price_change_percent:.4f}%, threshold={self.duplicate_price_threshold_percent}%")
-
-                
-
-                if price_change_percent < self.duplicate_price_threshold_percent:
+    
 
-                    logger.debug(f"Duplicate signal blocked: {signal.signal_type} within {time_diff.total_seconds()}s, price change {price_change_percent:.4f}%")
+    def _record_signal(self, signal: Signal) -> None:
 
-                    return True
+        """Add an emitted signal to history and the duplicate index."""
 
-        
+        self.signal_history.append(signal)
 
-        return False
+        self.duplicate_suppressor.record(signal)
 
     
 
     def _clean_expired_signals(self) -> None:
 
-        """Remove signals older than 30 minutes from the most recent signal."""
-
-        if not self.signal_history:
-
-            return
-
-        
-
-        # Use the most recent signal's timestamp as reference
+        """Expire duplicate-index entries older than 30 minutes from the most recent signal."""
 
-        most_recent_time = max(s.timestamp for s in self.signal_history)
-
-        cutoff_time = most_recent_time - timedelta(minutes=30)
-
-        
-
-        # Filter out expired signals
-
-        self.signal_history = deque(
-
-            [s for s in self.signal_history if s.timestamp > cutoff_time],
-
-            maxlen=50
-
-        )
+        self.duplicate_suppressor.expire()
 
     
 
@@ -3843,7 +3693,7 @@ class SignalDetector:
         """
         Detect ADX + RSI + Momentum confluence signals.
         
-        Strategy:
+        Strategy (conditions in detector_rules.adx_rsi_momentum_rules):
         1. Check ADX > adx_min (trend forming, default 20)
         2. Check ADX > adx_strong for strong trend (default 25)
         3. Detect RSI directional crosses (above/below 50)
@@ -3868,77 +3718,31 @@ class SignalDetector:
             Signal if detected, None otherwise
         """
         try:
-            if len(data) < 5:
-                logger.debug(f"[{timeframe}] Insufficient data for ADX+RSI+Momentum detection")
-                return None
-            
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            prev2 = data.iloc[-3]
+            rules = detector_rules.adx_rsi_momentum_rules(adx_min, rsi_momentum_threshold, volume_threshold,
+                                                          require_adx_rising)
             
             # Check for required indicators
-            required_indicators = ['adx', 'rsi', 'atr', 'volume', 'volume_ma']
-            if not all(ind in last.index for ind in required_indicators):
+            if rules.missing_columns(data):
                 logger.debug(f"[{timeframe}] Missing required indicators for ADX+RSI+Momentum detection")
                 return None
             
-            # Check ADX >= minimum (trend forming)
-            if last['adx'] < adx_min:
-                logger.debug(f"[{timeframe}] ADX too low: {last['adx']:.1f} (need >= {adx_min})")
+            signal_type = rules.last_signal(data)
+            if signal_type is None:
+                logger.debug(f"[{timeframe}] No ADX+RSI+Momentum confluence (ADX, RSI momentum, volume, price direction)")
                 return None
             
-            # Reject if ADX < 18 (too flat)
-            if last['adx'] < 18:
-                logger.debug(f"[{timeframe}] Market too flat: ADX {last['adx']:.1f} < 18")
-                return None
+            last = data.iloc[-1]
+            prev = data.iloc[-2]
+            prev2 = data.iloc[-3]
             
-            # Check if ADX is rising (strengthening trend)
             adx_rising = last['adx'] > prev['adx']
-            
-            if require_adx_rising and not adx_rising:
-                logger.debug(f"[{timeframe}] ADX not rising: {prev['adx']:.1f} -> {last['adx']:.1f}")
-                return None
-            
-            # Determine if strong trend
             is_strong_trend = last['adx'] > adx_strong
-            
-            # Check RSI directional position
             rsi = last['rsi']
-            rsi_prev = prev['rsi']
-            rsi_prev2 = prev2['rsi']
-            
-            # Calculate RSI momentum (change over last 2 candles)
-            rsi_momentum = abs(rsi - rsi_prev2)
-            
-            if rsi_momentum < rsi_momentum_threshold:
-                logger.debug(f"[{timeframe}] RSI momentum too low: {rsi_momentum:.1f} (need >= {rsi_momentum_threshold})")
-                return None
-            
-            # Check volume confirmation
+            rsi_momentum = abs(rsi - prev2['rsi'])
             volume_ratio = last['volume'] / last['volume_ma'] if last['volume_ma'] > 0 else 0
-            if volume_ratio < volume_threshold:
-                logger.debug(f"[{timeframe}] Volume too low: {volume_ratio:.2f}x (need >= {volume_threshold}x)")
-                return None
-            
-            # Check price momentum alignment
-            current_price = last['close']
-            prev_price = prev['close']
-            prev2_price = prev2['close']
             
             # Bullish setup: RSI > 50, RSI rising, price making higher highs
-            if rsi > 50 and rsi > rsi_prev:
-                # Check price momentum (higher highs)
-                if current_price <= prev_price or prev_price <= prev2_price:
-                    logger.debug(f"[{timeframe}] Price not making higher highs for bullish setup")
-                    return None
-                
-                # Check for extreme RSI (require additional confirmation)
-                if rsi > 70:
-                    # In extreme zone - require very strong momentum
-                    if rsi_momentum < rsi_momentum_threshold * 1.5:
-                        logger.debug(f"[{timeframe}] RSI extreme ({rsi:.1f}) - need stronger momentum")
-                        return None
-                
+            if signal_type == "LONG":
                 # Calculate confidence
                 confidence = 4
                 if is_strong_trend:
@@ -4003,19 +3807,7 @@ class SignalDetector:
                 return signal
             
             # Bearish setup: RSI < 50, RSI falling, price making lower lows
-            elif rsi < 50 and rsi < rsi_prev:
-                # Check price momentum (lower lows)
-                if current_price >= prev_price or prev_price >= prev2_price:
-                    logger.debug(f"[{timeframe}] Price not making lower lows for bearish setup")
-                    return None
-                
-                # Check for extreme RSI (require additional confirmation)
-                if rsi < 30:
-                    # In extreme zone - require very strong momentum
-                    if rsi_momentum < rsi_momentum_threshold * 1.5:
-                        logger.debug(f"[{timeframe}] RSI extreme ({rsi:.1f}) - need stronger momentum")
-                        return None
-                
+            elif signal_type == "SHORT":
                 # Calculate confidence
                 confidence = 4
                 if is_strong_trend:
@@ -4079,9 +3871,7 @@ class SignalDetector:
                 
                 return signal
             
-            else:
-                logger.debug(f"[{timeframe}] No clear RSI directional signal: RSI {rsi:.1f}")
-                return None
+            return None
             
         except Exception as e:
             logger.error(f"Error in ADX+RSI+Momentum confluence detection: {e}", exc_info=True)
@@ -65,6 +65,10 @@ class SignalDiagnostics:
     Comprehensive diagnostic system for signal detection analysis
     """
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('detection_attempts', 'successful_detections', 'filter_rejections',
+                        'data_quality_issues', 'last_signal_time')
+    
     def __init__(self, scanner_name: str):
         """
         Initialize diagnostics tracker
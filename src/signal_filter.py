@@ -16,6 +16,12 @@ logger = logging.getLogger(__name__)
 class SignalFilter:
     """Filters signals to prevent conflicts and duplicates."""
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('recent_signals', 'active_trades')
+    
+    # Directory of suppressed_signals.log
+    LOG_DIR = Path("logs")
+    
     # Timeframe hierarchy for conflict resolution (higher value = higher priority)
     TIMEFRAME_HIERARCHY = {
         '1d': 6,
@@ -59,7 +65,7 @@ class SignalFilter:
         """Setup logger for suppressed signals."""
         try:
             # Create logs directory
-            log_dir = Path("logs")
+            log_dir = Path(self.LOG_DIR)
             log_dir.mkdir(exist_ok=True)
             
             # Create suppressed signals logger
@@ -5,11 +5,12 @@ Enhanced with confluence evaluation, confidence scoring, and risk-reward validat
 """
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
 from src.signal_detector import Signal
+from src.duplicate_suppressor import DuplicateSuppressor
+from src import latency_trace
 
 
 logger = logging.getLogger(__name__)
@@ -57,6 +58,12 @@ class SignalQualityFilter:
     Filters signals based on quality criteria and confidence scoring
     """
     
+    # Indicator columns evaluate_signal reads (adx only when present)
+    REQUIRED_INDICATORS = ('ema_9', 'ema_21', 'ema_50', 'vwap', 'volume_ma', 'rsi', 'atr', 'adx')
+    
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('duplicate_suppressor',)
+    
     def __init__(self, config: Optional[QualityConfig] = None, diagnostics=None):
         """
         Initialize signal quality filter
@@ -66,7 +73,14 @@ class SignalQualityFilter:
             diagnostics: Optional SignalDiagnostics instance for tracking
         """
         self.config = config or QualityConfig()
-        self.recent_signals: Dict[str, List[Tuple[datetime, Signal]]] = {}
+        self.duplicate_suppressor = DuplicateSuppressor(
+            window_minutes=self.config.duplicate_window_seconds / 60,
+            price_threshold_percent=self.config.duplicate_price_tolerance_pct,
+            retention_minutes=self.config.duplicate_window_seconds * 2 / 60,
+            max_per_key=10,
+            significant_move_percent=self.config.significant_price_move_pct,
+            rsi_reset_points=15
+        )
         self.diagnostics = diagnostics
         
         logger.info(f"Initialized SignalQualityFilter: "
@@ -183,6 +197,7 @@ class SignalQualityFilter:
         if self.diagnostics:
             self.diagnostics.log_detection_attempt("Quality Filter", True)
         
+        latency_trace.mark('quality_filter', signal)
         return FilterResult(
             passed=True,
             confidence_score=confidence_score,
@@ -329,15 +344,16 @@ class SignalQualityFilter:
     
     def check_duplicate(self, signal: Signal) -> bool:
         """
-        Check if similar signal was sent recently for this symbol
+        Check if similar signal was sent recently for this symbol and timeframe
         
         Considers signals duplicate if:
-        - Same signal type (LONG/SHORT)
-        - Entry price within tolerance (0.5%)
+        - Same symbol, timeframe and signal type (LONG/SHORT)
+        - Entry price within tolerance
         - Within time window
         
         Allows new signals if:
-        - Price moved significantly (>1.0%)
+        - Price moved significantly
+        - RSI changed by 15 points or more
         
         Args:
             signal: Signal to check
@@ -345,57 +361,10 @@ class SignalQualityFilter:
         Returns:
             True if duplicate, False otherwise
         """
-        # Get symbol from signal
-        symbol = signal.symbol
-        if hasattr(signal, 'symbol_context') and signal.symbol_context:
-            symbol = signal.symbol_context.symbol
-        
-        # Clean expired signals
-        self._clean_expired_signals()
-        
-        # Check recent signals for this symbol
-        if symbol not in self.recent_signals:
-            self.recent_signals[symbol] = []
-            return False
-        
-        time_threshold = timedelta(seconds=self.config.duplicate_window_seconds)
-        
-        for timestamp, prev_signal in self.recent_signals[symbol]:
-            # Check same signal type
-            if prev_signal.signal_type != signal.signal_type:
-                continue
-            
-            # Allow if different timeframe (NEW RULE)
-            if hasattr(prev_signal, 'timeframe') and hasattr(signal, 'timeframe'):
-                if prev_signal.timeframe != signal.timeframe:
-                    logger.debug(f"Different timeframe ({prev_signal.timeframe} vs {signal.timeframe}), allowing signal")
-                    continue
-            
-            # Check time window
-            time_diff = signal.timestamp - timestamp
-            if time_diff < time_threshold:
-                # Check price proximity (within tolerance)
-                price_diff_pct = abs(signal.entry_price - prev_signal.entry_price) / prev_signal.entry_price * 100
-                
-                # Allow new signal if price moved significantly (1.5%)
-                if price_diff_pct >= self.config.significant_price_move_pct:
-                    logger.debug(f"Significant price move ({price_diff_pct:.2f}%), allowing new signal")
-                    continue
-                
-                # Allow if RSI changed significantly (NEW RULE)
-                if 'rsi' in signal.indicators and 'rsi' in prev_signal.indicators:
-                    rsi_diff = abs(signal.indicators['rsi'] - prev_signal.indicators['rsi'])
-                    if rsi_diff >= 15:
-                        logger.debug(f"Significant RSI change ({rsi_diff:.1f}), allowing signal")
-                        continue
-                
-                # Check if within duplicate tolerance (1.0%)
-                if price_diff_pct < self.config.duplicate_price_tolerance_pct:
-                    logger.info(f"Duplicate signal detected for {symbol}: {signal.signal_type} within {time_diff.seconds}s, price diff {price_diff_pct:.2f}%")
-                    logger.info(f"  Previous: {prev_signal.entry_price:.2f} @ {timestamp}")
-                    logger.info(f"  Current:  {signal.entry_price:.2f} @ {signal.timestamp}")
-                    return True
-        
+        if self.duplicate_suppressor.is_duplicate(signal):
+            logger.info(f"Duplicate signal detected for {DuplicateSuppressor.key_for(signal)}: "
+                        f"{signal.signal_type} @ {signal.entry_price:.2f}")
+            return True
         return False
     
     def suppress_duplicate(self, signal: Signal, reason: str):
@@ -419,31 +388,7 @@ class SignalQualityFilter:
         Args:
             signal: Signal to add
         """
-        symbol = signal.symbol
-        if hasattr(signal, 'symbol_context') and signal.symbol_context:
-            symbol = signal.symbol_context.symbol
-        
-        if symbol not in self.recent_signals:
-            self.recent_signals[symbol] = []
-        
-        self.recent_signals[symbol].append((signal.timestamp, signal))
-        
-        # Keep only recent signals (last 10 per symbol)
-        self.recent_signals[symbol] = self.recent_signals[symbol][-10:]
-    
-    def _clean_expired_signals(self):
-        """Remove signals older than duplicate window from history"""
-        cutoff_time = datetime.now() - timedelta(seconds=self.config.duplicate_window_seconds * 2)
-        
-        for symbol in list(self.recent_signals.keys()):
-            self.recent_signals[symbol] = [
-                (ts, sig) for ts, sig in self.recent_signals[symbol]
-                if ts > cutoff_time
-            ]
-            
-            # Remove empty symbol entries
-            if not self.recent_signals[symbol]:
-                del self.recent_signals[symbol]
+        self.duplicate_suppressor.record(signal)
     
     def _check_trend_alignment(self, signal: Signal, last_candle: pd.Series) -> bool:
         """
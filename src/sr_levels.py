@@ -0,0 +1,153 @@
+"""
+Support/Resistance Levels
+Vectorized swing-point discovery, level clustering and touch counting over OHLC arrays
+"""
+from typing import NamedTuple, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class LevelScores(NamedTuple):
+    """Levels with their touch statistics (parallel arrays)."""
+    price: np.ndarray        # Level prices, ascending
+    touches: np.ndarray      # Bars whose high/low came within tolerance of the level
+    last_touch: np.ndarray   # Row index of the latest touch (-1 if never touched)
+    strength: np.ndarray     # touches / max_touches, capped at 1.0
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def select(self, mask: np.ndarray) -> 'LevelScores':
+        """Keep the levels where ``mask`` is True."""
+        return LevelScores(self.price[mask], self.touches[mask], self.last_touch[mask], self.strength[mask])
+
+
+def local_extrema(values: np.ndarray, kind: str, window: int = 1, strict: bool = True) -> np.ndarray:
+    """
+    Indices of local highs or lows.
+
+    Args:
+        values: Highs (kind='high') or lows (kind='low')
+        kind: 'high' for maxima, 'low' for minima
+        window: Bars compared on each side
+        strict: With window=1, require the bar to beat both neighbours;
+            otherwise the bar only has to equal the window's extreme
+
+    Returns:
+        Ascending row indices (the first and last ``window`` bars never qualify)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 2 * window + 1:
+        return np.empty(0, dtype=np.int64)
+    centre = values[window:-window]
+    if strict and window == 1:
+        left, right = values[:-2], values[2:]
+        if kind == 'high':
+            mask = (centre > left) & (centre > right)
+        else:
+            mask = (centre < left) & (centre < right)
+    else:
+        windows = sliding_window_view(values, 2 * window + 1)
+        extreme = windows.max(axis=1) if kind == 'high' else windows.min(axis=1)
+        mask = centre == extreme
+    return np.flatnonzero(mask) + window
+
+
+def cluster_levels(levels: np.ndarray, tolerance_pct: float) -> np.ndarray:
+    """
+    Merge nearby levels by sorted 1-D binning.
+
+    Levels are sorted and swept into bins: a level joins the current bin
+    while it is within ``tolerance_pct`` percent of the bin's running mean,
+    otherwise it starts a new bin. Each bin is replaced by its mean. Every
+    bin's extent is found in one vectorized step from cumulative sums, so
+    the loop runs once per bin rather than once per level.
+
+    Args:
+        levels: Candidate prices
+        tolerance_pct: Distance from the bin mean, as % of it, inside one bin
+
+    Returns:
+        Bin means, ascending
+    """
+    levels = np.sort(np.asarray(levels, dtype=np.float64))
+    n = len(levels)
+    if n == 0:
+        return levels
+    cumsum = np.concatenate(([0.0], np.cumsum(levels)))
+    scale = 1 + tolerance_pct / 100
+
+    means = []
+    start = 0
+    while start < n:
+        # Mean of levels[start:j] for each candidate j; levels[j] joins if it stays within tolerance
+        j = np.arange(start + 1, n)
+        mean = (cumsum[j] - cumsum[start]) / (j - start)
+        outside = levels[j] > mean * scale
+        end = start + 1 + int(np.argmax(outside)) if outside.any() else n
+        means.append((cumsum[end] - cumsum[start]) / (end - start))
+        start = end
+    return np.array(means)
+
+
+def score_levels(levels: np.ndarray, prices: np.ndarray, tolerance_pct: float,
+                 max_touches: float = 5.0) -> LevelScores:
+    """
+    Count touches of every level in one broadcast over the price array.
+
+    A bar touches a level when its price is within ``tolerance_pct`` percent
+    of the level price.
+
+    Args:
+        levels: Level prices
+        prices: Lows (for support) or highs (for resistance), oldest first
+        tolerance_pct: Touch tolerance as % of the level price
+        max_touches: Touches that give full strength
+
+    Returns:
+        LevelScores in the order of ``levels``
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    tolerance = levels * (tolerance_pct / 100)
+    touched = np.abs(prices[None, :] - levels[:, None]) <= tolerance[:, None]
+
+    touches = touched.sum(axis=1)
+    last_touch = np.where(touches > 0, len(prices) - 1 - np.argmax(touched[:, ::-1], axis=1), -1)
+    strength = np.minimum(touches / max_touches, 1.0)
+    return LevelScores(levels, touches, last_touch, strength)
+
+
+def find_levels(highs: np.ndarray, lows: np.ndarray, tolerance_pct: float, min_touches: int = 0,
+                window: int = 1, strict: bool = True,
+                touch_tolerance_pct: float = None) -> Tuple[LevelScores, LevelScores]:
+    """
+    Support and resistance levels of an OHLC window.
+
+    Swing lows and highs are clustered into levels, then every level is
+    scored against the lows (support) or highs (resistance).
+
+    Args:
+        highs: High prices, oldest first
+        lows: Low prices, oldest first
+        tolerance_pct: Clustering tolerance (% of price)
+        min_touches: Drop levels touched fewer times
+        window: Bars compared on each side of a swing point
+        strict: See local_extrema()
+        touch_tolerance_pct: Touch tolerance (defaults to tolerance_pct)
+
+    Returns:
+        (support, resistance) LevelScores
+    """
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    if touch_tolerance_pct is None:
+        touch_tolerance_pct = tolerance_pct
+
+    result = []
+    for prices, kind in ((lows, 'low'), (highs, 'high')):
+        candidates = prices[local_extrema(prices, kind, window, strict)]
+        scores = score_levels(cluster_levels(candidates, tolerance_pct), prices, touch_tolerance_pct)
+        result.append(scores.select(scores.touches >= min_touches) if min_touches else scores)
+    return result[0], result[1]
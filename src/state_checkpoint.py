@@ -0,0 +1,406 @@
+"""
+State Checkpointing
+Periodic snapshots of scanner in-memory state for warm restarts
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+import logging
+
+import pandas as pd
+
+from src import virtual_clock
+from src.market_data_client import FRESHNESS_THRESHOLDS
+
+logger = logging.getLogger(__name__)
+
+
+CHECKPOINT_MAGIC = b'SCKP'
+CHECKPOINT_VERSION = 1
+
+
+class _NestedState(dict):
+    """Captured state of a checkpointable attribute, restored into the live object."""
+
+
+def capture_state(component: Any) -> Dict[str, Any]:
+    """
+    Collect the attributes a component lists in ``CHECKPOINT_ATTRS``.
+
+    Attributes that are themselves checkpointable are captured recursively, so
+    they are restored into the objects the new process built (keeping its
+    configuration). Everything else is taken as is and pickled whole.
+
+    Args:
+        component: Object with a CHECKPOINT_ATTRS tuple
+
+    Returns:
+        Attribute name -> value (references to live objects, not copies)
+    """
+    state = {}
+    for attr in component.CHECKPOINT_ATTRS:
+        value = getattr(component, attr, None)
+        if hasattr(value, 'CHECKPOINT_ATTRS'):
+            state[attr] = _NestedState(capture_state(value))
+        elif isinstance(value, dict) and type(value) is not dict:
+            state[attr] = dict(value)  # defaultdict factories are often lambdas
+        else:
+            state[attr] = value
+    return state
+
+
+def restore_state(component: Any, state: Mapping[str, Any]) -> None:
+    """
+    Apply captured state to a freshly constructed component.
+
+    Dicts are merged and deques refilled in place, so keys added by the new
+    configuration and deque lengths are kept; attributes that are no longer
+    listed, or were None when captured, are left alone.
+
+    Args:
+        component: Object with a CHECKPOINT_ATTRS tuple
+        state: Result of capture_state() from an earlier process
+    """
+    for attr, value in state.items():
+        if attr not in component.CHECKPOINT_ATTRS or value is None:
+            continue
+        current = getattr(component, attr, None)
+        if isinstance(value, _NestedState):
+            if hasattr(current, 'CHECKPOINT_ATTRS'):
+                restore_state(current, value)
+        elif isinstance(current, dict) and isinstance(value, dict):
+            current.update(value)
+        elif isinstance(current, deque) and isinstance(value, deque):
+            current.clear()
+            current.extend(value)
+        elif isinstance(current, set) and isinstance(value, set):
+            current.clear()
+            current.update(value)
+        else:
+            setattr(component, attr, value)
+
+
+def buffer_is_fresh(client: Any, timeframe: str, min_candles: int = 200) -> bool:
+    """
+    Whether a client's candle buffer (e.g. restored from a checkpoint) can stand in for a fetch.
+
+    Args:
+        client: Data client with ``buffers`` (timeframe -> candle dicts)
+        timeframe: Timeframe string
+        min_candles: Candles needed for the slowest indicator (EMA 200)
+
+    Returns:
+        True if the buffer holds enough candles and the last one is within
+        the timeframe's freshness threshold
+    """
+    buffer = getattr(client, 'buffers', {}).get(timeframe)
+    if not buffer or len(buffer) < min_candles:
+        return False
+    latest = pd.Timestamp(buffer[-1]['timestamp'])
+    if latest.tzinfo is not None:
+        latest = latest.tz_convert('UTC').tz_localize(None)
+    age_seconds = (virtual_clock.now(timezone.utc).replace(tzinfo=None) - latest).total_seconds()
+    return age_seconds < FRESHNESS_THRESHOLDS.get(timeframe, 300)
+
+
+def warm_start_fetch(client: Any, fetch: Callable[[str], pd.DataFrame]) -> Callable[[str], pd.DataFrame]:
+    """
+    Warm-up fetch stage that reads fresh restored buffers instead of the provider.
+
+    Args:
+        client: Data client with ``buffers`` and ``get_buffer_data``
+        fetch: Regular fetch stage (timeframe -> candles)
+
+    Returns:
+        Fetch stage for the first pass after a restart
+    """
+    def fetch_warm(timeframe: str) -> pd.DataFrame:
+        if buffer_is_fresh(client, timeframe):
+            logger.info(f"Using {timeframe} candles restored from checkpoint")
+            return client.get_buffer_data(timeframe)
+        return fetch(timeframe)
+    return fetch_warm
+
+
+class StateCheckpointer:
+    """
+    Writes registered components to one checkpoint file and restores them.
+
+    The file is a short header (magic and format version) followed by the
+    zlib-compressed pickle of every component's captured state. Writes go to
+    a temporary file that is fsynced and renamed over the old checkpoint, so
+    a crash mid-write leaves the previous checkpoint intact. Components are
+    captured while the scanners keep running; a capture that races with a
+    mutation is retried. Unchanged snapshots are not rewritten.
+
+    The file holds pickled objects and must only be read by the process that
+    wrote it: keep it on local disk, not in a shared location.
+    """
+
+    CAPTURE_ATTEMPTS = 3
+
+    def __init__(self, path: Union[str, Path], interval_seconds: float = 60,
+                 max_age_seconds: Optional[float] = 86400, compress_level: int = 1):
+        """
+        Initialize checkpointer.
+
+        Args:
+            path: Checkpoint file
+            interval_seconds: Time between background snapshots
+            max_age_seconds: Ignore checkpoints older than this at restore (None = any age)
+            compress_level: zlib level (1 favours speed)
+
+        Raises:
+            ValueError: If interval_seconds is not positive
+        """
+        if interval_seconds <= 0:
+            raise ValueError(f"interval_seconds must be positive (got {interval_seconds})")
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self.compress_level = compress_level
+
+        self.components: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_digest: Optional[bytes] = None
+
+        self.saves = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.last_save_ms = 0.0
+        self.last_size_bytes = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]]) -> Optional['StateCheckpointer']:
+        """
+        Build a checkpointer from a ``checkpoint`` config block.
+
+        Args:
+            config: e.g. ``{"path": "state/scanner.ckpt", "interval_seconds": 30}``
+
+        Returns:
+            StateCheckpointer, or None when no path is configured or it is disabled
+        """
+        if not config or not config.get('path') or not config.get('enabled', True):
+            return None
+        return cls(
+            config['path'],
+            interval_seconds=config.get('interval_seconds', 60),
+            max_age_seconds=config.get('max_age_seconds', 86400)
+        )
+
+    @classmethod
+    def for_components(cls, config: Optional[Mapping[str, Any]],
+                       components: Mapping[str, Any]) -> Optional['StateCheckpointer']:
+        """
+        Build a checkpointer from config and register the stateful components.
+
+        Components that are None or declare no CHECKPOINT_ATTRS are skipped,
+        so entrypoints can pass everything they build.
+
+        Args:
+            config: ``checkpoint`` config block (see from_config)
+            components: Name -> component
+
+        Returns:
+            StateCheckpointer, or None when checkpointing is not configured
+        """
+        checkpointer = cls.from_config(config)
+        if checkpointer is None:
+            return None
+        for name, component in components.items():
+            if hasattr(component, 'CHECKPOINT_ATTRS'):
+                checkpointer.register(name, component)
+        logger.info(f"Checkpointing enabled: {checkpointer.path} ({', '.join(checkpointer.components)})")
+        return checkpointer
+
+    def register(self, name: str, component: Any) -> None:
+        """
+        Include a component in checkpoints.
+
+        Args:
+            name: Stable name, unique within the file (e.g. 'scanner:BTC-USD')
+            component: Object with a CHECKPOINT_ATTRS tuple
+
+        Raises:
+            TypeError: If the component does not declare CHECKPOINT_ATTRS
+        """
+        if not hasattr(component, 'CHECKPOINT_ATTRS'):
+            raise TypeError(f"{type(component).__name__} does not declare CHECKPOINT_ATTRS")
+        with self._lock:
+            self.components[name] = component
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self.components.pop(name, None)
+
+    def _capture(self, name: str, component: Any) -> Optional[bytes]:
+        """Pickle one component, retrying if a scanner thread mutates it meanwhile."""
+        for attempt in range(self.CAPTURE_ATTEMPTS):
+            try:
+                return pickle.dumps(capture_state(component), protocol=pickle.HIGHEST_PROTOCOL)
+            except RuntimeError:
+                time.sleep(0.001 * (attempt + 1))  # "changed size during iteration"
+        logger.warning(f"Checkpoint of {name} skipped: it kept changing during capture")
+        return None
+
+    def checkpoint(self) -> bool:
+        """
+        Write a checkpoint now.
+
+        Returns:
+            True if the file was written, False if unchanged or the write failed
+        """
+        started = time.perf_counter()
+        with self._lock:
+            components = dict(self.components)
+
+        captured = {}
+        for name, component in components.items():
+            try:
+                data = self._capture(name, component)
+            except Exception as e:
+                logger.error(f"Checkpoint of {name} failed: {e}")
+                data = None
+            if data is not None:
+                captured[name] = data
+
+        digest = hashlib.blake2b(b''.join(k.encode() + v for k, v in sorted(captured.items()))).digest()
+        if digest == self._last_digest:
+            self.unchanged += 1
+            return False
+
+        payload = zlib.compress(pickle.dumps({
+            'saved_at': virtual_clock.time(),
+            'components': captured
+        }, protocol=pickle.HIGHEST_PROTOCOL), self.compress_level)
+        blob = CHECKPOINT_MAGIC + CHECKPOINT_VERSION.to_bytes(2, 'big') + payload
+
+        try:
+            self._write_atomic(blob)
+        except OSError as e:
+            self.failures += 1
+            logger.error(f"Could not write checkpoint {self.path}: {e}")
+            return False
+
+        self._last_digest = digest
+        self.saves += 1
+        self.last_size_bytes = len(blob)
+        self.last_save_ms = (time.perf_counter() - started) * 1000
+        logger.debug(f"Checkpoint written: {len(captured)} components, {len(blob):,} bytes "
+                     f"in {self.last_save_ms:.1f}ms")
+        return True
+
+    def _write_atomic(self, blob: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def restore(self) -> List[str]:
+        """
+        Restore registered components from the checkpoint file.
+
+        A missing, unreadable, stale or other-version file means a cold start;
+        a component that fails to restore is left as constructed.
+
+        Returns:
+            Names of the restored components
+        """
+        try:
+            blob = self.path.read_bytes()
+        except FileNotFoundError:
+            logger.info(f"No checkpoint at {self.path}: cold start")
+            return []
+        except OSError as e:
+            logger.warning(f"Could not read checkpoint {self.path}: {e}")
+            return []
+
+        if blob[:4] != CHECKPOINT_MAGIC:
+            logger.warning(f"{self.path} is not a checkpoint file: cold start")
+            return []
+        version = int.from_bytes(blob[4:6], 'big')
+        if version != CHECKPOINT_VERSION:
+            logger.warning(f"Checkpoint version {version} does not match {CHECKPOINT_VERSION}: cold start")
+            return []
+        try:
+            snapshot = pickle.loads(zlib.decompress(blob[6:]))
+        except Exception as e:
+            logger.warning(f"Checkpoint {self.path} is corrupt ({e}): cold start")
+            return []
+
+        age = virtual_clock.time() - snapshot['saved_at']
+        if self.max_age_seconds is not None and age > self.max_age_seconds:
+            logger.warning(f"Checkpoint is {age / 3600:.1f}h old: cold start")
+            return []
+
+        restored = []
+        with self._lock:
+            components = dict(self.components)
+        for name, data in snapshot['components'].items():
+            component = components.get(name)
+            if component is None:
+                continue
+            try:
+                restore_state(component, pickle.loads(data))
+                restored.append(name)
+            except Exception as e:
+                logger.warning(f"Could not restore {name} from checkpoint: {e}")
+
+        logger.info(f"Restored {len(restored)}/{len(components)} components from checkpoint "
+                    f"({age:.0f}s old)")
+        return restored
+
+    def start(self) -> None:
+        """Start writing checkpoints in the background."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="Checkpoint-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"Checkpointing to {self.path} every {self.interval_seconds}s")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Checkpoint failed: {e}", exc_info=True)
+
+    def stop(self, final: bool = True) -> None:
+        """
+        Stop the background writer.
+
+        Args:
+            final: Write one last checkpoint after the writer has stopped
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if final:
+            self.checkpoint()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path),
+            'components': len(self.components),
+            'saves': self.saves,
+            'unchanged': self.unchanged,
+            'failures': self.failures,
+            'last_save_ms': round(self.last_save_ms, 2),
+            'last_size_bytes': self.last_size_bytes
+        }
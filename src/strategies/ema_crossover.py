@@ -6,6 +6,8 @@ import logging
 from typing import Optional
 import pandas as pd
 
+from src.strategy_rules import StrategyRules
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +26,20 @@ class EMACrossover:
         self.slow_ema = self.config.get('slow_ema', 21)
         self.trend_ema = self.config.get('trend_ema', 50)
         self.volume_threshold = self.config.get('volume_threshold', 1.3)
+        
+        fast, slow = f'ema_{self.fast_ema}', f'ema_{self.slow_ema}'
+        self.rules = StrategyRules(
+            name="EMA Crossover",
+            long=f"{fast}[1] <= {slow}[1] and {fast} > {slow}",
+            short=f"{fast}[1] >= {slow}[1] and {fast} < {slow}",
+            filters=[
+                'not volume / volume_ma < volume_threshold',  # A NaN ratio passes
+                # ATR stop/target give risk/reward 1.33 whenever the risk is a number above 0
+                'abs(atr) > 0 and close == close',
+            ],
+            params={'volume_threshold': self.volume_threshold},
+        )
+        self.requires = self.rules.columns
     
     def detect_signal(
         self,
@@ -47,41 +63,22 @@ class EMACrossover:
                 logger.debug("Insufficient data for EMA crossover")
                 return None
             
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
             # Check for required indicators
-            required_indicators = [f'ema_{self.fast_ema}', f'ema_{self.slow_ema}', 'close', 'volume', 'volume_ma', 'atr']
-            if not all(ind in last.index for ind in required_indicators):
+            if self.rules.missing_columns(data):
                 logger.debug("Missing required EMA indicators")
                 return None
             
-            fast_ema_key = f'ema_{self.fast_ema}'
-            slow_ema_key = f'ema_{self.slow_ema}'
-            
-            # Check for crossover
-            prev_fast = prev[fast_ema_key]
-            prev_slow = prev[slow_ema_key]
-            curr_fast = last[fast_ema_key]
-            curr_slow = last[slow_ema_key]
-            
-            # Bullish crossover: fast crosses above slow
-            bullish_cross = prev_fast <= prev_slow and curr_fast > curr_slow
-            
-            # Bearish crossover: fast crosses below slow
-            bearish_cross = prev_fast >= prev_slow and curr_fast < curr_slow
-            
-            if not (bullish_cross or bearish_cross):
+            # Crossover, volume confirmation and risk/reward
+            signal_type = self.rules.last_signal(data)
+            if signal_type is None:
                 return None
             
-            # Check volume confirmation
+            last = data.iloc[-1]
+            curr_fast = last[f'ema_{self.fast_ema}']
+            curr_slow = last[f'ema_{self.slow_ema}']
+            bullish_cross = signal_type == "LONG"
             volume_ratio = last['volume'] / last['volume_ma']
-            if volume_ratio < self.volume_threshold:
-                logger.debug(f"Volume too low: {volume_ratio:.2f}x")
-                return None
             
-            # Determine signal type
-            signal_type = "LONG" if bullish_cross else "SHORT"
             entry = last['close']
             stop_loss = entry - (last['atr'] * 1.5) if bullish_cross else entry + (last['atr'] * 1.5)
             take_profit = entry + (last['atr'] * 2.0) if bullish_cross else entry - (last['atr'] * 2.0)
@@ -91,10 +88,6 @@ class EMACrossover:
             reward = abs(take_profit - entry)
             risk_reward = reward / risk if risk > 0 else 0
             
-            if risk_reward < 1.2:
-                logger.debug(f"Risk/reward too low: {risk_reward:.2f}")
-                return None
-            
             logger.info(f"EMA Crossover signal: {signal_type}")
             
             # Create signal object
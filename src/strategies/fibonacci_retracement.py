@@ -33,6 +33,7 @@ class FibonacciRetracement:
         self.level_tolerance_percent = self.config.get('level_tolerance_percent', 0.5)
         self.volume_threshold = self.config.get('volume_threshold', 1.3)
         self.require_reversal_candle = self.config.get('require_reversal_candle', True)
+        self.requires = ('high', 'low', 'close', 'volume', 'volume_ma', 'atr', 'rsi')
     
     def detect_signal(
         self,
@@ -60,8 +61,7 @@ class FibonacciRetracement:
             prev = data.iloc[-2]
             
             # Check for required indicators
-            required_indicators = ['high', 'low', 'close', 'volume', 'volume_ma', 'atr', 'rsi']
-            if not all(ind in last.index for ind in required_indicators):
+            if not all(ind in last.index for ind in self.requires):
                 logger.debug(f"Missing required indicators for Fibonacci strategy")
                 return None
             
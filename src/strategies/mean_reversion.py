@@ -6,6 +6,8 @@ import logging
 from typing import Optional
 import pandas as pd
 
+from src.strategy_rules import StrategyRules
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +26,21 @@ class MeanReversion:
         self.rsi_oversold = self.config.get('rsi_oversold', 30)
         self.volume_threshold = self.config.get('volume_threshold', 1.3)
         self.bb_std_dev = self.config.get('bb_std_dev', 2.0)
+        
+        # Mean reversion trades against the extreme
+        self.rules = StrategyRules(
+            name="Mean Reversion",
+            long="rsi < rsi_oversold",
+            short="rsi > rsi_overbought",
+            filters=[
+                'not volume / volume_ma < volume_threshold',  # A NaN ratio passes
+                # ATR stop/target give risk/reward above 1.2 whenever the risk is a number above 0
+                'abs(atr) > 0 and close == close',
+            ],
+            params={'rsi_overbought': self.rsi_overbought, 'rsi_oversold': self.rsi_oversold,
+                    'volume_threshold': self.volume_threshold},
+        )
+        self.requires = self.rules.columns
     
     def detect_signal(
         self,
@@ -47,35 +64,21 @@ class MeanReversion:
                 logger.debug("Insufficient data for mean reversion")
                 return None
             
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
             # Check for required indicators
-            required_indicators = ['rsi', 'close', 'volume', 'volume_ma', 'atr']
-            if not all(ind in last.index for ind in required_indicators):
+            if self.rules.missing_columns(data):
                 logger.debug("Missing required indicators for mean reversion")
                 return None
             
-            curr_rsi = last['rsi']
-            
-            # Overbought condition: RSI > 70
-            overbought = curr_rsi > self.rsi_overbought
-            
-            # Oversold condition: RSI < 30
-            oversold = curr_rsi < self.rsi_oversold
-            
-            if not (overbought or oversold):
-                logger.debug(f"RSI not in extreme zone: {curr_rsi:.1f}")
+            # RSI extreme, volume confirmation and risk/reward
+            signal_type = self.rules.last_signal(data)
+            if signal_type is None:
                 return None
             
-            # Check volume confirmation
+            last = data.iloc[-1]
+            curr_rsi = last['rsi']
+            overbought = signal_type == "SHORT"
             volume_ratio = last['volume'] / last['volume_ma']
-            if volume_ratio < self.volume_threshold:
-                logger.debug(f"Volume too low: {volume_ratio:.2f}x")
-                return None
             
-            # Determine signal type (mean reversion trades opposite direction)
-            signal_type = "SHORT" if overbought else "LONG"
             entry = last['close']
             stop_loss = entry + (last['atr'] * 1.5) if overbought else entry - (last['atr'] * 1.5)
             take_profit = entry - (last['atr'] * 2.0) if overbought else entry + (last['atr'] * 2.0)
@@ -85,10 +88,6 @@ class MeanReversion:
             reward = abs(take_profit - entry)
             risk_reward = reward / risk if risk > 0 else 0
             
-            if risk_reward < 1.2:
-                logger.debug(f"Risk/reward too low: {risk_reward:.2f}")
-                return None
-            
             logger.info(f"Mean Reversion signal: {signal_type}")
             
             # Create signal object
@@ -6,6 +6,8 @@ import logging
 from typing import Optional
 import pandas as pd
 
+from src.strategy_rules import StrategyRules
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,20 @@ class MomentumShift:
         self.rsi_threshold = self.config.get('rsi_threshold', 30)
         self.volume_threshold = self.config.get('volume_threshold', 1.3)
         self.lookback = self.config.get('lookback', 5)
+        
+        self.rules = StrategyRules(
+            name="Momentum Shift",
+            long="rsi[1] < rsi_threshold and rsi > rsi[1]",  # Oversold bounce
+            short="rsi[1] > 100 - rsi_threshold and rsi < rsi[1]",  # Overbought drop
+            filters=[
+                'not volume / volume_ma < volume_threshold',  # A NaN ratio passes
+                # ATR stop/target give risk/reward above 1.2 whenever the risk is a number above 0
+                'abs(atr) > 0 and close == close',
+            ],
+            params={'rsi_threshold': self.rsi_threshold, 'volume_threshold': self.volume_threshold},
+            min_bars=self.lookback + 1,
+        )
+        self.requires = self.rules.columns
     
     def detect_signal(
         self,
@@ -46,36 +62,22 @@ class MomentumShift:
                 logger.debug("Insufficient data for momentum shift")
                 return None
             
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
             # Check for required indicators
-            required_indicators = ['rsi', 'close', 'volume', 'volume_ma', 'atr']
-            if not all(ind in last.index for ind in required_indicators):
+            if self.rules.missing_columns(data):
                 logger.debug("Missing required indicators for momentum shift")
                 return None
             
-            # Check for RSI reversal
-            prev_rsi = prev['rsi']
-            curr_rsi = last['rsi']
-            
-            # Oversold bounce: RSI was below 30, now rising
-            oversold_bounce = prev_rsi < self.rsi_threshold and curr_rsi > prev_rsi
-            
-            # Overbought drop: RSI was above 70, now falling
-            overbought_drop = prev_rsi > (100 - self.rsi_threshold) and curr_rsi < prev_rsi
-            
-            if not (oversold_bounce or overbought_drop):
+            # RSI reversal, volume confirmation and risk/reward
+            signal_type = self.rules.last_signal(data)
+            if signal_type is None:
                 return None
             
-            # Check volume confirmation
+            last = data.iloc[-1]
+            prev_rsi = data['rsi'].iloc[-2]
+            curr_rsi = last['rsi']
+            oversold_bounce = signal_type == "LONG"
             volume_ratio = last['volume'] / last['volume_ma']
-            if volume_ratio < self.volume_threshold:
-                logger.debug(f"Volume too low: {volume_ratio:.2f}x")
-                return None
             
-            # Determine signal type
-            signal_type = "LONG" if oversold_bounce else "SHORT"
             entry = last['close']
             stop_loss = entry - (last['atr'] * 1.5) if oversold_bounce else entry + (last['atr'] * 1.5)
             take_profit = entry + (last['atr'] * 2.0) if oversold_bounce else entry - (last['atr'] * 2.0)
@@ -85,10 +87,6 @@ class MomentumShift:
             reward = abs(take_profit - entry)
             risk_reward = reward / risk if risk > 0 else 0
             
-            if risk_reward < 1.2:
-                logger.debug(f"Risk/reward too low: {risk_reward:.2f}")
-                return None
-            
             logger.info(f"Momentum Shift signal: {signal_type}")
             
             # Create signal object
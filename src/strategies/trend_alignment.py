@@ -6,6 +6,8 @@ import logging
 from typing import Optional
 import pandas as pd
 
+from src.strategy_rules import StrategyRules
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +24,20 @@ class TrendAlignment:
         self.config = config or {}
         self.volume_threshold = self.config.get('volume_threshold', 1.3)
         self.min_adx = self.config.get('min_adx', 20)
+        
+        self.rules = StrategyRules(
+            name="Trend Alignment",
+            long="ema_9 > ema_21 > ema_50 > ema_100 > ema_200",
+            short="ema_9 < ema_21 < ema_50 < ema_100 < ema_200",
+            filters=[
+                'not adx < min_adx',  # Trend strength (a missing ADX passes)
+                'not volume / volume_ma < volume_threshold',  # A NaN ratio passes
+                # ATR stop/target give risk/reward above 1.2 whenever the risk is a number above 0
+                'abs(atr) > 0 and close == close',
+            ],
+            params={'min_adx': self.min_adx, 'volume_threshold': self.volume_threshold},
+        )
+        self.requires = self.rules.columns
     
     def detect_signal(
         self,
@@ -45,38 +61,21 @@ class TrendAlignment:
                 logger.debug("Insufficient data for trend alignment")
                 return None
             
-            last = data.iloc[-1]
-            prev = data.iloc[-2]
-            
             # Check for required indicators
-            required_indicators = ['ema_9', 'ema_21', 'ema_50', 'ema_100', 'ema_200', 'close', 'volume', 'volume_ma', 'atr', 'adx']
-            if not all(ind in last.index for ind in required_indicators):
+            if self.rules.missing_columns(data):
                 logger.debug("Missing required indicators for trend alignment")
                 return None
             
-            # Check ADX for trend strength
-            if last['adx'] < self.min_adx:
-                logger.debug(f"ADX too low: {last['adx']:.1f} (need >= {self.min_adx})")
-                return None
-            
-            # Check EMA cascade for bullish trend
-            bullish_trend = (last['ema_9'] > last['ema_21'] > last['ema_50'] > last['ema_100'] > last['ema_200'])
-            
-            # Check EMA cascade for bearish trend
-            bearish_trend = (last['ema_9'] < last['ema_21'] < last['ema_50'] < last['ema_100'] < last['ema_200'])
-            
-            if not (bullish_trend or bearish_trend):
+            # ADX, EMA cascade, volume confirmation and risk/reward
+            signal_type = self.rules.last_signal(data)
+            if signal_type is None:
                 logger.debug("No clear trend alignment")
                 return None
             
-            # Check volume confirmation
+            last = data.iloc[-1]
+            bullish_trend = signal_type == "LONG"
             volume_ratio = last['volume'] / last['volume_ma']
-            if volume_ratio < self.volume_threshold:
-                logger.debug(f"Volume too low: {volume_ratio:.2f}x")
-                return None
             
-            # Determine signal type
-            signal_type = "LONG" if bullish_trend else "SHORT"
             entry = last['close']
             stop_loss = entry - (last['atr'] * 1.5) if bullish_trend else entry + (last['atr'] * 1.5)
             take_profit = entry + (last['atr'] * 2.5) if bullish_trend else entry - (last['atr'] * 2.5)
@@ -86,10 +85,6 @@ class TrendAlignment:
             reward = abs(take_profit - entry)
             risk_reward = reward / risk if risk > 0 else 0
             
-            if risk_reward < 1.2:
-                logger.debug(f"Risk/reward too low: {risk_reward:.2f}")
-                return None
-            
             logger.info(f"Trend Alignment signal: {signal_type}")
             
             # Create signal object
@@ -3,7 +3,7 @@ Pluggable Strategy Detection Framework
 Coordinates multiple trading strategies with market-condition-based priority.
 """
 import logging
-from typing import Optional, List, Dict, Callable
+from typing import Any, Optional, List, Dict, Callable, Iterable
 from dataclasses import dataclass
 import pandas as pd
 
@@ -34,7 +34,8 @@ class StrategyRegistry:
         strategy_func: Callable,
         priority: int = 0,
         description: str = "",
-        enabled: bool = True
+        enabled: bool = True,
+        requires: Iterable[str] = ()
     ) -> None:
         """
         Register a strategy.
@@ -45,12 +46,14 @@ class StrategyRegistry:
             priority: Strategy priority (higher = more important)
             description: Strategy description
             enabled: Whether strategy is enabled
+            requires: Indicator columns the strategy reads
         """
         self.strategies[name] = strategy_func
         self.strategy_metadata[name] = {
             'priority': priority,
             'description': description,
-            'enabled': enabled
+            'enabled': enabled,
+            'requires': tuple(requires)
         }
         logger.info(f"Registered strategy: {name} (priority: {priority})")
     
@@ -77,6 +80,12 @@ class StrategyRegistry:
         if name in self.strategy_metadata:
             self.strategy_metadata[name]['enabled'] = enabled
             logger.info(f"Strategy {name} {'enabled' if enabled else 'disabled'}")
+    
+    def required_columns(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Indicator columns read by the given strategies (default: the enabled ones)"""
+        names = self.get_enabled_strategies() if names is None else names
+        columns = [c for name in names for c in self.strategy_metadata.get(name, {}).get('requires', ())]
+        return list(dict.fromkeys(columns))
 
 
 class StrategyDetector:
@@ -108,6 +117,9 @@ class StrategyDetector:
         ]
     }
     
+    # Columns read by _analyze_market_conditions
+    MARKET_CONDITION_COLUMNS = ('adx', 'rsi', 'volume', 'volume_ma')
+    
     def __init__(self):
         """Initialize strategy detector"""
         self.registry = StrategyRegistry()
@@ -119,7 +131,8 @@ class StrategyDetector:
         strategy_func: Callable,
         priority: int = 0,
         description: str = "",
-        enabled: bool = True
+        enabled: bool = True,
+        requires: Optional[Iterable[str]] = None
     ) -> None:
         """
         Register a trading strategy.
@@ -130,8 +143,41 @@ class StrategyDetector:
             priority: Strategy priority
             description: Strategy description
             enabled: Whether strategy is enabled
+            requires: Indicator columns the strategy reads (defaults to the
+                ``requires`` of the strategy object strategy_func is bound to)
+        """
+        if requires is None:
+            requires = getattr(getattr(strategy_func, '__self__', None), 'requires', ())
+        self.registry.register(name, strategy_func, priority, description, enabled, requires)
+    
+    def checkpoint_components(self) -> Dict[str, Any]:
+        """
+        Detectors behind the registered strategies that keep state between scans.
+        
+        Returns:
+            Name -> detector declaring CHECKPOINT_ATTRS (one entry per detector)
+        """
+        components = {}
+        owners = set()
+        for name, strategy_func in self.registry.strategies.items():
+            owner = getattr(strategy_func, '__self__', None)
+            if hasattr(owner, 'CHECKPOINT_ATTRS') and id(owner) not in owners:
+                owners.add(id(owner))
+                components[f"strategy:{name}"] = owner
+        return components
+    
+    def required_columns(self, enabled_strategies: Optional[List[str]] = None) -> List[str]:
+        """
+        Indicator columns needed to run detection.
+        
+        Args:
+            enabled_strategies: Strategies that will run (None = all enabled)
+            
+        Returns:
+            Market-condition columns plus those the strategies declare
         """
-        self.registry.register(name, strategy_func, priority, description, enabled)
+        columns = list(self.MARKET_CONDITION_COLUMNS) + self.registry.required_columns(enabled_strategies)
+        return list(dict.fromkeys(columns))
     
     def detect_signals(
         self,
@@ -6,6 +6,8 @@ import pandas as pd
 import numpy as np
 import logging
 
+from src import sr_levels
+
 logger = logging.getLogger(__name__)
 
 
@@ -208,33 +210,25 @@ class SupportResistanceFinder:
                 lookback = len(data)
             
             recent_data = data.iloc[-lookback:]
-            levels = []
             
-            # Find potential support levels (local lows)
-            support_candidates = SupportResistanceFinder._find_local_extrema(
-                recent_data, 'low', window=5
+            # Swing points (local lows/highs over +/-5 candles) clustered into
+            # levels, with touches counted for every level in one pass
+            support, resistance = sr_levels.find_levels(
+                recent_data['high'].to_numpy(), recent_data['low'].to_numpy(),
+                tolerance_percent, min_touches=min_touches, window=5, strict=False
             )
             
-            # Find potential resistance levels (local highs)
-            resistance_candidates = SupportResistanceFinder._find_local_extrema(
-                recent_data, 'high', window=5
-            )
-            
-            # Cluster and validate support levels
-            for level_price in support_candidates:
-                level = SupportResistanceFinder._validate_level(
-                    recent_data, level_price, 'support', tolerance_percent, min_touches
-                )
-                if level:
-                    levels.append(level)
-            
-            # Cluster and validate resistance levels
-            for level_price in resistance_candidates:
-                level = SupportResistanceFinder._validate_level(
-                    recent_data, level_price, 'resistance', tolerance_percent, min_touches
-                )
-                if level:
-                    levels.append(level)
+            levels = []
+            for scores, level_type in ((support, 'support'), (resistance, 'resistance')):
+                for price, touches, last_touch, strength in zip(*scores):
+                    levels.append(SupportResistanceLevel(
+                        price=float(price),
+                        level_type=level_type,
+                        touches=int(touches),
+                        strength=float(strength),
+                        is_round_number=SupportResistanceFinder.is_round_number(float(price), "BTC"),
+                        last_touch_candles_ago=int(len(recent_data) - last_touch - 1)
+                    ))
             
             # Sort by strength (descending)
             levels.sort(key=lambda x: x.strength, reverse=True)
@@ -246,74 +240,6 @@ class SupportResistanceFinder:
             logger.error(f"Error finding support/resistance levels: {e}")
             return []
     
-    @staticmethod
-    def _find_local_extrema(data: pd.DataFrame, column: str, window: int = 5) -> List[float]:
-        """Find local extrema (highs or lows) in data."""
-        extrema = []
-        
-        for i in range(window, len(data) - window):
-            if column == 'low':
-                # Check if this is a local minimum
-                window_data = data[column].iloc[i-window:i+window+1]
-                if data[column].iloc[i] == window_data.min():
-                    extrema.append(data[column].iloc[i])
-            else:  # 'high'
-                # Check if this is a local maximum
-                window_data = data[column].iloc[i-window:i+window+1]
-                if data[column].iloc[i] == window_data.max():
-                    extrema.append(data[column].iloc[i])
-        
-        return extrema
-    
-    @staticmethod
-    def _validate_level(
-        data: pd.DataFrame,
-        level_price: float,
-        level_type: str,
-        tolerance_percent: float,
-        min_touches: int
-    ) -> Optional[SupportResistanceLevel]:
-        """Validate and create a support/resistance level."""
-        tolerance = level_price * (tolerance_percent / 100)
-        
-        # Count touches
-        touches = 0
-        last_touch_idx = -1
-        
-        for idx, row in data.iterrows():
-            if level_type == 'support':
-                # Check if low touched the level
-                if abs(row['low'] - level_price) <= tolerance:
-                    touches += 1
-                    last_touch_idx = idx
-            else:  # resistance
-                # Check if high touched the level
-                if abs(row['high'] - level_price) <= tolerance:
-                    touches += 1
-                    last_touch_idx = idx
-        
-        # Require minimum touches
-        if touches < min_touches:
-            return None
-        
-        # Calculate strength (0-1 based on touches and recency)
-        strength = min(touches / 5.0, 1.0)  # Max out at 5 touches
-        
-        # Calculate candles since last touch
-        last_touch_candles_ago = len(data) - data.index.get_loc(last_touch_idx) - 1
-        
-        # Check if it's a round number
-        is_round = SupportResistanceFinder.is_round_number(level_price, "BTC")
-        
-        return SupportResistanceLevel(
-            price=level_price,
-            level_type=level_type,
-            touches=touches,
-            strength=strength,
-            is_round_number=is_round,
-            last_touch_candles_ago=last_touch_candles_ago
-        )
-    
     @staticmethod
     def is_round_number(price: float, asset: str) -> bool:
         """
@@ -33,7 +33,8 @@ class StrategyRegistry:
         self, 
         name: str, 
         strategy_method_name: str,
-        default_params: Optional[dict] = None
+        default_params: Optional[dict] = None,
+        requires: Optional[List[str]] = None
     ):
         """
         Register a strategy with default parameters.
@@ -42,13 +43,15 @@ class StrategyRegistry:
             name: Strategy name (e.g., "fibonacci_retracement")
             strategy_method_name: Name of the detection method (e.g., "_detect_fibonacci_retracement")
             default_params: Default parameters for the strategy
+            requires: Indicator columns the detection method reads
         """
         if default_params is None:
             default_params = {}
         
         self.strategies[name] = {
             'method_name': strategy_method_name,
-            'default_params': default_params
+            'default_params': default_params,
+            'requires': list(requires or [])
         }
         
         # Initialize execution stats
@@ -237,6 +240,23 @@ class StrategyRegistry:
         
         return self.enabled_strategies.get(scanner_type, [])
     
+    def get_required_columns(self, scanner_type: str) -> List[str]:
+        """
+        Get the indicator columns the enabled strategies of a scanner read.
+        
+        Args:
+            scanner_type: Scanner type (e.g., "btc_scalp")
+            
+        Returns:
+            Union of the declared columns, in registration order
+        """
+        columns = [
+            column
+            for name in self.get_enabled_strategies(scanner_type)
+            for column in self.strategies.get(name, {}).get('requires', [])
+        ]
+        return list(dict.fromkeys(columns))
+    
     def reload_config(self, new_config: dict):
         """
         Reload configuration without restart.
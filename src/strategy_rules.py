@@ -0,0 +1,291 @@
+"""
+Strategy Rules
+Declarative strategy conditions compiled once into vectorized NumPy evaluators
+"""
+import ast
+import functools
+import operator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Column data: a DataFrame, or a mapping of column name to an array of shape
+# (bars,) or (symbols, bars) with the newest bar last
+RuleData = Union[pd.DataFrame, Mapping[str, np.ndarray]]
+
+_Evaluator = Callable[[Callable[[str, int], np.ndarray]], Any]
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+_COMPARE = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_FUNCTIONS = {
+    'abs': np.abs,
+    'min': np.minimum,
+    'max': np.maximum,
+}
+
+
+def _shift(values: np.ndarray, lag: int) -> np.ndarray:
+    """Values ``lag`` bars back along the last axis (NaN before the first bar)."""
+    if lag == 0:
+        return values
+    shifted = np.full(values.shape, np.nan)
+    if lag < values.shape[-1]:
+        shifted[..., lag:] = values[..., :-lag]
+    return shifted
+
+
+class CompiledRule:
+    """
+    A rule expression compiled into a NumPy evaluator.
+
+    Expressions use Python syntax over indicator columns: ``ema_9 > ema_21``,
+    ``rsi[1] < 30 and rsi > rsi[1]`` (``[n]`` is the value ``n`` bars back),
+    ``abs(close - vwap) >= atr * 1.8``. Chained comparisons, ``and``/``or``/
+    ``not``, arithmetic, ``abs`` and element-wise ``min``/``max`` of any number
+    of operands are supported. Names found in ``params`` are constants.
+    Comparisons involving NaN are False.
+    """
+
+    def __init__(self, expression: str, params: Optional[Mapping[str, Any]] = None):
+        """
+        Compile a rule.
+
+        Args:
+            expression: Rule expression
+            params: Named constants used in the expression
+
+        Raises:
+            ValueError: If the expression uses unsupported syntax
+        """
+        self.expression = expression
+        self.params = dict(params or {})
+        self._refs: Set[Tuple[str, int]] = set()
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid rule {expression!r}: {e}") from e
+        self._evaluate = self._compile(tree.body)
+        self.columns: Tuple[str, ...] = tuple(sorted({name for name, _ in self._refs}))
+        self.max_lag = max((lag for _, lag in self._refs), default=0)
+
+    def _compile(self, node: ast.AST) -> _Evaluator:
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+            def bool_op(get):
+                result = parts[0](get)
+                for part in parts[1:]:
+                    result = combine(result, part(get))
+                return result
+            return bool_op
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda get: np.logical_not(operand(get))
+            if isinstance(node.op, ast.USub):
+                return lambda get: -operand(get)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            left, right = self._compile(node.left), self._compile(node.right)
+            op = _BINARY[type(node.op)]
+            return lambda get: op(left(get), right(get))
+
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            operands = [self._compile(node.left)] + [self._compile(c) for c in node.comparators]
+            ops = [_COMPARE[type(op)] for op in node.ops]
+
+            def compare(get):
+                values = [operand(get) for operand in operands]
+                result = ops[0](values[0], values[1])
+                for i in range(1, len(ops)):
+                    result = np.logical_and(result, ops[i](values[i], values[i + 1]))
+                return result
+            return compare
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS \
+                and not node.keywords:
+            func = _FUNCTIONS[node.func.id]
+            args = [self._compile(arg) for arg in node.args]
+            if node.func.id in ('min', 'max') and len(args) > 2:
+                return lambda get: functools.reduce(func, [arg(get) for arg in args])
+            return lambda get: func(*[arg(get) for arg in args])
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)):
+            value = node.value
+            return lambda get: value
+
+        if isinstance(node, ast.Name):
+            return self._reference(node.id, 0)
+
+        if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) \
+                and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, int) \
+                and node.slice.value >= 0:
+            return self._reference(node.value.id, node.slice.value)
+
+        raise ValueError(f"Unsupported syntax in rule {self.expression!r}: {ast.dump(node)}")
+
+    def _reference(self, name: str, lag: int) -> _Evaluator:
+        if name in self.params:
+            if lag:
+                raise ValueError(f"Parameter {name!r} cannot be lagged in rule {self.expression!r}")
+            value = self.params[name]
+            return lambda get: value
+        self._refs.add((name, lag))
+        return lambda get: get(name, lag)
+
+    def missing_columns(self, data: RuleData) -> List[str]:
+        """Columns the rule needs that ``data`` lacks."""
+        return [name for name in self.columns if name not in data]
+
+    def evaluate(self, data: RuleData) -> np.ndarray:
+        """
+        Evaluate the rule on every bar.
+
+        Args:
+            data: Column data (bars of one symbol, or a stacked symbols x bars matrix)
+
+        Returns:
+            Boolean array with the shape of the columns (False where a lag
+            reaches before the first bar)
+
+        Raises:
+            KeyError: If a column is missing
+        """
+        arrays = {name: np.asarray(data[name], dtype=float) for name in self.columns}
+        shape = next(iter(arrays.values())).shape if arrays else (len(data),)
+
+        def get(name: str, lag: int) -> np.ndarray:
+            return _shift(arrays[name], lag)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = self._evaluate(get)
+        return np.broadcast_to(np.asarray(result, dtype=bool), shape)
+
+    def evaluate_last(self, data: RuleData) -> Union[bool, np.ndarray]:
+        """
+        Evaluate the rule on the last bar only (one value per symbol for a matrix).
+
+        Only the ``max_lag + 1`` newest values of each column are touched.
+        """
+        window = self.max_lag + 1
+        tail = {name: np.asarray(data[name], dtype=float)[..., -window:] for name in self.columns}
+        result = self.evaluate(tail if tail else data)[..., -1]
+        return bool(result) if np.ndim(result) == 0 else result
+
+    def __repr__(self) -> str:
+        return f"CompiledRule({self.expression!r})"
+
+
+@dataclass
+class StrategyRules:
+    """
+    Entry conditions of a strategy as declarative rules.
+
+    ``long`` and ``short`` decide the direction; every rule in ``filters``
+    must also hold. When both directions match, ``long`` wins (the order
+    the strategies check them in).
+    """
+    name: str
+    long: str
+    short: str
+    filters: List[str] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    min_bars: int = 2
+
+    def __post_init__(self):
+        self._long = CompiledRule(self.long, self.params)
+        self._short = CompiledRule(self.short, self.params)
+        self._filters = [CompiledRule(rule, self.params) for rule in self.filters]
+        rules = [self._long, self._short] + self._filters
+        self.columns: Tuple[str, ...] = tuple(sorted({c for rule in rules for c in rule.columns}))
+        self.max_lag = max(rule.max_lag for rule in rules)
+
+    def missing_columns(self, data: RuleData) -> List[str]:
+        """Columns the rules need that ``data`` lacks."""
+        return [name for name in self.columns if name not in data]
+
+    def signals(self, data: RuleData) -> np.ndarray:
+        """
+        Direction on every bar: 1 for LONG, -1 for SHORT, 0 for none.
+
+        Bars before ``min_bars`` are 0, as the strategy needs that much history.
+
+        Args:
+            data: Column data (bars of one symbol, or a stacked symbols x bars matrix)
+
+        Returns:
+            int8 array with the shape of the columns
+        """
+        direction = self._direction(data)
+        direction[..., :self.min_bars - 1] = 0
+        return direction
+
+    def last_signal(self, data: RuleData) -> Optional[str]:
+        """
+        Direction of the last bar of one symbol.
+
+        Returns:
+            "LONG", "SHORT" or None
+        """
+        bars = len(data) if isinstance(data, pd.DataFrame) else np.shape(next(iter(data.values())))[-1]
+        if bars < self.min_bars:
+            return None
+        window = self.max_lag + 1
+        tail = {name: np.asarray(data[name], dtype=float)[-window:] for name in self.columns}
+        direction = self._direction(tail)[-1]
+        return "LONG" if direction == 1 else "SHORT" if direction == -1 else None
+
+    def _direction(self, data: RuleData) -> np.ndarray:
+        long = self._long.evaluate(data)
+        short = self._short.evaluate(data)
+        allowed = np.ones(long.shape, dtype=bool)
+        for rule in self._filters:
+            allowed &= rule.evaluate(data)
+        direction = np.where(long, 1, np.where(short, -1, 0)).astype(np.int8)
+        direction[~allowed] = 0
+        return direction
+
+
+def stack_frames(frames: Mapping[str, pd.DataFrame], columns: Tuple[str, ...],
+                 bars: Optional[int] = None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Stack the newest bars of several symbols into (symbols, bars) matrices.
+
+    Shorter frames are left-padded with NaN so the newest bars line up.
+
+    Args:
+        frames: Indicator DataFrame per symbol
+        columns: Columns to stack (e.g. ``StrategyRules.columns``)
+        bars: Bars per symbol (defaults to the longest frame)
+
+    Returns:
+        (symbols in row order, column name -> matrix)
+    """
+    symbols = list(frames)
+    bars = bars or max((len(df) for df in frames.values()), default=0)
+    matrices = {name: np.full((len(symbols), bars), np.nan) for name in columns}
+    for row, symbol in enumerate(symbols):
+        df = frames[symbol].iloc[-bars:]
+        for name in columns:
+            matrices[name][row, bars - len(df):] = df[name].to_numpy(dtype=float)
+    return symbols, matrices
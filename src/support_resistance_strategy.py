@@ -7,6 +7,8 @@ from typing import Optional, List
 from datetime import datetime
 import pandas as pd
 
+from src import sr_levels
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +28,7 @@ class SupportResistanceStrategy:
         self.level_tolerance_percent = self.config.get('level_tolerance_percent', 0.3)
         self.volume_threshold = self.config.get('volume_threshold', 1.4)
         self.require_reversal_candle = self.config.get('require_reversal_candle', True)
+        self.requires = ('high', 'low', 'close', 'volume', 'volume_ma', 'atr', 'rsi')
     
     def detect_signal(
         self,
@@ -53,8 +56,7 @@ class SupportResistanceStrategy:
             prev = data.iloc[-2]
             
             # Check for required indicators
-            required_indicators = ['high', 'low', 'close', 'volume', 'volume_ma', 'atr', 'rsi']
-            if not all(ind in last.index for ind in required_indicators):
+            if not all(ind in last.index for ind in self.requires):
                 logger.debug(f"Missing required indicators for S/R strategy")
                 return None
             
@@ -199,27 +201,20 @@ class SupportResistanceStrategy:
             recent = data.tail(self.lookback_candles)
             
             # Find local highs and lows
-            highs = []
-            lows = []
-            
-            for i in range(1, len(recent) - 1):
-                # Local high
-                if recent.iloc[i]['high'] > recent.iloc[i-1]['high'] and \
-                   recent.iloc[i]['high'] > recent.iloc[i+1]['high']:
-                    highs.append(recent.iloc[i]['high'])
-                
-                # Local low
-                if recent.iloc[i]['low'] < recent.iloc[i-1]['low'] and \
-                   recent.iloc[i]['low'] < recent.iloc[i+1]['low']:
-                    lows.append(recent.iloc[i]['low'])
+            highs = recent['high'].to_numpy(dtype=float)
+            lows = recent['low'].to_numpy(dtype=float)
+            highs = highs[sr_levels.local_extrema(highs, 'high')]
+            lows = lows[sr_levels.local_extrema(lows, 'low')]
             
             # Group nearby levels using tolerance
-            support_levels = self._group_levels(lows, self.level_tolerance_percent)
-            resistance_levels = self._group_levels(highs, self.level_tolerance_percent)
+            support = sr_levels.cluster_levels(lows, self.level_tolerance_percent)
+            resistance = sr_levels.cluster_levels(highs, self.level_tolerance_percent)
             
-            # Filter by minimum touches
-            support_levels = [level for level in support_levels if self._count_touches(data, level, 'support') >= self.min_touches]
-            resistance_levels = [level for level in resistance_levels if self._count_touches(data, level, 'resistance') >= self.min_touches]
+            # Filter by minimum touches (all levels scored against the full history at once)
+            support_touches = sr_levels.score_levels(support, data['low'].to_numpy(dtype=float), 0.3).touches
+            resistance_touches = sr_levels.score_levels(resistance, data['high'].to_numpy(dtype=float), 0.3).touches
+            support_levels = support[support_touches >= self.min_touches].tolist()
+            resistance_levels = resistance[resistance_touches >= self.min_touches].tolist()
             
             logger.debug(f"Identified {len(support_levels)} support and {len(resistance_levels)} resistance levels")
             
@@ -232,7 +227,7 @@ class SupportResistanceStrategy:
     @staticmethod
     def _group_levels(levels: List[float], tolerance_pct: float) -> List[float]:
         """
-        Group nearby levels using tolerance.
+        Group nearby levels using tolerance (sorted 1-D binning).
         
         Args:
             levels: List of price levels
@@ -241,64 +236,7 @@ class SupportResistanceStrategy:
         Returns:
             List of grouped levels
         """
-        if not levels:
-            return []
-        
-        levels = sorted(levels)
-        grouped = []
-        current_group = [levels[0]]
-        
-        for level in levels[1:]:
-            # Check if within tolerance of current group average
-            group_avg = sum(current_group) / len(current_group)
-            tolerance = group_avg * (tolerance_pct / 100)
-            
-            if abs(level - group_avg) <= tolerance:
-                current_group.append(level)
-            else:
-                # Start new group
-                grouped.append(sum(current_group) / len(current_group))
-                current_group = [level]
-        
-        # Add last group
-        if current_group:
-            grouped.append(sum(current_group) / len(current_group))
-        
-        return grouped
-    
-    @staticmethod
-    def _count_touches(data: pd.DataFrame, level: float, level_type: str, tolerance_pct: float = 0.3) -> int:
-        """
-        Count how many times price touched a level.
-        
-        Args:
-            data: DataFrame with OHLC data
-            level: Price level
-            level_type: 'support' or 'resistance'
-            tolerance_pct: Tolerance percentage
-            
-        Returns:
-            Number of touches
-        """
-        try:
-            tolerance = level * (tolerance_pct / 100)
-            touches = 0
-            
-            for _, row in data.iterrows():
-                if level_type == 'support':
-                    # Check if low touched the level
-                    if abs(row['low'] - level) <= tolerance:
-                        touches += 1
-                else:  # resistance
-                    # Check if high touched the level
-                    if abs(row['high'] - level) <= tolerance:
-                        touches += 1
-            
-            return touches
-            
-        except Exception as e:
-            logger.debug(f"Error counting touches: {e}")
-            return 0
+        return sr_levels.cluster_levels(levels, tolerance_pct).tolist()
     
     @staticmethod
     def _is_pin_bar(last: pd.Series, prev: pd.Series) -> bool:
@@ -5,14 +5,21 @@ Manages multiple symbol scanners and coordinates signal filtering.
 import logging
 import threading
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
 
 from src.symbol_scanner import SymbolScanner
+from src.batch_indicators import BatchIndicatorCalculator
 from src.signal_filter import SignalFilter
 from src.trade_tracker import TradeTracker
 from src.asset_config_manager import AssetConfigManager
 from src.signal_detector import Signal
+from src.rate_limiter import get_broker
+from src.execution_engine import ExecutionEngine, PerformanceSettings
+from src.state_checkpoint import StateCheckpointer
+from src.email_dispatcher import stop_all_dispatchers
+from src.latency_trace import get_latency_tracker
 
 
 logger = logging.getLogger(__name__)
@@ -35,7 +42,8 @@ class SymbolOrchestrator:
         Args:
             config_manager: Asset configuration manager
             alerter: Alerter instance for sending notifications
-            max_concurrent_symbols: Maximum number of symbols to scan concurrently
+            max_concurrent_symbols: Maximum number of symbol scans running at once
+                (with thread_pool_size set; otherwise the maximum number of symbols)
             diagnostics: Optional SignalDiagnostics instance
             bypass_mode: Optional BypassMode instance
         """
@@ -62,6 +70,47 @@ class SymbolOrchestrator:
         self.scanners: Dict[str, SymbolScanner] = {}
         self.scanner_threads: Dict[str, threading.Thread] = {}
         
+        # Batched indicator mode: one loop computes indicators for all symbols per timeframe
+        self.batch_indicators = bool(config_manager.get_global_setting('batch_indicators', False))
+        self.batch_calculator = BatchIndicatorCalculator()
+        self.polling_interval = config_manager.get_global_setting('polling_interval_seconds', 60)
+        
+        # Startup bootstrap: scanners connect and warm up in parallel, paced by
+        # a token bucket per data provider; failures retry in the background
+        self.startup_workers = config_manager.get_global_setting('startup_workers', 8)
+        self.startup_retry_seconds = config_manager.get_global_setting('startup_retry_seconds', 30)
+        self.startup_retry_max_seconds = config_manager.get_global_setting('startup_retry_max_seconds', 600)
+        self.rate_limiter = get_broker()
+        provider_rate_limits = config_manager.get_global_setting('provider_rate_limits', {}) or {}
+        for provider, limits in provider_rate_limits.items():
+            self.rate_limiter.configure(provider, limits.get('rate'), limits.get('burst'), limits.get('daily_limit'))
+        self.pending_symbols: Set[str] = set()
+        
+        # Performance settings: with thread_pool_size configured, the scans of
+        # all symbols run as jobs on one bounded pool with a shared candle and
+        # indicator cache instead of one thread per symbol
+        self.performance = PerformanceSettings.from_config({
+            'thread_pool_size': config_manager.get_global_setting('thread_pool_size'),
+            'cache_ttl_seconds': config_manager.get_global_setting('cache_ttl_seconds'),
+            'max_concurrent_symbols': max_concurrent_symbols,
+        })
+        self.engine: Optional[ExecutionEngine] = None
+        if config_manager.get_global_setting('thread_pool_size'):
+            self.engine = ExecutionEngine(self.performance, name="Scanner")
+        self.bootstrap_attempts: Dict[str, int] = {}
+        self._retry_timers: Dict[str, threading.Timer] = {}
+        self._bootstrap_executor: Optional[ThreadPoolExecutor] = None
+        self._fetch_executor: Optional[ThreadPoolExecutor] = None
+        self._threads_lock = threading.Lock()
+        
+        # Warm restarts: filter, trade and scanner state is checkpointed to a local file
+        self.checkpointer = StateCheckpointer.from_config(config_manager.get_global_setting('checkpoint'))
+        if self.checkpointer is not None:
+            self.checkpointer.register('signal_filter', self.signal_filter)
+            self.checkpointer.register('trade_tracker', self.trade_tracker)
+            if hasattr(diagnostics, 'CHECKPOINT_ATTRS'):
+                self.checkpointer.register('diagnostics', diagnostics)
+        
         # Control flags
         self.running = False
         self.shutdown_event = threading.Event()
@@ -103,8 +152,8 @@ class SymbolOrchestrator:
                 logger.info(f"Symbol {symbol} is disabled, skipping")
                 return False
             
-            # Check concurrent limit
-            if len(self.scanners) >= self.max_concurrent_symbols:
+            # Check concurrent limit (the execution engine limits running scans instead)
+            if self.engine is None and len(self.scanners) >= self.max_concurrent_symbols:
                 logger.warning(f"Max concurrent symbols reached ({self.max_concurrent_symbols}), cannot add {symbol}")
                 return False
             
@@ -117,10 +166,13 @@ class SymbolOrchestrator:
                 timeframes=config.get('timeframes', ['5m', '15m']),
                 asset_config=config,
                 signal_callback=self._on_signal_detected,
-                polling_interval=self.config_manager.get_global_setting('polling_interval_seconds', 60)
+                polling_interval=self.config_manager.get_global_setting('polling_interval_seconds', 60),
+                engine=self.engine
             )
             
             self.scanners[symbol] = scanner
+            if self.checkpointer is not None:
+                self.checkpointer.register(f"scanner:{symbol}", scanner)
             logger.info(f"Added scanner for {config.get('display_name', symbol)} ({symbol})")
             
             return True
@@ -145,6 +197,9 @@ class SymbolOrchestrator:
                 return False
             
             # Stop scanner if running
+            if self.engine is not None:
+                self.engine.cancel(symbol)
+                self.scanners[symbol].stop()
             if symbol in self.scanner_threads:
                 self.scanners[symbol].stop()
                 self.scanner_threads[symbol].join(timeout=5)
@@ -152,6 +207,8 @@ class SymbolOrchestrator:
             
             # Remove scanner
             del self.scanners[symbol]
+            if self.checkpointer is not None:
+                self.checkpointer.unregister(f"scanner:{symbol}")
             logger.info(f"Removed scanner for {symbol}")
             
             return True
@@ -161,42 +218,64 @@ class SymbolOrchestrator:
             return False
     
     def start(self) -> None:
-        """Start all symbol scanners."""
+        """
+        Start all symbol scanners.
+        
+        Scanners are connected and warmed up concurrently. Each scanner thread
+        starts as soon as its own warm-up finishes; symbols that fail keep
+        retrying in the background with exponential backoff. Returns once every
+        symbol has had its first attempt.
+        """
         try:
             self.running = True
             self.start_time = datetime.now()
+            started = time.monotonic()
             
             logger.info("=" * 60)
             logger.info("Starting Symbol Orchestrator")
             logger.info(f"Symbols to scan: {len(self.scanners)}")
             logger.info("=" * 60)
             
-            # Connect all scanners
-            for symbol, scanner in self.scanners.items():
-                logger.info(f"Connecting {scanner.display_name}...")
-                if not scanner.connect():
-                    logger.error(f"Failed to connect {symbol}, skipping")
-                    continue
-                
-                # Fetch initial data
-                if not scanner.fetch_initial_data():
-                    logger.error(f"Failed to fetch initial data for {symbol}")
-                    continue
-                
-                # Stagger startup (1 second delay between symbols)
-                time.sleep(1)
+            with self._threads_lock:
+                self.pending_symbols = set(self.scanners)
+            
+            # Restore duplicate windows, open trades and buffers before the first scan
+            if self.checkpointer is not None:
+                self.checkpointer.restore()
+                self.checkpointer.start()
+            
+            if self.engine is not None and not self.batch_indicators:
+                self.engine.start()
+            
+            if self.batch_indicators:
+                thread = threading.Thread(
+                    target=self._run_batched,
+                    name="Scanner-batch",
+                    daemon=True
+                )
+                thread.start()
+                with self._threads_lock:
+                    self.scanner_threads['__batch__'] = thread
+                logger.info("Started batched scanner thread for all symbols")
+            
+            # Connect and warm up all scanners concurrently
+            self._bootstrap_executor = ThreadPoolExecutor(
+                max_workers=max(1, min(self.startup_workers, len(self.scanners))),
+                thread_name_prefix="Bootstrap"
+            )
+            futures = [
+                self._bootstrap_executor.submit(self._bootstrap_symbol, symbol)
+                for symbol in list(self.scanners)
+            ]
+            wait(futures)
             
-            # Start scanner threads
-            for symbol, scanner in self.scanners.items():
-                if scanner.market_client.is_connected():
-                    thread = threading.Thread(
-                        target=scanner.run,
-                        name=f"Scanner-{symbol}",
-                        daemon=True
-                    )
-                    thread.start()
-                    self.scanner_threads[symbol] = thread
-                    logger.info(f"Started scanner thread for {scanner.display_name}")
+            with self._threads_lock:
+                pending = sorted(self.pending_symbols)
+            ready = len(self.scanners) - len(pending)
+            logger.info(f"Bootstrap finished in {time.monotonic() - started:.1f}s: "
+                        f"{ready}/{len(self.scanners)} symbols ready")
+            if pending:
+                logger.warning(f"Retrying in background: {', '.join(pending)}")
             
             # Send startup notification
             if self.alerter:
@@ -208,6 +287,166 @@ class SymbolOrchestrator:
             logger.error(f"Error starting orchestrator: {e}")
             raise
     
+    def _bootstrap_symbol(self, symbol: str) -> bool:
+        """
+        Connect and warm up one scanner, then start its thread.
+        
+        Args:
+            symbol: Symbol identifier
+            
+        Returns:
+            True if the scanner is ready
+        """
+        scanner = self.scanners.get(symbol)
+        if scanner is None or not self.running:
+            return False
+        
+        attempt = self.bootstrap_attempts.get(symbol, 0) + 1
+        self.bootstrap_attempts[symbol] = attempt
+        
+        # Data clients draw from the shared rate limiter themselves, so the
+        # pool never outruns the provider whatever the number of symbols
+        def still_running() -> bool:
+            return not self.shutdown_event.is_set()
+        
+        try:
+            logger.info(f"Connecting {scanner.display_name}...")
+            ready = scanner.connect() and scanner.fetch_initial_data(throttle=still_running)
+        except Exception as e:
+            logger.error(f"Bootstrap error for {symbol}: {e}")
+            ready = False
+        
+        if not self.running:
+            return False
+        
+        if not ready:
+            delay = min(self.startup_retry_max_seconds, self.startup_retry_seconds * 2 ** (attempt - 1))
+            logger.error(f"Failed to start {symbol} (attempt {attempt}), retrying in {delay}s")
+            self._schedule_retry(symbol, delay)
+            return False
+        
+        if not self.batch_indicators:
+            self._start_scanner_thread(symbol)
+        with self._threads_lock:
+            self.pending_symbols.discard(symbol)
+        return True
+    
+    def _schedule_retry(self, symbol: str, delay: float) -> None:
+        """Resubmit a failed symbol to the bootstrap pool after a delay."""
+        def resubmit():
+            self._retry_timers.pop(symbol, None)
+            if self.running and self._bootstrap_executor is not None:
+                try:
+                    self._bootstrap_executor.submit(self._bootstrap_symbol, symbol)
+                except RuntimeError:
+                    pass  # Executor shut down
+        
+        timer = threading.Timer(delay, resubmit)
+        timer.daemon = True
+        self._retry_timers[symbol] = timer
+        timer.start()
+    
+    def _start_scanner_thread(self, symbol: str) -> None:
+        """Start the scanning loop thread (or engine job) for a warmed-up scanner."""
+        scanner = self.scanners[symbol]
+        if self.engine is not None:
+            scanner.running = True
+            self.engine.schedule(symbol, scanner.scan_once, scanner.polling_interval)
+            logger.info(f"Scheduled scan job for {scanner.display_name} every {scanner.polling_interval}s")
+            return
+        with self._threads_lock:
+            existing = self.scanner_threads.get(symbol)
+            if existing is not None and existing.is_alive():
+                return
+            thread = threading.Thread(
+                target=scanner.run,
+                name=f"Scanner-{symbol}",
+                daemon=True
+            )
+            thread.start()
+            self.scanner_threads[symbol] = thread
+        logger.info(f"Started scanner thread for {scanner.display_name}")
+    
+    def scan_batch(self) -> List[Signal]:
+        """
+        Run one scan cycle for all symbols with batched indicator calculation.
+        
+        Candles are fetched for every active scanner concurrently on a bounded
+        pool (the execution engine's when thread_pool_size is configured),
+        indicators are computed once per timeframe over all symbols together,
+        and each scanner then runs signal detection on its prepared frames.
+        
+        Returns:
+            List of detected signals
+        """
+        active = [
+            scanner for scanner in self.scanners.values()
+            if scanner.symbol not in self.pending_symbols
+            and scanner.market_client.is_connected() and scanner.try_resume()
+        ]
+        
+        # Fetch raw candles concurrently, grouped by timeframe
+        pool = self._get_fetch_pool()
+        fetches = [
+            (scanner.symbol, timeframe, pool.submit(scanner.fetch_timeframe, timeframe))
+            for scanner in active
+            for timeframe in scanner.timeframes
+        ]
+        raw: Dict[str, Dict[str, Any]] = {}
+        for symbol, timeframe, future in fetches:
+            df = future.result()
+            if not df.empty:
+                raw.setdefault(timeframe, {})[symbol] = df
+        
+        # One batched calculation per timeframe
+        prepared: Dict[str, Dict[str, Any]] = {}
+        for timeframe, frames in raw.items():
+            try:
+                result = self.batch_calculator.calculate(frames)
+            except Exception as e:
+                logger.error(f"Batched indicator calculation failed for {timeframe}: {e}")
+                continue
+            for symbol, df in result.frames().items():
+                prepared.setdefault(symbol, {})[timeframe] = df
+        
+        signals = []
+        for scanner in active:
+            if scanner.paused:
+                continue
+            signals.extend(scanner.scan_all_timeframes(prepared.get(scanner.symbol, {})))
+        
+        return signals
+    
+    def _get_fetch_pool(self) -> ThreadPoolExecutor:
+        """Worker pool for batched candle fetches, bounded by max_concurrent_symbols."""
+        if self.engine is not None:
+            return self.engine.pool
+        with self._threads_lock:
+            if self._fetch_executor is None:
+                self._fetch_executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.max_concurrent_symbols),
+                    thread_name_prefix="Fetch"
+                )
+            return self._fetch_executor
+    
+    def _run_batched(self) -> None:
+        """Batched scanning loop used instead of per-symbol threads."""
+        for scanner in self.scanners.values():
+            scanner.running = True
+        
+        while self.running:
+            try:
+                self.scan_batch()
+            except Exception as e:
+                logger.error(f"Error in batched scan cycle: {e}")
+            
+            if self.shutdown_event.wait(self.polling_interval):
+                break
+        
+        for scanner in self.scanners.values():
+            scanner.running = False
+        logger.info("Batched scanner loop stopped")
+    
     def _monitor_symbol_health(self) -> None:
         """Monitor symbol health and send admin alerts for issues."""
         for symbol, scanner in self.scanners.items():
@@ -332,6 +571,11 @@ class SymbolOrchestrator:
                 'suppressed_signals': self.suppressed_signals,
                 'active_scanners': len([s for s in self.scanners.values() if not s.paused]),
                 'paused_scanners': len([s for s in self.scanners.values() if s.paused]),
+                'rate_limits': self.rate_limiter.get_metrics(),
+                'execution': self.engine.get_stats() if self.engine is not None else None,
+                'checkpoint': self.checkpointer.get_stats() if self.checkpointer is not None else None,
+                'signal_latency': get_latency_tracker().summary(),
+                'slowest_signals': list(get_latency_tracker().flagged),
                 'symbols': {}
             }
             
@@ -361,19 +605,38 @@ class SymbolOrchestrator:
             self.running = False
             self.shutdown_event.set()
             
+            # Cancel pending bootstrap retries
+            for timer in list(self._retry_timers.values()):
+                timer.cancel()
+            self._retry_timers.clear()
+            if self._bootstrap_executor is not None:
+                self._bootstrap_executor.shutdown(wait=False, cancel_futures=True)
+            if self._fetch_executor is not None:
+                self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+            if self.engine is not None:
+                self.engine.shutdown()
+            
             # Stop all scanners
             for symbol, scanner in self.scanners.items():
                 scanner.stop()
             
             # Wait for threads to finish
-            for symbol, thread in self.scanner_threads.items():
+            with self._threads_lock:
+                threads = list(self.scanner_threads.items())
+            for symbol, thread in threads:
                 logger.info(f"Waiting for {symbol} scanner to stop...")
                 thread.join(timeout=10)
             
+            if self.checkpointer is not None:
+                self.checkpointer.stop()
+            
             # Send shutdown notification
             if self.alerter:
                 self._send_shutdown_notification()
             
+            # Deliver queued emails before the process exits
+            stop_all_dispatchers()
+            
             logger.info("Symbol Orchestrator stopped")
             
         except Exception as e:
@@ -496,12 +759,22 @@ class SymbolOrchestrator:
         
         runtime = datetime.now() - self.start_time if self.start_time else None
         
+        # Bootstrap threads discard symbols as they come up
+        with self._threads_lock:
+            pending = sorted(self.pending_symbols)
+            active_threads = len(self.scanner_threads)
+        
         return {
             'running': self.running,
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'runtime_seconds': runtime.total_seconds() if runtime else 0,
             'total_scanners': len(self.scanners),
-            'active_threads': len(self.scanner_threads),
+            'active_threads': active_threads,
+            'pending_symbols': pending,
+            'rate_limits': self.rate_limiter.get_metrics(),
+            'execution': self.engine.get_stats() if self.engine is not None else None,
+            'checkpoint': self.checkpointer.get_stats() if self.checkpointer is not None else None,
+            'signal_latency': get_latency_tracker().summary(),
             'total_signals': self.total_signals,
             'suppressed_signals': self.suppressed_signals,
             'sent_signals': self.total_signals - self.suppressed_signals,
@@ -10,6 +10,7 @@ from datetime import datetime
 from pathlib import Path
 import pandas as pd
 
+from src import latency_trace
 from src.yfinance_client import YFinanceClient
 from src.indicator_calculator import IndicatorCalculator
 from src.signal_detector import SignalDetector, Signal
@@ -23,6 +24,12 @@ logger = logging.getLogger(__name__)
 class SymbolScanner:
     """Scanner for a single symbol with asset-specific configuration."""
     
+    # Components restored on warm restart (each declares its own CHECKPOINT_ATTRS)
+    CHECKPOINT_ATTRS = ('signal_detector', 'fvg_detector', 'nwog_detector', 'market_client')
+    
+    # Directory of the per-symbol log files
+    LOG_DIR = Path("logs")
+    
     def __init__(
         self,
         symbol: str,
@@ -32,7 +39,8 @@ class SymbolScanner:
         timeframes: List[str],
         asset_config: Dict[str, Any],
         signal_callback: Callable[[str, Signal], None],
-        polling_interval: int = 60
+        polling_interval: int = 60,
+        engine: Optional[Any] = None
     ):
         """
         Initialize symbol scanner.
@@ -46,6 +54,7 @@ class SymbolScanner:
             asset_config: Asset-specific parameters
             signal_callback: Function to call when signal detected (symbol, signal)
             polling_interval: Seconds between data polls
+            engine: Optional ExecutionEngine whose cache is shared with other scanners
         """
         self.symbol = symbol
         self.asset_type = asset_type
@@ -55,8 +64,10 @@ class SymbolScanner:
         self.config = asset_config
         self.signal_callback = signal_callback
         self.polling_interval = polling_interval
+        self.engine = engine
         
         self.running = False
+        self.next_resume_at = 0.0
         self.error_count = 0
         self.consecutive_errors = 0
         self.max_consecutive_errors = 5
@@ -108,6 +119,7 @@ class SymbolScanner:
                 timeframes=timeframes,
                 buffer_size=500
             )
+            self.provider = 'yfinance'
             
             self.indicator_calc = IndicatorCalculator()
             
@@ -138,7 +150,7 @@ class SymbolScanner:
         """Setup per-symbol log file with rotation."""
         try:
             # Create logs directory
-            log_dir = Path("logs")
+            log_dir = Path(self.LOG_DIR)
             log_dir.mkdir(exist_ok=True)
             
             # Create symbol-specific logger
@@ -201,10 +213,14 @@ class SymbolScanner:
             self.error_count += 1
             return False
     
-    def fetch_initial_data(self) -> bool:
+    def fetch_initial_data(self, throttle: Optional[Callable[[], bool]] = None) -> bool:
         """
         Fetch initial historical data for all timeframes.
         
+        Args:
+            throttle: Optional callable invoked before each request; returning
+                False aborts the warm-up (e.g. during shutdown)
+        
         Returns:
             True if successful
         """
@@ -212,7 +228,9 @@ class SymbolScanner:
             logger.info(f"Fetching initial data for {self.display_name}...")
             
             for timeframe in self.timeframes:
-                df = self.market_client.get_latest_candles(timeframe, count=500)
+                if throttle is not None and not throttle():
+                    return False
+                df = self._fetch_candles(timeframe)
                 
                 if df.empty:
                     logger.warning(f"No data received for {self.display_name} {timeframe}")
@@ -230,26 +248,82 @@ class SymbolScanner:
             self.error_count += 1
             return False
     
-    def scan_timeframe(self, timeframe: str) -> Optional[Signal]:
+    def fetch_timeframe(self, timeframe: str) -> pd.DataFrame:
         """
-        Scan a single timeframe for signals.
+        Fetch the latest candles for a timeframe without calculating indicators.
         
         Args:
-            timeframe: Timeframe to scan
+            timeframe: Timeframe to fetch
             
         Returns:
-            Signal if detected, None otherwise
+            OHLCV DataFrame (empty if no data or on error)
         """
         try:
-            # Fetch latest data
-            df = self.market_client.get_latest_candles(timeframe, count=500)
+            df = self._get_candles(timeframe)
             
             if df.empty:
                 logger.warning(f"Empty data for {self.display_name} {timeframe}")
-                return None
             
-            # Calculate indicators
-            df = self._calculate_indicators(df)
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error fetching {self.display_name} {timeframe}: {e}")
+            self._record_scan_error()
+            return pd.DataFrame()
+    
+    def _get_candles(self, timeframe: str) -> pd.DataFrame:
+        """
+        Fetch the latest 500 candles, through the engine's shared cache if any.
+        
+        A fetch by another scanner of the same symbol is reused when it is at
+        most half a polling interval old, so a poll never sees the previous
+        poll's data.
+        """
+        def fetch() -> pd.DataFrame:
+            return self._fetch_candles(timeframe)
+        
+        if self.engine is None:
+            return fetch()
+        max_age = min(self.engine.cache.ttl_seconds, self.polling_interval / 2)
+        return self.engine.candles((self.provider, self.symbol, timeframe), 500, fetch, max_age=max_age)
+    
+    def _fetch_candles(self, timeframe: str, count: int = 500) -> pd.DataFrame:
+        """Fetch the latest candles from the market client."""
+        result = self.market_client.get_latest_candles(timeframe, count=count)
+        # YFinanceClient returns (df, is_fresh) unless the response was empty
+        return result[0] if isinstance(result, tuple) else result
+    
+    def scan_timeframe(self, timeframe: str, prepared: Optional[pd.DataFrame] = None) -> Optional[Signal]:
+        """
+        Scan a single timeframe for signals.
+        
+        Args:
+            timeframe: Timeframe to scan
+            prepared: DataFrame with indicators already calculated (e.g. by a
+                batched calculation); fetched and calculated here when None
+            
+        Returns:
+            Signal if detected, None otherwise
+        """
+        try:
+            if prepared is not None:
+                df = prepared
+                latency_trace.mark_received('prepared', df, timeframe)
+            else:
+                # Fetch latest data
+                df = self._get_candles(timeframe)
+                
+                if df.empty:
+                    logger.warning(f"Empty data for {self.display_name} {timeframe}")
+                    return None
+                latency_trace.mark_received('fetch', df, timeframe)
+                
+                # Calculate indicators
+                if self.engine is not None:
+                    df = self.engine.indicators((self.symbol, timeframe), df, self._calculate_indicators)
+                else:
+                    df = self._calculate_indicators(df)
+                latency_trace.mark('indicators')
             
             # Update volatility and volume metrics
             self._update_volatility_metrics(df)
@@ -279,24 +353,56 @@ class SymbolScanner:
             
         except Exception as e:
             logger.error(f"Error scanning {self.display_name} {timeframe}: {e}")
-            self.error_count += 1
-            self.consecutive_errors += 1
-            
-            # Check if we should pause due to consecutive errors
-            if self.consecutive_errors >= self.max_consecutive_errors:
-                self.paused = True
-                self.pause_reason = f"Too many consecutive errors ({self.consecutive_errors})"
-                logger.error(f"Pausing {self.display_name} scanner: {self.pause_reason}")
-                
-                # Calculate exponential backoff
-                self.reconnect_backoff = min(self.reconnect_backoff * 2, 300)  # Max 5 minutes
-            
+            self._record_scan_error()
             return None
     
-    def scan_all_timeframes(self) -> List[Signal]:
+    def _record_scan_error(self) -> None:
+        """Count a scan error and pause the scanner after too many in a row."""
+        self.error_count += 1
+        self.consecutive_errors += 1
+        
+        # Check if we should pause due to consecutive errors
+        if self.consecutive_errors >= self.max_consecutive_errors:
+            self.paused = True
+            self.pause_reason = f"Too many consecutive errors ({self.consecutive_errors})"
+            logger.error(f"Pausing {self.display_name} scanner: {self.pause_reason}")
+            
+            # Calculate exponential backoff
+            self.reconnect_backoff = min(self.reconnect_backoff * 2, 300)  # Max 5 minutes
+    
+    def try_resume(self) -> bool:
+        """
+        Health-check a paused scanner and resume it if data is available again.
+        
+        Returns:
+            True if the scanner is (now) active
+        """
+        if not self.paused:
+            return True
+        
+        try:
+            df = self._fetch_candles(self.timeframes[0], count=1)
+            if not df.empty:
+                # Success! Reset error state
+                self.paused = False
+                self.pause_reason = ""
+                self.consecutive_errors = 0
+                self.reconnect_backoff = 1
+                logger.info(f"Successfully reconnected {self.display_name}")
+                return True
+            logger.warning(f"Reconnection attempt failed for {self.display_name}")
+        except Exception as e:
+            logger.error(f"Reconnection attempt failed for {self.display_name}: {e}")
+        return False
+    
+    def scan_all_timeframes(self, prepared: Optional[Dict[str, pd.DataFrame]] = None) -> List[Signal]:
         """
         Scan all timeframes for signals.
         
+        Args:
+            prepared: Optional timeframe -> DataFrame with indicators already
+                calculated; timeframes missing from it are fetched as usual
+        
         Returns:
             List of detected signals
         """
@@ -308,21 +414,7 @@ class SymbolScanner:
             time.sleep(self.reconnect_backoff)
             logger.info(f"Attempting to reconnect {self.display_name} after {self.reconnect_backoff}s backoff")
             
-            # Try a simple health check
-            try:
-                df = self.market_client.get_latest_candles(self.timeframes[0], count=1)
-                if not df.empty:
-                    # Success! Reset error state
-                    self.paused = False
-                    self.pause_reason = ""
-                    self.consecutive_errors = 0
-                    self.reconnect_backoff = 1
-                    logger.info(f"Successfully reconnected {self.display_name}")
-                else:
-                    logger.warning(f"Reconnection attempt failed for {self.display_name}")
-                    return []
-            except Exception as e:
-                logger.error(f"Reconnection attempt failed for {self.display_name}: {e}")
+            if not self.try_resume():
                 return []
         
         signals = []
@@ -330,17 +422,19 @@ class SymbolScanner:
         # Scan for regular signals
         for timeframe in self.timeframes:
             try:
-                signal = self.scan_timeframe(timeframe)
-                if signal:
-                    # Reset consecutive errors on successful signal detection
-                    self.consecutive_errors = 0
-                    self.reconnect_backoff = 1
-                    
-                    signals.append(signal)
-                    
-                    # Call callback
-                    if self.signal_callback:
-                        self.signal_callback(self.symbol, signal)
+                # The trace follows the update from fetch to alert delivery in the callback
+                with latency_trace.tracing(self.symbol, timeframe):
+                    signal = self.scan_timeframe(timeframe, (prepared or {}).get(timeframe))
+                    if signal:
+                        # Reset consecutive errors on successful signal detection
+                        self.consecutive_errors = 0
+                        self.reconnect_backoff = 1
+                        
+                        signals.append(signal)
+                        
+                        # Call callback
+                        if self.signal_callback:
+                            self.signal_callback(self.symbol, signal)
                         
             except Exception as e:
                 logger.error(f"Error in scan_all_timeframes for {self.display_name} {timeframe}: {e}")
@@ -410,6 +504,39 @@ class SymbolScanner:
         self.running = False
         logger.info(f"Scanner stopped for {self.display_name}")
     
+    def scan_once(self) -> List[Signal]:
+        """
+        One pass of the scanning loop, for running on a shared worker pool.
+        
+        Unlike run(), never sleeps: a paused scanner is only health-checked
+        once its reconnect backoff has passed.
+        
+        Returns:
+            List of detected signals
+        """
+        if not self.running:
+            return []
+        
+        if self.error_count >= self.max_errors:
+            logger.error(f"Max errors reached for {self.display_name}, reconnecting")
+            self.error_count = 0
+            if not self.connect():
+                return []
+        
+        if self.paused:
+            if time.monotonic() < self.next_resume_at:
+                return []
+            self.next_resume_at = time.monotonic() + self.reconnect_backoff
+            if not self.try_resume():
+                return []
+        
+        try:
+            return self.scan_all_timeframes()
+        except Exception as e:
+            logger.error(f"Error in scan pass for {self.display_name}: {e}")
+            self.error_count += 1
+            return []
+    
     def stop(self) -> None:
         """Stop the scanner loop."""
         logger.info(f"Stopping scanner for {self.display_name}")
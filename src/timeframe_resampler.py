@@ -0,0 +1,353 @@
+"""
+Timeframe Resampler
+Builds higher-timeframe candles locally from the finest fetched timeframe
+"""
+import threading
+from typing import Any, Dict, Optional, Union
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# Daily and weekly bars of session-traded assets start at the futures session
+# open (17:00 New York, 22:00 UTC) rather than at midnight UTC
+DEFAULT_SESSION_OFFSETS: Dict[str, str] = {
+    'XAUUSD': '22h',
+    'US30': '22h',
+    'US100': '22h',
+}
+
+# Epoch origins: 1970-01-01 for intraday/daily bars, Monday 1970-01-05 for weekly bars
+_EPOCH = pd.Timestamp('1970-01-01')
+_WEEK_EPOCH = pd.Timestamp('1970-01-05')
+
+_OHLCV = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def timeframe_to_timedelta(timeframe: str) -> pd.Timedelta:
+    """
+    Convert a timeframe string ('1m', '15m', '4h', '1d', '1w') to its duration.
+
+    Raises:
+        ValueError: If the timeframe is not understood
+    """
+    try:
+        return pd.Timedelta(seconds=int(timeframe[:-1]) * _UNIT_SECONDS[timeframe[-1]])
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"Unsupported timeframe: {timeframe!r}")
+
+
+def _origin(period: pd.Timedelta, session_offset: pd.Timedelta, tz,
+            bar_offset: Optional[pd.Timedelta] = None) -> pd.Timestamp:
+    """
+    Bar alignment origin.
+
+    A bar offset shifts the grid of any timeframe; otherwise the session
+    offset applies to daily and longer bars only.
+    """
+    origin = _WEEK_EPOCH if period >= pd.Timedelta(days=7) else _EPOCH
+    if bar_offset is not None:
+        origin = origin + bar_offset
+    elif period >= pd.Timedelta(days=1):
+        origin = origin + session_offset
+    return origin.tz_localize(tz) if tz is not None else origin
+
+
+def period_start(timestamps: Union[pd.Series, pd.Timestamp], timeframe: str,
+                 session_offset: Union[str, pd.Timedelta, None] = None,
+                 bar_offset: Union[str, pd.Timedelta, None] = None):
+    """
+    Start of the bar each timestamp falls in.
+
+    Args:
+        timestamps: Timestamp or Series of timestamps (naive or tz-aware)
+        timeframe: Bar timeframe
+        session_offset: Shift of daily/weekly bar boundaries from midnight UTC
+        bar_offset: Shift of the bar grid from the epoch origin, e.g. '30min'
+            for hourly bars opening at :30 (overrides session_offset)
+
+    Returns:
+        Same shape as ``timestamps``
+    """
+    period = timeframe_to_timedelta(timeframe)
+    offset = pd.Timedelta(session_offset or 0)
+    tz = timestamps.tz if isinstance(timestamps, pd.Timestamp) else timestamps.dt.tz
+    origin = _origin(period, offset, tz, pd.Timedelta(bar_offset) if bar_offset is not None else None)
+    return origin + ((timestamps - origin) // period) * period
+
+
+def bar_offset_of(timestamp: pd.Timestamp, timeframe: str) -> pd.Timedelta:
+    """
+    Shift from the epoch origin of the bar grid a bar start lies on.
+
+    Args:
+        timestamp: Start of a provider bar
+        timeframe: Bar timeframe
+
+    Returns:
+        Offset in [0, period), usable as ``bar_offset``
+    """
+    period = timeframe_to_timedelta(timeframe)
+    origin = _origin(period, pd.Timedelta(0), timestamp.tz, pd.Timedelta(0))
+    return (timestamp - origin) % period
+
+
+def resample_candles(df: pd.DataFrame, timeframe: str,
+                     session_offset: Union[str, pd.Timedelta, None] = None,
+                     bar_offset: Union[str, pd.Timedelta, None] = None) -> pd.DataFrame:
+    """
+    Aggregate candles into a higher timeframe.
+
+    The last bar is built from whatever base bars exist so far, so it is the
+    forming bar just like the last bar of a provider response. Columns other
+    than OHLCV (e.g. ``symbol``) take the last value of each bar.
+
+    Args:
+        df: Candles with a 'timestamp' column, oldest first
+        timeframe: Target timeframe
+        session_offset: Shift of daily/weekly bar boundaries from midnight UTC
+        bar_offset: Shift of the bar grid from the epoch origin (see period_start)
+
+    Returns:
+        DataFrame of higher-timeframe candles labelled by bar start
+    """
+    if df.empty:
+        return df.copy()
+    starts = period_start(df['timestamp'], timeframe, session_offset, bar_offset)
+    aggregations = {col: _OHLCV.get(col, 'last') for col in df.columns if col != 'timestamp'}
+    bars = df.groupby(starts.values, sort=True).agg(aggregations)
+    bars.insert(0, 'timestamp', bars.index)
+    if starts.dt.tz is not None:
+        bars['timestamp'] = bars['timestamp'].dt.tz_localize('UTC').dt.tz_convert(starts.dt.tz)
+    return bars.reset_index(drop=True)
+
+
+def _merge_bars(early: Dict[str, Any], late: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two consecutive parts of one bar."""
+    merged = dict(late)
+    merged['timestamp'] = early['timestamp']
+    merged['open'] = early['open']
+    merged['high'] = max(early['high'], late['high'])
+    merged['low'] = min(early['low'], late['low'])
+    merged['volume'] = early['volume'] + late['volume']
+    return merged
+
+
+class TimeframeResampler:
+    """
+    Higher-timeframe candles for one symbol, kept up to date from base candles.
+
+    Base candles are merged into a rolling store as they are fetched; each
+    higher timeframe is recomputed only from the first bar the new base data
+    touched. Bars older than the base store come from ``seed()``, a one-off
+    direct fetch for deep history. All timeframes are derived from the same
+    base snapshot, so they share one clock.
+
+    Bars follow the provider's grid: an explicit ``bar_offsets`` entry, else
+    the grid of the seeded provider bars, else (intraday) the grid of the
+    base bars. The bar the base store starts in the middle of keeps
+    updating: the part of it the store no longer holds (trimmed base bars,
+    or the seeded provider bar) is carried and merged into the rebuilt bar.
+    """
+
+    def __init__(self, base_timeframe: str, session_offset: Union[str, pd.Timedelta, None] = None,
+                 max_base_bars: int = 5000, max_bars: int = 2000,
+                 bar_offsets: Optional[Dict[str, Union[str, pd.Timedelta]]] = None):
+        """
+        Initialize resampler.
+
+        Args:
+            base_timeframe: Finest fetched timeframe (e.g. '1m' or '15m')
+            session_offset: Shift of daily/weekly bar boundaries from midnight UTC
+            max_base_bars: Base candles kept
+            max_bars: Candles kept per higher timeframe
+            bar_offsets: Timeframe -> shift of the provider's bar grid from
+                the epoch origin (e.g. {'1h': '30min'})
+        """
+        self.base_timeframe = base_timeframe
+        self.base_period = timeframe_to_timedelta(base_timeframe)
+        self.session_offset = pd.Timedelta(session_offset or 0)
+        self.max_base_bars = max_base_bars
+        self.max_bars = max_bars
+        self.bar_offsets = {tf: pd.Timedelta(offset) for tf, offset in (bar_offsets or {}).items()}
+
+        self._base = pd.DataFrame()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._seeded: set = set()
+        self._seed_offsets: Dict[str, pd.Timedelta] = {}
+        self._carry: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self.base_fresh = False
+
+    def __getstate__(self) -> dict:
+        """Picklable state for checkpoints (the lock is recreated on load)."""
+        with self._lock:
+            state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault('bar_offsets', {})
+        self.__dict__.setdefault('_seed_offsets', {})
+        self.__dict__.setdefault('_carry', {})
+        self._lock = threading.RLock()
+
+    def covers(self, timeframe: str) -> bool:
+        """True if ``timeframe`` is a whole multiple of the base timeframe (and longer)."""
+        try:
+            period = timeframe_to_timedelta(timeframe)
+        except ValueError:
+            return False
+        return period > self.base_period and period % self.base_period == pd.Timedelta(0)
+
+    @property
+    def has_base(self) -> bool:
+        return not self._base.empty
+
+    @property
+    def latest_base(self) -> pd.DataFrame:
+        """The newest base candle (empty before the first fetch)."""
+        with self._lock:
+            return self._base.iloc[-1:].reset_index(drop=True)
+
+    def update_base(self, df: pd.DataFrame, is_fresh: bool = True) -> None:
+        """
+        Merge freshly fetched base candles and update the higher timeframes.
+
+        Args:
+            df: Base candles, oldest first (the last one may still be forming)
+            is_fresh: Freshness of the fetch, reported for derived timeframes
+        """
+        if df.empty:
+            return
+        with self._lock:
+            self.base_fresh = is_fresh
+            if self._base.empty or df['timestamp'].iloc[0] > self._base['timestamp'].iloc[-1]:
+                # First fetch, or a gap since the last one: start the store over
+                self._base = df.reset_index(drop=True)
+                self._carry.clear()
+                changed_from = df['timestamp'].iloc[0]
+            else:
+                last = self._base['timestamp'].iloc[-1]
+                new_rows = df[df['timestamp'] >= last]
+                if new_rows.empty:
+                    return
+                kept = self._base[self._base['timestamp'] < last]
+                self._base = pd.concat([kept, new_rows], ignore_index=True)
+                changed_from = last
+            if len(self._base) > self.max_base_bars:
+                trimmed = self._base.iloc[:-self.max_base_bars]
+                self._base = self._base.iloc[-self.max_base_bars:].reset_index(drop=True)
+                self._carry_trimmed(trimmed)
+
+            for timeframe in list(self._frames):
+                self._frames[timeframe] = self._splice(self._frames[timeframe], timeframe, changed_from)
+
+    def seed(self, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        Provide deep history for a timeframe (e.g. from a direct provider fetch).
+
+        Bars the base store covers are replaced by locally built ones.
+        """
+        with self._lock:
+            self._seeded.add(timeframe)
+            if not df.empty:
+                self._seed_offsets[timeframe] = bar_offset_of(df['timestamp'].iloc[-1], timeframe)
+            df = df.reset_index(drop=True)
+            self._carry_seeded(timeframe, df)
+            self._frames[timeframe] = self._splice(df, timeframe)
+
+    def get(self, timeframe: str, count: int) -> Optional[pd.DataFrame]:
+        """
+        Get the last ``count`` candles of a higher timeframe.
+
+        Returns:
+            DataFrame, or None if fewer than ``count`` bars are available and
+            the timeframe has not been seeded with deep history yet
+        """
+        with self._lock:
+            if self._base.empty:
+                return None
+            frame = self._frames.get(timeframe)
+            if frame is None:
+                frame = self._frames[timeframe] = self._splice(pd.DataFrame(), timeframe)
+            if len(frame) < count and timeframe not in self._seeded:
+                return None
+            return frame.iloc[-count:].reset_index(drop=True)
+
+    def _bar_offset(self, timeframe: str) -> Optional[pd.Timedelta]:
+        """Grid of a timeframe: configured, seeded from the provider, or the base grid for intraday bars."""
+        if timeframe in self.bar_offsets:
+            return self.bar_offsets[timeframe]
+        if timeframe in self._seed_offsets:
+            return self._seed_offsets[timeframe]
+        if not self._base.empty and timeframe_to_timedelta(timeframe) < pd.Timedelta(days=1):
+            offset = bar_offset_of(self._base['timestamp'].iloc[0], self.base_timeframe)
+            return offset if offset else None
+        return None
+
+    def _period_start(self, timestamps, timeframe: str):
+        return period_start(timestamps, timeframe, self.session_offset, self._bar_offset(timeframe))
+
+    def _carry_trimmed(self, trimmed: pd.DataFrame) -> None:
+        """Keep the trimmed part of each bar the base store now starts in the middle of."""
+        first = self._base['timestamp'].iloc[0]
+        for timeframe in self._frames:
+            start = self._period_start(first, timeframe)
+            part = trimmed[trimmed['timestamp'] >= start]
+            if start == first or part.empty:
+                self._carry.pop(timeframe, None)
+                continue
+            bar = resample_candles(part, timeframe, self.session_offset, self._bar_offset(timeframe)).iloc[0].to_dict()
+            carry = self._carry.get(timeframe)
+            self._carry[timeframe] = _merge_bars(carry, bar) if carry and carry['timestamp'] == start else bar
+
+    def _carry_seeded(self, timeframe: str, frame: pd.DataFrame) -> None:
+        """Carry the part of a seeded provider bar that precedes the base store."""
+        if self._base.empty or frame.empty:
+            return
+        first = self._base['timestamp'].iloc[0]
+        start = self._period_start(first, timeframe)
+        match = frame[frame['timestamp'] == start]
+        if start == first or match.empty:
+            return
+        bar = match.iloc[-1].to_dict()
+        # High/low/open hold as they are; volume loses the part the base store also has
+        covered = self._base.loc[self._base['timestamp'] < start + timeframe_to_timedelta(timeframe), 'volume'].sum()
+        bar['volume'] = max(0.0, bar['volume'] - covered)
+        self._carry[timeframe] = bar
+
+    def _splice(self, frame: pd.DataFrame, timeframe: str,
+                changed_from: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Replace the bars of ``frame`` from ``changed_from`` on with bars built from the base store."""
+        if self._base.empty:
+            return frame
+        # Only whole bars are built locally: skip one the base store starts in the
+        # middle of, unless the part before the store is carried
+        first = self._base['timestamp'].iloc[0]
+        start = self._period_start(first, timeframe)
+        carry = self._carry.get(timeframe)
+        if carry is None or carry['timestamp'] != start:
+            carry = None
+            if start < first:
+                start = start + timeframe_to_timedelta(timeframe)
+        if changed_from is not None:
+            start = max(start, self._period_start(changed_from, timeframe))
+
+        rebuilt = resample_candles(self._base[self._base['timestamp'] >= start], timeframe,
+                                   self.session_offset, self._bar_offset(timeframe))
+        if carry is not None and not rebuilt.empty and rebuilt['timestamp'].iloc[0] == carry['timestamp']:
+            merged = _merge_bars(carry, rebuilt.iloc[0].to_dict())
+            for column in ('open', 'high', 'low', 'volume'):
+                rebuilt.loc[0, column] = merged[column]
+        if not frame.empty:
+            frame = frame[frame['timestamp'] < start]
+            rebuilt = pd.concat([frame, rebuilt], ignore_index=True)
+        if len(rebuilt) > self.max_bars:
+            rebuilt = rebuilt.iloc[-self.max_bars:].reset_index(drop=True)
+        return rebuilt
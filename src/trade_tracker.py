@@ -5,6 +5,7 @@ from typing import Optional, Dict
 from collections import deque
 import logging
 
+from src import virtual_clock
 from src.signal_detector import Signal
 
 
@@ -48,6 +49,9 @@ class TradeTracker:
     - Strict exit conditions (no exits on negative P&L)
     """
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('active_trades', 'closed_trades', 'symbol_trade_history')
+    
     def __init__(
         self,
         alerter,
@@ -56,7 +60,8 @@ class TradeTracker:
         min_profit_threshold_fx: float = 0.3,
         max_giveback_percent: float = 40.0,
         min_peak_profit_for_exit: float = 2.0,
-        duplicate_exit_window_minutes: int = 10
+        duplicate_exit_window_minutes: int = 10,
+        events=None
     ):
         """
         Initialize trade tracker.
@@ -69,8 +74,10 @@ class TradeTracker:
             max_giveback_percent: Maximum giveback % before exit signal
             min_peak_profit_for_exit: Minimum peak profit % required for exit evaluation
             duplicate_exit_window_minutes: Minimum time between duplicate exit signals
+            events: Optional EventStore receiving trade_open/trade_close events
         """
         self.alerter = alerter
+        self.events = events
         self.active_trades: Dict[str, TradeStatus] = {}  # Per-symbol tracking
         self.closed_trades: deque = deque(maxlen=100)
         
@@ -109,13 +116,15 @@ class TradeTracker:
         
         trade_status = TradeStatus(
             signal=signal,
-            entry_time=datetime.now(),
+            entry_time=virtual_clock.now(),
             highest_price=signal.entry_price,  # Initialize with entry price
             lowest_price=signal.entry_price,   # Initialize with entry price
             symbol=symbol
         )
         
         self.active_trades[trade_id] = trade_status
+        if self.events is not None:
+            self.events.record_signal('trade_open', signal, symbol=symbol, trade_id=trade_id)
         logger.info(f"Added trade to tracking: {trade_id} at ${signal.entry_price:.2f}")
         logger.debug(f"Trade ID generated with microseconds: {trade_id}")
         
@@ -260,14 +269,14 @@ class TradeTracker:
             True if momentum reversal detected
         """
         # STRICT RULE 1: Grace period enforcement
-        time_since_entry = datetime.now() - trade.entry_time
+        time_since_entry = virtual_clock.now() - trade.entry_time
         if time_since_entry < timedelta(minutes=self.grace_period_minutes):
             logger.debug(f"Grace period active: {time_since_entry.total_seconds()/60:.1f}m / {self.grace_period_minutes}m")
             return False
         
         # STRICT RULE 2: Check duplicate exit signal prevention
         if trade.last_exit_signal_time:
-            time_since_last_exit = datetime.now() - trade.last_exit_signal_time
+            time_since_last_exit = virtual_clock.now() - trade.last_exit_signal_time
             if time_since_last_exit < timedelta(minutes=self.duplicate_exit_window_minutes):
                 logger.debug(f"Duplicate exit signal suppressed: {time_since_last_exit.total_seconds()/60:.1f}m since last")
                 return False
@@ -361,7 +370,7 @@ class TradeTracker:
     def _send_momentum_reversal_alert(self, signal: Signal, current_price: float, indicators: Dict, trade: TradeStatus) -> None:
         """Send EXIT NOW alert when momentum reverses."""
         # Update exit signal tracking
-        trade.last_exit_signal_time = datetime.now()
+        trade.last_exit_signal_time = virtual_clock.now()
         trade.exit_signal_count += 1
         
         rsi = indicators.get('rsi', 0)
@@ -404,7 +413,7 @@ EXIT NOW at market price ${current_price:,.2f}
 
 The smart move is to exit now and preserve capital for the next setup.
 
-⏰ {datetime.now().strftime('%H:%M:%S UTC')}
+⏰ {virtual_clock.now().strftime('%H:%M:%S UTC')}
 """
         
         self.alerter.send_message(message)
@@ -519,7 +528,7 @@ Current Price: ${current_price:,.2f}
 
 This is a runner! The trend is strong and likely to continue past your original target.
 
-⏰ {datetime.now().strftime('%H:%M:%S UTC')}
+⏰ {virtual_clock.now().strftime('%H:%M:%S UTC')}
 """
         
         self.alerter.send_message(message)
@@ -557,7 +566,7 @@ Move your stop-loss to ${signal.entry_price:,.2f} (breakeven)
 
 This locks in a risk-free trade. If price reverses, you exit at breakeven. If it continues, you're still in for the full target at ${signal.take_profit:,.2f}.
 
-⏰ {datetime.now().strftime('%H:%M:%S UTC')}
+⏰ {virtual_clock.now().strftime('%H:%M:%S UTC')}
 """
         
         self.alerter.send_message(message)
@@ -586,7 +595,7 @@ Price is moving against your position. Prepare for potential stop-out.
 • Close manually if you see weakness
 • Do NOT move stop further away!
 
-⏰ {datetime.now().strftime('%H:%M:%S UTC')}
+⏰ {virtual_clock.now().strftime('%H:%M:%S UTC')}
 """
         
         self.alerter.send_message(message)
@@ -633,7 +642,7 @@ Price is moving against your position. Prepare for potential stop-out.
             trade.status = "CLOSED_SL"
         
         # Calculate hold time
-        hold_time = datetime.now() - trade.entry_time
+        hold_time = virtual_clock.now() - trade.entry_time
         minutes = int(hold_time.total_seconds() / 60)
         
         # Calculate R:R achieved (handle breakeven case where SL = entry)
@@ -654,7 +663,7 @@ R:R Achieved: {rr_achieved:.2f}
 *💡 NEXT STEPS:*
 {"✅ Great trade! Wait for next setup." if reason == "TARGET" else "✅ Stop protected you. Wait for next setup."}
 
-⏰ {datetime.now().strftime('%H:%M:%S UTC')}
+⏰ {virtual_clock.now().strftime('%H:%M:%S UTC')}
 """
         
         self.alerter.send_message(message)
@@ -668,6 +677,13 @@ R:R Achieved: {rr_achieved:.2f}
         is_win = (reason == "TARGET")
         self._record_trade_result(signal.symbol, is_win, pnl_percent)
         
+        if self.events is not None:
+            self.events.record_signal(
+                'trade_close', signal, reason=reason, symbol=trade.symbol,
+                trade_id=trade_id, exit_price=current_price, pnl_percent=pnl_percent,
+                hold_minutes=minutes, rr_achieved=rr_achieved
+            )
+        
         # Move to closed trades and remove from active
         self.closed_trades.append(trade)
         del self.active_trades[trade_id]
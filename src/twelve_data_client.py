@@ -7,7 +7,8 @@ import requests
 import pandas as pd
 from datetime import datetime
 from typing import Optional, List
-import time
+
+from src.rate_limiter import Priority, get_broker, priority_for_timeframe
 
 logger = logging.getLogger(__name__)
 
@@ -57,14 +58,16 @@ class TwelveDataClient:
         self.td_symbol = self.SYMBOL_MAP.get(symbol, symbol)
         
         self.connected = False
-        self.last_call_time = 0
-        self.min_call_interval = 7.5  # 8 calls/min = 7.5 seconds between calls
+        self.rate_limiter = get_broker()  # Shared with every client using this provider/key
         
         logger.info(f"Initialized TwelveDataClient for {symbol} (mapped to {self.td_symbol})")
     
     def connect(self) -> bool:
         """Test connection"""
         try:
+            if not self._rate_limit_wait(Priority.BACKFILL):
+                return False
+            
             # Test with a quote request
             params = {
                 'symbol': self.td_symbol,
@@ -95,14 +98,25 @@ class TwelveDataClient:
             logger.error(f"Failed to connect to Twelve Data: {e}")
             return False
     
-    def _rate_limit_wait(self):
-        """Wait if needed to respect rate limits"""
-        elapsed = time.time() - self.last_call_time
-        if elapsed < self.min_call_interval:
-            wait_time = self.min_call_interval - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.1f}s")
-            time.sleep(wait_time)
-        self.last_call_time = time.time()
+    def _rate_limit_wait(self, priority: Priority = Priority.SCAN) -> bool:
+        """
+        Wait for the shared Twelve Data request budget.
+        
+        Args:
+            priority: Request priority class
+            
+        Returns:
+            False if the request must not be sent (daily quota spent)
+        """
+        return self.rate_limiter.acquire('twelve_data', priority, api_key=self.api_key)
+    
+    def _report_throttled(self, response) -> None:
+        """Tell the rate limiter the provider rejected a request for exceeding limits."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        self.rate_limiter.report_throttled(
+            'twelve_data', api_key=self.api_key,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else 60.0
+        )
     
     def get_latest_candles(self, timeframe: str, count: int = 100) -> pd.DataFrame:
         """
@@ -116,7 +130,8 @@ class TwelveDataClient:
             DataFrame with OHLCV data
         """
         try:
-            self._rate_limit_wait()
+            if not self._rate_limit_wait(priority_for_timeframe(timeframe)):
+                return pd.DataFrame()
             
             td_interval = self.INTERVAL_MAP.get(timeframe, '5min')
             
@@ -129,6 +144,8 @@ class TwelveDataClient:
             
             response = requests.get(f"{self.base_url}/time_series", params=params, timeout=30)
             
+            if response.status_code == 429:
+                self._report_throttled(response)
             if response.status_code != 200:
                 logger.error(f"HTTP {response.status_code} from Twelve Data")
                 return pd.DataFrame()
@@ -136,6 +153,8 @@ class TwelveDataClient:
             data = response.json()
             
             # Check for errors
+            if data.get('code') == 429:
+                self._report_throttled(response)
             if 'code' in data and data['code'] != 200:
                 logger.error(f"Twelve Data error: {data.get('message', 'Unknown error')}")
                 return pd.DataFrame()
@@ -184,7 +203,8 @@ class TwelveDataClient:
     def get_current_price(self) -> Optional[float]:
         """Get current price"""
         try:
-            self._rate_limit_wait()
+            if not self._rate_limit_wait(Priority.TRADE):
+                return None
             
             params = {
                 'symbol': self.td_symbol,
@@ -16,6 +16,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
+from src.candle_cache import CandleCache
+from src.timeframe_resampler import TimeframeResampler, DEFAULT_SESSION_OFFSETS
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +39,17 @@ class DataSourceConfig:
     retry_config: RetryConfig = field(default_factory=RetryConfig)
     freshness_threshold_seconds: int = 300  # 5 minutes
     cache_enabled: bool = True
+    cache_ttl_seconds: float = 5.0  # Reuse fetches this long before asking the provider again
+    cache_max_entries: int = 256
+    
+    # Local resampling: timeframes above a symbol's base timeframe are built
+    # from its base candles instead of being fetched separately
+    resample_timeframes: bool = False
+    base_timeframes: Dict[str, str] = field(default_factory=dict)  # symbol -> finest fetched timeframe
+    session_offsets: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_SESSION_OFFSETS))
+    bar_offsets: Dict[str, Dict[str, str]] = field(default_factory=dict)  # symbol -> timeframe -> provider bar grid shift
+    resample_base_limit: int = 1000  # Base candles fetched per refresh
+    resample_max_age_seconds: float = 30.0  # Base snapshot age reused for higher timeframes
     
     # API Keys
     alpha_vantage_key: Optional[str] = None
@@ -55,67 +69,6 @@ class DataSourceError(Exception):
     pass
 
 
-class DataSourceCache:
-    """Simple cache for market data with TTL"""
-    
-    def __init__(self, ttl_seconds: int = 300):
-        """
-        Initialize cache
-        
-        Args:
-            ttl_seconds: Time-to-live for cached data
-        """
-        self.ttl_seconds = ttl_seconds
-        self.cache: Dict[str, Tuple[pd.DataFrame, datetime]] = {}
-    
-    def get(self, key: str) -> Optional[pd.DataFrame]:
-        """
-        Get cached data if not expired
-        
-        Args:
-            key: Cache key (symbol_timeframe)
-            
-        Returns:
-            DataFrame if cached and not expired, None otherwise
-        """
-        if key not in self.cache:
-            return None
-        
-        df, timestamp = self.cache[key]
-        age_seconds = (datetime.now() - timestamp).total_seconds()
-        
-        if age_seconds > self.ttl_seconds:
-            del self.cache[key]
-            return None
-        
-        logger.debug(f"Cache hit for {key} (age: {age_seconds:.1f}s)")
-        return df
-    
-    def set(self, key: str, df: pd.DataFrame) -> None:
-        """
-        Cache data
-        
-        Args:
-            key: Cache key (symbol_timeframe)
-            df: DataFrame to cache
-        """
-        self.cache[key] = (df, datetime.now())
-        logger.debug(f"Cached {key}")
-    
-    def clear(self, key: Optional[str] = None) -> None:
-        """
-        Clear cache
-        
-        Args:
-            key: Specific key to clear, or None to clear all
-        """
-        if key:
-            if key in self.cache:
-                del self.cache[key]
-        else:
-            self.cache.clear()
-
-
 class UnifiedDataSource:
     """
     Unified data source interface for all scanners with multi-provider fallback.
@@ -128,6 +81,9 @@ class UnifiedDataSource:
     - Per-source connection tracking
     """
     
+    # Resampled candle stores kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('resamplers',)
+    
     def __init__(self, config: DataSourceConfig):
         """
         Initialize unified data source
@@ -136,7 +92,12 @@ class UnifiedDataSource:
             config: DataSourceConfig with provider settings
         """
         self.config = config
-        self.cache = DataSourceCache(ttl_seconds=config.freshness_threshold_seconds)
+        # Entries live as long as the freshness threshold so they can serve as
+        # a last resort; normal reads only accept cache_ttl_seconds old data
+        self.cache = CandleCache(
+            ttl_seconds=max(config.freshness_threshold_seconds, config.cache_ttl_seconds),
+            max_entries=config.cache_max_entries
+        )
         
         # Track data source status
         self.source_status: Dict[str, bool] = {}
@@ -152,6 +113,12 @@ class UnifiedDataSource:
         # Client instances per source
         self.clients: Dict[str, any] = {}
         
+        # Per-symbol resamplers and when their base candles were last fetched
+        self.resamplers: Dict[str, TimeframeResampler] = {}
+        self._base_fetched_at: Dict[str, float] = {}
+        self.resampled_requests = 0
+        self.direct_requests = 0
+        
         logger.info(f"Initialized UnifiedDataSource")
         logger.info(f"Primary source: {config.primary_source}")
         logger.info(f"Fallback sources: {config.fallback_sources}")
@@ -179,8 +146,103 @@ class UnifiedDataSource:
         Raises:
             DataSourceError: If all sources fail and no cached data available
         """
-        cache_key = f"{symbol}_{timeframe}"
+        resampler = self._get_resampler(symbol)
+        if resampler is not None:
+            if timeframe == resampler.base_timeframe:
+                return self._fetch_base(resampler, symbol, max(limit, self.config.resample_base_limit),
+                                        validate_freshness, limit)
+            if resampler.covers(timeframe):
+                return self._get_resampled(resampler, symbol, timeframe, limit, validate_freshness)
+        
+        return self._fetch_with_fallback(symbol, timeframe, limit, validate_freshness)
+    
+    def has_fresh_candles(self, symbol: str, timeframe: str) -> bool:
+        """
+        Check whether stored base candles (e.g. restored from a checkpoint) can serve a timeframe.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Candle timeframe
+            
+        Returns:
+            True if the symbol's resampler covers the timeframe and its newest base candle is fresh
+        """
+        resampler = self.resamplers.get(symbol)
+        if resampler is None or not resampler.has_base:
+            return False
+        if timeframe != resampler.base_timeframe and not resampler.covers(timeframe):
+            return False
+        return self._validate_freshness(resampler.latest_base, timeframe)
+    
+    def _get_resampler(self, symbol: str) -> Optional[TimeframeResampler]:
+        """Resampler for a symbol with a configured base timeframe, if resampling is on."""
+        if not self.config.resample_timeframes:
+            return None
+        base_timeframe = self.config.base_timeframes.get(symbol)
+        if base_timeframe is None:
+            return None
+        resampler = self.resamplers.get(symbol)
+        if resampler is None:
+            resampler = self.resamplers[symbol] = TimeframeResampler(
+                base_timeframe, session_offset=self.config.session_offsets.get(symbol),
+                bar_offsets=self.config.bar_offsets.get(symbol)
+            )
+        return resampler
+    
+    def _fetch_base(
+        self,
+        resampler: TimeframeResampler,
+        symbol: str,
+        fetch_limit: int,
+        validate_freshness: bool,
+        limit: int
+    ) -> Tuple[pd.DataFrame, bool]:
+        """Fetch base candles, feed them to the resampler and return the last ``limit``."""
+        df, is_fresh = self._fetch_with_fallback(symbol, resampler.base_timeframe, fetch_limit, validate_freshness)
+        resampler.update_base(df, is_fresh)
+        self._base_fetched_at[symbol] = time.monotonic()
+        return df.iloc[-limit:].reset_index(drop=True), is_fresh
+    
+    def _get_resampled(
+        self,
+        resampler: TimeframeResampler,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        validate_freshness: bool
+    ) -> Tuple[pd.DataFrame, bool]:
+        """
+        Build a higher timeframe from the symbol's base candles.
+        
+        The base snapshot is reused while it is younger than
+        resample_max_age_seconds, so one scan cycle costs one base fetch.
+        The provider is only asked for the timeframe itself the first time
+        more history is needed than the base candles cover.
+        """
+        fetched_at = self._base_fetched_at.get(symbol)
+        if fetched_at is None or time.monotonic() - fetched_at > self.config.resample_max_age_seconds:
+            self._fetch_base(resampler, symbol, self.config.resample_base_limit, validate_freshness, 1)
+        
+        df = resampler.get(timeframe, limit)
+        if df is None:
+            logger.info(f"Fetching {symbol} {timeframe} history directly ({limit} candles exceed local base data)")
+            history, _ = self._fetch_with_fallback(symbol, timeframe, limit, False)
+            self.direct_requests += 1
+            resampler.seed(timeframe, history)
+            df = resampler.get(timeframe, limit)
         
+        self.resampled_requests += 1
+        # A derived bar is as fresh as the base candles it was built from
+        return df, resampler.base_fresh if validate_freshness else True
+    
+    def _fetch_with_fallback(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        validate_freshness: bool
+    ) -> Tuple[pd.DataFrame, bool]:
+        """Fetch candles from the first source that has them, falling back to cached data."""
         # Try to get data from primary and fallback sources
         all_sources = [self.config.primary_source] + self.config.fallback_sources
         
@@ -192,18 +254,9 @@ class UnifiedDataSource:
             
             try:
                 logger.debug(f"Attempting to fetch {symbol} {timeframe} from {source}")
-                df = self._fetch_from_source(source, symbol, timeframe, limit)
+                df, is_fresh = self._cached_fetch(source, symbol, timeframe, limit, validate_freshness)
                 
-                if df is not None and not df.empty:
-                    # Validate freshness if requested
-                    is_fresh = True
-                    if validate_freshness:
-                        is_fresh = self._validate_freshness(df, timeframe)
-                    
-                    # Cache the data
-                    if self.config.cache_enabled:
-                        self.cache.set(cache_key, df)
-                    
+                if not df.empty:
                     # Update source status
                     self.source_status[source] = True
                     self.source_last_success[source] = datetime.now()
@@ -225,17 +278,50 @@ class UnifiedDataSource:
         
         # All sources failed, try cache
         logger.warning(f"All data sources failed for {symbol} {timeframe}, attempting cache")
-        cached_df = self.cache.get(cache_key)
-        
-        if cached_df is not None and not cached_df.empty:
-            logger.warning(f"Using cached data for {symbol} {timeframe}")
-            return cached_df, False  # Mark as not fresh
+        if self.config.cache_enabled:
+            for source in all_sources:
+                cached = self.cache.get((source, symbol, timeframe, validate_freshness), limit)
+                if cached is not None:
+                    logger.warning(f"Using cached data for {symbol} {timeframe} from {source}")
+                    return cached[0], False  # Mark as not fresh
         
         # No data available
         raise DataSourceError(
             f"Failed to fetch {symbol} {timeframe} from all sources and no cached data available"
         )
     
+    def _cached_fetch(
+        self,
+        source: str,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        validate_freshness: bool
+    ) -> Tuple[pd.DataFrame, bool]:
+        """
+        Fetch from one source through the cache.
+        
+        Concurrent callers asking for the same candles share one request and
+        smaller limits are sliced from a larger cached fetch.
+        
+        Returns:
+            Tuple of (DataFrame, is_fresh); the DataFrame is empty if the source had no data
+        """
+        def fetch() -> Tuple[pd.DataFrame, bool]:
+            df = self._fetch_from_source(source, symbol, timeframe, limit)
+            if df is None or df.empty:
+                return pd.DataFrame(), False
+            is_fresh = self._validate_freshness(df, timeframe) if validate_freshness else True
+            return df, is_fresh
+        
+        if not self.config.cache_enabled:
+            return fetch()
+        
+        return self.cache.get_or_fetch(
+            (source, symbol, timeframe, validate_freshness), limit, fetch,
+            max_age=self.config.cache_ttl_seconds
+        )
+    
     def _fetch_from_source(
         self,
         source: str,
@@ -477,8 +563,23 @@ class UnifiedDataSource:
         Clear cache.
         
         Args:
-            key: Specific cache key to clear, or None to clear all
+            key: Specific "symbol_timeframe" to clear, or None to clear all
         """
-        self.cache.clear(key)
+        if key:
+            self.cache.clear(lambda cache_key: f"{cache_key[1]}_{cache_key[2]}" == key)
+        else:
+            self.cache.clear()
         logger.info(f"Cleared cache: {key or 'all'}")
+    
+    def get_cache_stats(self) -> Dict[str, object]:
+        """
+        Get candle cache statistics.
+        
+        Returns:
+            Dictionary with hit/miss counters and size
+        """
+        stats = self.cache.get_stats()
+        stats['resampled_requests'] = self.resampled_requests
+        stats['direct_history_requests'] = self.direct_requests
+        return stats
 
@@ -31,6 +31,9 @@ class US30Strategy:
     - Partial exit at 2R, let rest run
     """
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('fvg_detector',)
+    
     def __init__(self, config: dict = None):
         """
         Initialize US30 strategy
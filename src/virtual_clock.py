@@ -0,0 +1,112 @@
+"""
+Virtual Clock
+Process-wide time source that replays can move independently of the wall clock
+"""
+import threading
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime, tzinfo
+from typing import Iterator, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SystemClock:
+    """The wall clock."""
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        return datetime.now(tz)
+
+    def time(self) -> float:
+        return _time.time()
+
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        _time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    A clock that only moves when told to.
+
+    Replays set it to the timestamp of each recorded event, so everything
+    that reads the time sees the moment the event originally happened.
+    sleep() advances virtual time instead of blocking.
+    """
+
+    def __init__(self, start: Union[datetime, float] = 0.0):
+        """
+        Initialize clock.
+
+        Args:
+            start: Initial time (aware datetime, or epoch seconds)
+        """
+        self._epoch = start.timestamp() if isinstance(start, datetime) else float(start)
+        self._origin = self._epoch
+        self._lock = threading.Lock()
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Current virtual time, with the semantics of datetime.now(tz)."""
+        return datetime.fromtimestamp(self._epoch, tz)
+
+    def time(self) -> float:
+        """Current virtual time in epoch seconds."""
+        return self._epoch
+
+    def monotonic(self) -> float:
+        """Virtual seconds since the clock was created."""
+        return self._epoch - self._origin
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by ``seconds``."""
+        if seconds > 0:
+            with self._lock:
+                self._epoch += seconds
+
+    def advance_to(self, epoch: float) -> None:
+        """Move the clock forward to ``epoch`` (never backwards)."""
+        with self._lock:
+            if epoch > self._epoch:
+                self._epoch = epoch
+
+
+_clock: Union[SystemClock, VirtualClock] = SystemClock()
+
+
+def get_clock() -> Union[SystemClock, VirtualClock]:
+    """Get the process-wide clock."""
+    return _clock
+
+
+def set_clock(clock: Optional[Union[SystemClock, VirtualClock]]) -> None:
+    """Install a clock process-wide (None restores the wall clock)."""
+    global _clock
+    _clock = clock or SystemClock()
+    logger.info(f"Clock set to {type(_clock).__name__}")
+
+
+@contextmanager
+def use_clock(clock: Union[SystemClock, VirtualClock]) -> Iterator[Union[SystemClock, VirtualClock]]:
+    """Install ``clock`` for the duration of a with-block."""
+    previous = _clock
+    set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def now(tz: Optional[tzinfo] = None) -> datetime:
+    """datetime.now() of the process-wide clock."""
+    return _clock.now(tz)
+
+
+def time() -> float:
+    """time.time() of the process-wide clock."""
+    return _clock.time()
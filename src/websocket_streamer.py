@@ -3,34 +3,435 @@ import json
 import threading
 import time
 import websocket
-from datetime import datetime
-from typing import Callable, Dict, List
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+import pandas as pd
+
+from src import latency_trace, virtual_clock
+from src.timeframe_resampler import timeframe_to_timedelta
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _loads = json.loads
+
 
 logger = logging.getLogger(__name__)
 
 
+# (timeframe, open_time_ms, open, high, low, close, volume, is_closed, event_time_ms)
+Kline = Tuple[str, int, float, float, float, float, float, bool, int]
+
+# (trade_time_ms, price, quantity, event_time_ms)
+AggTrade = Tuple[int, float, float, int]
+
+# TradeBarAccumulator.add() result bits
+NEW_HIGH = 1
+NEW_LOW = 2
+LATE = 4
+AMENDED = 8
+
+# Binance weekly klines open on Monday; the epoch was a Thursday
+_WEEK_ORIGIN_MS = 4 * 86_400_000
+
+
+def parse_kline(message) -> Optional[Kline]:
+    """
+    Decode a combined-stream kline message.
+    
+    Timestamps stay integer epoch milliseconds; nothing is converted to
+    datetime on the hot path.
+    
+    Args:
+        message: Raw message (str or bytes)
+        
+    Returns:
+        Kline tuple, or None for non-kline messages
+    """
+    return _kline(_loads(message).get('data'))
+
+
+def _kline(data: Optional[dict]) -> Optional[Kline]:
+    if not data or data.get('e') != 'kline':
+        return None
+    
+    k = data['k']
+    return (k['i'], k['t'], float(k['o']), float(k['h']), float(k['l']),
+            float(k['c']), float(k['v']), k['x'], data.get('E', k['t']))
+
+
+def parse_agg_trade(message) -> Optional[AggTrade]:
+    """
+    Decode a combined-stream aggTrade message.
+    
+    Args:
+        message: Raw message (str or bytes)
+        
+    Returns:
+        AggTrade tuple, or None for other messages
+    """
+    return _agg_trade(_loads(message).get('data'))
+
+
+def _agg_trade(data: Optional[dict]) -> Optional[AggTrade]:
+    if not data or data.get('e') != 'aggTrade':
+        return None
+    return (data['T'], float(data['p']), float(data['q']), data.get('E', data['T']))
+
+
+def binance_stream_symbol(symbol: str) -> str:
+    """
+    Binance stream name of a configured symbol.
+    
+    Binance.com quotes dollar pairs in USDT, so a USD quote maps to USDT.
+    
+    Args:
+        symbol: Configured symbol (e.g. 'BTC/USD', 'BTC/USDT', 'BTCUSDT')
+        
+    Returns:
+        Lowercase stream symbol (e.g. 'btcusdt')
+    """
+    pair = symbol.replace('/', '').replace('-', '').upper()
+    if pair.endswith('USD'):
+        pair += 'T'
+    return pair.lower()
+
+
+def _candle(open_time: int, open_: float, high: float, low: float, close: float,
+            volume: float, is_closed: bool) -> dict:
+    """Candle dict as passed to callbacks (timestamp as naive UTC datetime)."""
+    return {
+        'timestamp': datetime.fromtimestamp(open_time / 1000, tz=timezone.utc).replace(tzinfo=None),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+        'is_closed': is_closed
+    }
+
+
+class KlineRingBuffer:
+    """
+    Fixed-size candle buffer backed by preallocated NumPy columns.
+    
+    Updates to the forming candle overwrite the newest slot in place; a new
+    open time advances the head. Nothing is allocated per message.
+    """
+    
+    def __init__(self, capacity: int = 500):
+        """
+        Initialize ring buffer.
+        
+        Args:
+            capacity: Number of candles kept
+        """
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.ohlcv = np.zeros((capacity, 5), dtype=np.float64)
+        self.closed = np.zeros(capacity, dtype=bool)
+        self.head = -1  # Slot of the newest candle
+        self.size = 0
+        self._lock = threading.Lock()
+    
+    def write(self, open_time: int, open_: float, high: float, low: float,
+              close: float, volume: float, is_closed: bool) -> None:
+        """Write a candle update (thread-safe)."""
+        with self._lock:
+            head = self.head
+            if self.size == 0 or self.timestamps[head] != open_time:
+                head = self.head = (head + 1) % self.capacity
+                if self.size < self.capacity:
+                    self.size += 1
+                self.timestamps[head] = open_time
+            row = self.ohlcv[head]
+            row[0] = open_
+            row[1] = high
+            row[2] = low
+            row[3] = close
+            row[4] = volume
+            self.closed[head] = is_closed
+    
+    def load(self, candles: pd.DataFrame, now_ms: int) -> None:
+        """
+        Replace the buffer contents with historical candles (thread-safe).
+        
+        Args:
+            candles: DataFrame with timestamp, open, high, low, close, volume, oldest first
+            now_ms: Current epoch ms; candles still open at this time are marked forming
+        """
+        candles = candles.iloc[-self.capacity:]
+        timestamps = pd.to_datetime(candles['timestamp'], utc=True).dt.tz_localize(None)
+        open_times = timestamps.to_numpy('datetime64[ms]').astype(np.int64)
+        period_ms = int(np.median(np.diff(open_times))) if len(open_times) > 1 else 0
+        count = len(candles)
+        with self._lock:
+            self.timestamps[:count] = open_times
+            self.ohlcv[:count] = candles[['open', 'high', 'low', 'close', 'volume']].to_numpy(np.float64)
+            self.closed[:count] = open_times + period_ms <= now_ms
+            self.head = count - 1 if count else -1
+            self.size = count
+    
+    def _order(self) -> np.ndarray:
+        """Slot indices from oldest to newest (lock held)."""
+        start = (self.head - self.size + 1) % self.capacity
+        return (start + np.arange(self.size)) % self.capacity
+    
+    def latest(self) -> Optional[dict]:
+        """
+        Get the newest candle as a dict.
+        
+        Returns:
+            Candle dict (timestamp as naive UTC datetime), or None if empty
+        """
+        with self._lock:
+            if self.size == 0:
+                return None
+            head = self.head
+            open_, high, low, close, volume = self.ohlcv[head].tolist()
+            timestamp = int(self.timestamps[head])
+            is_closed = bool(self.closed[head])
+        return _candle(timestamp, open_, high, low, close, volume, is_closed)
+    
+    def amend(self, open_time: int, open_: float, high: float, low: float,
+              close: float, volume: float) -> bool:
+        """
+        Overwrite a buffered candle with final values (thread-safe).
+        
+        Returns:
+            False if the candle is no longer (or not yet) buffered
+        """
+        with self._lock:
+            order = self._order()
+            slots = order[self.timestamps[order] == open_time]
+            if len(slots) == 0:
+                return False
+            self.ohlcv[slots[0]] = (open_, high, low, close, volume)
+            self.closed[slots[0]] = True
+            return True
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get buffered candles as a DataFrame, oldest first.
+        
+        Returns:
+            DataFrame with timestamp, open, high, low, close, volume, is_closed
+        """
+        with self._lock:
+            order = self._order()
+            timestamps = self.timestamps[order]
+            ohlcv = self.ohlcv[order]
+            closed = self.closed[order]
+        
+        df = pd.DataFrame(ohlcv, columns=['open', 'high', 'low', 'close', 'volume'])
+        df.insert(0, 'timestamp', pd.to_datetime(timestamps, unit='ms'))
+        df['is_closed'] = closed
+        return df
+    
+    def __len__(self) -> int:
+        return self.size
+
+
+class TradeBarAccumulator:
+    """
+    The forming bar of one timeframe, built trade by trade.
+    
+    Holds a single OHLCV row in plain attributes. roll() closes the bar once
+    the clock passes its end; a period without trades becomes a flat bar at
+    the last price with zero volume, as in exchange klines. The last closed
+    bar is kept so a trade published after its close can still be folded in.
+    """
+    
+    __slots__ = ('period_ms', 'origin_ms', 'open_time', 'open', 'high', 'low', 'close', 'volume',
+                 'empty', 'last_trade', 'prev', 'prev_last_trade', 'prev_partial', 'partial')
+    
+    def __init__(self, period_ms: int, origin_ms: int = 0):
+        """
+        Initialize accumulator.
+        
+        Args:
+            period_ms: Bar length in milliseconds
+            origin_ms: Epoch offset bars are aligned to
+        """
+        self.period_ms = period_ms
+        self.origin_ms = origin_ms
+        self.reset()
+    
+    def reset(self) -> None:
+        """Forget the forming bar; the next trade starts a new one."""
+        self.open_time = -1
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+        self.empty = True  # No trade in the forming bar yet
+        self.last_trade = -1  # Time of the newest trade folded into the forming bar
+        self.prev = None  # Last closed bar as an [open_time, open, high, low, close, volume] list
+        self.prev_last_trade = -1
+        self.prev_partial = False
+        self.partial = True  # The first bar after a reset misses the trades before it
+    
+    @property
+    def close_time(self) -> Optional[int]:
+        """Epoch ms at which the forming bar closes (None before the first trade)."""
+        return self.open_time + self.period_ms if self.open_time >= 0 else None
+    
+    def add(self, trade_time: int, price: float, quantity: float) -> int:
+        """
+        Fold a trade into the forming bar.
+        
+        Call roll(trade_time) first so the trade lands in the right bar.
+        
+        Returns:
+            NEW_HIGH/NEW_LOW bits; AMENDED if the trade belongs to the last
+            closed bar and was folded into ``prev``; LATE for an older trade
+        """
+        if self.open_time < 0:
+            self.open_time = trade_time - (trade_time - self.origin_ms) % self.period_ms
+            self.open = self.high = self.low = self.close = price
+            self.volume = quantity
+            self.empty = False
+            self.last_trade = trade_time
+            return NEW_HIGH | NEW_LOW
+        if trade_time < self.open_time:
+            prev = self.prev
+            if prev is None or trade_time < prev[0]:
+                return LATE
+            prev[2] = max(prev[2], price)
+            prev[3] = min(prev[3], price)
+            if trade_time >= self.prev_last_trade:
+                # Only a trade at or after the bar's last one moves its close
+                prev[4] = price
+                self.prev_last_trade = trade_time
+            prev[5] += quantity
+            return AMENDED
+        if self.empty:
+            # The bar opens at its first trade, not at the previous close
+            self.open = self.high = self.low = self.close = price
+            self.volume = quantity
+            self.empty = False
+            self.last_trade = trade_time
+            return NEW_HIGH | NEW_LOW
+        
+        extended = 0
+        if price > self.high:
+            self.high = price
+            extended |= NEW_HIGH
+        if price < self.low:
+            self.low = price
+            extended |= NEW_LOW
+        self.close = price
+        self.volume += quantity
+        self.last_trade = max(self.last_trade, trade_time)
+        return extended
+    
+    def roll(self, now_ms: int) -> List[Tuple[int, float, float, float, float, float]]:
+        """
+        Close every bar that has ended by ``now_ms``.
+        
+        Returns:
+            Closed (open_time, open, high, low, close, volume) rows, oldest first
+        """
+        closed = []
+        while self.open_time >= 0 and now_ms >= self.open_time + self.period_ms:
+            closed.append((self.open_time, self.open, self.high, self.low, self.close, self.volume))
+            self.prev = list(closed[-1])
+            self.prev_last_trade = self.last_trade
+            self.prev_partial = self.partial
+            self.partial = False
+            self.open_time += self.period_ms
+            self.open = self.high = self.low = self.close
+            self.volume = 0.0
+            self.empty = True
+        return closed
+    
+    def bar(self) -> Tuple[int, float, float, float, float, float]:
+        """The forming bar as an (open_time, open, high, low, close, volume) row."""
+        return (self.open_time, self.open, self.high, self.low, self.close, self.volume)
+
+
 class BinanceWebSocketStreamer:
     """
     WebSocket client for Binance real-time kline (candlestick) streams.
     
     Connects to Binance WebSocket API and streams real-time candlestick updates.
+    Messages are decoded with orjson when installed and written straight into
+    per-timeframe ring buffers.
+    
+    In trade mode the candles are built locally from the aggTrade stream
+    instead of kline updates, which Binance throttles to about one a second.
+    A bar closes on the first trade stamped at or past its boundary, or by
+    the bar-clock thread once ``close_grace_ms`` has passed without one. A
+    trade of the just-closed bar that arrives after it closed is folded in
+    and the bar is re-emitted with ``'is_correction': True``. The first bar
+    after a (re)connect misses its earlier trades and is never emitted; the
+    exchange kline is emitted in its place. Each trade that makes a new high
+    or low of the base bar goes to ``on_price_callback``, and the exchange's
+    closed klines are still subscribed to validate (and if need be correct)
+    every locally built bar.
     Note: This is disabled by default. Use polling mode instead for better compatibility.
     """
     
-    def __init__(self, symbol: str, timeframes: List[str], on_candle_callback: Callable):
+    MODES = ('kline', 'trade')
+    
+    def __init__(self, symbol: str, timeframes: List[str], on_candle_callback: Optional[Callable] = None,
+                 buffer_size: int = 500, max_latency_seconds: float = 2.0, mode: str = 'kline',
+                 on_price_callback: Optional[Callable[[float], None]] = None,
+                 validate_klines: bool = True, close_grace_ms: int = 500):
         """
         Initialize WebSocket streamer.
         
         Args:
-            symbol: Trading pair (e.g., 'BTCUSDT' - note: no slash for Binance WS)
+            symbol: Trading pair (e.g., 'BTC/USDT'; a USD quote streams the USDT pair)
             timeframes: List of timeframes (e.g., ['1m', '5m'])
-            on_candle_callback: Callback function(timeframe, candle_dict) called on new data
+            on_candle_callback: Callback function(timeframe, candle_dict) called on new data (optional)
+            buffer_size: Candles kept per timeframe
+            max_latency_seconds: Event latency above which a warning is logged
+            mode: 'kline' to stream exchange klines, 'trade' to build bars from aggTrades
+            on_price_callback: Trade mode: called with the price whenever a trade makes a
+                new high or low of the forming base bar (e.g. TradeTracker.update_trades)
+            validate_klines: Trade mode: compare built bars with the exchange's closed klines
+            close_grace_ms: Trade mode: how long past a boundary the bar clock waits for
+                in-flight trades before closing a bar no later trade has closed
+            
+        Raises:
+            ValueError: If the mode is unknown
         """
-        self.symbol = symbol.replace('/', '').lower()  # Convert BTC/USDT -> btcusdt
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown streamer mode: {mode!r}")
+        self.symbol = binance_stream_symbol(symbol)  # BTC/USD -> btcusdt
+        self.trace_symbol = symbol  # As configured, to match polled traces
         self.timeframes = timeframes
         self.on_candle_callback = on_candle_callback
+        self.max_latency_ms = max_latency_seconds * 1000
+        self.buffers: Dict[str, KlineRingBuffer] = {tf: KlineRingBuffer(buffer_size) for tf in timeframes}
+        self.period_ms = {tf: int(timeframe_to_timedelta(tf).total_seconds() * 1000) for tf in timeframes}
+        self.messages_processed = 0
+        self.recorder = None  # Optional FeedRecorder capturing raw messages
+        
+        # Trade mode
+        self.mode = mode
+        self.on_price_callback = on_price_callback
+        self.validate_klines = validate_klines
+        self.close_grace_ms = close_grace_ms
+        self.base_timeframe = min(timeframes, key=self.period_ms.get)
+        self.accumulators: Dict[str, TradeBarAccumulator] = {
+            tf: TradeBarAccumulator(period, _WEEK_ORIGIN_MS if tf.endswith('w') else 0)
+            for tf, period in self.period_ms.items()
+        }
+        self.trades_processed = 0
+        self.late_trades = 0
+        self.bars_closed = 0
+        self.bars_corrected = 0
+        self.partial_bars = 0
+        self.validation = {'compared': 0, 'mismatched': 0, 'amended': 0, 'max_diff_pct': 0.0}
+        self._unmatched: Dict[Tuple[str, int], Tuple[str, tuple]] = {}  # (tf, open_time) -> (origin, bar)
+        self._bar_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self.clock_thread = None
         
         self.ws = None
         self.ws_thread = None
@@ -38,10 +439,15 @@ class BinanceWebSocketStreamer:
         self._connected = False
         
         # Build WebSocket URL for multiple streams
-        streams = [f"{self.symbol}@kline_{tf}" for tf in timeframes]
+        if mode == 'trade':
+            streams = [f"{self.symbol}@aggTrade"]
+            if validate_klines:
+                streams += [f"{self.symbol}@kline_{tf}" for tf in timeframes]
+        else:
+            streams = [f"{self.symbol}@kline_{tf}" for tf in timeframes]
         self.ws_url = f"wss://stream.binance.com:9443/stream?streams={'/'.join(streams)}"
         
-        logger.info(f"Initialized WebSocket streamer for {symbol} on timeframes {timeframes}")
+        logger.info(f"Initialized WebSocket streamer for {symbol} on timeframes {timeframes} ({mode} mode)")
     
     def start(self) -> None:
         """Start WebSocket connection in background thread."""
@@ -50,23 +456,79 @@ class BinanceWebSocketStreamer:
             return
         
         self._running = True
+        self._wakeup.clear()
         self.ws_thread = threading.Thread(target=self._run_websocket, daemon=True)
         self.ws_thread.start()
+        if self.mode == 'trade':
+            self.clock_thread = threading.Thread(target=self._run_bar_clock, name="Bar-clock", daemon=True)
+            self.clock_thread.start()
         logger.info("WebSocket streamer started")
     
     def stop(self) -> None:
         """Stop WebSocket connection and cleanup."""
         self._running = False
+        self._wakeup.set()
         if self.ws:
             self.ws.close()
         if self.ws_thread:
             self.ws_thread.join(timeout=5)
+        if self.clock_thread:
+            self.clock_thread.join(timeout=5)
         logger.info("WebSocket streamer stopped")
     
     def is_connected(self) -> bool:
         """Check if WebSocket is currently connected."""
         return self._connected
     
+    def get_buffer_data(self, timeframe: str) -> pd.DataFrame:
+        """
+        Get streamed candles for a timeframe.
+        
+        Args:
+            timeframe: Timeframe string
+            
+        Returns:
+            DataFrame with buffered candlestick data
+        """
+        buffer = self.buffers.get(timeframe)
+        if buffer is None or len(buffer) == 0:
+            return pd.DataFrame()
+        return buffer.to_frame()
+    
+    def seed(self, timeframe: str, candles: pd.DataFrame) -> None:
+        """
+        Fill a timeframe's buffer with fetched history so closed streamed bars
+        can be scanned without waiting for the buffer to fill.
+        
+        Args:
+            timeframe: Timeframe string
+            candles: Historical candles, oldest first
+        """
+        buffer = self.buffers.get(timeframe)
+        if buffer is None or candles is None or candles.empty:
+            return
+        buffer.load(candles, int(virtual_clock.time() * 1000))
+        logger.debug(f"Seeded {timeframe} stream buffer with {len(buffer)} candles")
+    
+    def get_stats(self) -> Dict:
+        """
+        Get streaming statistics.
+        
+        Returns:
+            Dictionary with message/trade counts and kline validation results
+        """
+        return {
+            'mode': self.mode,
+            'connected': self._connected,
+            'messages_processed': self.messages_processed,
+            'trades_processed': self.trades_processed,
+            'late_trades': self.late_trades,
+            'bars_closed': self.bars_closed,
+            'bars_corrected': self.bars_corrected,
+            'partial_bars': self.partial_bars,
+            'validation': dict(self.validation)
+        }
+    
     def _run_websocket(self) -> None:
         """Main WebSocket loop (runs in background thread)."""
         while self._running:
@@ -91,9 +553,28 @@ class BinanceWebSocketStreamer:
                 logger.info("WebSocket disconnected, reconnecting in 5s...")
                 time.sleep(5)
     
+    def _run_bar_clock(self) -> None:
+        """Close trade-built bars at their boundary (trade mode, background thread)."""
+        while self._running:
+            with self._bar_lock:
+                closes = [acc.close_time for acc in self.accumulators.values() if acc.open_time >= 0]
+            wait = (min(closes) + self.close_grace_ms) / 1000 - virtual_clock.time() if closes else 1.0
+            if self._wakeup.wait(min(max(wait, 0.0), 1.0)):
+                break
+            try:
+                self.close_due_bars()
+            except Exception as e:
+                logger.error(f"Error closing trade bars: {e}")
+    
     def _on_open(self, ws) -> None:
         """Called when WebSocket connection is established."""
         self._connected = True
+        if self.mode == 'trade':
+            # Trades were missed while disconnected: start the bars over rather
+            # than close the gap with flat bars (the partial first bar is not emitted)
+            with self._bar_lock:
+                for acc in self.accumulators.values():
+                    acc.reset()
         logger.info("WebSocket connection established")
     
     def _on_close(self, ws, close_status_code, close_msg) -> None:
@@ -106,57 +587,272 @@ class BinanceWebSocketStreamer:
         logger.error(f"WebSocket error: {error}")
         self._connected = False
     
-    def _on_message(self, ws, message: str) -> None:
+    def _on_message(self, ws, message) -> None:
         """
         Called when WebSocket receives a message.
         
         Args:
             ws: WebSocket instance
-            message: JSON message string
+            message: JSON message (str or bytes)
         """
         try:
-            data = json.loads(message)
-            
-            # Binance sends data in 'data' field for combined streams
-            if 'data' not in data:
+            if self.recorder is not None:
+                self.recorder.record('ws', self.symbol, message)
+            data = _loads(message).get('data')
+            if self.mode == 'trade':
+                trade = _agg_trade(data)
+                if trade is not None:
+                    self._on_trade(trade)
+                    return
+                kline = _kline(data)
+                if kline is not None and kline[7] and self.validate_klines:
+                    self._emit_closed(self._validate_kline(kline))
                 return
             
-            kline_data = data['data']
-            
-            # Extract kline information
-            if kline_data.get('e') != 'kline':
+            kline = _kline(data)
+            if kline is None:
                 return
             
-            kline = kline_data['k']
-            
-            # Extract timeframe (e.g., '1m', '5m')
-            timeframe = kline['i']
-            
-            # Parse candle data
-            candle = {
-                'timestamp': pd.to_datetime(kline['t'], unit='ms'),
-                'open': float(kline['o']),
-                'high': float(kline['h']),
-                'low': float(kline['l']),
-                'close': float(kline['c']),
-                'volume': float(kline['v']),
-                'is_closed': kline['x']  # True if candle is closed
-            }
-            
-            # Calculate latency
-            current_time = datetime.now()
-            candle_time = candle['timestamp']
-            latency = (current_time - candle_time).total_seconds()
+            timeframe, open_time, open_, high, low, close, volume, is_closed, event_time = kline
+            buffer = self.buffers.get(timeframe)
+            if buffer is None:
+                return
+            buffer.write(open_time, open_, high, low, close, volume, is_closed)
+            self.messages_processed += 1
             
-            if latency > 2.0:
-                logger.warning(f"High latency detected: {latency:.2f}s for {timeframe}")
+            # Latency from Binance's event time, not the candle open time
+            latency_ms = int(virtual_clock.time() * 1000) - event_time
+            if latency_ms > self.max_latency_ms:
+                logger.warning(f"High latency detected: {latency_ms / 1000:.2f}s for {timeframe}")
             
-            # Call callback with parsed candle
-            self.on_candle_callback(timeframe, candle)
+            if self.on_candle_callback is not None:
+                # A closed bar is final at its close, a forming one at the exchange event time
+                source_ms = open_time + self.period_ms[timeframe] if is_closed else event_time
+                with latency_trace.tracing(self.trace_symbol, timeframe) as trace:
+                    trace.received('websocket', source_ms / 1000)
+                    self.on_candle_callback(timeframe, buffer.latest())
             
         except Exception as e:
             logger.error(f"Error processing WebSocket message: {e}")
+    
+    def _on_trade(self, trade: AggTrade) -> None:
+        """Fold an aggTrade into the forming bars of every timeframe."""
+        trade_time, price, quantity, event_time = trade
+        with self._bar_lock:
+            # A trade past a boundary the bar clock has not reached yet closes the bar first
+            closed = self._roll_bars(trade_time)
+            extended = 0
+            for timeframe, acc in self.accumulators.items():
+                flags = acc.add(trade_time, price, quantity)
+                if timeframe == self.base_timeframe:
+                    extended = flags
+                if flags & AMENDED:
+                    closed += self._correct(timeframe, acc)
+                elif not flags & LATE:
+                    self.buffers[timeframe].write(*acc.bar(), False)
+            self.trades_processed += 1
+            self.messages_processed += 1
+            if extended & LATE:
+                self.late_trades += 1
+        
+        latency_ms = int(virtual_clock.time() * 1000) - event_time
+        if latency_ms > self.max_latency_ms:
+            logger.warning(f"High latency detected: {latency_ms / 1000:.2f}s for aggTrade")
+        
+        self._emit_closed(closed)
+        if extended & (NEW_HIGH | NEW_LOW) and self.on_price_callback is not None:
+            self.on_price_callback(price)
+    
+    def close_due_bars(self) -> int:
+        """
+        Close trade-built bars still open ``close_grace_ms`` past their boundary
+        (called by the bar clock).
+        
+        Returns:
+            Number of bars closed
+        """
+        with self._bar_lock:
+            closed = self._roll_bars(int(virtual_clock.time() * 1000) - self.close_grace_ms)
+        self._emit_closed(closed)
+        return len(closed)
+    
+    def _roll_bars(self, now_ms: int) -> List[Tuple[str, tuple, bool]]:
+        """
+        Close ended bars into the buffers and the validation queue (bar lock held).
+        
+        The partial first bar after a reset stays unclosed in the buffer; it is
+        only emitted as the exchange kline that replaces it.
+        
+        Returns:
+            (timeframe, bar, is_correction) entries to emit
+        """
+        closed = []
+        for timeframe, acc in self.accumulators.items():
+            partial = acc.partial
+            for bar in acc.roll(now_ms):
+                if partial:
+                    partial = False
+                    self.partial_bars += 1
+                    self.buffers[timeframe].write(*bar, False)
+                    exchange = self._match(timeframe, 'partial', bar) if self.validate_klines else None
+                    if exchange is not None:
+                        closed.append((timeframe, exchange, False))
+                    continue
+                self.buffers[timeframe].write(*bar, True)
+                if self.validate_klines:
+                    self._match(timeframe, 'local', bar)
+                closed.append((timeframe, bar, False))
+                self.bars_closed += 1
+        return closed
+    
+    def _correct(self, timeframe: str, acc: TradeBarAccumulator) -> List[Tuple[str, tuple, bool]]:
+        """
+        Apply a late trade folded into the last closed bar (bar lock held).
+        
+        Returns:
+            The corrected bar to re-emit, or nothing if the bar was partial or
+            its exchange kline has already settled it
+        """
+        bar = tuple(acc.prev)
+        key = (timeframe, bar[0])
+        if self.validate_klines:
+            pending = self._unmatched.get(key)
+            if pending is None or pending[0] == 'kline':
+                return []
+            self._unmatched[key] = (pending[0], bar)
+            if pending[0] == 'partial':
+                return []
+        elif acc.prev_partial:
+            return []
+        self.buffers[timeframe].amend(*bar)
+        self.bars_corrected += 1
+        return [(timeframe, bar, True)]
+    
+    def _emit_closed(self, closed: List[Tuple[str, tuple, bool]]) -> None:
+        """Hand closed (or corrected) bars to the candle callback, traced from their close time."""
+        if self.on_candle_callback is None:
+            return
+        for timeframe, bar, is_correction in closed:
+            candle = _candle(*bar, True)
+            if is_correction:
+                candle['is_correction'] = True
+            with latency_trace.tracing(self.trace_symbol, timeframe) as trace:
+                trace.received('trade_bar', (bar[0] + self.period_ms[timeframe]) / 1000)
+                self.on_candle_callback(timeframe, candle)
+    
+    def _validate_kline(self, kline: Kline) -> List[Tuple[str, tuple, bool]]:
+        """
+        Queue an exchange closed kline for comparison with the locally built bar.
+        
+        Returns:
+            The kline as a bar to emit if it replaces a partial first bar
+        """
+        timeframe, open_time, open_, high, low, close, volume = kline[:7]
+        if timeframe not in self.accumulators:
+            return []
+        with self._bar_lock:
+            exchange = self._match(timeframe, 'kline', (open_time, open_, high, low, close, volume))
+        return [(timeframe, exchange, False)] if exchange is not None else []
+    
+    def _match(self, timeframe: str, origin: str, bar: tuple) -> Optional[tuple]:
+        """
+        Pair a built bar with its exchange kline, whichever arrives second (bar lock held).
+        
+        A mismatch is logged and the exchange values replace the built bar in
+        the buffer. A partial bar ('partial' origin) is not compared: the
+        kline simply replaces it.
+        
+        Returns:
+            The kline bar when it replaces a partial bar, else None
+        """
+        key = (timeframe, bar[0])
+        other = self._unmatched.pop(key, None)
+        if other is None or other[0] == origin:
+            self._unmatched[key] = (origin, bar)
+            if len(self._unmatched) > 4 * len(self.accumulators):
+                self._unmatched.pop(next(iter(self._unmatched)))
+            return None
+        
+        if 'partial' in (origin, other[0]):
+            exchange = bar if origin == 'kline' else other[1]
+            self.buffers[timeframe].amend(*exchange)
+            return exchange
+        
+        local, exchange = (bar, other[1]) if origin == 'local' else (other[1], bar)
+        self.validation['compared'] += 1
+        price_diff = max(abs(a - b) / b for a, b in zip(local[1:5], exchange[1:5]) if b) * 100
+        volume_diff = abs(local[5] - exchange[5])
+        self.validation['max_diff_pct'] = max(self.validation['max_diff_pct'], price_diff)
+        if price_diff > 1e-9 or volume_diff > 1e-6 * max(exchange[5], 1.0):
+            self.validation['mismatched'] += 1
+            logger.warning(f"Trade-built {timeframe} bar at {bar[0]} differs from exchange kline "
+                           f"(prices {price_diff:.4f}%, volume {local[5]:.6f} vs {exchange[5]:.6f}); using kline")
+            if self.buffers[timeframe].amend(*exchange):
+                self.validation['amended'] += 1
+        return None
 
 
-# Import pandas here to avoid circular import
-import pandas as pd
+def _legacy_parse(message: str) -> Optional[dict]:
+    """Original json + pd.to_datetime parse path, kept as the benchmark baseline."""
+    data = json.loads(message)
+    if 'data' not in data or data['data'].get('e') != 'kline':
+        return None
+    kline = data['data']['k']
+    candle = {
+        'timestamp': pd.to_datetime(kline['t'], unit='ms'),
+        'open': float(kline['o']),
+        'high': float(kline['h']),
+        'low': float(kline['l']),
+        'close': float(kline['c']),
+        'volume': float(kline['v']),
+        'is_closed': kline['x']
+    }
+    (datetime.now() - candle['timestamp']).total_seconds()
+    return candle
+
+
+def benchmark(messages: int = 20000) -> Dict[str, float]:
+    """
+    Measure parse throughput of the legacy and fast message paths.
+    
+    Args:
+        messages: Number of synthetic kline messages
+        
+    Returns:
+        Dictionary of implementation -> messages per second
+    """
+    start_ms = 1_700_000_000_000
+    payloads = []
+    for i in range(messages):
+        open_time = start_ms + (i // 10) * 60_000
+        payloads.append(json.dumps({
+            'stream': 'btcusdt@kline_1m',
+            'data': {
+                'e': 'kline', 'E': open_time + 500, 's': 'BTCUSDT',
+                'k': {
+                    't': open_time, 'T': open_time + 59_999, 's': 'BTCUSDT', 'i': '1m',
+                    'o': '42000.10', 'h': f'{42010 + i % 7:.2f}', 'l': '41990.00',
+                    'c': f'{42000 + i % 13:.2f}', 'v': '12.345', 'n': 100, 'x': i % 10 == 9,
+                    'q': '518000.0', 'V': '6.1', 'Q': '256000.0', 'B': '0'
+                }
+            }
+        }))
+    
+    results = {}
+    
+    started = time.perf_counter()
+    for payload in payloads:
+        _legacy_parse(payload)
+    results['legacy'] = messages / (time.perf_counter() - started)
+    
+    streamer = BinanceWebSocketStreamer('BTCUSDT', ['1m'], max_latency_seconds=float('inf'))
+    started = time.perf_counter()
+    for payload in payloads:
+        streamer._on_message(None, payload)
+    results['orjson' if ORJSON_AVAILABLE else 'json'] = messages / (time.perf_counter() - started)
+    return results
+
+
+if __name__ == "__main__":
+    for name, rate in benchmark().items():
+        print(f"{name:>7}: {rate:,.0f} msg/s")
@@ -2,7 +2,6 @@
 YFinance Market Data Client for Gold (XAU/USD)
 Fetches real Gold spot prices using Yahoo Finance
 """
-import yfinance as yf
 import pandas as pd
 import threading
 import time
@@ -11,6 +10,10 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import logging
 
+from src.lazy_import import lazy_module
+from src.rate_limiter import Priority, get_broker, is_rate_limit_error, priority_for_timeframe
+
+yf = lazy_module('yfinance', install_hint='pip install yfinance')
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,12 @@ class YFinanceClient:
     Compatible with the MarketDataClient interface but uses yfinance backend.
     """
     
+    # Candle buffers kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('buffers',)
+    
+    # Ticker.info is a full quoteSummary request: refresh bid/ask at most this often
+    QUOTE_REFRESH_SECONDS = 30.0
+    
     def __init__(self, symbol: str, timeframes: List[str], buffer_size: int = 500, price_offset: float = 0.0):
         """
         Initialize YFinance client.
@@ -44,6 +53,12 @@ class YFinanceClient:
         self.ticker = None
         self._connected = False
         
+        # Request budget shared with every Yahoo Finance client in the process
+        self.rate_limiter = get_broker()
+        
+        # Last bid/ask read from Ticker.info: (monotonic fetch time, quote or None)
+        self._quote_cache: Optional[tuple] = None
+        
         # Thread-safe candlestick buffers
         self.buffers: Dict[str, deque] = {}
         self.buffer_locks: Dict[str, threading.Lock] = {}
@@ -83,6 +98,7 @@ class YFinanceClient:
             self.ticker = yf.Ticker(self.symbol)
             
             # Test connection by fetching info
+            self._throttle(Priority.BACKFILL)
             info = self.ticker.info
             
             if info and 'symbol' in info:
@@ -96,9 +112,25 @@ class YFinanceClient:
             
         except Exception as e:
             logger.error(f"Failed to connect to Yahoo Finance: {e}")
+            self._report_if_throttled(e)
             self._connected = False
             return False
     
+    def _throttle(self, priority: Priority) -> None:
+        """
+        Wait for the shared Yahoo Finance request budget.
+        
+        Raises:
+            RuntimeError: If the request budget is exhausted
+        """
+        if not self.rate_limiter.acquire('yfinance', priority):
+            raise RuntimeError("Request budget for yfinance exhausted")
+    
+    def _report_if_throttled(self, error: Exception) -> None:
+        """Pass Yahoo rate-limit errors on to the shared rate limiter."""
+        if is_rate_limit_error(error):
+            self.rate_limiter.report_throttled('yfinance')
+    
     def is_connected(self) -> bool:
         """Check if client is connected."""
         return self._connected
@@ -132,6 +164,7 @@ class YFinanceClient:
             logger.debug(f"Fetching {timeframe} data: period={period}, interval={yf_interval}, requested_count={count}")
             
             # Fetch data
+            self._throttle(priority_for_timeframe(timeframe))
             df = self.ticker.history(period=period, interval=yf_interval)
             
             if df.empty:
@@ -224,6 +257,7 @@ class YFinanceClient:
             
         except Exception as e:
             logger.error(f"Failed to fetch candles for {timeframe}: {e}")
+            self._report_if_throttled(e)
             raise
     
     def _calculate_period(self, timeframe: str, count: int) -> str:
@@ -417,6 +451,47 @@ class YFinanceClient:
         self.ticker = None
         logger.info("YFinance client closed")
     
+    def get_quote(self) -> Optional[Dict[str, float]]:
+        """
+        Get the latest top-of-book quote.
+        
+        Yahoo only publishes bid/ask in the heavyweight quoteSummary, so the
+        quote is refreshed at most every QUOTE_REFRESH_SECONDS; in between the
+        cached quote is returned with its original timestamp.
+        
+        Returns:
+            Dict with 'bid', 'ask' and 'timestamp' (epoch seconds), or None if
+            the feed does not publish a two-sided quote right now
+        """
+        try:
+            if not self._connected or self.ticker is None:
+                return None
+            
+            cached = self._quote_cache
+            if cached is not None and time.monotonic() - cached[0] < self.QUOTE_REFRESH_SECONDS:
+                return cached[1]
+            
+            self._throttle(Priority.TRADE)
+            info = self.ticker.info
+            bid = info.get('bid')
+            ask = info.get('ask')
+            
+            # Yahoo reports 0 for bid/ask outside trading hours
+            quote = None
+            if bid and ask and ask >= bid:
+                quote = {
+                    'bid': float(bid) + self.price_offset,
+                    'ask': float(ask) + self.price_offset,
+                    'timestamp': time.time()
+                }
+            self._quote_cache = (time.monotonic(), quote)
+            return quote
+            
+        except Exception as e:
+            self._report_if_throttled(e)
+            logger.debug(f"Failed to get quote: {e}")
+            return None
+    
     def get_current_price(self) -> Optional[float]:
         """
         Get current price (latest close).
@@ -429,6 +504,7 @@ class YFinanceClient:
                 return None
             
             # Get latest data
+            self._throttle(Priority.TRADE)
             df = self.ticker.history(period='1d', interval='1m')
             
             if not df.empty:
@@ -0,0 +1,182 @@
+"""
+Unit Tests for Batched Indicator Calculation
+Tests that the 2-D matrix path matches the per-symbol IndicatorCalculator path
+"""
+import threading
+import time
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+
+from src.batch_indicators import BatchIndicatorCalculator, ewm_matrix, segmented_vwap_matrix
+from src.indicator_calculator import IndicatorCalculator
+
+
+def make_candles(n, seed, start='2024-01-01 20:00'):
+    """Create n 5-minute candles crossing midnight"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=n, freq='5min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0, 1, n),
+        'low': np.minimum(open_, close) - rng.uniform(0, 1, n),
+        'close': close,
+        'volume': rng.uniform(1, 100, n),
+    })
+
+
+def reference_indicators(df):
+    """Indicators as SymbolScanner._calculate_indicators computes them"""
+    calc = IndicatorCalculator
+    df = df.copy()
+    for period in (9, 21, 50, 100, 200):
+        df[f'ema_{period}'] = calc.calculate_ema(df, period)
+    df['vwap'] = calc.calculate_vwap(df)
+    df['atr'] = calc.calculate_atr(df, 14)
+    df['rsi'] = calc.calculate_rsi(df, 14)
+    df['volume_ma'] = calc.calculate_volume_ma(df, 20)
+    df['stoch_k'], df['stoch_d'] = calc.calculate_stochastic(df, k_period=14, d_period=3, smooth_k=3)
+    df['adx'] = calc.calculate_adx(df, period=14)
+    return df
+
+
+@pytest.fixture
+def frames():
+    """Ragged batch: symbols have different history lengths"""
+    return {f"SYM{i}": make_candles(500 if i % 3 else 320, seed=i) for i in range(12)}
+
+
+class TestBatchIndicatorCalculator:
+    """Batched results must match the per-symbol calculation"""
+
+    def test_recursive_indicators_bit_identical(self, frames):
+        result = BatchIndicatorCalculator().calculate(frames)
+
+        for symbol, df in frames.items():
+            expected = reference_indicators(df)
+            actual = result.frame(symbol)
+            for column in ('ema_9', 'ema_21', 'ema_50', 'ema_100', 'ema_200', 'atr', 'rsi', 'adx'):
+                np.testing.assert_array_equal(actual[column].to_numpy(), expected[column].to_numpy(),
+                                              err_msg=f"{symbol} {column}")
+
+    def test_window_indicators_match(self, frames):
+        result = BatchIndicatorCalculator().calculate(frames)
+
+        for symbol, df in frames.items():
+            expected = reference_indicators(df)
+            actual = result.frame(symbol)
+            for column in ('vwap', 'volume_ma', 'stoch_k', 'stoch_d'):
+                np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(),
+                                           rtol=1e-10, err_msg=f"{symbol} {column}")
+
+    def test_frame_layout_and_views(self, frames):
+        result = BatchIndicatorCalculator().calculate(frames)
+
+        frame = result.frame('SYM0')
+        assert list(frame.columns) == list(reference_indicators(frames['SYM0']).columns)
+        assert frame.index.equals(frames['SYM0'].index)
+
+        arrays = result.arrays('SYM0')
+        assert len(arrays['ema_9']) == len(frames['SYM0'])
+        assert np.shares_memory(arrays['ema_9'], result.columns['ema_9'])
+
+    def test_empty_batch_raises(self):
+        with pytest.raises(ValueError):
+            BatchIndicatorCalculator().calculate({'SYM': pd.DataFrame()})
+
+    def test_ewm_matrix_per_column_alpha_and_nan_gaps(self):
+        values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 3.0], [4.0, 5.0]])
+        out = ewm_matrix(values, np.array([0.5, 0.2]))
+
+        for j, alpha in enumerate((0.5, 0.2)):
+            expected = pd.Series(values[:, j]).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+            np.testing.assert_array_equal(out[:, j], expected)
+
+    def test_vwap_resets_per_segment(self):
+        ones = np.ones((4, 1))
+        close = np.array([[1.0], [2.0], [10.0], [20.0]])
+        segments = np.array([[0], [0], [1], [1]])
+
+        vwap = segmented_vwap_matrix(close, close, close, ones, segments)
+
+        np.testing.assert_allclose(vwap[:, 0], [1.0, 1.5, 10.0, 15.0])
+
+
+class TestOrchestratorBatchScan:
+    """Batched scan cycle hands prepared frames to each scanner"""
+
+    @staticmethod
+    def make_orchestrator(frames, settings=None, fetch=None, **kwargs):
+        from src.symbol_orchestrator import SymbolOrchestrator
+
+        config_manager = Mock()
+        config_manager.get_global_setting.side_effect = lambda key, default=None: (settings or {}).get(key, default)
+        orchestrator = SymbolOrchestrator(config_manager, alerter=None, **kwargs)
+
+        scanners = {}
+        for symbol, df in frames.items():
+            scanner = Mock()
+            scanner.symbol = symbol
+            scanner.timeframes = ['5m']
+            scanner.paused = False
+            scanner.market_client.is_connected.return_value = True
+            scanner.try_resume.return_value = True
+            scanner.fetch_timeframe.side_effect = (lambda tf, df=df: fetch(df)) if fetch else None
+            scanner.fetch_timeframe.return_value = df
+            scanner.scan_all_timeframes.return_value = []
+            scanners[symbol] = scanner
+        orchestrator.scanners = scanners
+        return orchestrator
+
+    def test_scan_batch_passes_prepared_frames(self, frames):
+        orchestrator = self.make_orchestrator(frames)
+
+        orchestrator.scan_batch()
+
+        for symbol, scanner in orchestrator.scanners.items():
+            prepared = scanner.scan_all_timeframes.call_args[0][0]
+            expected = reference_indicators(frames[symbol])
+            np.testing.assert_array_equal(prepared['5m']['ema_21'].to_numpy(), expected['ema_21'].to_numpy())
+        orchestrator.stop()
+
+    def test_fetches_run_concurrently_within_limit(self, frames):
+        active = [0]
+        peak = []
+        lock = threading.Lock()
+
+        def slow_fetch(df):
+            with lock:
+                active[0] += 1
+                peak.append(active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return df
+
+        four = {f"{symbol}-{i}": df for i in range(2) for symbol, df in frames.items()}
+        orchestrator = self.make_orchestrator(four, fetch=slow_fetch, max_concurrent_symbols=2)
+
+        orchestrator.scan_batch()
+
+        assert max(peak) == 2
+        assert all('5m' in s.scan_all_timeframes.call_args[0][0] for s in orchestrator.scanners.values())
+        orchestrator.stop()
+
+    def test_fetches_reuse_engine_pool(self, frames):
+        threads = set()
+
+        def record_thread(df):
+            threads.add(threading.current_thread().name)
+            return df
+
+        orchestrator = self.make_orchestrator(frames, settings={'thread_pool_size': 2}, fetch=record_thread)
+
+        orchestrator.scan_batch()
+
+        assert threads and all(name.startswith('Scanner-worker') for name in threads)
+        assert orchestrator._fetch_executor is None
+        orchestrator.stop()
@@ -0,0 +1,198 @@
+"""
+Unit Tests for Candle Cache
+Tests LRU/TTL behaviour, slicing, single-flight coalescing and client integration
+"""
+import threading
+import time
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+
+from src.candle_cache import CandleCache
+from src.hybrid_data_client import HybridDataClient
+from src.unified_data_source import DataSourceConfig, UnifiedDataSource
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def candles(count):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=count, freq='5min'),
+        'close': [float(i) for i in range(count)],
+    })
+
+
+class TestCandleCache:
+    """Cache semantics"""
+
+    def test_smaller_count_sliced_from_larger_entry(self):
+        cache = CandleCache()
+        fetch = Mock(return_value=(candles(500), True))
+
+        cache.get_or_fetch(('p', 'BTC', '5m'), 500, fetch)
+        frame, fresh = cache.get_or_fetch(('p', 'BTC', '5m'), 100, fetch)
+
+        assert fetch.call_count == 1
+        assert len(frame) == 100
+        assert frame['close'].iloc[-1] == 499.0
+        assert fresh is True
+        assert cache.get_stats()['slice_hits'] == 1
+
+    def test_larger_count_refetches(self):
+        cache = CandleCache()
+        cache.get_or_fetch(('p', 'BTC', '5m'), 100, lambda: (candles(100), True))
+        fetch = Mock(return_value=(candles(500), True))
+
+        frame, _ = cache.get_or_fetch(('p', 'BTC', '5m'), 500, fetch)
+
+        assert fetch.call_count == 1
+        assert len(frame) == 500
+
+    def test_entries_expire_and_respect_max_age(self):
+        clock = FakeClock()
+        cache = CandleCache(ttl_seconds=10, clock=clock)
+        cache.put(('p', 'BTC', '5m'), 10, candles(10), True)
+
+        clock.now = 3
+        assert cache.get(('p', 'BTC', '5m'), 10, max_age=2) is None
+        assert cache.get(('p', 'BTC', '5m'), 10) is not None
+
+        clock.now = 11
+        assert cache.get(('p', 'BTC', '5m'), 10) is None
+        assert cache.get_stats()['expirations'] == 1
+
+    def test_expired_entries_purged_on_put(self):
+        clock = FakeClock()
+        cache = CandleCache(ttl_seconds=10, clock=clock)
+        cache.put(('p', 'BTC', '5m'), 10, candles(10))
+
+        clock.now = 11
+        cache.put(('p', 'ETH', '5m'), 10, candles(10))
+
+        assert cache.get_stats()['entries'] == 1
+        assert cache.get_stats()['expirations'] == 1
+
+    def test_lru_eviction(self):
+        cache = CandleCache(max_entries=2)
+        for symbol in ('A', 'B'):
+            cache.put(('p', symbol, '5m'), 10, candles(10))
+        cache.get(('p', 'A', '5m'), 10)  # A becomes most recent
+
+        cache.put(('p', 'C', '5m'), 10, candles(10))
+
+        assert cache.get(('p', 'B', '5m'), 10) is None
+        assert cache.get(('p', 'A', '5m'), 10) is not None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_callers_get_independent_copies(self):
+        cache = CandleCache()
+        cache.put(('p', 'BTC', '5m'), 10, candles(10))
+
+        frame, _ = cache.get(('p', 'BTC', '5m'), 10)
+        frame['ema_21'] = 1.0
+
+        assert 'ema_21' not in cache.get(('p', 'BTC', '5m'), 10)[0].columns
+
+    def test_concurrent_misses_share_one_fetch(self):
+        cache = CandleCache()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return candles(500), True
+
+        results = []
+
+        def request(count):
+            results.append(cache.get_or_fetch(('p', 'BTC', '5m'), count, slow_fetch)[0])
+
+        leader = threading.Thread(target=request, args=(500,))
+        leader.start()
+        time.sleep(0.01)
+        followers = [threading.Thread(target=request, args=(100 + n,)) for n in range(7)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join(timeout=2)
+
+        assert len(calls) == 1
+        assert sorted(len(frame) for frame in results) == [100 + n for n in range(7)] + [500]
+        assert cache.get_stats()['coalesced'] == 7
+
+    def test_followers_never_read_the_leaders_frame(self):
+        cache = CandleCache()
+        fetched = candles(500)
+        leader_done = threading.Event()
+        sliced_from = []
+        slice_frame = cache._slice
+
+        def slice_after_leader(frame, extra, count):
+            leader_done.wait(timeout=2)
+            sliced_from.append(frame)
+            return slice_frame(frame, extra, count)
+
+        def slow_fetch():
+            time.sleep(0.05)
+            return fetched, True
+
+        def lead():
+            frame, _ = cache.get_or_fetch(('p', 'BTC', '5m'), 500, slow_fetch)
+            frame['ema_21'] = 1.0
+            leader_done.set()
+
+        results = []
+        cache._slice = slice_after_leader
+        leader = threading.Thread(target=lead)
+        leader.start()
+        time.sleep(0.01)
+        follower = threading.Thread(
+            target=lambda: results.append(cache.get_or_fetch(('p', 'BTC', '5m'), 100, slow_fetch)[0]))
+        follower.start()
+        for thread in (leader, follower):
+            thread.join(timeout=2)
+
+        assert sliced_from and sliced_from[0] is not fetched
+        assert 'ema_21' not in results[0].columns
+
+    def test_fetch_error_shared_and_not_cached(self):
+        cache = CandleCache()
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_fetch(('p', 'BTC', '5m'), 10, Mock(side_effect=ConnectionError("down")))
+
+        assert cache.get(('p', 'BTC', '5m'), 10) is None
+
+
+class TestClientCaching:
+    """Clients reuse fetches through the cache"""
+
+    def test_hybrid_client_reuses_fetch(self):
+        client = HybridDataClient('BTC/USD', ['5m'], preferred_provider='yfinance')
+        provider = Mock()
+        provider.get_latest_candles.return_value = (candles(500), True)
+        client.clients['yfinance'] = provider
+
+        client.get_latest_candles('5m', 500)
+        frame, fresh = client.get_latest_candles('5m', 50)
+
+        assert provider.get_latest_candles.call_count == 1
+        assert len(frame) == 50 and fresh
+        assert client.get_client_info()['cache']['slice_hits'] == 1
+
+    def test_unified_source_falls_back_to_stale_cache(self):
+        source = UnifiedDataSource(DataSourceConfig(fallback_sources=[], cache_ttl_seconds=0))
+        source._fetch_from_source = Mock(return_value=candles(20))
+        source.get_latest_candles('BTC', '5m', limit=20, validate_freshness=False)
+
+        source._fetch_from_source = Mock(return_value=None)
+        frame, fresh = source.get_latest_candles('BTC', '5m', limit=20, validate_freshness=False)
+
+        assert len(frame) == 20
+        assert fresh is False
@@ -0,0 +1,118 @@
+"""
+Unit Tests for Duplicate Suppressor
+Tests keying, time window, price tolerance, override rules and heap-driven expiry
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from src.duplicate_suppressor import DuplicateSuppressor
+from src.signal_detector import Signal
+
+
+def make_signal(timestamp, signal_type="LONG", timeframe="5m", entry_price=45000.0,
+                symbol="BTC/USD", rsi=55.0, atr=150.0, strategy="Momentum Shift"):
+    """Create a minimal signal for duplicate checks"""
+    return Signal(
+        timestamp=timestamp,
+        signal_type=signal_type,
+        timeframe=timeframe,
+        entry_price=entry_price,
+        stop_loss=entry_price - 300,
+        take_profit=entry_price + 600,
+        atr=atr,
+        risk_reward=2.0,
+        market_bias="bullish",
+        confidence=4,
+        indicators={'rsi': rsi},
+        symbol=symbol,
+        strategy=strategy
+    )
+
+
+@pytest.fixture
+def suppressor():
+    """Suppressor with a 5 minute window and 0.3% price tolerance"""
+    return DuplicateSuppressor(window_minutes=5, price_threshold_percent=0.3)
+
+
+class TestDuplicateSuppressor:
+    """Test suite for DuplicateSuppressor"""
+
+    def test_same_key_within_window_is_duplicate(self, suppressor):
+        now = datetime.now()
+        suppressor.record(make_signal(now))
+
+        assert suppressor.is_duplicate(make_signal(now + timedelta(minutes=2), entry_price=45050.0))
+
+    def test_different_direction_timeframe_or_symbol_not_duplicate(self, suppressor):
+        now = datetime.now()
+        suppressor.record(make_signal(now))
+
+        assert not suppressor.is_duplicate(make_signal(now, signal_type="SHORT"))
+        assert not suppressor.is_duplicate(make_signal(now, timeframe="15m"))
+        assert not suppressor.is_duplicate(make_signal(now, symbol="XAU/USD"))
+
+    def test_outside_window_not_duplicate(self, suppressor):
+        now = datetime.now()
+        suppressor.record(make_signal(now))
+
+        assert not suppressor.is_duplicate(make_signal(now + timedelta(minutes=6)))
+
+    def test_price_move_not_duplicate(self, suppressor):
+        now = datetime.now()
+        suppressor.record(make_signal(now))
+
+        assert not suppressor.is_duplicate(make_signal(now, entry_price=45200.0))
+
+    def test_atr_tolerance(self):
+        suppressor = DuplicateSuppressor(window_minutes=15, atr_tolerance_multiplier=0.5)
+        now = datetime.now()
+        suppressor.record(make_signal(now, atr=10.0))
+
+        assert suppressor.is_duplicate(make_signal(now, entry_price=45004.0, atr=10.0))
+        assert not suppressor.is_duplicate(make_signal(now, entry_price=45006.0, atr=10.0))
+
+    def test_rsi_reset_allows_signal(self):
+        suppressor = DuplicateSuppressor(window_minutes=10, price_threshold_percent=1.0, rsi_reset_points=15)
+        now = datetime.now()
+        suppressor.record(make_signal(now, rsi=50.0))
+
+        assert suppressor.is_duplicate(make_signal(now, rsi=60.0))
+        assert not suppressor.is_duplicate(make_signal(now, rsi=70.0))
+
+    def test_strategy_scope(self):
+        suppressor = DuplicateSuppressor(window_minutes=240, price_threshold_percent=0.5, strategy="H4 HVG")
+        now = datetime.now()
+        suppressor.record(make_signal(now, timeframe="4h"))
+
+        assert len(suppressor) == 0
+        suppressor.record(make_signal(now, timeframe="4h", strategy="H4 HVG"))
+        assert suppressor.is_duplicate(make_signal(now, timeframe="4h", strategy="H4 HVG"))
+
+    def test_expiry_uses_newest_timestamp(self, suppressor):
+        start = datetime(2024, 1, 1, 12, 0)
+        for i in range(5):
+            suppressor.record(make_signal(start + timedelta(minutes=i), symbol="BTC", entry_price=45000.0 + i * 500))
+        assert len(suppressor) == 5
+
+        suppressor.record(make_signal(start + timedelta(minutes=30), symbol="XAUUSD", entry_price=2000.0))
+
+        assert len(suppressor) == 1
+
+    def test_out_of_order_record_and_bucket_cap(self):
+        suppressor = DuplicateSuppressor(window_minutes=60, price_threshold_percent=0.3, max_per_key=3)
+        start = datetime(2024, 1, 1, 12, 0)
+        for minutes in (10, 5, 20, 15):
+            suppressor.record(make_signal(start + timedelta(minutes=minutes), entry_price=45000.0 + minutes * 1000))
+
+        assert len(suppressor) == 3
+        # Oldest (minute 5) was evicted; its stale heap item must not drop a live entry
+        assert suppressor.expire(start + timedelta(minutes=70)) == 1
+        assert len(suppressor) == 2
+
+    def test_check_and_record(self, suppressor):
+        now = datetime.now()
+
+        assert suppressor.check_and_record(make_signal(now))
+        assert not suppressor.check_and_record(make_signal(now))
+        assert len(suppressor) == 1
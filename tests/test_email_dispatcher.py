@@ -0,0 +1,141 @@
+"""
+Unit Tests for Email Dispatcher
+Tests connection reuse, digest batching and non-blocking alert delivery
+"""
+import smtplib
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.alerter import EmailAlerter
+from src.email_dispatcher import EmailDispatcher, OutgoingEmail, stop_all_dispatchers
+
+
+@pytest.fixture
+def smtp():
+    """Patch SMTP_SSL with a mock server that records sent messages"""
+    server = MagicMock()
+    server.noop.return_value = (250, b'OK')
+    with patch('src.email_dispatcher.smtplib.SMTP_SSL', return_value=server) as factory:
+        yield factory, server
+
+
+def make_dispatcher(**kwargs):
+    options = dict(digest_window_seconds=0.2, retry_delay_seconds=0.01)
+    options.update(kwargs)
+    return EmailDispatcher('smtp.test', 465, 'user', 'secret', **options)
+
+
+def email(subject, **kwargs):
+    return OutgoingEmail(subject=subject, body=f"body of {subject}",
+                         from_email='bot@test', to_email='me@test', **kwargs)
+
+
+class TestEmailDispatcher:
+    """Queue draining over a persistent connection"""
+
+    def test_burst_sent_as_single_digest(self, smtp):
+        factory, server = smtp
+        dispatcher = make_dispatcher()
+
+        for i in range(3):
+            dispatcher.submit(email(f"alert {i}"))
+        assert dispatcher.flush(timeout=5)
+
+        assert server.send_message.call_count == 1
+        msg = server.send_message.call_args[0][0]
+        assert msg['Subject'].startswith('[Digest] 3 messages')
+        assert 'body of alert 2' in msg.as_string()
+        assert dispatcher.sent_count == 3
+        assert dispatcher.digest_count == 1
+        dispatcher.stop()
+
+    def test_connection_reused_until_idle_timeout(self, smtp):
+        factory, server = smtp
+        dispatcher = make_dispatcher(digest_window_seconds=0)
+
+        dispatcher.submit(email("first"))
+        dispatcher.flush(timeout=5)
+        dispatcher.submit(email("second"))
+        dispatcher.flush(timeout=5)
+
+        assert factory.call_count == 1
+        assert server.login.call_count == 1
+
+        dispatcher.idle_timeout_seconds = 0
+        time.sleep(0.01)
+        dispatcher.submit(email("third"))
+        dispatcher.flush(timeout=5)
+
+        assert factory.call_count == 2
+        dispatcher.stop()
+
+    def test_reconnects_and_retries_after_failure(self, smtp):
+        factory, server = smtp
+        server.send_message.side_effect = [smtplib.SMTPServerDisconnected("gone"), {}]
+        dispatcher = make_dispatcher(digest_window_seconds=0)
+        results = []
+
+        dispatcher.submit(email("retry me", on_result=results.append))
+        dispatcher.flush(timeout=5)
+
+        assert results == [True]
+        assert factory.call_count == 2
+        dispatcher.stop()
+
+    def test_gives_up_after_max_retries(self, smtp):
+        factory, server = smtp
+        server.send_message.side_effect = smtplib.SMTPException("rejected")
+        dispatcher = make_dispatcher(digest_window_seconds=0)
+        results = []
+
+        dispatcher.submit(email("doomed", max_retries=2, on_result=results.append))
+        dispatcher.flush(timeout=5)
+
+        assert results == [False]
+        assert server.send_message.call_count == 2
+        assert dispatcher.failed_count == 1
+        dispatcher.stop()
+
+    def test_worker_survives_build_error(self, smtp):
+        factory, server = smtp
+        dispatcher = make_dispatcher(digest_window_seconds=0)
+
+        with patch.object(dispatcher, '_build_message', side_effect=ValueError("bad header")):
+            dispatcher.submit(email("broken"))
+            assert dispatcher.flush(timeout=5)
+        dispatcher.submit(email("next"))
+        assert dispatcher.flush(timeout=5)
+
+        assert dispatcher.failed_count == 1
+        assert dispatcher.sent_count == 1
+        dispatcher.stop()
+
+    def test_stop_all_delivers_queued_emails(self, smtp):
+        factory, server = smtp
+        dispatcher = make_dispatcher(digest_window_seconds=0.5)
+
+        dispatcher.submit(email("last words"))
+        stop_all_dispatchers(timeout=5)
+
+        assert server.send_message.call_count == 1
+        assert dispatcher._thread is None
+
+
+class TestEmailAlerterDispatch:
+    """EmailAlerter only enqueues"""
+
+    def test_send_error_alert_does_not_block(self, smtp):
+        factory, server = smtp
+        dispatcher = make_dispatcher(digest_window_seconds=0.5)
+        alerter = EmailAlerter('smtp.test', 465, 'user', 'secret', 'bot@test', 'me@test',
+                               dispatcher=dispatcher)
+
+        started = time.perf_counter()
+        assert alerter.send_error_alert(RuntimeError("boom"), context="test")
+        assert time.perf_counter() - started < 0.1
+
+        dispatcher.flush(timeout=5)
+        assert alerter.success_count == 1
+        assert alerter.get_success_rate() == 100.0
+        dispatcher.stop()
@@ -0,0 +1,203 @@
+"""
+Unit Tests for Event Store
+Tests batching, hourly rotation, queries and summaries of the scan event log
+"""
+import json
+import time
+import pytest
+import pandas as pd
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from src.event_store import EventStore, PYARROW_AVAILABLE
+from src.scan_engine import ScanEngine
+from src.trade_tracker import TradeTracker
+
+
+class FakeClock:
+    def __init__(self, now=datetime(2025, 1, 6, 9, 30).timestamp()):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def signal(strategy='EMA Crossover', direction='LONG', price=100.0):
+    return SimpleNamespace(symbol='BTC/USD', strategy=strategy, timeframe='5m', signal_type=direction,
+                           entry_price=price, confidence=4, stop_loss=99.0, take_profit=102.0, risk_reward=2.0)
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+FORMATS = ['jsonl'] + (['parquet', 'arrow'] if PYARROW_AVAILABLE else [])
+
+
+@pytest.fixture(params=FORMATS)
+def store(request, tmp_path):
+    store = EventStore(tmp_path, batch_size=100, flush_interval=3600, format=request.param, clock=FakeClock())
+    yield store
+    store.close()
+
+
+class TestWriting:
+    """Batching and rotation"""
+
+    def test_events_buffered_until_batch_full(self, tmp_path):
+        store = EventStore(tmp_path, batch_size=3, flush_interval=3600, format='jsonl', clock=FakeClock())
+        store.record('scan', symbol='BTC/USD', timeframe='5m')
+        store.record('scan', symbol='BTC/USD', timeframe='15m')
+        assert store.get_stats()['segments_written'] == 0
+
+        store.record('scan', symbol='BTC/USD', timeframe='1h')
+
+        assert wait_for(lambda: store.get_stats()['segments_written'] == 1)
+        assert store.get_stats()['buffered'] == 0
+        store.close()
+
+    def test_flush_after_interval_without_new_events(self, tmp_path):
+        clock = FakeClock()
+        store = EventStore(tmp_path, batch_size=100, flush_interval=60, format='jsonl', clock=clock)
+        store.record('scan')
+        clock.now += 61
+
+        assert wait_for(lambda: store.get_stats()['segments_written'] == 1)
+        store.close()
+
+    def test_failed_write_keeps_events_for_retry(self, tmp_path):
+        store = EventStore(tmp_path, batch_size=2, flush_interval=3600, format='jsonl',
+                           clock=FakeClock(), retry_interval=0.05)
+        write_segment = store._write_segment
+        attempts = []
+
+        def flaky_write(directory, batch):
+            attempts.append(len(batch))
+            if len(attempts) == 1:
+                raise OSError("disk full")
+            write_segment(directory, batch)
+
+        with patch.object(store, '_write_segment', side_effect=flaky_write):
+            store.record('scan', symbol='BTC/USD')
+            store.record('scan', symbol='ETH/USD')
+
+            assert wait_for(lambda: store.get_stats()['segments_written'] == 1)
+        store.close()
+
+        assert attempts == [2, 2]
+        assert store.get_stats()['write_errors'] == 1
+        assert sorted(store.query()['symbol']) == ['BTC/USD', 'ETH/USD']
+
+    def test_buffer_bounded_while_writes_fail(self, tmp_path):
+        store = EventStore(tmp_path, batch_size=1000, flush_interval=3600, format='jsonl',
+                           clock=FakeClock(), max_buffered=3)
+        for i in range(5):
+            store.record('scan', price=i)
+
+        with patch.object(store, '_write_segment', side_effect=OSError("disk full")):
+            assert store.flush() == 0
+
+        assert store.get_stats()['buffered'] == 3
+        assert store.get_stats()['events_dropped'] == 2
+        store.close()
+        assert store.query()['price'].tolist() == [2.0, 3.0, 4.0]
+
+    def test_close_writes_remaining_events(self, tmp_path):
+        store = EventStore(tmp_path, batch_size=100, flush_interval=3600, format='jsonl', clock=FakeClock())
+        store.record('scan')
+
+        store.close()
+
+        assert store.get_stats()['segments_written'] == 1
+        assert store._thread is None
+
+    def test_rotates_into_hourly_partitions(self, store, tmp_path):
+        store.record('scan', timestamp=datetime(2025, 1, 6, 9, 59))
+        store.record('scan', timestamp=datetime(2025, 1, 6, 10, 1))
+        store.flush()
+
+        partitions = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.glob('date=*/hour=*'))
+        assert partitions == ['date=2025-01-06/hour=09', 'date=2025-01-06/hour=10']
+
+    def test_invalid_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            EventStore(tmp_path, format='xlsx')
+
+
+class TestQuery:
+    """Filtering and summaries"""
+
+    def test_filter_by_symbol_strategy_and_time(self, store):
+        store.record_signal('signal', signal('EMA Crossover'), timestamp=datetime(2025, 1, 6, 9, 0))
+        store.record_signal('signal', signal('Trend Following'), timestamp=datetime(2025, 1, 6, 10, 0))
+        store.record('scan', symbol='XAU/USD', timestamp=datetime(2025, 1, 6, 11, 0))
+
+        df = store.query(symbols='BTC/USD', start=datetime(2025, 1, 6, 9, 30))
+
+        assert df['strategy'].tolist() == ['Trend Following']
+        assert df['price'].tolist() == [100.0]
+        assert df['time'].iloc[0] == pd.Timestamp('2025-01-06 10:00', tz='UTC')
+        assert len(store.query(strategies=['EMA Crossover', 'Trend Following'])) == 2
+
+    def test_payload_round_trips(self, store):
+        store.record_signal('rejection', signal(), reason='low confidence', filter='quality')
+
+        row = store.query(events='rejection').iloc[0]
+
+        assert row['reason'] == 'low confidence'
+        assert json.loads(row['payload'])['filter'] == 'quality'
+
+    def test_strategy_stats_and_rejections(self, store):
+        for _ in range(4):
+            store.record_signal('signal', signal('EMA Crossover'))
+        for _ in range(3):
+            store.record_signal('rejection', signal('EMA Crossover'), reason='duplicate')
+        store.record_signal('alert', signal('EMA Crossover'))
+
+        stats = store.strategy_stats()
+        rejections = store.rejection_summary()
+
+        assert stats.loc['EMA Crossover', 'signals'] == 4
+        assert stats.loc['EMA Crossover', 'hit_rate'] == 0.25
+        assert rejections.iloc[0].tolist() == ['EMA Crossover', 'duplicate', 3]
+
+    def test_empty_store(self, store):
+        assert store.query().empty
+        assert store.rejection_summary().empty
+
+
+class TestIntegration:
+    """Scan engine and trade tracker write events"""
+
+    def test_scan_engine_records_funnel(self, tmp_path):
+        store = EventStore(tmp_path, format='jsonl', clock=FakeClock())
+        candles = pd.DataFrame({'close': [1.0, 2.0]})
+
+        def reject(ctx):
+            ctx.rejection_reason = 'risk/reward too low'
+            return False
+
+        engine = ScanEngine(['5m', '15m'], fetch=lambda tf: candles, indicators=lambda c: c,
+                            detect=lambda ctx: signal() if ctx.timeframe == '5m' else None,
+                            filters=[reject], events=store, symbol='BTC/USD')
+        engine.run_cycle()
+        engine.shutdown()
+
+        df = store.query()
+        assert sorted(df['event']) == ['rejection', 'scan', 'scan', 'signal']
+        assert df.loc[df['event'] == 'rejection', 'reason'].item() == 'risk/reward too low'
+
+    def test_trade_tracker_records_open(self, tmp_path):
+        store = EventStore(tmp_path, format='jsonl', clock=FakeClock())
+        tracker = TradeTracker(alerter=Mock(), events=store)
+        trade = signal()
+        trade.timestamp = datetime(2025, 1, 6, 9, 30)
+
+        trade_id = tracker.add_trade(trade)
+
+        row = store.query(events='trade_open').iloc[0]
+        assert json.loads(row['payload'])['trade_id'] == trade_id
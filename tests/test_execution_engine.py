@@ -0,0 +1,194 @@
+"""
+Unit Tests for Execution Engine
+Tests performance settings, admission control, overrun skipping and the shared candle/indicator cache
+"""
+import threading
+import time
+import pytest
+import pandas as pd
+from unittest.mock import Mock, patch
+
+from src.execution_engine import ExecutionEngine, PerformanceSettings
+from src.symbol_scanner import SymbolScanner
+
+
+def candles(count=10):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=count, freq='5min'),
+        'close': [float(i) for i in range(count)],
+    })
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestPerformanceSettings:
+    """Parsing of the performance block"""
+
+    def test_from_config_ignores_unknown_and_missing(self):
+        settings = PerformanceSettings.from_config({'thread_pool_size': 2, 'cache_ttl_seconds': None,
+                                                    'unknown': True})
+
+        assert settings.thread_pool_size == 2
+        assert settings.cache_ttl_seconds == 300.0
+
+    @pytest.mark.parametrize('config', [{'thread_pool_size': 0}, {'max_concurrent_symbols': 0},
+                                        {'cache_ttl_seconds': -1}])
+    def test_invalid_values_rejected(self, config):
+        with pytest.raises(ValueError):
+            PerformanceSettings.from_config(config)
+
+
+class TestScheduling:
+    """Bounded pool and admission control"""
+
+    def test_admission_limits_concurrent_jobs(self):
+        engine = ExecutionEngine(PerformanceSettings(thread_pool_size=4, max_concurrent_symbols=2))
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def job():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+        engine.start()
+        for i in range(5):
+            engine.schedule(f"SYM{i}", job, interval=10)
+
+        assert wait_for(lambda: engine.get_stats()['admitted'] == 5)
+        stats = engine.get_stats()
+        engine.shutdown(wait=True)
+
+        assert peak[0] == 2
+        assert stats['peak_running'] == 2
+        assert stats['deferred'] == 3
+
+    def test_slow_job_overruns_instead_of_overlapping(self):
+        engine = ExecutionEngine(PerformanceSettings(thread_pool_size=2))
+        release = threading.Event()
+        calls = []
+
+        def job():
+            calls.append(time.monotonic())
+            release.wait(1.0)
+
+        engine.start()
+        engine.schedule('BTC', job, interval=0.02)
+        assert wait_for(lambda: engine.get_stats()['jobs']['BTC']['overruns'] >= 3)
+        release.set()
+        engine.shutdown(wait=True)
+
+        assert len(calls) <= 2
+
+    def test_failing_job_keeps_running(self):
+        engine = ExecutionEngine(PerformanceSettings(thread_pool_size=1))
+        engine.start()
+        engine.schedule('BTC', Mock(side_effect=RuntimeError("boom")), interval=0.02)
+
+        assert wait_for(lambda: engine.get_stats()['jobs']['BTC']['failures'] >= 2)
+        engine.shutdown(wait=True)
+
+    def test_cancelled_job_stops(self):
+        engine = ExecutionEngine(PerformanceSettings(thread_pool_size=1))
+        job = Mock()
+        engine.start()
+        engine.schedule('BTC', job, interval=0.02)
+        assert wait_for(lambda: job.call_count >= 1)
+
+        assert engine.cancel('BTC')
+        time.sleep(0.05)
+        calls = job.call_count
+        time.sleep(0.1)
+        engine.shutdown(wait=True)
+
+        assert job.call_count == calls
+        assert not engine.cancel('BTC')
+
+
+class TestSharedCache:
+    """Candles and indicators shared between scanners"""
+
+    def test_candles_fetched_once_for_same_key(self):
+        engine = ExecutionEngine()
+        fetch = Mock(return_value=candles())
+
+        first = engine.candles(('yfinance', 'BTC-USD', '5m'), 10, fetch)
+        second = engine.candles(('yfinance', 'BTC-USD', '5m'), 10, fetch)
+        engine.candles(('yfinance', 'ETH-USD', '5m'), 10, fetch)
+
+        assert fetch.call_count == 2
+        pd.testing.assert_frame_equal(first, second)
+        engine.shutdown()
+
+    def test_indicators_recomputed_only_when_candles_change(self):
+        engine = ExecutionEngine()
+        calculate = Mock(side_effect=lambda df: df.assign(ema=df['close'] * 2))
+
+        engine.indicators(('BTC-USD', '5m'), candles(), calculate)
+        result = engine.indicators(('BTC-USD', '5m'), candles(), calculate)
+        engine.indicators(('BTC-USD', '5m'), candles(11), calculate)
+
+        assert calculate.call_count == 2
+        assert 'ema' in result.columns
+        assert engine.cache.get_stats()['entries'] == 1  # The new result replaced the stale one
+        engine.shutdown()
+
+    def test_zero_ttl_disables_cache(self):
+        engine = ExecutionEngine(PerformanceSettings(cache_ttl_seconds=0))
+        fetch = Mock(return_value=candles())
+
+        engine.candles(('yfinance', 'BTC-USD', '5m'), 10, fetch)
+        engine.candles(('yfinance', 'BTC-USD', '5m'), 10, fetch)
+
+        assert fetch.call_count == 2
+        engine.shutdown()
+
+
+class TestScanOnce:
+    """SymbolScanner single pass for the engine"""
+
+    def scanner(self):
+        scanner = SymbolScanner('BTC-USD', 'crypto', 'Bitcoin', '₿', ['5m'], {}, Mock(),
+                                polling_interval=60, engine=ExecutionEngine())
+        scanner.scan_all_timeframes = Mock(return_value=[])
+        scanner.try_resume = Mock(return_value=False)
+        return scanner
+
+    def test_not_running_does_nothing(self):
+        scanner = self.scanner()
+
+        assert scanner.scan_once() == []
+        scanner.scan_all_timeframes.assert_not_called()
+
+    def test_paused_scanner_waits_for_backoff(self):
+        scanner = self.scanner()
+        scanner.running = True
+        scanner.paused = True
+        scanner.reconnect_backoff = 60
+
+        scanner.scan_once()
+        scanner.scan_once()
+
+        assert scanner.try_resume.call_count == 1
+        scanner.scan_all_timeframes.assert_not_called()
+
+    def test_paused_scanner_resumes_from_yfinance_tuple(self):
+        scanner = SymbolScanner('BTC-USD', 'crypto', 'Bitcoin', '₿', ['5m'], {}, Mock())
+        scanner.paused = True
+        scanner.consecutive_errors = 5
+
+        with patch.object(scanner.market_client, 'get_latest_candles', return_value=(candles(1), True)) as fetch:
+            assert scanner.try_resume() is True
+
+        fetch.assert_called_once_with('5m', count=1)
+        assert not scanner.paused
+        assert scanner.consecutive_errors == 0
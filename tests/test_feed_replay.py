@@ -0,0 +1,188 @@
+"""
+Unit Tests for Feed Replay
+Tests the virtual clock, segment recording and replay through MarketDataClient, the websocket streamer and TradeTracker
+"""
+import gzip
+import json
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from src import virtual_clock
+from src.feed_replay import FeedRecord, FeedRecorder, FeedReplayer, read_feed
+from src.market_data_client import MarketDataClient
+from src.virtual_clock import VirtualClock
+from src.websocket_streamer import BinanceWebSocketStreamer
+from xauusd_scanner.news_calendar import NewsCalendar
+
+START = datetime(2025, 3, 3, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def ohlcv(end, count=5, period=60):
+    """Candles ending with the bar that opened at ``end``"""
+    return [[int((end - (count - 1 - i) * period) * 1000), 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0]
+            for i in range(count)]
+
+
+def kline_message(open_time, close, is_closed, timeframe='1m'):
+    return json.dumps({'stream': f'btcusdt@kline_{timeframe}', 'data': {
+        'e': 'kline', 'E': int(open_time * 1000) + 1000, 'k': {
+            't': int(open_time * 1000), 'i': timeframe, 'o': '100', 'h': '102', 'l': '99',
+            'c': str(close), 'v': '5', 'x': is_closed}}})
+
+
+class TestVirtualClock:
+    """Process-wide clock switching"""
+
+    def test_use_clock_restores_wall_clock(self):
+        clock = VirtualClock(START)
+
+        with virtual_clock.use_clock(clock):
+            clock.advance(90)
+            assert virtual_clock.now(timezone.utc) == datetime(2025, 3, 3, 12, 1, 30, tzinfo=timezone.utc)
+            assert virtual_clock.time() == START + 90
+
+        assert abs(virtual_clock.time() - time.time()) < 5
+
+    def test_never_moves_backwards(self):
+        clock = VirtualClock(START)
+        clock.advance_to(START + 10)
+        clock.advance_to(START + 5)
+        clock.sleep(2)
+
+        assert clock.time() == START + 12
+        assert clock.monotonic() == 12
+
+    def test_gold_news_pause_follows_virtual_clock(self, tmp_path):
+        calendar = NewsCalendar(str(tmp_path / 'none.json'))
+        calendar.add_event('NFP', datetime(2025, 3, 3, 12, 20, tzinfo=timezone.utc), impact='high')
+
+        with virtual_clock.use_clock(VirtualClock(START)):
+            assert calendar.should_pause_trading()[0]
+            assert len(calendar.get_upcoming_events(hours=1)) == 1
+        assert not calendar.should_pause_trading()[0]
+
+
+class TestFeedRecorder:
+    """Segment files"""
+
+    def test_round_trip_across_segments(self, tmp_path):
+        clock = VirtualClock(START)
+        with virtual_clock.use_clock(clock), FeedRecorder(tmp_path, segment_seconds=60) as recorder:
+            for i in range(5):
+                recorder.record('rest', ('fetch_ohlcv', 'BTC/USDT', '1m'), ohlcv(START + i * 30))
+                recorder.record('ws', 'btcusdt', kline_message(START, 100 + i, False).encode())
+                clock.advance(30)
+
+        records = list(read_feed(tmp_path))
+
+        assert len(list(tmp_path.glob('*.ndjson.gz'))) == 3
+        assert len(records) == 10
+        assert [r.t for r in records] == sorted(r.t for r in records)
+        assert records[0].key == ('fetch_ohlcv', 'BTC/USDT', '1m')
+        assert records[0].payload == ohlcv(START)
+        assert isinstance(records[1].payload, str)
+
+    def test_truncated_segment_read_to_last_full_line(self, tmp_path):
+        with virtual_clock.use_clock(VirtualClock(START)), FeedRecorder(tmp_path) as recorder:
+            recorder.record('ws', 'btcusdt', 'first')
+            recorder.record('ws', 'btcusdt', 'second')
+        path = next(tmp_path.glob('*.ndjson.gz'))
+        raw = gzip.decompress(path.read_bytes())
+        path.write_bytes(gzip.compress(raw[:-5]))
+
+        assert [r.payload for r in read_feed(tmp_path)] == ['first']
+
+    def test_recording_exchange_passes_through(self, tmp_path):
+        exchange = Mock()
+        exchange.fetch_ohlcv.return_value = ohlcv(START)
+        client = MarketDataClient('binance', 'BTC/USDT', ['1m'])
+        client.exchange, client._connected = exchange, True
+
+        with virtual_clock.use_clock(VirtualClock(START + 30)), FeedRecorder(tmp_path) as recorder:
+            recorder.attach_client(client)
+            client.exchange.markets
+            df, _ = client.get_latest_candles('1m', count=5)
+
+        assert len(df) == 5
+        assert [r.key for r in read_feed(tmp_path)] == [('fetch_ohlcv', 'BTC/USDT', '1m')]
+
+
+class TestFeedReplayer:
+    """Deterministic replay through the live components"""
+
+    def test_client_sees_responses_at_their_recorded_time(self):
+        records = [FeedRecord(START + i * 60, 'rest', ('fetch_ohlcv', 'BTC/USDT', '1m'), ohlcv(START + i * 60))
+                   for i in range(10)]
+        client = MarketDataClient('binance', 'BTC/USDT', ['1m'])
+        replayer = FeedReplayer(records, speed=None)
+        replayer.attach_client(client)
+        seen = []
+
+        def scan():
+            df, is_fresh = client.get_latest_candles('1m', count=3)
+            seen.append((virtual_clock.time(), df['timestamp'].iloc[-1].timestamp(), is_fresh))
+
+        replayer.every(90, scan)
+        stats = replayer.run()
+
+        assert stats.events == 10 and stats.callbacks == 6
+        for now, last_bar, is_fresh in seen:
+            assert now - 60 <= last_bar <= now
+            assert is_fresh
+
+    def test_streamer_receives_messages(self):
+        records = [FeedRecord(START + i, 'ws', ('btcusdt',), kline_message(START + (i // 60) * 60, 100 + i, i % 60 == 59))
+                   for i in range(180)]
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], on_candle_callback=lambda tf, c: candles.append(c))
+        replayer = FeedReplayer(records, speed=None)
+        replayer.attach_streamer(streamer)
+
+        stats = replayer.run()
+
+        assert stats.ws_messages == 180 == len(candles)
+        assert len(streamer.get_buffer_data('1m')) == 3
+        assert sum(c['is_closed'] for c in candles) == 3
+
+    def test_timers_interleave_in_time_order(self):
+        records = [FeedRecord(START + t, 'rest', ('fetch_ticker', 'BTC/USDT'), {'last': t}) for t in (0, 25, 50)]
+        replayer = FeedReplayer(records, speed=None)
+        order = []
+        replayer.every(10, lambda: order.append(('a', virtual_clock.time() - START)))
+        replayer.every(20, lambda: order.append(('b', virtual_clock.time() - START)))
+
+        replayer.run(until=START + 40)
+
+        assert order == [('a', 10), ('a', 20), ('b', 20), ('a', 30), ('a', 40), ('b', 40)]
+
+    def test_trade_timers_follow_virtual_time(self):
+        from src.signal_detector import Signal
+        from src.trade_tracker import TradeTracker
+
+        records = [FeedRecord(START + t, 'rest', ('fetch_ticker', 'BTC/USDT'), {}) for t in (0, 3600)]
+        tracker = TradeTracker(alerter=Mock())
+        replayer = FeedReplayer(records, speed=None)
+        signal = Signal(timestamp=datetime(2025, 3, 3, 12, 0), signal_type='LONG', timeframe='5m',
+                        entry_price=100.0, stop_loss=99.0, take_profit=103.0, atr=1.0, risk_reward=3.0,
+                        market_bias='bullish', confidence=4, indicators={}, symbol='BTC/USDT')
+        replayer.every(1800, lambda: tracker.add_trade(signal) if not tracker.active_trades else None)
+
+        replayer.run()
+
+        trade = next(iter(tracker.active_trades.values()))
+        assert trade.entry_time == datetime.fromtimestamp(START + 1800)
+
+    def test_paced_replay_respects_speed(self):
+        records = [FeedRecord(START + t, 'rest', ('fetch_ticker', 'BTC/USDT'), {}) for t in (0, 5, 10)]
+
+        stats = FeedReplayer(records, speed=500).run()
+
+        assert stats.wall_seconds >= 0.02
+        assert stats.virtual_seconds == 10
+
+    def test_invalid_speed_rejected(self):
+        with pytest.raises(ValueError):
+            FeedReplayer([], speed=0)
@@ -156,6 +156,33 @@ class TestIndicatorCalculator:
         assert not result['atr'].isna().any()
         assert not result['rsi'].isna().any()
     
+    def test_calculate_all_indicators_view_mode(self, sample_ohlcv_data):
+        """Test view mode returns the same rows as copy mode without copying the block."""
+        copied = IndicatorCalculator.calculate_all_indicators(sample_ohlcv_data, ema_periods=[9, 21, 50])
+        viewed = IndicatorCalculator.calculate_all_indicators(sample_ohlcv_data, ema_periods=[9, 21, 50], view=True)
+        
+        pd.testing.assert_frame_equal(copied, viewed)
+        assert list(copied.columns[:6]) == list(sample_ohlcv_data.columns)
+        assert copied['volume'].dtype == sample_ohlcv_data['volume'].dtype
+        assert copied['timestamp'].dtype == sample_ohlcv_data['timestamp'].dtype
+        
+        # Source and indicator floats share one block, which in view mode still holds the warm-up rows
+        close = viewed['close'].to_numpy()
+        assert close.base is viewed['ema_9'].to_numpy().base
+        assert close.base.shape[0] == len(sample_ohlcv_data)
+    
+    def test_calculate_all_indicators_drops_gap_rows(self, sample_ohlcv_data):
+        """Test NaN rows after the warm-up are dropped like dropna()."""
+        data = sample_ohlcv_data.copy()
+        data['timestamp'] = pd.date_range('2025-01-01 23:00', periods=len(data), freq='1min')
+        data.loc[60, 'volume'] = 0  # First bar of the new day: VWAP is 0/0
+        
+        result = IndicatorCalculator.calculate_all_indicators(data, ema_periods=[9, 21, 50], view=True)
+        
+        assert 60 not in result.index
+        assert 61 in result.index
+        assert not result[['ema_9', 'ema_21', 'vwap', 'atr', 'rsi']].isna().any().any()
+    
     def test_calculate_all_indicators_empty_data(self):
         """Test that empty DataFrame raises error (should never happen in production)."""
         empty_df = pd.DataFrame()
@@ -0,0 +1,133 @@
+"""
+Unit Tests for Indicator Kernels
+Tests that every kernel backend is bit-identical to the pandas implementations
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from src import indicator_kernels
+from src.indicator_calculator import IndicatorCalculator
+
+
+BACKENDS = [
+    'numpy',
+    pytest.param('numba', marks=pytest.mark.skipif(not indicator_kernels.NUMBA_AVAILABLE,
+                                                   reason="numba not installed")),
+]
+
+
+def make_candles(n=400, seed=0, gaps=False, flat=False, tz=None):
+    """Create candles crossing several days, optionally with NaN gaps and flat ranges"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01 20:00', periods=n, freq='7min', tz=tz),
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0, 1, n),
+        'low': np.minimum(open_, close) - rng.uniform(0, 1, n),
+        'close': close,
+        'volume': rng.uniform(0, 100, n),
+    })
+    if flat:
+        df.loc[30:60, ['open', 'high', 'low', 'close']] = 100.0
+        df.loc[70:80, 'volume'] = 0.0
+    if gaps:
+        for column in ('high', 'low', 'close', 'volume'):
+            df.loc[rng.choice(n, 6, replace=False), column] = np.nan
+    return df
+
+
+def pandas_reference(func, *args, **kwargs):
+    """Run an IndicatorCalculator method on the original pandas path"""
+    previous = indicator_kernels.get_backend()
+    indicator_kernels.set_backend('pandas')
+    try:
+        return func(*args, **kwargs)
+    finally:
+        indicator_kernels.set_backend(previous)
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Select a kernel backend for the test and restore the previous one"""
+    previous = indicator_kernels.get_backend()
+    indicator_kernels.set_backend(request.param)
+    yield request.param
+    indicator_kernels.set_backend(previous)
+
+
+@pytest.fixture(params=[{}, {'gaps': True}, {'flat': True}, {'gaps': True, 'flat': True}],
+                ids=['clean', 'gaps', 'flat', 'gaps+flat'])
+def candles(request):
+    return make_candles(**request.param)
+
+
+def assert_identical(actual, expected):
+    assert actual.index.equals(expected.index)
+    np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+
+
+class TestKernelEquivalence:
+    """Kernels must reproduce the pandas results bit for bit"""
+
+    @pytest.mark.parametrize('period', [3, 6, 14, 19])
+    def test_atr(self, backend, candles, period):
+        assert_identical(IndicatorCalculator.calculate_atr(candles, period),
+                         pandas_reference(IndicatorCalculator.calculate_atr, candles, period))
+
+    @pytest.mark.parametrize('period', [3, 6, 14, 19])
+    def test_rsi(self, backend, candles, period):
+        assert_identical(IndicatorCalculator.calculate_rsi(candles, period),
+                         pandas_reference(IndicatorCalculator.calculate_rsi, candles, period))
+
+    @pytest.mark.parametrize('period', [3, 6, 14, 19])
+    def test_adx(self, backend, candles, period):
+        assert_identical(IndicatorCalculator.calculate_adx(candles, period),
+                         pandas_reference(IndicatorCalculator.calculate_adx, candles, period))
+
+    @pytest.mark.parametrize('params', [(14, 3, 3), (5, 3, 1), (9, 4, 2)])
+    def test_stochastic(self, backend, candles, params):
+        actual = IndicatorCalculator.calculate_stochastic(candles, *params)
+        expected = pandas_reference(IndicatorCalculator.calculate_stochastic, candles, *params)
+        assert_identical(actual[0], expected[0])
+        assert_identical(actual[1], expected[1])
+
+    @pytest.mark.parametrize('reset_daily', [True, False])
+    def test_vwap(self, backend, candles, reset_daily):
+        assert_identical(IndicatorCalculator.calculate_vwap(candles, reset_daily),
+                         pandas_reference(IndicatorCalculator.calculate_vwap, candles, reset_daily))
+
+    def test_vwap_timezone_aware_days(self, backend):
+        candles = make_candles(tz='America/New_York')
+        assert_identical(IndicatorCalculator.calculate_vwap(candles),
+                         pandas_reference(IndicatorCalculator.calculate_vwap, candles))
+
+    @pytest.mark.parametrize('span', [3, 9, 20, 200])
+    def test_ewm_mean(self, backend, candles, span):
+        actual = indicator_kernels.ewm_mean(candles['close'], indicator_kernels.ewm_alpha(span=span))
+        expected = candles['close'].ewm(span=span, adjust=False).mean()
+        np.testing.assert_array_equal(actual, expected.to_numpy())
+
+
+class TestBackendSelection:
+    """Runtime backend switching"""
+
+    def test_auto_prefers_numba_when_installed(self):
+        previous = indicator_kernels.get_backend()
+        try:
+            expected = 'numba' if indicator_kernels.NUMBA_AVAILABLE else 'numpy'
+            assert indicator_kernels.set_backend('auto') == expected
+        finally:
+            indicator_kernels.set_backend(previous)
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            indicator_kernels.set_backend('fortran')
+
+    def test_benchmark_reports_every_backend(self):
+        results = indicator_kernels.benchmark(bars=50, repeat=1)
+
+        assert set(results) == set(indicator_kernels.available_backends())
+        assert set(results['pandas']) == {'atr', 'rsi', 'adx', 'stochastic', 'vwap'}
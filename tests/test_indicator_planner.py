@@ -0,0 +1,147 @@
+"""
+Unit Tests for Indicator Planner
+Tests planned columns against the calculator, shared intermediates and requirement declarations
+"""
+import numpy as np
+import pytest
+import pandas as pd
+from types import SimpleNamespace
+
+from src import indicator_kernels
+from src.indicator_calculator import IndicatorCalculator
+from src.base_scanner import BaseScanner
+from src.indicator_planner import DEFAULT_COLUMNS, IndicatorPlanner, required_columns
+from src.strategies import TrendAlignment
+from src.strategy_detector import StrategyDetector
+from src.strategy_registry import StrategyRegistry
+from xauusd_scanner.gold_signal_detector import GoldSignalDetector
+from xauusd_scanner.key_level_tracker import KeyLevelTracker
+from xauusd_scanner.session_manager import SessionManager
+from xauusd_scanner.strategy_selector import StrategySelector
+
+
+def candles(count=600, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=count, freq='5min'),
+        'open': close - rng.uniform(0, 0.5, count),
+        'high': close + rng.uniform(0, 1, count),
+        'low': close - rng.uniform(0, 1, count),
+        'close': close,
+        'volume': rng.uniform(1, 10, count),
+    })
+
+
+class TestIndicatorPlan:
+    """Planned columns match the full calculation"""
+
+    def test_default_columns_match_calculate_all_indicators(self):
+        df = candles()
+
+        planned = IndicatorPlanner(rsi_period=6).plan(DEFAULT_COLUMNS).compute(df)
+        expected = IndicatorCalculator.calculate_all_indicators(df, rsi_period=6)
+
+        pd.testing.assert_frame_equal(planned, expected)
+
+    def test_adx_and_extra_periods_match_kernels(self):
+        df = candles()
+
+        planned = IndicatorPlanner().plan(['adx', 'rsi_7', 'atr']).compute(df)
+
+        adx = indicator_kernels.adx(df['high'], df['low'], df['close'], 14)
+        rsi = indicator_kernels.rsi(df['close'], 7)
+        np.testing.assert_allclose(planned['adx'], adx[-len(planned):])
+        np.testing.assert_allclose(planned['rsi_7'], rsi[-len(planned):])
+
+    def test_only_requested_columns_are_output(self):
+        planned = IndicatorPlanner().plan(['ema_9', 'close', 'atr']).compute(candles())
+
+        assert list(planned.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'ema_9', 'atr']
+
+    def test_unknown_column_rejected(self):
+        with pytest.raises(ValueError, match="supertrend"):
+            IndicatorPlanner().plan(['ema_9', 'supertrend'])
+
+
+class TestSharedIntermediates:
+    """Each intermediate is computed once per plan"""
+
+    def test_adx_reuses_atr(self):
+        steps = IndicatorPlanner().plan(['atr', 'adx']).step_names
+
+        assert steps.count('true_range') == 1
+        assert steps.count('atr_14') == 1
+        assert steps.index('atr_14') < steps.index('adx_14')
+
+    def test_rsi_periods_share_price_moves(self):
+        steps = IndicatorPlanner().plan(['rsi', 'rsi_7', 'rsi_21']).step_names
+
+        assert steps.count('price_moves') == 1
+
+    def test_macd_reuses_emas(self):
+        steps = IndicatorPlanner().plan(['ema_12', 'macd_histogram']).step_names
+
+        assert steps.count('ema_12') == 1
+        assert steps[-1] == 'macd_histogram'
+
+
+class TestRequirements:
+    """Strategies declare the columns they read"""
+
+    def test_detector_includes_market_conditions(self):
+        detector = StrategyDetector()
+        detector.register_strategy('vwap_bounce', lambda *args: None, requires=['vwap', 'ema_21'])
+        detector.register_strategy('breakout', lambda *args: None, requires=['ema_200'], enabled=False)
+
+        columns = detector.required_columns()
+
+        assert 'adx' in columns and 'vwap' in columns
+        assert 'ema_200' not in columns
+
+    def test_strategy_objects_declare_their_columns(self):
+        detector = StrategyDetector()
+        detector.register_strategy('trend_alignment', TrendAlignment().detect_signal)
+
+        columns = detector.required_columns()
+
+        assert {'ema_100', 'ema_200', 'adx', 'atr'} <= set(columns)
+        assert {'ema_100', 'ema_200'} <= set(IndicatorPlanner().plan(columns).compute(candles()).columns)
+
+    def test_base_scanner_registers_declaring_strategies(self):
+        scanner = SimpleNamespace(strategy_detector=StrategyDetector(),
+                                  asset_config={'volume_thresholds': {'mean_reversion': 1.5}})
+
+        BaseScanner._register_strategies(scanner)
+
+        registry = scanner.strategy_detector.registry
+        assert set(registry.get_enabled_strategies()) == {
+            'momentum_shift', 'trend_alignment', 'mean_reversion', 'support_resistance_bounce', 'fibonacci_retracement'}
+        assert all(meta['requires'] for meta in registry.strategy_metadata.values())
+        assert registry.get_strategy('mean_reversion').__self__.volume_threshold == 1.5
+
+    def test_registry_union_over_enabled_strategies(self):
+        registry = StrategyRegistry({'strategies': {
+            'a': {'enabled': True},
+            'b': {'enabled': False},
+            'c': {'enabled': True, 'scanners': ['btc_scalp']},
+        }})
+        registry.register_strategy('a', '_detect_a', requires=['rsi', 'atr'])
+        registry.register_strategy('b', '_detect_b', requires=['ema_200'])
+        registry.register_strategy('c', '_detect_c', requires=['atr', 'adx'])
+
+        assert registry.get_required_columns('btc_scalp') == ['rsi', 'atr', 'adx']
+
+    def test_required_columns_keeps_first_seen_order(self):
+        assert required_columns(['a', 'b'], ('b', 'c')) == ['a', 'b', 'c']
+
+    def test_gold_detector_declarations_plan(self):
+        session_manager = SessionManager()
+        detector = GoldSignalDetector(session_manager, KeyLevelTracker(), StrategySelector(session_manager))
+
+        columns = detector.required_columns()
+        planned = IndicatorPlanner().plan(columns).compute(candles())
+
+        assert 'rsi_7' in columns and 'adx' in columns
+        assert set(columns) <= set(planned.columns)
+        assert not planned[columns].iloc[-1].isna().any()
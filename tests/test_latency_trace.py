@@ -0,0 +1,204 @@
+"""
+Unit Tests for Signal Latency Tracing
+Tests trace hops, publish lag, delivery, percentile summaries and hourly slowest-signal flags
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src import latency_trace, virtual_clock
+from src.latency_trace import LatencyTracker, SignalTrace
+from src.liquidity_filter import LiquidityFilter
+from src.signal_detector import Signal
+from src.virtual_clock import VirtualClock
+from src.websocket_streamer import BinanceWebSocketStreamer
+
+START = datetime(2025, 3, 3, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def make_signal():
+    return Signal(timestamp=datetime(2025, 3, 3, 12, 0), signal_type='LONG', timeframe='1m',
+                  entry_price=100.0, stop_loss=99.0, take_profit=103.0, atr=1.0, risk_reward=3.0,
+                  market_bias='bullish', confidence=4, indicators={}, symbol='BTC/USDT')
+
+
+def finished_trace(symbol, timeframe, total):
+    trace = SignalTrace(symbol, timeframe)
+    trace.hops = [('fetch', trace.started), ('alert', trace.started + total)]
+    return trace
+
+
+@pytest.fixture
+def tracker():
+    tracker = LatencyTracker(slowest_per_hour=2)
+    with patch('src.latency_trace.get_latency_tracker', return_value=tracker):
+        yield tracker
+
+
+class TestSignalTrace:
+    """Hop timing and publish lag"""
+
+    def test_durations_and_total(self):
+        trace = SignalTrace('BTC/USDT', '1m')
+        with virtual_clock.use_clock(VirtualClock(START + 1.5)):
+            trace.received('fetch', START)
+        trace.hops = [('fetch', trace.started + 0.2), ('indicators', trace.started + 0.25),
+                      ('alert', trace.started + 0.45)]
+        trace.received_mono = trace.started + 0.2
+
+        durations = trace.durations()
+
+        assert durations['fetch'] == pytest.approx(0.2)
+        assert durations['indicators'] == pytest.approx(0.05)
+        assert durations['alert'] == pytest.approx(0.2)
+        assert trace.publish_lag == 1.5
+        assert trace.total_seconds == pytest.approx(1.75)
+
+    def test_polled_bar_close(self):
+        candles = pd.DataFrame({'timestamp': pd.to_datetime([START - 60, START], unit='s')})
+
+        with virtual_clock.use_clock(VirtualClock(START + 10)), latency_trace.tracing('BTC/USDT', '1m') as trace:
+            latency_trace.mark_received('fetch', candles, '1m')
+        with virtual_clock.use_clock(VirtualClock(START + 70)), latency_trace.tracing('BTC/USDT', '1m') as later:
+            latency_trace.mark_received('fetch', candles, '1m')
+
+        # While the last row is forming the newest close is the previous row's
+        assert trace.source_time == START
+        assert trace.publish_lag == 10
+        assert later.source_time == START + 60
+        assert later.publish_lag == 10
+
+    def test_forming_bar_after_gap(self):
+        candles = pd.DataFrame({'timestamp': pd.to_datetime([START - 300, START], unit='s')})
+
+        with virtual_clock.use_clock(VirtualClock(START + 10)), latency_trace.tracing('BTC/USDT', '1m') as trace:
+            latency_trace.mark_received('fetch', candles, '1m')
+
+        # The forming bar's open is not the close of any received bar
+        assert trace.source_time == START - 240
+        assert trace.publish_lag == 250
+
+    def test_no_closed_bar(self):
+        candles = pd.DataFrame({'timestamp': pd.to_datetime([START], unit='s')})
+
+        with virtual_clock.use_clock(VirtualClock(START + 10)), latency_trace.tracing('BTC/USDT', '1m') as trace:
+            latency_trace.mark_received('fetch', candles, '1m')
+
+        assert trace.source_time is None
+        assert trace.publish_lag is None
+        assert [hop for hop, _ in trace.hops] == ['fetch']
+
+
+class TestSignalPropagation:
+    """Signals pick up the trace of the update that produced them"""
+
+    def test_signal_carries_current_trace(self):
+        with latency_trace.tracing('BTC/USDT', '1m') as trace:
+            latency_trace.mark('indicators')
+            signal = make_signal()
+
+        latency_trace.mark('quality_filter', signal)
+
+        assert signal.trace is trace
+        assert [hop for hop, _ in trace.hops] == ['indicators', 'detect_signals', 'quality_filter']
+        assert 'trace' not in signal.to_dict()
+
+    def test_signal_outside_trace(self):
+        signal = make_signal()
+
+        latency_trace.mark('quality_filter', signal)
+        latency_trace.complete(signal)
+
+        assert signal.trace is None
+
+    def test_trace_resumed_on_another_thread(self):
+        with latency_trace.tracing('BTC/USDT', '1m') as trace:
+            latency_trace.mark('fetch')
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            signal = pool.submit(self._detect_in_trace, trace).result()
+
+        assert signal.trace is trace
+        assert [hop for hop, _ in trace.hops] == ['fetch', 'detect_signals']
+
+    @staticmethod
+    def _detect_in_trace(trace):
+        with latency_trace.tracing('BTC/USDT', '1m', trace=trace):
+            return make_signal()
+
+    def test_liquidity_filter_marks_signal(self):
+        with latency_trace.tracing('BTC/USDT', '1m'):
+            signal = make_signal()
+
+        allowed, _ = LiquidityFilter().filter_signal(
+            datetime(2025, 3, 3, 14, 0, tzinfo=timezone.utc), 'BTC', {}, signal=signal)
+
+        assert allowed
+        assert signal.trace.hops[-1][0] == 'liquidity_filter'
+
+    def test_complete_records_once(self, tracker):
+        with latency_trace.tracing('BTC/USDT', '1m'):
+            signal = make_signal()
+
+        latency_trace.complete(signal)
+        latency_trace.complete(signal)
+
+        assert tracker.summary()['BTC/USDT 1m']['count'] == 1
+        assert signal.trace.hops[-1][0] == 'alert'
+
+    def test_websocket_message_starts_trace(self):
+        traces = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'],
+                                            on_candle_callback=lambda tf, c: traces.append(make_signal().trace))
+        message = json.dumps({'stream': 'btcusdt@kline_1m', 'data': {
+            'e': 'kline', 'E': int(START * 1000) + 60500, 'k': {
+                't': int(START * 1000), 'i': '1m', 'o': '100', 'h': '101', 'l': '99', 'c': '100.5',
+                'v': '5', 'x': True}}})
+
+        with virtual_clock.use_clock(VirtualClock(START + 60.4)):
+            streamer._on_message(None, message)
+
+        trace = traces[0]
+        assert trace.symbol == 'BTC/USDT'
+        assert trace.source_time == START + 60
+        assert trace.publish_lag == pytest.approx(0.4)
+        assert [hop for hop, _ in trace.hops] == ['websocket', 'detect_signals']
+        assert latency_trace.current_trace() is None
+
+
+class TestLatencyTracker:
+    """Summaries and hourly slowest signals"""
+
+    def test_percentiles_per_symbol_and_timeframe(self, tracker):
+        with virtual_clock.use_clock(VirtualClock(START)):
+            for i in range(1, 101):
+                tracker.record(finished_trace('BTC/USDT', '1m', i / 1000))
+            tracker.record(finished_trace('ETH/USDT', '5m', 0.5))
+            summary = tracker.summary()
+
+        btc = summary['BTC/USDT 1m']
+        assert btc['count'] == 100
+        assert btc['p50_ms'] == pytest.approx(50.5)
+        assert btc['max_ms'] == pytest.approx(100)
+        assert btc['publish_lag_p50_ms'] is None
+        assert set(btc['hop_p50_ms']) == {'fetch', 'alert'}
+        assert summary['ETH/USDT 5m']['count'] == 1
+
+    def test_slowest_flagged_when_hour_ends(self, tracker):
+        clock = VirtualClock(START)
+        with virtual_clock.use_clock(clock):
+            for total in (0.1, 0.9, 0.3, 0.7):
+                tracker.record(finished_trace('BTC/USDT', '1m', total))
+            assert [s['total_ms'] for s in tracker.slowest()] == [900, 700]
+            assert not tracker.flagged
+
+            clock.advance(3600)
+            tracker.summary()
+
+        assert [f['total_ms'] for f in tracker.flagged] == [900, 700]
+        assert tracker.flagged[0]['hour'] == '2025-03-03 12:00'
+        assert tracker.slowest() == []
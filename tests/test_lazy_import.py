@@ -0,0 +1,83 @@
+"""
+Unit Tests for Lazy Imports
+Tests deferred SDK loading and the import-time profiling report
+"""
+import subprocess
+import sys
+import pytest
+
+from src.lazy_import import LazyModule, lazy_module, parse_importtime, get_lazy_load_times
+
+
+IMPORTTIME_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 | site
+import time:       250 |        250 |     pandas._libs
+import time:     40000 |      40250 |   pandas
+import time:       500 |        500 |   src.lazy_import
+import time:      1000 |      41750 | main_multi_symbol
+"""
+
+
+def modules_loaded_by(statement):
+    """Run an import in a fresh interpreter and return the heavy SDKs it loaded"""
+    code = (
+        f"import sys\n{statement}\n"
+        "print(','.join(m for m in ('yfinance', 'ccxt', 'openpyxl', 'telegram', 'numba') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(filter(None, result.stdout.strip().split(',')))
+
+
+class TestLazyModule:
+    """Deferred module loading"""
+
+    def test_import_deferred_until_attribute_access(self):
+        module = LazyModule('colorsys')
+        sys.modules.pop('colorsys', None)
+
+        assert 'not loaded' in repr(module)
+        assert module.rgb_to_hsv(1, 0, 0)[0] == 0.0
+        assert 'colorsys' in sys.modules
+        assert 'colorsys' in get_lazy_load_times()
+
+    def test_returns_already_imported_module(self):
+        assert lazy_module('json') is sys.modules['json']
+
+    def test_missing_module_raises_with_install_hint(self):
+        module = lazy_module('not_a_real_sdk', install_hint='pip install not-a-real-sdk')
+
+        with pytest.raises(ImportError, match='pip install not-a-real-sdk'):
+            module.connect
+
+    @pytest.mark.parametrize("statement", [
+        "from src.imports import *",
+        "import src.symbol_scanner",
+        "import src.excel_reporter",
+        "import src.indicator_kernels",
+    ])
+    def test_scanner_modules_do_not_import_sdks(self, statement):
+        assert modules_loaded_by(statement) == set()
+
+
+class TestImportProfile:
+    """Parsing python -X importtime output"""
+
+    def test_parse_depth_and_parents(self):
+        profile = parse_importtime(IMPORTTIME_SAMPLE, 'main_multi_symbol')
+
+        pandas = next(r for r in profile.records if r.module == 'pandas')
+        assert pandas.depth == 1
+        assert pandas.parent == 'main_multi_symbol'
+        assert profile.total_ms == pytest.approx(42.05)
+        assert profile.loaded('pandas')
+        assert not profile.loaded('yfinance')
+
+    def test_report_breaks_down_target(self):
+        profile = parse_importtime(IMPORTTIME_SAMPLE, 'main_multi_symbol')
+
+        assert [r.module for r in profile.top(2)] == ['pandas', 'src.lazy_import']
+        report = profile.format_report(budget_ms=10)
+        assert 'pandas' in report
+        assert 'OVER BUDGET' in report
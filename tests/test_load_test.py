@@ -0,0 +1,145 @@
+"""
+Unit Tests for Load Test Harness
+Tests the synthetic market, fake providers, config generation and a short orchestrator run
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from src import virtual_clock
+from src.asset_config_manager import AssetConfigManager
+from src.load_test import (
+    FakeExchange, FakeNetworkError, FaultProfile, LoadTest, SyntheticMarket, fake_providers,
+    format_report, generate_config
+)
+from src.market_data_client import MarketDataClient
+from src.virtual_clock import VirtualClock
+from src.yfinance_client import YFinanceClient
+
+START = pd.Timestamp('2025-03-03 12:00:30', tz='UTC').timestamp()
+
+
+class TestSyntheticMarket:
+    """Consistent random-walk history"""
+
+    def test_history_is_stable_as_clock_moves(self):
+        market = SyntheticMarket(seed=1)
+        clock = VirtualClock(START)
+
+        with virtual_clock.use_clock(clock):
+            first = market.candles('BTC-USD', 60, 100)
+            clock.advance(180)
+            later = market.candles('BTC-USD', 60, 100)
+
+        assert first[-1, 0] == pd.Timestamp('2025-03-03 12:00', tz='UTC').timestamp() * 1000
+        assert later[-1, 0] - first[-1, 0] == 180_000
+        pd.testing.assert_frame_equal(pd.DataFrame(later[:-3]), pd.DataFrame(first[3:]))
+
+    def test_bars_are_valid_ohlc(self):
+        bars = SyntheticMarket(seed=2).candles('ETH-USD', 300, 500)
+
+        opens, highs, lows, closes = bars[:, 1], bars[:, 2], bars[:, 3], bars[:, 4]
+        assert (highs >= opens).all() and (highs >= closes).all()
+        assert (lows <= opens).all() and (lows <= closes).all()
+        assert (bars[:, 5] > 0).all()
+
+    def test_symbols_get_different_series(self):
+        market = SyntheticMarket()
+
+        assert market.candles('A', 60, 5)[-1, 4] != market.candles('B', 60, 5)[-1, 4]
+
+
+class TestFakeProviders:
+    """The real clients run unchanged against the fakes"""
+
+    def test_yfinance_client(self):
+        with fake_providers(SyntheticMarket()):
+            client = YFinanceClient('LOAD0001-USD', ['5m'])
+            assert client.connect()
+            df, is_fresh = client.get_latest_candles('5m', count=200)
+
+        assert len(df) == 200
+        assert is_fresh
+
+    def test_ccxt_client(self):
+        with fake_providers(SyntheticMarket()):
+            client = MarketDataClient('binance', 'LOAD/USDT', ['1m'])
+            assert client.connect()
+            df, is_fresh = client.get_latest_candles('1m', count=50)
+
+        assert len(df) == 50 and is_fresh
+
+    def test_modules_restored(self):
+        from src import market_data_client
+        before = market_data_client.ccxt
+
+        with fake_providers(SyntheticMarket()):
+            assert market_data_client.ccxt is not before
+
+        assert market_data_client.ccxt is before
+
+    def test_injected_errors(self):
+        exchange = FakeExchange(SyntheticMarket(), FaultProfile(error_rate=0.5, seed=3))
+        failures = 0
+        for _ in range(200):
+            try:
+                exchange.fetch_ohlcv('X/USDT', '1m', limit=5)
+            except FakeNetworkError:
+                failures += 1
+
+        assert 70 < failures < 130
+
+
+class TestGenerateConfig:
+    """Generated multi_* configs"""
+
+    def test_symbols_load_and_validate(self, tmp_path):
+        path = tmp_path / 'multi_load.json'
+
+        symbols = generate_config(25, path, polling_interval=10, thread_pool_size=8)
+        manager = AssetConfigManager(str(path))
+
+        assert len(symbols) == 25
+        assert manager.get_enabled_symbols() == symbols
+        assert manager.get_global_setting('thread_pool_size') == 8
+        assert manager.get_global_setting('provider_rate_limits')['yfinance']['rate'] >= 1e6
+
+    def test_keep_rate_limits(self, tmp_path):
+        path = tmp_path / 'multi_load.json'
+
+        generate_config(2, path, keep_rate_limits=True)
+
+        assert json.loads(path.read_text())['global_settings']['provider_rate_limits']['yfinance']['rate'] == 2.0
+
+
+class TestLoadTest:
+    """A short ramp through the real orchestrator"""
+
+    @pytest.fixture
+    def template(self, tmp_path):
+        with open('config/multi_crypto_scalp.json') as f:
+            data = json.load(f)
+        symbol = next(iter(data['symbols'].values()))
+        symbol['timeframes'] = ['5m']
+        data['symbols'] = {'BTC-USD': symbol}
+        path = tmp_path / 'template.json'
+        path.write_text(json.dumps(data))
+        return str(path)
+
+    def test_level_report(self, template, tmp_path, monkeypatch):
+        load_test = LoadTest(polling_interval=0.5, duration=1.5, template=template, thread_pool_size=2)
+        run_dir = tmp_path / 'cwd'
+        run_dir.mkdir()
+        monkeypatch.chdir(run_dir)
+
+        report = load_test.run_level(2)
+
+        assert not (run_dir / 'logs').exists()
+        assert report.symbols == 2
+        assert report.target_scans_per_sec == 4.0
+        assert report.scans_per_sec > 0
+        assert report.cycle_ms_p50 <= report.cycle_ms_p99 <= report.cycle_ms_max
+        assert report.provider_requests > 0
+        assert report.rss_mb_peak > 0
+        assert 'symbols' in format_report([report])
@@ -0,0 +1,131 @@
+"""
+Unit Tests for Orchestrator Startup
+Tests parallel bootstrap, per-provider token buckets and background retries
+"""
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from src.rate_limiter import TokenBucket, get_broker
+from src.symbol_orchestrator import SymbolOrchestrator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_orchestrator(**settings):
+    config_manager = Mock()
+    config_manager.get_global_setting.side_effect = lambda key, default=None: settings.get(key, default)
+    return SymbolOrchestrator(config_manager, alerter=None, max_concurrent_symbols=50)
+
+
+def make_scanner(symbol, provider='test-provider', connect_delay=0.0, connect_results=None):
+    scanner = Mock()
+    scanner.symbol = symbol
+    scanner.display_name = symbol
+    scanner.provider = provider
+    scanner.timeframes = ['5m']
+    results = list(connect_results or [])
+
+    # Like the real data clients, every request draws from the shared broker
+    def connect():
+        get_broker().acquire(provider)
+        time.sleep(connect_delay)
+        return results.pop(0) if results else True
+
+    def fetch_initial_data(throttle=None):
+        for _ in scanner.timeframes:
+            if throttle and not throttle():
+                return False
+            get_broker().acquire(provider)
+        return True
+
+    scanner.connect.side_effect = connect
+    scanner.fetch_initial_data.side_effect = fetch_initial_data
+    scanner.run.side_effect = lambda: None
+    return scanner
+
+
+class TestTokenBucket:
+    """Token bucket pacing"""
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert bucket.try_acquire() == 0.0
+        assert bucket.available == pytest.approx(0.0)
+
+    def test_acquire_respects_cancel(self):
+        bucket = TokenBucket(rate=0.01, capacity=1)
+        bucket.try_acquire()
+        cancel = threading.Event()
+        cancel.set()
+
+        assert not bucket.acquire(cancel=cancel)
+        assert not bucket.acquire(timeout=0.01)
+
+
+class TestParallelBootstrap:
+    """SymbolOrchestrator.start connects scanners concurrently"""
+
+    def test_startup_does_not_scale_with_symbol_count(self):
+        orchestrator = make_orchestrator(startup_workers=20,
+                                         provider_rate_limits={'fast-provider': {'rate': 1000, 'burst': 100}})
+        orchestrator.scanners = {
+            f"SYM{i}": make_scanner(f"SYM{i}", provider='fast-provider', connect_delay=0.1)
+            for i in range(20)
+        }
+
+        started = time.perf_counter()
+        orchestrator.start()
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0  # 20 x 0.1s sequentially, plus the old 1s stagger each
+        assert orchestrator.pending_symbols == set()
+        assert set(orchestrator.scanner_threads) == set(orchestrator.scanners)
+        orchestrator.stop()
+
+    def test_failed_symbol_retries_in_background(self):
+        orchestrator = make_orchestrator(startup_retry_seconds=0.05,
+                                         provider_rate_limits={'retry-provider': {'rate': 1000, 'burst': 100}})
+        good = make_scanner('GOOD', provider='retry-provider')
+        flaky = make_scanner('FLAKY', provider='retry-provider', connect_results=[False, True])
+        orchestrator.scanners = {'GOOD': good, 'FLAKY': flaky}
+
+        orchestrator.start()
+        assert orchestrator.pending_symbols == {'FLAKY'}
+        assert 'GOOD' in orchestrator.scanner_threads
+
+        deadline = time.time() + 5
+        while orchestrator.pending_symbols and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert orchestrator.pending_symbols == set()
+        assert orchestrator.bootstrap_attempts['FLAKY'] == 2
+        assert 'FLAKY' in orchestrator.scanner_threads
+        orchestrator.stop()
+
+    def test_provider_bucket_paces_requests(self):
+        orchestrator = make_orchestrator(startup_workers=10,
+                                         provider_rate_limits={'slow-provider': {'rate': 20, 'burst': 1}})
+        orchestrator.scanners = {
+            f"SYM{i}": make_scanner(f"SYM{i}", provider='slow-provider') for i in range(5)
+        }
+
+        started = time.perf_counter()
+        orchestrator.start()
+
+        # 10 requests (connect + one timeframe each) at 20/s after a burst of 1
+        assert time.perf_counter() - started >= 0.4
+        orchestrator.stop()
@@ -0,0 +1,103 @@
+"""
+Unit Tests for Price Validator
+Tests the vectorized mask engine against the per-candle validation path
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+
+from src.price_validator import FrameValidation, PriceValidator, ValidationConfig, compute_candle_masks
+
+
+@pytest.fixture
+def candles():
+    """Create 200 candles with a handful of injected defects"""
+    rng = np.random.default_rng(7)
+    n = 200
+    close = 45000 + np.cumsum(rng.normal(0, 40, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + rng.uniform(1, 20, n)
+    low = np.minimum(open_, close) - rng.uniform(1, 20, n)
+    df = pd.DataFrame({
+        'timestamp': pd.date_range(end=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=5), periods=n, freq='1min'),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.uniform(1, 100, n),
+    })
+    df.loc[20, 'high'] = df.loc[20, 'low'] - 1  # Broken OHLC
+    df.loc[50, 'volume'] = -5  # Negative volume
+    df.loc[120, 'close'] = df.loc[119, 'close'] * 1.08  # Extreme move (error)
+    df.loc[120, 'high'] = df.loc[120, 'close'] + 1  # Row 121 snaps back: also extreme
+    df.loc[150, 'volume'] = np.nan
+    df.loc[199, 'timestamp'] = pd.Timestamp(datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=2))  # Future
+    return df
+
+
+class TestVectorizedValidation:
+    """Vectorized validation must agree with validate_candle row by row"""
+
+    def test_matches_per_candle_validation(self, candles):
+        validator = PriceValidator(ValidationConfig())
+        validation = validator.validate_frame(candles)
+
+        for i in range(len(candles)):
+            expected = validator.validate_candle(candles.iloc[i], candles.iloc[i - 1] if i > 0 else None)
+            actual = validation.result(i)
+            assert actual.is_valid == expected.is_valid, f"row {i}"
+            assert actual.errors == expected.errors, f"row {i}"
+            assert actual.warnings == expected.warnings, f"row {i}"
+            if expected.percent_change is None:
+                assert actual.percent_change is None
+            else:
+                assert actual.percent_change == pytest.approx(expected.percent_change)
+
+    def test_invalid_rows_and_summary(self, candles):
+        validation = PriceValidator().validate_frame(candles)
+
+        assert not validation.all_valid
+        assert validation.invalid_rows.tolist() == [20, 50, 120, 121, 150, 199]
+        assert [row for row, _ in validation.failures()] == [20, 50, 120, 121, 150, 199]
+
+        summary = validation.summary()
+        assert summary['invalid'] == 6
+        assert summary['valid'] == len(candles) - 6
+        assert summary['price_changes']['count'] == len(candles) - 1
+
+    def test_validate_dataframe_keeps_legacy_shape(self, candles):
+        all_valid, results = PriceValidator().validate_dataframe(candles)
+
+        assert all_valid is False
+        assert len(results) == len(candles)
+        assert sum(1 for r in results if not r.is_valid) == 6
+
+    def test_validate_dataframe_builds_results_lazily(self, candles):
+        validator = PriceValidator()
+        with patch.object(FrameValidation, 'result', autospec=True,
+                          side_effect=FrameValidation.result) as build:
+            _, results = validator.validate_dataframe(candles)
+            failures = build.call_count  # Logged while validating
+
+            assert results[20] is results[20]
+            assert not results[20].is_valid
+
+        assert failures == 6
+        assert build.call_count == failures + 1
+
+    def test_empty_dataframe(self):
+        all_valid, results = PriceValidator().validate_dataframe(pd.DataFrame())
+
+        assert all_valid is False
+        assert results == []
+
+    def test_nonpositive_previous_close_warns(self, candles):
+        df = candles.iloc[:3].copy()
+        df.loc[0, ['open', 'high', 'low', 'close']] = [0.0, 0.0, 0.0, 0.0]
+
+        masks = compute_candle_masks(df)
+
+        assert masks['price_warning'][1]
+        assert masks['percent_change'][1] == 0.0
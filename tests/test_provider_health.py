@@ -0,0 +1,240 @@
+"""
+Unit Tests for Provider Health
+Tests health scoring, dynamic ranking with recovery and hedged failover in HybridDataClient
+"""
+import time
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+
+from src.provider_health import ProviderHealth, ProviderHealthTracker
+from src.hybrid_data_client import HybridDataClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def candles(count=10):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=count, freq='5min'),
+        'close': [float(i) for i in range(count)],
+    })
+
+
+def provider(delay=0.0, data=None, error=None):
+    """Mock provider client answering after ``delay`` seconds"""
+    client = Mock()
+    client.connect.return_value = True
+
+    def fetch(timeframe, count, validate_freshness=True):
+        time.sleep(delay)
+        if error:
+            raise error
+        return (candles() if data is None else data), True
+
+    client.get_latest_candles.side_effect = fetch
+    return client
+
+
+def hybrid(clients, **kwargs):
+    """BTC client with mocked providers (yfinance, kraken, ...)"""
+    client = HybridDataClient('BTC/USD', ['5m'], cache_ttl_seconds=0, **kwargs)
+    client.clients.update(clients)
+    for name in client.providers:
+        client.clients.setdefault(name, None)
+    return client
+
+
+class TestProviderHealth:
+    """Scoring of one provider"""
+
+    def test_failures_raise_score_and_bench_provider(self):
+        clock = FakeClock()
+        health = ProviderHealth('yfinance', failure_threshold=3, cooldown_seconds=30, clock=clock)
+        health.record_success(0.2)
+        healthy_score = health.score()
+
+        for _ in range(3):
+            health.record_failure(0.2, "timeout")
+
+        assert health.score() > healthy_score
+        assert health.cooling_down
+        clock.now = 31
+        assert not health.cooling_down
+
+    def test_error_rate_decays_with_time(self):
+        clock = FakeClock()
+        health = ProviderHealth('yfinance', half_life_seconds=60, clock=clock)
+        health.record_failure(0.2)
+        rate = health.error_rate
+
+        clock.now = 60
+        assert health.error_rate == pytest.approx(rate / 2)
+
+    def test_unanswered_request_counts_as_latency(self):
+        clock = FakeClock()
+        health = ProviderHealth('yfinance', clock=clock)
+        health.record_success(0.2)
+        token = health.begin()
+
+        clock.now = 5
+        assert health.in_flight == 1
+        assert health.score() == pytest.approx(5.0)
+
+        health.end(token)
+        assert health.score() == pytest.approx(0.2)
+
+    def test_p95_latency(self):
+        health = ProviderHealth('yfinance', max_samples=100)
+        for latency in range(1, 101):
+            health.record_success(latency / 100)
+
+        assert health.latency_percentile(95) == pytest.approx(0.95, abs=0.01)
+
+
+class TestRanking:
+    """Dynamic provider ranking"""
+
+    def test_configured_order_without_history(self):
+        tracker = ProviderHealthTracker()
+        assert tracker.rank(['yfinance', 'kraken']) == ['yfinance', 'kraken']
+
+    def test_failing_primary_drops_and_recovers(self):
+        clock = FakeClock()
+        tracker = ProviderHealthTracker(half_life_seconds=60, cooldown_seconds=30, clock=clock)
+        tracker.record_success('kraken', 0.3)
+        for _ in range(3):
+            tracker.record_failure('yfinance', 0.3, "HTTP 500")
+
+        assert tracker.rank(['yfinance', 'kraken']) == ['kraken', 'yfinance']
+
+        clock.now = 600
+        assert tracker.rank(['yfinance', 'kraken']) == ['yfinance', 'kraken']
+
+    def test_saturated_provider_ranks_last(self):
+        tracker = ProviderHealthTracker(max_in_flight=1)
+        tracker.record_success('yfinance', 0.1)
+        token = tracker.begin('yfinance')
+
+        assert tracker.saturated('yfinance')
+        assert tracker.rank(['yfinance', 'kraken']) == ['kraken', 'yfinance']
+        assert tracker.snapshot()['yfinance']['in_flight'] == 1
+
+        tracker.end('yfinance', token)
+        assert tracker.rank(['yfinance', 'kraken']) == ['yfinance', 'kraken']
+
+    def test_hedge_delay_uses_p95_after_warmup(self):
+        tracker = ProviderHealthTracker(min_samples_for_hedge=5, default_hedge_delay=2.0, min_hedge_delay=0.1)
+        assert tracker.hedge_delay('yfinance') == 2.0
+
+        for _ in range(5):
+            tracker.record_success('yfinance', 0.4)
+        assert tracker.hedge_delay('yfinance') == pytest.approx(0.4)
+
+
+class TestHedgedFailover:
+    """HybridDataClient provider selection"""
+
+    def test_slow_primary_is_hedged(self):
+        client = hybrid({'yfinance': provider(delay=1.0), 'kraken': provider()},
+                        health=ProviderHealthTracker(default_hedge_delay=0.05))
+
+        started = time.monotonic()
+        frame, fresh = client.get_latest_candles('5m', 10)
+
+        assert time.monotonic() - started < 0.5
+        assert not frame.empty and fresh
+        assert client.client_type == 'kraken'
+        assert client.get_provider_health()['hedge_wins'] == 1
+        client.close()
+
+    def test_failure_falls_back_immediately(self):
+        client = hybrid({'yfinance': provider(error=ConnectionError("down")), 'kraken': provider()})
+
+        started = time.monotonic()
+        frame, _ = client.get_latest_candles('5m', 10)
+
+        assert time.monotonic() - started < 1.0
+        assert not frame.empty
+        assert client.get_provider_health()['providers']['yfinance']['failures'] == 1
+        client.close()
+
+    def test_empty_response_does_not_win(self):
+        client = hybrid({'yfinance': provider(data=pd.DataFrame()), 'kraken': provider(delay=0.05)},
+                        health=ProviderHealthTracker(default_hedge_delay=1.0))
+
+        frame, _ = client.get_latest_candles('5m', 10)
+
+        assert len(frame) == 10
+        assert client.client_type == 'kraken'
+        client.close()
+
+    def test_recovered_primary_is_used_again(self):
+        clock = FakeClock()
+        health = ProviderHealthTracker(half_life_seconds=60, clock=clock)
+        yfinance = provider()
+        client = hybrid({'yfinance': yfinance, 'kraken': provider()}, health=health)
+        for _ in range(3):
+            health.record_failure('yfinance', 0.1, "HTTP 500")
+
+        client.get_latest_candles('5m', 10)
+        assert client.client_type == 'kraken'
+
+        clock.now = 900
+        client.get_latest_candles('5m', 10)
+        assert client.client_type == 'yfinance'
+        client.close()
+
+    def test_hung_primary_times_out_and_ranks_down(self):
+        client = hybrid({'yfinance': provider(delay=1.0), 'kraken': provider()},
+                        hedge_requests=False, request_timeout_seconds=0.1)
+
+        started = time.monotonic()
+        frame, _ = client.get_latest_candles('5m', 10)
+
+        assert time.monotonic() - started < 0.5
+        assert not frame.empty and client.client_type == 'kraken'
+        health = client.get_provider_health()
+        assert health['timeouts'] == 1
+        assert health['providers']['yfinance']['in_flight'] == 1
+        assert health['ranking'][0] == 'kraken'
+        client.close()
+
+    def test_saturated_provider_is_skipped(self):
+        yfinance = provider()
+        client = hybrid({'yfinance': yfinance, 'kraken': provider()},
+                        health=ProviderHealthTracker(max_in_flight=1))
+        client.health.begin('yfinance')  # A request that never came back
+
+        frame, _ = client.get_latest_candles('5m', 10)
+
+        assert not frame.empty and client.client_type == 'kraken'
+        yfinance.get_latest_candles.assert_not_called()
+        client.close()
+
+    def test_hedge_needs_spare_budget(self):
+        client = hybrid({'yfinance': provider(delay=0.3), 'kraken': provider()},
+                        health=ProviderHealthTracker(default_hedge_delay=0.05))
+        client.rate_limiter = Mock()
+        client.rate_limiter.has_budget.return_value = False
+
+        frame, _ = client.get_latest_candles('5m', 10)
+
+        assert not frame.empty and client.client_type == 'yfinance'
+        assert client.get_provider_health()['hedged_requests'] == 0
+        client.rate_limiter.has_budget.assert_called_once_with('kraken', None)
+        client.close()
+
+    def test_all_providers_failing(self):
+        client = hybrid({'yfinance': provider(error=ConnectionError("down")),
+                         'kraken': provider(data=pd.DataFrame())})
+
+        frame, fresh = client.get_latest_candles('5m', 10)
+
+        assert frame.empty and not fresh
+        client.close()
@@ -0,0 +1,136 @@
+"""
+Unit Tests for Rate Limit Broker
+Tests priority ordering, daily budgets, throttling feedback and host-wide buckets
+"""
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.rate_limiter import (
+    FCNTL_AVAILABLE, Priority, RateLimitBroker, is_rate_limit_error, priority_for_timeframe
+)
+from src.twelve_data_client import TwelveDataClient
+
+
+def make_broker(**limits):
+    return RateLimitBroker(limits={'test': dict({'rate': 20, 'burst': 1}, **limits)})
+
+
+class TestRateLimitBroker:
+    """Shared token buckets per provider and API key"""
+
+    def test_higher_priority_served_first(self):
+        broker = make_broker()
+        assert broker.acquire('test')  # Empty the bucket
+        order = []
+
+        def request(priority):
+            broker.acquire('test', priority)
+            order.append(priority)
+
+        backfill = threading.Thread(target=request, args=(Priority.BACKFILL,))
+        backfill.start()
+        time.sleep(0.01)
+        trade = threading.Thread(target=request, args=(Priority.TRADE,))
+        trade.start()
+        backfill.join(timeout=2)
+        trade.join(timeout=2)
+
+        assert order == [Priority.TRADE, Priority.BACKFILL]
+
+    def test_daily_budget_refuses_when_spent(self):
+        broker = make_broker(rate=1000, burst=10, daily_limit=2)
+
+        assert broker.acquire('test') and broker.acquire('test')
+        assert not broker.acquire('test')
+
+        metrics = broker.get_metrics()['test']
+        assert metrics['daily_remaining'] == 0
+        assert metrics['granted'] == 2
+        assert metrics['denied'] == 1
+
+    def test_api_keys_have_separate_buckets(self):
+        broker = make_broker()
+
+        assert broker.acquire('test', api_key='secret-a')
+        assert broker.acquire('test', api_key='secret-b')
+        assert not broker.acquire('test', api_key='secret-a', timeout=0.01)
+
+        names = list(broker.get_metrics())
+        assert len(names) == 2
+        assert not any('secret' in name for name in names)
+
+    def test_throttle_report_backs_off(self):
+        broker = make_broker(rate=1000, burst=5)
+
+        broker.report_throttled('test', retry_after=0.2)
+
+        assert not broker.acquire('test', timeout=0.05)
+        assert broker.acquire('test', timeout=1)
+        assert broker.get_metrics()['test']['throttled'] == 1
+
+    def test_has_budget_without_spending_it(self):
+        broker = make_broker(rate=0.01, burst=1, daily_limit=5)
+
+        assert broker.has_budget('test')
+        assert broker.has_budget('test')  # Checking does not take tokens
+        assert broker.acquire('test')
+        assert not broker.has_budget('test')
+
+        spent = make_broker(rate=1000, burst=10, daily_limit=1)
+        assert spent.acquire('test')
+        assert not spent.has_budget('test')
+
+    def test_cancel_aborts_wait(self):
+        broker = make_broker(rate=0.01)
+        broker.acquire('test')
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+
+        assert not broker.acquire('test', cancel=cancel)
+        assert broker.get_metrics()['test']['queued']['SCAN'] == 0
+
+    @pytest.mark.skipif(not FCNTL_AVAILABLE, reason="host-wide buckets need fcntl")
+    def test_state_file_shares_buckets_between_brokers(self, tmp_path):
+        state_file = str(tmp_path / 'rate_limits.json')
+        limits = {'test': {'rate': 0.01, 'burst': 2}}
+        first = RateLimitBroker(limits=limits, state_file=state_file)
+        second = RateLimitBroker(limits=limits, state_file=state_file)
+
+        assert first.acquire('test')
+        assert second.acquire('test')
+        assert not first.acquire('test', timeout=0.01)
+        assert not second.acquire('test', timeout=0.01)
+
+
+class TestHelpers:
+    """Priority and error classification"""
+
+    def test_priority_for_timeframe(self):
+        assert priority_for_timeframe('5m') == Priority.SCAN
+        assert priority_for_timeframe('1d') == Priority.BACKFILL
+
+    def test_rate_limit_errors_detected_by_name(self):
+        RateLimitExceeded = type('RateLimitExceeded', (Exception,), {})
+
+        assert is_rate_limit_error(RateLimitExceeded("slow down"))
+        assert is_rate_limit_error(Exception("HTTP 429 Too Many Requests"))
+        assert not is_rate_limit_error(ValueError("bad symbol"))
+
+
+class TestClientIntegration:
+    """Data clients report provider throttling to the broker"""
+
+    def test_twelve_data_429_penalizes_bucket(self):
+        client = TwelveDataClient('key', 'XAU/USD', ['5m'])
+        client.rate_limiter = RateLimitBroker(limits={'twelve_data': {'rate': 1000, 'burst': 5}})
+        response = MagicMock(status_code=429, headers={'Retry-After': '30'})
+
+        with patch('src.twelve_data_client.requests.get', return_value=response):
+            assert client.get_latest_candles('5m').empty
+
+        metrics = client.rate_limiter.get_metrics()
+        (lane,) = metrics.values()
+        assert lane['throttled'] == 1
+        assert lane['tokens_available'] < 0
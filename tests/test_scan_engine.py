@@ -0,0 +1,165 @@
+"""
+Unit Tests for Scan Engine
+Tests stage ordering, overlap across timeframes, filters and indicator caching
+"""
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+
+from src import latency_trace
+from src.scan_engine import ScanEngine
+
+
+def make_candles(n=50, last_close=100.0):
+    close = np.linspace(90, last_close, n)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='5min'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': np.full(n, 10.0),
+    })
+
+
+def add_sma(candles):
+    candles = candles.copy()
+    candles['sma'] = candles['close'].rolling(5).mean()
+    return candles
+
+
+class TestScanEngine:
+    """Pipelined scan cycle"""
+
+    def test_stages_run_in_timeframe_order(self):
+        calls = []
+        engine = ScanEngine(
+            ['1m', '5m', '15m'],
+            fetch=lambda tf: make_candles(),
+            indicators=add_sma,
+            detect=lambda ctx: calls.append(('detect', ctx.timeframe)) or ctx.timeframe,
+            report=lambda ctx: calls.append(('report', ctx.timeframe)),
+            alert=lambda ctx: calls.append(('alert', ctx.signal)),
+        )
+
+        results = engine.run_cycle()
+
+        assert calls == [(stage, tf) for tf in ('1m', '5m', '15m') for stage in ('detect', 'report', 'alert')]
+        assert 'sma' in results['5m'].candles.columns
+        assert set(engine.candle_data) == {'1m', '5m', '15m'}
+        engine.shutdown()
+
+    def test_fetches_overlap_across_timeframes(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_fetch(timeframe):
+            with lock:
+                active.append(timeframe)
+                peak.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.remove(timeframe)
+            return make_candles()
+
+        engine = ScanEngine(['1m', '5m', '15m', '1h'], fetch=slow_fetch, indicators=add_sma,
+                            detect=lambda ctx: None)
+
+        started = time.perf_counter()
+        engine.run_cycle()
+
+        assert max(peak) > 1
+        assert time.perf_counter() - started < 0.35
+        engine.shutdown()
+
+    def test_gate_and_filters_stop_signal(self):
+        alerts = []
+        engine = ScanEngine(
+            ['1m', '5m'],
+            fetch=lambda tf: make_candles(),
+            indicators=add_sma,
+            gate=lambda ctx: ctx.timeframe != '1m',
+            detect=lambda ctx: 'LONG',
+            filters=[lambda ctx: True, lambda ctx: False],
+            alert=alerts.append,
+        )
+
+        results = engine.run_cycle()
+
+        assert results['1m'].skipped == 'gated'
+        assert results['5m'].detected == 'LONG'
+        assert results['5m'].signal is None
+        assert alerts == []
+        engine.shutdown()
+
+    def test_indicators_cached_while_candles_unchanged(self):
+        computed = []
+        closes = iter([100.0, 100.0, 101.0])
+
+        def indicators(candles):
+            computed.append(len(candles))
+            return add_sma(candles)
+
+        engine = ScanEngine(['5m'], fetch=lambda tf: make_candles(last_close=next(closes)),
+                            indicators=indicators, detect=lambda ctx: None)
+
+        results = [engine.run_cycle()['5m'] for _ in range(3)]
+
+        assert [ctx.cached for ctx in results] == [False, True, False]
+        assert len(computed) == 2
+        assert engine.get_stats()['indicator_cache_hits'] == 1
+        engine.shutdown()
+
+    def test_stage_error_is_isolated_to_timeframe(self):
+        def fetch(timeframe):
+            if timeframe == '1m':
+                raise ConnectionError("provider down")
+            return make_candles()
+
+        engine = ScanEngine(['1m', '5m'], fetch=fetch, indicators=add_sma, detect=lambda ctx: None)
+
+        results = engine.run_cycle()
+
+        assert isinstance(results['1m'].error, ConnectionError)
+        assert results['5m'].error is None
+        stats = engine.get_stats()['stages']
+        assert stats['fetch']['count'] == 2
+        assert stats['detect']['count'] == 1
+        engine.shutdown()
+
+    def test_prepare_all_with_warm_start_fetch(self):
+        fetched = []
+        engine = ScanEngine(
+            ['1m', '5m'],
+            fetch=lambda tf: fetched.append(tf) or make_candles(),
+            indicators=add_sma,
+            detect=lambda ctx: None,
+        )
+
+        candles = engine.prepare_all(fetch=lambda tf: make_candles(last_close=120.0))
+
+        assert fetched == []
+        assert candles['5m']['close'].iloc[-1] == 120.0
+        engine.run_cycle()
+        assert sorted(fetched) == ['1m', '5m']
+        engine.shutdown()
+
+    def test_signal_traced_from_fetch_to_alert(self):
+        traces = []
+        engine = ScanEngine(
+            ['1m', '5m'],
+            fetch=lambda tf: make_candles(),
+            indicators=add_sma,
+            detect=lambda ctx: SimpleNamespace(trace=latency_trace.current_trace()),
+            alert=lambda ctx: latency_trace.mark('alert', ctx.signal) or traces.append(ctx.signal.trace),
+            name="btc",
+        )
+
+        results = engine.run_cycle()
+
+        assert traces == [results['1m'].trace, results['5m'].trace]
+        assert [trace.timeframe for trace in traces] == ['1m', '5m']
+        assert [hop for hop, _ in traces[0].hops] == ['fetch', 'alert']
+        assert traces[0].source_time is not None
+        assert latency_trace.current_trace() is None
+        engine.shutdown()
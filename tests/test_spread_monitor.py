@@ -0,0 +1,164 @@
+"""
+Unit Tests for Spread Monitoring
+Tests rolling spread statistics, the SpreadMonitor and the quote feed
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timezone, timedelta
+
+from xauusd_scanner.spread_monitor import RollingSpreadStats, SpreadMonitor
+from xauusd_scanner.quote_feed import QuoteFeed, SimulatedQuoteSource
+
+
+class TestRollingSpreadStats:
+    """Time-bucketed aggregates must match a full rescan of the window"""
+
+    def test_matches_rescan(self):
+        rng = np.random.default_rng(0)
+        stats = RollingSpreadStats(window_seconds=60, bucket_seconds=5)
+        readings = []
+
+        for i in range(2000):
+            ts = 1_000_000 + i * 0.5
+            value = round(float(rng.uniform(0, 20)), 1)
+            stats.add(value, ts)
+            readings.append((ts, value))
+
+            oldest = (int((ts - 60) // 5) + 1) * 5
+            window = [v for t, v in readings if t >= oldest]
+            assert stats.count == len(window)
+            assert stats.mean() == pytest.approx(np.mean(window))
+            assert stats.max() == max(window)
+            assert stats.min() == min(window)
+
+        expected_p95 = np.percentile(window, 95, method='inverted_cdf')
+        assert stats.percentile(95) == pytest.approx(expected_p95, abs=stats.bin_width_pips)
+
+    def test_expire_empties_window(self):
+        stats = RollingSpreadStats(window_seconds=60, bucket_seconds=5)
+        stats.add(3.0, 100.0)
+
+        stats.expire(1000.0)
+
+        assert stats.count == 0
+        assert stats.mean() is None
+        assert stats.max() is None
+        assert stats.percentile(50) is None
+
+
+class TestSpreadMonitor:
+    """SpreadMonitor decisions and statistics"""
+
+    def test_status_statistics(self):
+        monitor = SpreadMonitor(acceptable_spread_pips=10, pause_spread_pips=15)
+        for spread in (0.5, 1.0, 1.5, 2.0):
+            monitor.update_spread(2000.0, 2000.0 + spread / 10, source='live')
+
+        status = monitor.get_spread_status()
+
+        assert status['current_pips'] == 2.0
+        assert status['source'] == 'live'
+        assert status['statistics']['samples'] == 4
+        assert status['statistics']['average_pips'] == pytest.approx(1.2, abs=0.1)
+        assert status['statistics']['max_pips'] == 2.0
+        assert monitor.get_spread_percentile(50) == pytest.approx(1.0, abs=0.1)
+
+    def test_wide_spread_pauses(self):
+        monitor = SpreadMonitor(acceptable_spread_pips=10, pause_spread_pips=15)
+        monitor.update_spread(2000.0, 2002.0)
+
+        should_pause, reason = monitor.should_pause_trading()
+
+        assert should_pause
+        assert 'too wide' in reason
+
+    def test_stale_quote_pauses(self):
+        monitor = SpreadMonitor(max_quote_age_seconds=30)
+        monitor.update_spread(2000.0, 2000.1, datetime.now(timezone.utc) - timedelta(seconds=90))
+
+        should_pause, reason = monitor.should_pause_trading()
+
+        assert should_pause
+        assert 'stale' in reason
+
+    def test_invalid_quote_ignored(self):
+        monitor = SpreadMonitor()
+        monitor.update_spread(2000.0, 2000.1)
+
+        monitor.update_spread(2000.5, 2000.0)
+
+        assert monitor.current_spread_pips == pytest.approx(1.0)
+        assert monitor.stats.count == 1
+
+
+class TestQuoteFeed:
+    """Quote polling and fallback"""
+
+    def test_poll_uses_live_quotes(self):
+        monitor = SpreadMonitor()
+        feed = QuoteFeed(monitor, lambda: {'bid': 2000.0, 'ask': 2000.3, 'timestamp': None})
+
+        spread = feed.poll_once()
+
+        assert spread == pytest.approx(3.0)
+        assert feed.active_source == 'live'
+
+    def test_falls_back_to_simulated_quotes(self):
+        def failing_source():
+            raise ConnectionError("no book")
+
+        monitor = SpreadMonitor()
+        simulated = SimulatedQuoteSource(spread_pips=1.0, price=2000.0)
+        feed = QuoteFeed(monitor, failing_source, fallback_source=simulated)
+
+        spread = feed.poll_once()
+
+        assert spread == pytest.approx(1.0)
+        assert feed.active_source == 'simulated'
+        assert feed.errors == 1
+        assert monitor.quote_source == 'simulated'
+
+    def test_no_quote_leaves_monitor_untouched(self):
+        monitor = SpreadMonitor()
+        feed = QuoteFeed(monitor, lambda: None)
+
+        assert feed.poll_once() is None
+        assert monitor.should_pause_trading()[0]
+
+    def test_repeated_cached_quote_recorded_once(self):
+        monitor = SpreadMonitor()
+        quote = {'bid': 2000.0, 'ask': 2000.3, 'timestamp': 1_700_000_000.0}
+        feed = QuoteFeed(monitor, lambda: quote)
+
+        feed.poll_once()
+        spread = feed.poll_once()
+
+        assert spread == pytest.approx(3.0)
+        assert feed.quotes_received == 1
+
+
+class TestYFinanceQuote:
+    """Bid/ask from Ticker.info is cached between refreshes"""
+
+    def test_info_refreshed_at_most_every_interval(self, monkeypatch):
+        from src.yfinance_client import YFinanceClient
+
+        class Ticker:
+            reads = 0
+
+            @property
+            def info(self):
+                Ticker.reads += 1
+                return {'bid': 2000.0, 'ask': 2000.5}
+
+        client = YFinanceClient('GC=F', ['1m'])
+        client._connected = True
+        client.ticker = Ticker()
+
+        first = client.get_quote()
+        second = client.get_quote()
+        monkeypatch.setattr(client, 'QUOTE_REFRESH_SECONDS', 0.0)
+        client.get_quote()
+
+        assert first == second and first['ask'] == 2000.5
+        assert Ticker.reads == 2
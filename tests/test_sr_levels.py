@@ -0,0 +1,127 @@
+"""
+Unit Tests for Vectorized Support/Resistance Levels
+Tests swing-point discovery, level binning and touch counting against the per-row definitions
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import sr_levels
+from src.strategy_helpers import SupportResistanceFinder
+
+
+def running_average_groups(levels, tolerance_pct):
+    """The per-level grouping loop cluster_levels replaced"""
+    if not levels:
+        return []
+    levels = sorted(levels)
+    grouped = []
+    current_group = [levels[0]]
+    for level in levels[1:]:
+        group_avg = sum(current_group) / len(current_group)
+        if abs(level - group_avg) <= group_avg * (tolerance_pct / 100):
+            current_group.append(level)
+        else:
+            grouped.append(sum(current_group) / len(current_group))
+            current_group = [level]
+    grouped.append(sum(current_group) / len(current_group))
+    return grouped
+
+
+@pytest.fixture
+def ohlc():
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 0.4, 300))
+    return pd.DataFrame({
+        'open': close, 'close': close,
+        'high': close + rng.uniform(0, 0.5, 300),
+        'low': close - rng.uniform(0, 0.5, 300),
+    })
+
+
+class TestLocalExtrema:
+    """Swing highs and lows"""
+
+    def test_strict_neighbours(self, ohlc):
+        highs = ohlc['high'].to_numpy()
+        expected = [i for i in range(1, len(highs) - 1) if highs[i] > highs[i - 1] and highs[i] > highs[i + 1]]
+
+        assert sr_levels.local_extrema(highs, 'high').tolist() == expected
+
+    def test_window_extreme(self, ohlc):
+        lows = ohlc['low'].to_numpy()
+        expected = [i for i in range(5, len(lows) - 5) if lows[i] == lows[i - 5:i + 6].min()]
+
+        assert sr_levels.local_extrema(lows, 'low', window=5, strict=False).tolist() == expected
+
+    def test_short_input(self):
+        assert len(sr_levels.local_extrema(np.array([1.0, 2.0]), 'high')) == 0
+
+
+class TestClusterLevels:
+    """Sorted binning of nearby levels"""
+
+    def test_bins_split_on_gaps(self):
+        levels = sr_levels.cluster_levels([100.2, 200.0, 100.0, 100.1, 150.0], 0.3)
+
+        assert levels.tolist() == pytest.approx([100.1, 150.0, 200.0])
+
+    def test_evenly_spaced_levels_do_not_chain(self):
+        lows = [100 * 1.0025 ** i for i in range(7)]
+
+        levels = sr_levels.cluster_levels(lows, 0.3)
+
+        assert len(levels) == 4
+        assert levels.tolist() == pytest.approx(running_average_groups(lows, 0.3))
+
+    @pytest.mark.parametrize('tolerance_pct', [0.1, 0.3, 0.5])
+    def test_matches_running_average_grouping(self, tolerance_pct):
+        rng = np.random.default_rng(11)
+        for _ in range(200):
+            close = 100 + np.cumsum(rng.normal(0, 0.4, 100))
+            lows = (close - rng.uniform(0, 0.5, 100)).tolist()
+
+            levels = sr_levels.cluster_levels(lows, tolerance_pct)
+
+            assert levels.tolist() == pytest.approx(running_average_groups(lows, tolerance_pct))
+
+    def test_empty(self):
+        assert len(sr_levels.cluster_levels([], 0.3)) == 0
+
+
+class TestScoreLevels:
+    """Touch counts, last touches and strength"""
+
+    def test_matches_row_by_row_count(self, ohlc):
+        lows = ohlc['low'].to_numpy()
+        levels = np.array([98.0, 100.0, 101.5, 500.0])
+
+        scores = sr_levels.score_levels(levels, lows, 0.3)
+
+        for level, touches, last in zip(levels, scores.touches, scores.last_touch):
+            hits = [i for i, low in enumerate(lows) if abs(low - level) <= level * 0.003]
+            assert touches == len(hits)
+            assert last == (hits[-1] if hits else -1)
+        assert scores.strength.tolist() == [min(t / 5, 1.0) for t in scores.touches]
+
+    def test_min_touches_filter(self, ohlc):
+        support, resistance = sr_levels.find_levels(ohlc['high'], ohlc['low'], 0.3, min_touches=3)
+
+        assert (support.touches >= 3).all() and (resistance.touches >= 3).all()
+        assert len(support) and len(resistance)
+
+
+class TestSupportResistanceFinder:
+    """Finder output built from the vectorized engine"""
+
+    def test_levels_and_recency(self, ohlc):
+        levels = SupportResistanceFinder.find_levels(ohlc, lookback=100, min_touches=2)
+        recent = ohlc.iloc[-100:]
+
+        assert levels
+        assert [l.strength for l in levels] == sorted((l.strength for l in levels), reverse=True)
+        for level in levels:
+            column = recent['low'] if level.level_type == 'support' else recent['high']
+            hits = np.flatnonzero((column - level.price).abs() <= level.price * 0.003)
+            assert level.touches == len(hits) >= 2
+            assert level.last_touch_candles_ago == len(recent) - 1 - hits[-1]
@@ -0,0 +1,267 @@
+"""
+Unit Tests for State Checkpointing
+Tests capture/restore rules, the checkpoint file format and warm restarts of the filters
+"""
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from src import virtual_clock
+from src.duplicate_suppressor import DuplicateSuppressor
+from src.hybrid_data_client import HybridDataClient
+from src.signal_detector import Signal, SignalDetector
+from src.signal_filter import SignalFilter
+from src.state_checkpoint import (CHECKPOINT_MAGIC, StateCheckpointer, buffer_is_fresh, capture_state,
+                                  restore_state, warm_start_fetch)
+from src.strategy_detector import StrategyDetector
+from src.timeframe_resampler import TimeframeResampler
+from src.unified_data_source import DataSourceConfig, UnifiedDataSource
+
+
+def make_signal(price=100.0, timestamp=None):
+    return Signal(timestamp=timestamp or datetime.now(), signal_type='LONG', timeframe='5m',
+                  entry_price=price, stop_loss=price - 1, take_profit=price + 3, atr=1.0, risk_reward=3.0,
+                  market_bias='bullish', confidence=4, indicators={'rsi': 55.0}, symbol='BTC/USDT')
+
+
+class Holder:
+    CHECKPOINT_ATTRS = ('counts', 'history', 'child', 'note')
+
+    def __init__(self, maxlen=3):
+        self.counts = defaultdict(lambda: 0)
+        self.history = deque(maxlen=maxlen)
+        self.child = DuplicateSuppressor(window_minutes=5)
+        self.note = None
+        self.config = 'new'
+
+
+class TestCaptureRestore:
+    """Which attributes are kept and how they are applied"""
+
+    def test_restores_into_live_objects(self):
+        old = Holder(maxlen=10)
+        old.counts['a'] += 2
+        old.history.extend(range(10))
+        old.child.record(make_signal())
+        new = Holder(maxlen=3)
+        child = new.child
+
+        restore_state(new, capture_state(old))
+
+        assert new.counts['a'] == 2 and new.counts['missing'] == 0
+        assert list(new.history) == [7, 8, 9]
+        assert new.child is child
+        assert new.child.is_duplicate(make_signal(100.1))
+        assert new.config == 'new'
+
+    def test_none_does_not_overwrite(self):
+        new = Holder()
+        new.note = 'configured'
+
+        restore_state(new, {'note': None, 'config': 'old'})
+
+        assert new.note == 'configured'
+        assert new.config == 'new'
+
+
+class TestStateCheckpointer:
+    """Checkpoint file handling"""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / 'scanner.ckpt'
+        writer = StateCheckpointer(path)
+        old = SignalFilter(duplicate_window_minutes=10)
+        old.add_signal_to_history('BTC/USDT', make_signal())
+        writer.register('signal_filter', old)
+
+        assert writer.checkpoint()
+        assert path.read_bytes()[:4] == CHECKPOINT_MAGIC
+        assert not writer.checkpoint()  # unchanged
+
+        reader = StateCheckpointer(path)
+        new = SignalFilter(duplicate_window_minutes=10)
+        reader.register('signal_filter', new)
+
+        assert reader.restore() == ['signal_filter']
+        assert new.should_suppress_signal('BTC/USDT', make_signal(100.05))[0]
+
+    def test_version_mismatch_is_cold_start(self, tmp_path):
+        path = tmp_path / 'scanner.ckpt'
+        writer = StateCheckpointer(path)
+        writer.register('filter', SignalFilter())
+        writer.checkpoint()
+        blob = path.read_bytes()
+        path.write_bytes(blob[:4] + (99).to_bytes(2, 'big') + blob[6:])
+
+        reader = StateCheckpointer(path)
+        reader.register('filter', SignalFilter())
+
+        assert reader.restore() == []
+
+    def test_stale_and_corrupt_files_are_ignored(self, tmp_path):
+        path = tmp_path / 'scanner.ckpt'
+        writer = StateCheckpointer(path)
+        writer.register('filter', SignalFilter())
+        writer.checkpoint()
+
+        stale = StateCheckpointer(path, max_age_seconds=-1)
+        stale.register('filter', SignalFilter())
+        assert stale.restore() == []
+
+        path.write_bytes(path.read_bytes()[:20])
+        corrupt = StateCheckpointer(path)
+        corrupt.register('filter', SignalFilter())
+        assert corrupt.restore() == []
+
+    def test_missing_file_is_cold_start(self, tmp_path):
+        assert StateCheckpointer(tmp_path / 'none.ckpt').restore() == []
+
+    def test_write_replaces_atomically(self, tmp_path):
+        path = tmp_path / 'state' / 'scanner.ckpt'
+        writer = StateCheckpointer(path)
+        holder = Holder()
+        writer.register('holder', holder)
+
+        writer.checkpoint()
+        holder.history.append(1)
+        writer.checkpoint()
+
+        assert [p.name for p in path.parent.iterdir()] == ['scanner.ckpt']
+        assert writer.saves == 2
+
+    def test_background_writer_and_final_checkpoint(self, tmp_path):
+        writer = StateCheckpointer(tmp_path / 'scanner.ckpt', interval_seconds=0.05)
+        holder = Holder()
+        writer.register('holder', holder)
+
+        writer.start()
+        time.sleep(0.2)
+        holder.history.append('last')
+        writer.stop()
+
+        assert writer.saves >= 2
+        restored = Holder()
+        reader = StateCheckpointer(tmp_path / 'scanner.ckpt')
+        reader.register('holder', restored)
+        reader.restore()
+        assert list(restored.history) == ['last']
+
+    def test_rejects_components_without_attrs(self, tmp_path):
+        with pytest.raises(TypeError):
+            StateCheckpointer(tmp_path / 'x.ckpt').register('bad', object())
+
+    def test_from_config(self, tmp_path):
+        assert StateCheckpointer.from_config(None) is None
+        assert StateCheckpointer.from_config({'path': 'x', 'enabled': False}) is None
+        checkpointer = StateCheckpointer.from_config({'path': str(tmp_path / 'x'), 'interval_seconds': 5})
+        assert checkpointer.interval_seconds == 5
+
+    def test_for_components_skips_stateless(self, tmp_path):
+        holder = Holder()
+
+        checkpointer = StateCheckpointer.for_components({'path': str(tmp_path / 'x')},
+                                                        {'holder': holder, 'plain': object(), 'unset': None})
+
+        assert checkpointer.components == {'holder': holder}
+        assert StateCheckpointer.for_components(None, {'holder': holder}) is None
+
+    def test_strategy_detectors_registered(self):
+        detector = SignalDetector()
+        strategies = StrategyDetector()
+        strategies.register_strategy('trend', detector._detect_trend_alignment)
+        strategies.register_strategy('reversion', detector._detect_mean_reversion)
+        strategies.register_strategy('plain', lambda *args: None)
+
+        assert strategies.checkpoint_components() == {'strategy:trend': detector}
+
+
+class TestResamplerCheckpoint:
+    """Candle stores survive a restart"""
+
+    def test_resamplers_restored(self, tmp_path):
+        config = DataSourceConfig(primary_source='binance', fallback_sources=[])
+        old = UnifiedDataSource(config)
+        resampler = TimeframeResampler('1m')
+        index = pd.date_range('2025-03-03 12:00', periods=30, freq='1min', tz='UTC')
+        resampler.update_base(pd.DataFrame({
+            'timestamp': index, 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0
+        }))
+        old.resamplers['BTC'] = resampler
+        writer = StateCheckpointer(tmp_path / 'scanner.ckpt')
+        writer.register('data_client', old)
+        writer.checkpoint()
+
+        new = UnifiedDataSource(config)
+        reader = StateCheckpointer(tmp_path / 'scanner.ckpt')
+        reader.register('data_client', new)
+        reader.restore()
+
+        assert len(new.resamplers['BTC'].get('5m', 6)) == 6
+
+
+class BufferClient:
+    def __init__(self, timestamps):
+        self.buffers = {'5m': deque({'timestamp': ts, 'close': 1.0} for ts in timestamps)}
+
+    def get_buffer_data(self, timeframe):
+        return pd.DataFrame(list(self.buffers[timeframe]))
+
+
+class TestWarmStart:
+    """Restored buffers replace the warm-up fetch only while fresh"""
+
+    NOW = datetime(2025, 3, 3, 12, 0, tzinfo=timezone.utc)
+
+    def client(self, minutes_old, count=200):
+        end = pd.Timestamp(self.NOW).tz_localize(None) - pd.Timedelta(minutes=minutes_old)
+        return BufferClient(pd.date_range(end=end, periods=count, freq='5min'))
+
+    def test_buffer_freshness(self):
+        with virtual_clock.use_clock(virtual_clock.VirtualClock(self.NOW)):
+            assert buffer_is_fresh(self.client(5), '5m')
+            assert not buffer_is_fresh(self.client(30), '5m')
+            assert not buffer_is_fresh(self.client(5, count=20), '5m')
+            assert not buffer_is_fresh(self.client(5), '1h')
+
+    def test_warm_start_fetch(self):
+        fetched = []
+        fresh, stale = self.client(5), self.client(30)
+
+        with virtual_clock.use_clock(virtual_clock.VirtualClock(self.NOW)):
+            assert len(warm_start_fetch(fresh, fetched.append)('5m')) == 200
+            warm_start_fetch(stale, fetched.append)('5m')
+
+        assert fetched == ['5m']
+
+    def test_hybrid_client_buffers_restored(self, tmp_path):
+        old = HybridDataClient('BTC/USD', ['5m'], buffer_size=500, preferred_provider='yfinance')
+        old.buffers['5m'].extend(self.client(5).buffers['5m'])
+        StateCheckpointer.for_components({'path': str(tmp_path / 'state.pkl')}, {'market_client': old}).checkpoint()
+
+        new = HybridDataClient('BTC/USD', ['5m'], buffer_size=500, preferred_provider='yfinance')
+        restored = StateCheckpointer.for_components({'path': str(tmp_path / 'state.pkl')},
+                                                    {'market_client': new}).restore()
+
+        assert restored == ['market_client']
+        assert len(new.get_buffer_data('5m')) == 200
+        with virtual_clock.use_clock(virtual_clock.VirtualClock(self.NOW)):
+            assert buffer_is_fresh(new, '5m')
+        old.close()
+        new.close()
+
+    def test_unified_source_fresh_candles(self):
+        source = UnifiedDataSource(DataSourceConfig(primary_source='binance', fallback_sources=[]))
+        resampler = source.resamplers['BTC'] = TimeframeResampler('5m')
+        assert not source.has_fresh_candles('BTC', '15m')
+
+        index = pd.date_range(end=datetime.now() - pd.Timedelta(minutes=1), periods=30, freq='5min')
+        resampler.update_base(pd.DataFrame({
+            'timestamp': index, 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0
+        }))
+
+        assert source.has_fresh_candles('BTC', '5m') and source.has_fresh_candles('BTC', '15m')
+        assert not source.has_fresh_candles('BTC', '7m')
+        assert not source.has_fresh_candles('ETH', '15m')
@@ -0,0 +1,293 @@
+"""
+Unit Tests for Strategy Rules
+Tests the rule compiler, multi-symbol evaluation and equivalence of the ported strategies
+"""
+import numpy as np
+import pytest
+import pandas as pd
+
+from src import detector_rules
+from src.signal_detector import SignalDetector
+from src.strategy_rules import CompiledRule, StrategyRules, stack_frames
+from src.strategies import EMACrossover, MomentumShift, TrendAlignment, MeanReversion
+
+
+def indicator_frame(count=400, seed=3):
+    """Random-walk candles with indicators, including NaN warm-up periods"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=count, freq='5min'),
+        'close': close,
+        'volume': rng.uniform(1, 10, count),
+    })
+    for period in (9, 21, 50, 100, 200):
+        df[f'ema_{period}'] = df['close'].ewm(span=period // 4 + 2).mean()
+    df['volume_ma'] = df['volume'].rolling(20).mean()
+    df['atr'] = df['close'].diff().abs().rolling(14).mean()
+    delta = df['close'].diff()
+    gain = delta.clip(lower=0).rolling(5).mean()
+    loss = (-delta.clip(upper=0)).rolling(5).mean()
+    df['rsi'] = 100 - 100 / (1 + gain / loss)
+    df['adx'] = rng.uniform(10, 40, count)
+    df.loc[5:20, 'adx'] = np.nan
+    df['open'] = df['close'].shift(1).fillna(100) + rng.normal(0, 0.3, count)
+    df['high'] = df[['open', 'close']].max(axis=1) + rng.uniform(0, 1, count)
+    df['low'] = df[['open', 'close']].min(axis=1) - rng.uniform(0, 1, count)
+    df['vwap'] = df['close'].rolling(20).mean()
+    return df
+
+
+def direction(signal):
+    return 0 if signal is None else (1 if signal.signal_type == "LONG" else -1)
+
+
+# Reference implementations: the if-chains the strategies used before the port
+
+def legacy_checks(last, volume_threshold=1.3):
+    if last['volume'] / last['volume_ma'] < volume_threshold:
+        return False
+    risk = abs(last['atr'] * 1.5)
+    return bool(risk > 0) and not pd.isna(last['close'])
+
+
+def legacy_ema_crossover(data):
+    last, prev = data.iloc[-1], data.iloc[-2]
+    bullish = prev['ema_9'] <= prev['ema_21'] and last['ema_9'] > last['ema_21']
+    bearish = prev['ema_9'] >= prev['ema_21'] and last['ema_9'] < last['ema_21']
+    if not (bullish or bearish) or not legacy_checks(last):
+        return 0
+    return 1 if bullish else -1
+
+
+def legacy_momentum_shift(data):
+    if len(data) < 6:
+        return 0
+    prev_rsi, rsi = data['rsi'].iloc[-2], data['rsi'].iloc[-1]
+    bounce = prev_rsi < 30 and rsi > prev_rsi
+    drop = prev_rsi > 70 and rsi < prev_rsi
+    if not (bounce or drop) or not legacy_checks(data.iloc[-1]):
+        return 0
+    return 1 if bounce else -1
+
+
+def legacy_trend_alignment(data):
+    last = data.iloc[-1]
+    if last['adx'] < 20:
+        return 0
+    bullish = last['ema_9'] > last['ema_21'] > last['ema_50'] > last['ema_100'] > last['ema_200']
+    bearish = last['ema_9'] < last['ema_21'] < last['ema_50'] < last['ema_100'] < last['ema_200']
+    if not (bullish or bearish) or not legacy_checks(last):
+        return 0
+    return 1 if bullish else -1
+
+
+def legacy_mean_reversion(data):
+    last = data.iloc[-1]
+    overbought, oversold = last['rsi'] > 70, last['rsi'] < 30
+    if not (overbought or oversold) or not legacy_checks(last):
+        return 0
+    return -1 if overbought else 1
+
+
+# The SignalDetector setups before they were ported to detector_rules
+
+def legacy_detector_mean_reversion(data, detector):
+    if len(data) < 3:
+        return 0
+    last, prev = data.iloc[-1], data.iloc[-2]
+    if pd.isna(last['vwap']) or pd.isna(last['rsi']) or pd.isna(last['atr']):
+        return 0
+    if abs(last['close'] - last['vwap']) < last['atr'] * 1.8:
+        return 0
+    overbought, oversold = last['rsi'] > 80, last['rsi'] < 20
+    if not (overbought or oversold) or last['volume'] / last['volume_ma'] < 1.5:
+        return 0
+    if not (detector._is_pin_bar(last) or detector._is_engulfing(last, prev) or detector._is_doji(last)):
+        return 0
+    if last['close'] < last['vwap'] and oversold:
+        return 1
+    if last['close'] > last['vwap'] and overbought:
+        return -1
+    return 0
+
+
+def legacy_detector_ema_cloud_breakout(data, detector):
+    if len(data) < 11:
+        return 0
+    last = data.iloc[-1]
+    if pd.isna(last['ema_21']) or pd.isna(last['ema_50']) or pd.isna(last['vwap']):
+        return 0
+    if last['rsi'] < 30 or last['rsi'] > 70 or last['volume'] / last['volume_ma'] < 1.5:
+        return 0
+    if last['ema_21'] > last['ema_50'] and last['close'] > last['vwap']:
+        return 1 if last['close'] > data['high'].iloc[-11:-1].max() * 1.002 else 0
+    if last['ema_21'] < last['ema_50'] and last['close'] < last['vwap']:
+        return -1 if last['close'] < data['low'].iloc[-11:-1].min() * 0.998 else 0
+    return 0
+
+
+def legacy_detector_trend_alignment(data, detector):
+    if len(data) < 3:
+        return 0
+    last, prev = data.iloc[-1], data.iloc[-2]
+    if pd.isna(last['ema_9']) or pd.isna(last['ema_21']) or pd.isna(last['ema_50']):
+        return 0
+    if last['adx'] < 19 or last['volume'] / last['volume_ma'] < 0.8:
+        return 0
+    if last['close'] > last['ema_9'] > last['ema_21'] > last['ema_50']:
+        return 1 if last['rsi'] > 50 and last['rsi'] > prev['rsi'] else 0
+    if last['close'] < last['ema_9'] < last['ema_21'] < last['ema_50']:
+        return -1 if last['rsi'] < 50 and last['rsi'] < prev['rsi'] else 0
+    return 0
+
+
+def legacy_detector_adx_rsi_momentum(data, detector):
+    if len(data) < 5:
+        return 0
+    last, prev, prev2 = data.iloc[-1], data.iloc[-2], data.iloc[-3]
+    if last['adx'] < 20 or last['adx'] < 18:
+        return 0
+    rsi, momentum = last['rsi'], abs(last['rsi'] - prev2['rsi'])
+    if momentum < 3.0:
+        return 0
+    volume_ratio = last['volume'] / last['volume_ma'] if last['volume_ma'] > 0 else 0
+    if volume_ratio < 1.2:
+        return 0
+    if rsi > 50 and rsi > prev['rsi']:
+        if last['close'] <= prev['close'] or prev['close'] <= prev2['close']:
+            return 0
+        return 0 if rsi > 70 and momentum < 4.5 else 1
+    if rsi < 50 and rsi < prev['rsi']:
+        if last['close'] >= prev['close'] or prev['close'] >= prev2['close']:
+            return 0
+        return 0 if rsi < 30 and momentum < 4.5 else -1
+    return 0
+
+
+DETECTORS = [
+    ('_detect_mean_reversion', legacy_detector_mean_reversion, detector_rules.mean_reversion_rules(1.5)),
+    ('_detect_ema_cloud_breakout', legacy_detector_ema_cloud_breakout,
+     detector_rules.ema_cloud_breakout_rules(1.5)),
+    ('_detect_trend_alignment', legacy_detector_trend_alignment, detector_rules.trend_alignment_rules(19, 0.8)),
+    ('_detect_adx_rsi_momentum_confluence', legacy_detector_adx_rsi_momentum,
+     detector_rules.adx_rsi_momentum_rules(20, 3.0, 1.2, False)),
+]
+
+
+STRATEGIES = [
+    (EMACrossover, legacy_ema_crossover),
+    (MomentumShift, legacy_momentum_shift),
+    (TrendAlignment, legacy_trend_alignment),
+    (MeanReversion, legacy_mean_reversion),
+]
+
+
+class TestCompiledRule:
+    """Expression compiler"""
+
+    def test_lagged_columns(self):
+        rule = CompiledRule("rsi[1] < 30 and rsi > rsi[1]")
+        data = {'rsi': np.array([25.0, 28.0, 35.0, 26.0])}
+
+        assert rule.evaluate(data).tolist() == [False, True, True, False]
+        assert rule.columns == ('rsi',) and rule.max_lag == 1
+
+    def test_chained_comparison_and_params(self):
+        rule = CompiledRule("a > b > c and abs(a - c) >= gap", params={'gap': 2})
+        data = {'a': np.array([3.0, 3.0]), 'b': np.array([2.0, 2.0]), 'c': np.array([1.0, 2.5])}
+
+        assert rule.evaluate(data).tolist() == [True, False]
+
+    def test_nan_comparisons_are_false(self):
+        data = {'a': np.array([np.nan, 1.0])}
+
+        assert CompiledRule("a > 0").evaluate(data).tolist() == [False, True]
+        assert CompiledRule("not a < 0").evaluate(data).tolist() == [True, True]
+
+    @pytest.mark.parametrize('expression', ["a.b > 1", "__import__('os')", "a[-1] > 0", "a if b else c"])
+    def test_unsupported_syntax_rejected(self, expression):
+        with pytest.raises(ValueError):
+            CompiledRule(expression)
+
+    def test_last_bar_matches_full_evaluation(self):
+        df = indicator_frame()
+        rule = CompiledRule("ema_9[1] <= ema_21[1] and ema_9 > ema_21")
+
+        for end in range(2, len(df), 37):
+            assert rule.evaluate_last(df.iloc[:end]) == rule.evaluate(df.iloc[:end])[-1]
+
+
+class TestStrategyRules:
+    """Direction, filters and multi-symbol matrices"""
+
+    def test_filters_and_min_bars(self):
+        rules = StrategyRules("Test", long="x > 0", short="x < 0", filters=["abs(x) > 1"], min_bars=2)
+
+        assert rules.signals({'x': np.array([5.0, 0.5, -3.0, 2.0])}).tolist() == [0, 0, -1, 1]
+        assert rules.last_signal({'x': np.array([5.0])}) is None
+
+    def test_stacked_matrix_matches_per_symbol(self):
+        frames = {'BTC': indicator_frame(seed=1), 'ETH': indicator_frame(300, seed=2),
+                  'SOL': indicator_frame(seed=3)}
+        rules = EMACrossover().rules
+
+        symbols, matrix = stack_frames(frames, rules.columns, bars=250)
+        stacked = rules.signals(matrix)
+
+        assert stacked.shape == (3, 250)
+        for row, symbol in enumerate(symbols):
+            np.testing.assert_array_equal(stacked[row, 1:], rules.signals(frames[symbol])[-249:])
+
+
+class TestPortedStrategies:
+    """The rule-based strategies decide like the if-chains they replaced"""
+
+    @pytest.mark.parametrize('strategy,legacy', STRATEGIES)
+    def test_backtest_matches_legacy_conditions(self, strategy, legacy):
+        df = indicator_frame()
+
+        expected = [0] + [legacy(df.iloc[:end]) for end in range(2, len(df) + 1)]
+        vectorized = strategy().rules.signals(df)
+
+        assert np.count_nonzero(expected) > 0
+        np.testing.assert_array_equal(vectorized, expected)
+
+    @pytest.mark.parametrize('strategy', [strategy for strategy, _ in STRATEGIES])
+    def test_live_detection_matches_backtest(self, strategy):
+        df = indicator_frame(seed=7)
+        instance = strategy()
+
+        vectorized = instance.rules.signals(df)
+        live = [direction(instance.detect_signal(df.iloc[:end], '5m', 'BTC')) for end in range(1, len(df) + 1)]
+
+        np.testing.assert_array_equal(live, vectorized)
+
+    def test_missing_column_gives_no_signal(self):
+        df = indicator_frame().drop(columns='adx')
+
+        assert TrendAlignment().detect_signal(df, '5m', 'BTC') is None
+        assert TrendAlignment().rules.missing_columns(df) == ['adx']
+
+
+class TestPortedDetectors:
+    """The SignalDetector setups decide like the if-chains they replaced"""
+
+    @pytest.mark.parametrize('method,legacy,rules', DETECTORS, ids=[d[0] for d in DETECTORS])
+    def test_live_detection_matches_legacy_conditions(self, method, legacy, rules):
+        df = indicator_frame(1500, seed=5)
+        detector = SignalDetector()
+        detect = getattr(detector, method)
+
+        expected = [legacy(df.iloc[:end], detector) for end in range(1, len(df) + 1)]
+        live = [direction(detect(df.iloc[:end], '5m', 'BTC/USD')) for end in range(1, len(df) + 1)]
+
+        assert np.count_nonzero(expected) > 0
+        assert live == expected
+        np.testing.assert_array_equal(rules.signals(df), expected)
+
+    def test_missing_column_gives_no_signal(self):
+        df = indicator_frame().drop(columns='vwap')
+
+        assert SignalDetector()._detect_mean_reversion(df, '5m', 'BTC/USD') is None
+        assert detector_rules.mean_reversion_rules(1.5).missing_columns(df) == ['vwap']
@@ -0,0 +1,204 @@
+"""
+Unit Tests for Timeframe Resampler
+Tests bar alignment, incremental updates and resampled fetching in UnifiedDataSource
+"""
+import numpy as np
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+from src.timeframe_resampler import (
+    TimeframeResampler, period_start, resample_candles, timeframe_to_timedelta
+)
+from src.unified_data_source import UnifiedDataSource, DataSourceConfig
+
+
+def candles(count, freq='1min', start='2025-01-06 00:00', seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, count))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=count, freq=freq),
+        'open': close - rng.uniform(0, 0.2, count),
+        'high': close + rng.uniform(0, 0.5, count),
+        'low': close - rng.uniform(0, 0.5, count),
+        'close': close,
+        'volume': rng.uniform(1, 10, count),
+    })
+
+
+def reference(df, rule, offset='0h'):
+    """pandas resample of the same candles"""
+    bars = df.set_index('timestamp').resample(rule, offset=offset, origin='epoch').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).dropna()
+    return bars.reset_index()
+
+
+class TestResampleCandles:
+    """Vectorized aggregation and alignment"""
+
+    def test_timeframe_parsing(self):
+        assert timeframe_to_timedelta('15m') == pd.Timedelta(minutes=15)
+        assert timeframe_to_timedelta('1w') == pd.Timedelta(days=7)
+        with pytest.raises(ValueError):
+            timeframe_to_timedelta('5x')
+
+    @pytest.mark.parametrize('timeframe,rule', [('5m', '5min'), ('15m', '15min'), ('1h', '1h'), ('4h', '4h')])
+    def test_matches_pandas_resample(self, timeframe, rule):
+        df = candles(600)
+
+        pd.testing.assert_frame_equal(resample_candles(df, timeframe), reference(df, rule), check_freq=False)
+
+    def test_session_aligned_daily_bars(self):
+        df = candles(72, freq='1h', start='2025-01-05 00:00')
+
+        bars = resample_candles(df, '1d', session_offset='22h')
+
+        assert bars['timestamp'].tolist()[:2] == [pd.Timestamp('2025-01-04 22:00'), pd.Timestamp('2025-01-05 22:00')]
+        pd.testing.assert_frame_equal(bars, reference(df, '1D', offset='22h'), check_freq=False)
+
+    def test_weekly_bars_start_monday(self):
+        assert period_start(pd.Timestamp('2025-01-09 12:00'), '1w') == pd.Timestamp('2025-01-06')
+
+    def test_tz_aware_timestamps_kept(self):
+        df = candles(120)
+        df['timestamp'] = df['timestamp'].dt.tz_localize('UTC')
+
+        bars = resample_candles(df, '1h')
+
+        assert bars['timestamp'].iloc[1] == pd.Timestamp('2025-01-06 01:00', tz='UTC')
+
+
+class TestTimeframeResampler:
+    """Incremental updates and deep history"""
+
+    def test_incremental_updates_match_full_resample(self):
+        full = candles(900)
+        resampler = TimeframeResampler('1m')
+        resampler.update_base(full.iloc[:500])
+        resampler.get('15m', 1)
+
+        # Overlapping polls, each ending on a forming bar that later closes
+        for end in range(520, 901, 20):
+            poll = full.iloc[end - 60:end].copy()
+            poll.loc[poll.index[-1], 'close'] += 0.1
+            resampler.update_base(poll)
+            resampler.update_base(full.iloc[end - 60:end])
+
+        pd.testing.assert_frame_equal(resampler.get('15m', 60), reference(full, '15min'), check_freq=False)
+
+    def test_partial_first_bar_is_not_built(self):
+        resampler = TimeframeResampler('1m')
+        resampler.update_base(candles(130, start='2025-01-06 00:10'))
+
+        assert resampler.get('1h', 2)['timestamp'].tolist() == [pd.Timestamp('2025-01-06 01:00'),
+                                                                 pd.Timestamp('2025-01-06 02:00')]
+        assert resampler.get('1h', 3) is None
+
+    def test_seeded_history_extended_by_base(self):
+        history = candles(10, freq='1h', start='2025-01-05 20:00', seed=2)
+        resampler = TimeframeResampler('1m')
+        resampler.update_base(candles(90, start='2025-01-06 05:00'))
+
+        resampler.seed('1h', history)
+        bars = resampler.get('1h', 20)
+
+        assert bars['timestamp'].iloc[-1] == pd.Timestamp('2025-01-06 06:00')
+        assert bars['timestamp'].is_monotonic_increasing and bars['timestamp'].is_unique
+        assert bars.loc[bars['timestamp'] == '2025-01-06 05:00', 'volume'].item() == pytest.approx(
+            candles(90, start='2025-01-06 05:00')['volume'].iloc[:60].sum())
+
+    def test_seeded_offset_bars_set_the_grid(self):
+        base = candles(300, start='2025-01-06 00:00')
+        history = candles(10, freq='1h', start='2025-01-05 20:30', seed=2)
+        resampler = TimeframeResampler('1m')
+        resampler.update_base(base)
+
+        resampler.seed('1h', history)
+        bars = resampler.get('1h', 15)
+
+        assert (bars['timestamp'].dt.minute == 30).all()
+        assert bars['timestamp'].is_monotonic_increasing and bars['timestamp'].is_unique
+        assert bars['timestamp'].iloc[-1] == pd.Timestamp('2025-01-06 04:30')
+        built = bars.set_index('timestamp').loc['2025-01-06 01:30':'2025-01-06 03:30']
+        expected = reference(base, '1h', offset='30min').set_index('timestamp').loc['2025-01-06 01:30':'2025-01-06 03:30']
+        pd.testing.assert_frame_equal(built, expected, check_freq=False)
+
+    def test_configured_bar_offset(self):
+        df = candles(600)
+        resampler = TimeframeResampler('1m', bar_offsets={'1h': '30min'})
+        resampler.update_base(df)
+
+        bars = resampler.get('1h', 10)
+
+        pd.testing.assert_frame_equal(bars, reference(df, '1h', offset='30min').iloc[1:].reset_index(drop=True),
+                                      check_freq=False)
+
+    def test_forming_bar_kept_current_after_base_trim(self):
+        full = candles(600)
+        resampler = TimeframeResampler('1m', max_base_bars=100)
+        resampler.update_base(full.iloc[:100])
+        resampler.get('4h', 1)
+
+        for end in range(120, 601, 20):
+            resampler.update_base(full.iloc[end - 40:end])
+
+        pd.testing.assert_frame_equal(resampler.get('4h', 3), reference(full, '4h'), check_freq=False)
+
+    def test_seeded_forming_weekly_bar_keeps_updating(self):
+        full = candles(288, freq='15min', start='2025-01-06 00:00')
+        resampler = TimeframeResampler('15m')
+        resampler.update_base(full.iloc[100:200])
+        resampler.seed('1w', resample_candles(full.iloc[:200], '1w'))
+
+        resampler.update_base(full.iloc[150:288])
+        week = resampler.get('1w', 1).iloc[0]
+
+        expected = resample_candles(full, '1w').iloc[0]
+        assert week['timestamp'] == pd.Timestamp('2025-01-06')
+        for column in ('open', 'high', 'low', 'close', 'volume'):
+            assert week[column] == pytest.approx(expected[column])
+
+    def test_covers_only_multiples(self):
+        resampler = TimeframeResampler('15m')
+        assert resampler.covers('1h') and resampler.covers('1d')
+        assert not resampler.covers('15m') and not resampler.covers('5m')
+
+
+class TestUnifiedDataSource:
+    """One provider request per scan cycle"""
+
+    def source(self):
+        config = DataSourceConfig(fallback_sources=[], cache_enabled=False, resample_timeframes=True,
+                                  base_timeframes={'BTC': '15m'})
+        return UnifiedDataSource(config)
+
+    def test_one_base_fetch_per_cycle(self):
+        base = candles(1000, freq='15min', start='2024-12-27 00:00')
+        source = self.source()
+
+        with patch.object(source, '_fetch_from_source', return_value=base) as fetch:
+            for timeframe in ['15m', '1h', '4h']:
+                df, _ = source.get_latest_candles('BTC', timeframe, limit=50)
+                assert len(df) == 50
+
+        assert fetch.call_count == 1
+        assert fetch.call_args[0][2] == '15m'
+
+    def test_deep_history_fetched_directly_once(self):
+        base = candles(1000, freq='15min', start='2024-12-27 00:00')
+        daily = candles(500, freq='1D', start='2023-08-24')
+        source = self.source()
+
+        def fetch(provider, symbol, timeframe, limit):
+            return daily if timeframe == '1d' else base
+
+        with patch.object(source, '_fetch_from_source', side_effect=fetch) as mocked:
+            first, _ = source.get_latest_candles('BTC', '1d', limit=500)
+            source._base_fetched_at.clear()
+            second, _ = source.get_latest_candles('BTC', '1d', limit=500)
+
+        requested = [call[0][2] for call in mocked.call_args_list]
+        assert requested.count('1d') == 1
+        assert len(first) == len(second) == 500
+        assert second['timestamp'].iloc[-1] == period_start(base['timestamp'].iloc[-1], '1d')
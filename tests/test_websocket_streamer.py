@@ -0,0 +1,401 @@
+"""
+Unit Tests for WebSocket Streamer
+Tests kline decoding, ring buffer writes, trade-built bars and parse throughput
+"""
+import json
+import pandas as pd
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from src import virtual_clock, websocket_streamer
+from src.virtual_clock import VirtualClock
+from src.websocket_streamer import (AMENDED, LATE, NEW_HIGH, NEW_LOW, BinanceWebSocketStreamer,
+                                    KlineRingBuffer, TradeBarAccumulator, parse_agg_trade, parse_kline)
+
+MINUTE = 60_000
+T0 = 1_700_000_100_000  # A 5-minute boundary
+
+
+def kline_message(open_time=1_700_000_000_000, close='42000.5', closed=False, timeframe='1m'):
+    return json.dumps({
+        'stream': f'btcusdt@kline_{timeframe}',
+        'data': {
+            'e': 'kline', 'E': open_time + 1000, 's': 'BTCUSDT',
+            'k': {'t': open_time, 'i': timeframe, 'o': '42000.0', 'h': '42010.0',
+                  'l': '41990.0', 'c': close, 'v': '3.5', 'x': closed}
+        }
+    })
+
+
+def trade_message(trade_time, price, quantity=1.0):
+    return json.dumps({
+        'stream': 'btcusdt@aggTrade',
+        'data': {'e': 'aggTrade', 'E': trade_time + 5, 's': 'BTCUSDT', 'a': 1, 'p': str(price),
+                 'q': str(quantity), 'f': 1, 'l': 1, 'T': trade_time, 'm': False}
+    })
+
+
+def candles(count, end):
+    """1m candles opening before ``end``"""
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime([end - (count - i) * MINUTE for i in range(count)], unit='ms'),
+        'open': 100.0, 'high': 101.0, 'low': 99.0,
+        'close': [100.0 + (i % 7) * 0.1 for i in range(count)],
+        'volume': 10.0,
+    })
+
+
+def warm_up(streamer, price=100.0):
+    """Trade just before T0 so the partial first bar is behind the bars under test"""
+    streamer._on_message(None, trade_message(T0 - 10, price))
+
+
+class TestParseKline:
+    """Message decoding"""
+
+    def test_parses_kline_with_integer_timestamps(self):
+        kline = parse_kline(kline_message())
+
+        assert kline == ('1m', 1_700_000_000_000, 42000.0, 42010.0, 41990.0, 42000.5, 3.5, False,
+                         1_700_000_001_000)
+
+    def test_accepts_bytes(self):
+        assert parse_kline(kline_message().encode())[5] == 42000.5
+
+    def test_ignores_other_events(self):
+        assert parse_kline(json.dumps({'data': {'e': 'trade'}})) is None
+        assert parse_kline(json.dumps({'result': None, 'id': 1})) is None
+
+
+class TestKlineRingBuffer:
+    """Preallocated candle buffer"""
+
+    def test_updates_forming_candle_in_place(self):
+        buffer = KlineRingBuffer(capacity=3)
+        buffer.write(1000, 1.0, 2.0, 0.5, 1.5, 10.0, False)
+        buffer.write(1000, 1.0, 2.5, 0.5, 2.2, 12.0, True)
+
+        assert len(buffer) == 1
+        assert buffer.latest()['close'] == 2.2
+        assert buffer.latest()['is_closed'] is True
+
+    def test_wraps_around_oldest_first(self):
+        buffer = KlineRingBuffer(capacity=3)
+        for i in range(5):
+            buffer.write(i * 60_000, 1.0, 1.0, 1.0, float(i), 1.0, True)
+
+        df = buffer.to_frame()
+
+        assert df['close'].tolist() == [2.0, 3.0, 4.0]
+        assert df['timestamp'].iloc[0] == pd.Timestamp(120_000, unit='ms')
+
+
+class TestStreamer:
+    """BinanceWebSocketStreamer message handling"""
+
+    def test_message_writes_buffer_and_calls_back(self):
+        callback = Mock()
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m', '5m'], callback)
+
+        streamer._on_message(None, kline_message(close='42001.0', closed=True))
+
+        df = streamer.get_buffer_data('1m')
+        assert df['close'].tolist() == [42001.0]
+        assert streamer.get_buffer_data('5m').empty
+        timeframe, candle = callback.call_args[0]
+        assert timeframe == '1m'
+        assert candle['timestamp'] == pd.Timestamp(1_700_000_000_000, unit='ms')
+        assert candle['is_closed'] is True
+
+    def test_usd_symbol_streams_usdt_pair(self):
+        streamer = BinanceWebSocketStreamer('BTC/USD', ['1m'])
+
+        assert streamer.ws_url.endswith('streams=btcusdt@kline_1m')
+        assert websocket_streamer.binance_stream_symbol('BTCUSDT') == 'btcusdt'
+
+    def test_seed_loads_history_as_closed_bars(self):
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'])
+        history = candles(count=3, end=T0)
+
+        streamer.seed('1m', history)
+        streamer._on_message(None, kline_message(open_time=T0, close='42001.0'))
+
+        df = streamer.get_buffer_data('1m')
+        assert df['close'].tolist() == history['close'].tolist() + [42001.0]
+        assert df['is_closed'].tolist() == [True, True, True, False]
+
+    def test_bad_message_is_logged_not_raised(self):
+        streamer = BinanceWebSocketStreamer('BTCUSDT', ['1m'])
+        streamer._on_message(None, 'not json')
+
+        assert streamer.messages_processed == 0
+
+    def test_benchmark_fast_path_beats_legacy(self):
+        results = websocket_streamer.benchmark(messages=2000)
+
+        fast = results['orjson' if websocket_streamer.ORJSON_AVAILABLE else 'json']
+        assert fast > results['legacy']
+
+
+class TestTradeBarAccumulator:
+    """Bars built trade by trade"""
+
+    def test_builds_ohlcv_and_flags_extremes(self):
+        acc = TradeBarAccumulator(MINUTE)
+
+        assert acc.add(T0 + 10, 100.0, 1.0) == NEW_HIGH | NEW_LOW
+        assert acc.add(T0 + 20, 101.0, 2.0) == NEW_HIGH
+        assert acc.add(T0 + 30, 100.5, 1.0) == 0
+        assert acc.add(T0 + 40, 99.0, 0.5) == NEW_LOW
+
+        assert acc.bar() == (T0, 100.0, 101.0, 99.0, 99.0, 4.5)
+        assert acc.close_time == T0 + MINUTE
+
+    def test_late_trade_moves_close_only_if_newest(self):
+        acc = TradeBarAccumulator(MINUTE)
+        acc.add(T0 + 10, 100.0, 1.0)
+        acc.add(T0 + 50_000, 101.0, 1.0)
+        acc.roll(T0 + MINUTE)
+        acc.add(T0 + MINUTE + 5, 102.0, 1.0)
+
+        assert acc.add(T0 + 40_000, 99.0, 1.0) == AMENDED
+        assert acc.prev == [T0, 100.0, 101.0, 99.0, 101.0, 3.0]
+        assert acc.add(T0 + 59_000, 100.5, 1.0) == AMENDED
+        assert acc.prev == [T0, 100.0, 101.0, 99.0, 100.5, 4.0]
+
+    def test_roll_closes_at_boundary_with_flat_gap_bars(self):
+        acc = TradeBarAccumulator(MINUTE)
+        acc.add(T0 + 10, 100.0, 1.0)
+
+        assert acc.roll(T0 + MINUTE - 1) == []
+        closed = acc.roll(T0 + 3 * MINUTE)
+
+        assert [bar[0] for bar in closed] == [T0, T0 + MINUTE, T0 + 2 * MINUTE]
+        assert closed[1] == (T0 + MINUTE, 100.0, 100.0, 100.0, 100.0, 0.0)
+        assert acc.add(T0 + 3 * MINUTE - 5, 100.2, 1.0) == AMENDED
+        assert acc.prev == [T0 + 2 * MINUTE, 100.0, 100.2, 100.0, 100.2, 1.0]
+        assert acc.add(T0 + 2 * MINUTE - 5, 100.2, 1.0) == LATE
+        assert acc.add(T0 + 3 * MINUTE, 99.0, 1.0) == NEW_HIGH | NEW_LOW
+        assert acc.bar() == (T0 + 3 * MINUTE, 99.0, 99.0, 99.0, 99.0, 1.0)
+
+    def test_only_first_bar_after_reset_is_partial(self):
+        acc = TradeBarAccumulator(MINUTE)
+        acc.add(T0 + 10, 100.0, 1.0)
+        acc.roll(T0 + 2 * MINUTE)
+
+        assert acc.prev_partial is False and acc.partial is False
+        acc.reset()
+        acc.add(T0 + 2 * MINUTE + 10, 100.0, 1.0)
+        acc.roll(T0 + 3 * MINUTE)
+        assert acc.prev_partial is True
+
+    def test_weekly_bars_open_on_monday(self):
+        acc = TradeBarAccumulator(7 * 86_400_000, websocket_streamer._WEEK_ORIGIN_MS)
+        acc.add(T0, 100.0, 1.0)
+
+        assert pd.Timestamp(acc.open_time, unit='ms').day_name() == 'Monday'
+
+
+class TestTradeMode:
+    """aggTrade ingestion, bar-clock closes and kline validation"""
+
+    def test_parse_agg_trade(self):
+        assert parse_agg_trade(trade_message(T0, 42000.5, 0.25)) == (T0, 42000.5, 0.25, T0 + 5)
+        assert parse_agg_trade(kline_message()) is None
+
+    def test_streams_and_mode(self):
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m', '5m'], mode='trade')
+
+        assert streamer.ws_url.endswith('streams=btcusdt@aggTrade/btcusdt@kline_1m/btcusdt@kline_5m')
+        with pytest.raises(ValueError):
+            BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='book')
+
+    def test_closes_bars_at_boundary_and_pushes_extremes(self):
+        candles, prices = [], []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m', '5m'], mode='trade',
+                                            on_candle_callback=lambda tf, c: candles.append((tf, c)),
+                                            on_price_callback=prices.append)
+        clock = VirtualClock(T0 / 1000)
+        with virtual_clock.use_clock(clock):
+            warm_up(streamer, 98.0)
+            for offset, price in ((100, 100.0), (200, 101.0), (300, 100.5), (400, 99.0)):
+                streamer._on_message(None, trade_message(T0 + offset, price))
+            assert streamer.get_buffer_data('1m')['close'].tolist() == [98.0, 99.0]
+            assert streamer.close_due_bars() == 0
+
+            clock.advance_to((T0 + MINUTE + 499) / 1000)
+            assert streamer.close_due_bars() == 0  # Still inside the grace period
+            clock.advance_to((T0 + MINUTE + 500) / 1000)
+            assert streamer.close_due_bars() == 1
+
+        assert prices == [98.0, 100.0, 101.0, 99.0]
+        assert len(candles) == 1  # The partial warm-up bars are not emitted
+        timeframe, candle = candles[0]
+        assert timeframe == '1m' and candle['is_closed'] and 'is_correction' not in candle
+        assert (candle['open'], candle['high'], candle['low'], candle['close'], candle['volume']) == \
+            (100.0, 101.0, 99.0, 99.0, 4.0)
+        assert streamer.get_buffer_data('5m')['high'].tolist() == [98.0, 101.0]
+        assert streamer.get_stats()['partial_bars'] == 2
+
+    def test_kline_validation_amends_mismatched_bars(self):
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade')
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            warm_up(streamer, 42000.0)
+            streamer._on_message(None, trade_message(T0 + 100, 42000.0, 1.5))
+            streamer._on_message(None, trade_message(T0 + 200, 42010.0, 1.0))
+            streamer._on_message(None, trade_message(T0 + 300, 41990.0, 0.5))
+            streamer._on_message(None, trade_message(T0 + 400, 42000.5, 0.5))
+            streamer._on_message(None, trade_message(T0 + MINUTE + 1, 42001.0))
+            streamer._on_message(None, trade_message(T0 + MINUTE + 2, 42001.5))
+
+        streamer._on_message(None, kline_message(T0, close='42000.5', closed=True))
+        assert streamer.validation['compared'] == 1
+        assert streamer.validation['mismatched'] == 0
+
+        streamer._on_message(None, kline_message(T0 + MINUTE, close='42002.0', closed=True))
+        with virtual_clock.use_clock(VirtualClock((T0 + 2 * MINUTE + 500) / 1000)):
+            streamer.close_due_bars()  # Kline arrived first; the built bar closes now
+        assert streamer.validation['mismatched'] == 1
+        assert streamer.validation['amended'] == 1
+        assert streamer.get_buffer_data('1m')['close'].tolist() == [42000.0, 42000.5, 42002.0]
+        assert streamer.get_stats()['trades_processed'] == 7
+
+    def test_late_trade_counted_not_applied(self):
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade', validate_klines=False)
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            streamer._on_message(None, trade_message(T0 + MINUTE + 10, 100.0))
+            streamer._on_message(None, trade_message(T0 + MINUTE - 10, 90.0))
+
+        assert streamer.late_trades == 1
+        assert streamer.get_buffer_data('1m')['low'].tolist() == [100.0]
+
+    def test_trade_past_boundary_closes_without_waiting(self):
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade', validate_klines=False,
+                                            on_candle_callback=lambda tf, c: candles.append(c))
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            warm_up(streamer)
+            streamer._on_message(None, trade_message(T0 + 100, 100.0))
+            streamer._on_message(None, trade_message(T0 + MINUTE, 100.5))
+
+        assert [c['close'] for c in candles] == [100.0]
+
+    def test_trade_inside_grace_period_lands_in_its_bar(self):
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade', validate_klines=False,
+                                            on_candle_callback=lambda tf, c: candles.append(c))
+        clock = VirtualClock(T0 / 1000)
+        with virtual_clock.use_clock(clock):
+            warm_up(streamer)
+            streamer._on_message(None, trade_message(T0 + 100, 100.0))
+            clock.advance_to((T0 + MINUTE + 300) / 1000)
+            streamer.close_due_bars()
+            streamer._on_message(None, trade_message(T0 + MINUTE - 5, 102.0))  # Published late
+            clock.advance_to((T0 + MINUTE + 500) / 1000)
+            streamer.close_due_bars()
+
+        assert [(c['high'], c['close'], c['volume']) for c in candles] == [(102.0, 102.0, 2.0)]
+
+    def test_late_trade_after_close_re_emits_correction(self):
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade', validate_klines=False,
+                                            on_candle_callback=lambda tf, c: candles.append(c))
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            warm_up(streamer)
+            streamer._on_message(None, trade_message(T0 + 100, 100.0))
+            streamer._on_message(None, trade_message(T0 + MINUTE + 1, 100.5))
+            streamer._on_message(None, trade_message(T0 + MINUTE - 5, 103.0, 0.5))
+
+        assert len(candles) == 2
+        correction = candles[1]
+        assert correction['is_correction'] and correction['timestamp'] == candles[0]['timestamp']
+        assert (correction['high'], correction['close'], correction['volume']) == (103.0, 103.0, 1.5)
+        assert streamer.get_buffer_data('1m')['high'].tolist() == [100.0, 103.0, 100.5]
+        assert streamer.get_buffer_data('1m')['is_closed'].tolist() == [False, True, False]
+        assert streamer.bars_corrected == 1 and streamer.late_trades == 0
+
+    def test_no_correction_once_kline_settled_the_bar(self):
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade',
+                                            on_candle_callback=lambda tf, c: candles.append(c))
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            warm_up(streamer, 42000.0)
+            streamer._on_message(None, trade_message(T0 + 100, 42000.0))
+            streamer._on_message(None, trade_message(T0 + MINUTE + 1, 42001.0))
+            streamer._on_message(None, kline_message(T0, close='42000.0', closed=True))
+            streamer._on_message(None, trade_message(T0 + MINUTE - 5, 42005.0))
+
+        assert len(candles) == 1
+        assert streamer.bars_corrected == 0
+
+    def test_partial_first_bar_is_replaced_by_its_kline(self):
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade',
+                                            on_candle_callback=lambda tf, c: candles.append(c))
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            streamer._on_message(None, trade_message(T0 + 30_000, 42005.0))  # Joined mid-bar
+            streamer._on_message(None, trade_message(T0 + MINUTE + 1, 42001.0))
+            assert candles == []
+
+            streamer._on_message(None, kline_message(T0, close='42000.5', closed=True))
+
+        assert len(candles) == 1
+        assert (candles[0]['open'], candles[0]['close'], candles[0]['volume']) == (42000.0, 42000.5, 3.5)
+        row = streamer.get_buffer_data('1m').iloc[0]
+        assert (row['close'], row['is_closed']) == (42000.5, True)
+        assert streamer.validation['compared'] == 0
+
+    def test_reconnect_suppresses_the_next_partial_bar(self):
+        candles = []
+        streamer = BinanceWebSocketStreamer('BTC/USDT', ['1m'], mode='trade', validate_klines=False,
+                                            on_candle_callback=lambda tf, c: candles.append(c))
+        with virtual_clock.use_clock(VirtualClock(T0 / 1000)):
+            warm_up(streamer)
+            streamer._on_message(None, trade_message(T0 + 100, 100.0))
+            streamer._on_message(None, trade_message(T0 + MINUTE + 1, 100.5))
+            streamer._on_open(None)
+            streamer._on_message(None, trade_message(T0 + 3 * MINUTE + 20_000, 101.0))
+            streamer._on_message(None, trade_message(T0 + 4 * MINUTE + 1, 101.5))
+
+        assert [c['timestamp'] for c in candles] == [pd.Timestamp(T0, unit='ms')]
+        assert streamer.partial_bars == 2
+
+
+class TestMainStreaming:
+    """main.py scans closed streamed bars from the streamer's buffers"""
+
+    def test_closed_bar_scanned_with_hybrid_client(self):
+        from main import BTCScalpingScanner
+        from src.hybrid_data_client import HybridDataClient
+        from src.indicator_calculator import IndicatorCalculator
+
+        scanner = Mock(spec=BTCScalpingScanner)
+        scanner.market_client = Mock(spec=HybridDataClient)  # No update_buffer/get_buffer_data
+        scanner.indicator_calculator = IndicatorCalculator()
+        scanner.config = SimpleNamespace(
+            exchange=SimpleNamespace(symbol='BTC/USD'),
+            indicators=SimpleNamespace(ema_fast=9, ema_slow=21, ema_trend=50, atr_period=14,
+                                       rsi_period=6, volume_ma_period=20)
+        )
+        scanner.health_monitor = Mock()
+        scanner.data_validator = Mock(validate_market_data=Mock(return_value=(True, [])))
+        scanner.signal_detector = Mock(detect_signals=Mock(return_value=None))
+        streamer = BinanceWebSocketStreamer(
+            'BTC/USD', ['1m'], mode='trade', validate_klines=False,
+            on_candle_callback=lambda tf, candle: BTCScalpingScanner._on_candle_update(scanner, tf, candle)
+        )
+        scanner.ws_streamer = streamer
+        streamer.seed('1m', candles(count=300, end=T0))
+
+        warm_up(streamer)
+        streamer._on_message(None, trade_message(T0 + 10, 105.0))
+        streamer._on_message(None, trade_message(T0 + MINUTE + 10, 106.0))
+
+        scanner.health_monitor.record_error.assert_not_called()
+        scanner.signal_detector.detect_signals.assert_called_once()
+        data, timeframe = scanner.signal_detector.detect_signals.call_args[0]
+        assert timeframe == '1m'
+        assert data['timestamp'].iloc[-1] == pd.Timestamp(T0, unit='ms')
+        assert data['close'].iloc[-1] == 105.0
+        assert len(data) > 250
@@ -18,6 +18,7 @@ from src.indicator_calculator import IndicatorCalculator
 from src.alerter import TelegramAlerter
 from src.trade_tracker import TradeTracker
 from src.excel_reporter import ExcelReporter
+from src.scan_engine import ScanEngine
 
 from us30_scanner.us30_scalp_detector import US30ScalpDetector
 
@@ -143,13 +144,13 @@ def main():
     
     logger.info(f"Successfully connected to {config['exchange']['name']}")
     
-    # Fetch initial data
-    logger.info("Fetching initial data...")
-    candle_data = {}
-    for timeframe in config['exchange']['timeframes']:
+    # Scan pipeline stages
+    def fetch_candles(timeframe):
         # Disable freshness validation for US30 - yfinance data may be delayed
-        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
-        
+        candles, _ = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
+        return candles
+    
+    def add_indicators(candles):
         # Calculate indicators
         candles['ema_8'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_fast'])
         candles['ema_21'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_mid'])
@@ -170,8 +171,83 @@ def main():
         )
         candles['stoch_k'] = stoch_k
         candles['stoch_d'] = stoch_d
+        return candles
+    
+    def detect_signal(ctx):
+        return signal_detector.detect_signals(ctx.candles, ctx.timeframe, symbol="US30")
+    
+    def log_scan(ctx):
+        # Log scan result to Excel
+        candles, timeframe, signal = ctx.candles, ctx.timeframe, ctx.signal
+        last_row = candles.iloc[-1]
+        # Determine scanner name based on strategy
+        scanner_name = 'US30-Scalp'
+        if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
+            scanner_name = 'US30-Scalp-H4HVG'
+        
+        scan_data = {
+            'timestamp': datetime.now(),
+            'scanner': scanner_name,
+            'symbol': config['exchange']['symbol'],
+            'timeframe': timeframe,
+            'price': last_row['close'],
+            'volume': last_row['volume'],
+            'indicators': {
+                'ema_8': last_row.get('ema_8', None),
+                'ema_21': last_row.get('ema_21', None),
+                'ema_50': last_row.get('ema_50', None),
+                'rsi': last_row.get('rsi', None),
+                'atr': last_row.get('atr', None),
+                'volume_ma': last_row.get('volume_ma', None),
+                'vwap': last_row.get('vwap', None),
+                'stoch_k': last_row.get('stoch_k', None),
+                'stoch_d': last_row.get('stoch_d', None)
+            },
+            'signal_detected': signal is not None,
+            'signal_type': signal.signal_type if signal else None,
+            'signal_details': {
+                'entry_price': signal.entry_price,
+                'stop_loss': signal.stop_loss,
+                'take_profit': signal.take_profit,
+                'risk_reward': signal.risk_reward,
+                'strategy': getattr(signal, 'strategy', 'N/A'),
+                'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
+                'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
+                'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
+            } if signal else {}
+        }
+        excel_reporter.log_scan_result(scan_data)
+    
+    def send_alert(ctx):
+        signal, timeframe = ctx.signal, ctx.timeframe
+        
+        logger.info(f"🚨 {signal.signal_type} SIGNAL on {timeframe}!")
+        logger.info(f"Strategy: {signal.strategy}")
+        logger.info(f"Entry: {signal.entry_price:.2f}, SL: {signal.stop_loss:.2f}, TP: {signal.take_profit:.2f}")
+        logger.info(f"R:R = {signal.risk_reward:.2f}")
+        
+        # Send alert
+        if alerter:
+            alerter.send_signal_alert(signal)
         
-        candle_data[timeframe] = candles
+        # Track trade
+        trade_tracker.add_trade(signal)
+    
+    scan_engine = ScanEngine(
+        config['exchange']['timeframes'],
+        fetch=fetch_candles,
+        indicators=add_indicators,
+        detect=detect_signal,
+        report=log_scan if excel_reporter else None,
+        alert=send_alert,
+        name="us30-scalp"
+    )
+    
+    # Fetch initial data
+    logger.info("Fetching initial candlestick data...")
+    scan_engine.prepare_all()
+    candle_data = scan_engine.candle_data
+    for timeframe in candle_data:
         logger.info(f"Loaded {timeframe} data with indicators")
     
     # Send startup notification
@@ -200,92 +276,8 @@ def main():
                 time.sleep(300)  # Check every 5 minutes
                 continue
             
-            # Update data for each timeframe
-            for timeframe in config['exchange']['timeframes']:
-                try:
-                    # Fetch latest candles (disable freshness validation - yfinance data may be delayed)
-                    candles, is_fresh = market_client.get_latest_candles(timeframe, count=500, validate_freshness=False)
-                    
-                    # Calculate indicators
-                    candles['ema_8'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_fast'])
-                    candles['ema_21'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_mid'])
-                    candles['ema_50'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_slow'])
-                    candles['vwap'] = indicator_calc.calculate_vwap(candles)
-                    candles['atr'] = indicator_calc.calculate_atr(candles, config['indicators']['atr_period'])
-                    candles['rsi'] = indicator_calc.calculate_rsi(candles, config['indicators']['rsi_period'])
-                    candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, config['indicators']['volume_ma_period'])
-                    
-                    # Calculate Stochastic
-                    stoch_k, stoch_d = indicator_calc.calculate_stochastic(
-                        candles,
-                        config['indicators']['stochastic_k'],
-                        config['indicators']['stochastic_d'],
-                        config['indicators']['stochastic_smooth']
-                    )
-                    candles['stoch_k'] = stoch_k
-                    candles['stoch_d'] = stoch_d
-                    
-                    candle_data[timeframe] = candles
-                    
-                    # Detect signals
-                    signal = signal_detector.detect_signals(candles, timeframe, symbol="US30")
-                    
-                    # Log scan result to Excel
-                    if excel_reporter and not candles.empty:
-                        last_row = candles.iloc[-1]
-                        # Determine scanner name based on strategy
-                        scanner_name = 'US30-Scalp'
-                        if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
-                            scanner_name = 'US30-Scalp-H4HVG'
-                        
-                        scan_data = {
-                            'timestamp': datetime.now(),
-                            'scanner': scanner_name,
-                            'symbol': config['exchange']['symbol'],
-                            'timeframe': timeframe,
-                            'price': last_row['close'],
-                            'volume': last_row['volume'],
-                            'indicators': {
-                                'ema_8': last_row.get('ema_8', None),
-                                'ema_21': last_row.get('ema_21', None),
-                                'ema_50': last_row.get('ema_50', None),
-                                'rsi': last_row.get('rsi', None),
-                                'atr': last_row.get('atr', None),
-                                'volume_ma': last_row.get('volume_ma', None),
-                                'vwap': last_row.get('vwap', None),
-                                'stoch_k': last_row.get('stoch_k', None),
-                                'stoch_d': last_row.get('stoch_d', None)
-                            },
-                            'signal_detected': signal is not None,
-                            'signal_type': signal.signal_type if signal else None,
-                            'signal_details': {
-                                'entry_price': signal.entry_price,
-                                'stop_loss': signal.stop_loss,
-                                'take_profit': signal.take_profit,
-                                'risk_reward': signal.risk_reward,
-                                'strategy': getattr(signal, 'strategy', 'N/A'),
-                                'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
-                                'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
-                                'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
-                            } if signal else {}
-                        }
-                        excel_reporter.log_scan_result(scan_data)
-                    
-                    if signal:
-                        logger.info(f"🚨 {signal.signal_type} SIGNAL on {timeframe}!")
-                        logger.info(f"Strategy: {signal.strategy}")
-                        logger.info(f"Entry: {signal.entry_price:.2f}, SL: {signal.stop_loss:.2f}, TP: {signal.take_profit:.2f}")
-                        logger.info(f"R:R = {signal.risk_reward:.2f}")
-                        
-                        # Send alert
-                        if alerter:
-                            alerter.send_signal_alert(signal)
-                        
-                        # Track trade
-                        trade_tracker.add_trade(signal)
-                
-                except Exception as e:
-                    logger.error(f"Error processing {timeframe}: {e}")
+            # Fetch, compute indicators and detect across timeframes
+            scan_engine.run_cycle()
             
             # Check for trade updates
             try:
@@ -329,6 +321,8 @@ def main():
         logger.info("Scanner stopped by user")
         logger.info("=" * 60)
         
+        scan_engine.shutdown()
+        
         # Stop Excel reporter
         if excel_reporter:
             excel_reporter.stop()
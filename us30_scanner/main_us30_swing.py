@@ -18,6 +18,7 @@ from src.indicator_calculator import IndicatorCalculator
 from src.alerter import TelegramAlerter
 from src.trade_tracker import TradeTracker
 from src.excel_reporter import ExcelReporter
+from src.scan_engine import ScanEngine
 
 from us30_scanner.us30_swing_detector import US30SwingDetector
 
@@ -127,12 +128,12 @@ def main():
     
     logger.info(f"Successfully connected to {config['exchange']['name']}")
     
-    # Fetch initial data
-    logger.info("Fetching initial data...")
-    candle_data = {}
-    for timeframe in config['exchange']['timeframes']:
-        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
-        
+    # Scan pipeline stages
+    def fetch_candles(timeframe):
+        candles, _ = market_client.get_latest_candles(timeframe, count=500)
+        return candles
+    
+    def add_indicators(candles):
         # Calculate indicators
         candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
         candles['ema_21'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_fast'])
@@ -164,8 +165,101 @@ def main():
         candles['macd'] = macd
         candles['macd_signal'] = macd_signal
         candles['macd_histogram'] = macd_histogram
+        return candles
+    
+    def detect_signal(ctx):
+        return signal_detector.detect_signals(ctx.candles, ctx.timeframe, symbol="US30")
+    
+    def log_scan(ctx):
+        candles, timeframe, signal = ctx.candles, ctx.timeframe, ctx.signal
+        
+        # Calculate volume ratio for logging
+        last_row = candles.iloc[-1]
+        volume_ratio = last_row['volume'] / last_row['volume_ma'] if 'volume_ma' in last_row.index else 0
+        
+        # Log scan result to Excel
+        if excel_reporter:
+            # Determine scanner name based on strategy
+            scanner_name = 'US30-Swing'
+            if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
+                scanner_name = 'US30-Swing-H4HVG'
+            
+            scan_data = {
+                'timestamp': datetime.now(),
+                'scanner': scanner_name,
+                'symbol': config['exchange']['symbol'],
+                'timeframe': timeframe,
+                'price': last_row['close'],
+                'volume': last_row['volume'],
+                'indicators': {
+                    'ema_9': last_row.get('ema_9', None),
+                    'ema_21': last_row.get('ema_21', None),
+                    'ema_50': last_row.get('ema_50', None),
+                    'ema_100': last_row.get('ema_100', None),
+                    'ema_200': last_row.get('ema_200', None),
+                    'rsi': last_row.get('rsi', None),
+                    'atr': last_row.get('atr', None),
+                    'volume_ma': last_row.get('volume_ma', None),
+                    'vwap': last_row.get('vwap', None),
+                    'stoch_k': last_row.get('stoch_k', None),
+                    'stoch_d': last_row.get('stoch_d', None)
+                },
+                'signal_detected': signal is not None,
+                'signal_type': signal.signal_type if signal else None,
+                'signal_details': {
+                    'entry_price': signal.entry_price,
+                    'stop_loss': signal.stop_loss,
+                    'take_profit': signal.take_profit,
+                    'risk_reward': signal.risk_reward,
+                    'strategy': getattr(signal, 'strategy', 'EMA Crossover'),
+                    'confidence': getattr(signal, 'confidence', None),
+                    'market_bias': getattr(signal, 'market_bias', None),
+                    'trend_direction': getattr(signal, 'trend_direction', None),
+                    'swing_points': getattr(signal, 'swing_points', None),
+                    'pullback_depth': getattr(signal, 'pullback_depth', None),
+                    'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
+                    'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
+                    'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
+                } if signal else {}
+            }
+            excel_reporter.log_scan_result(scan_data)
+        
+        # Log scan completion with detailed indicators
+        logger.info(f"[{timeframe}] Scan complete - Price: ${last_row['close']:.2f}")
+        logger.info(f"[{timeframe}] Trend: EMA9=${last_row.get('ema_9', 0):.2f}, EMA21=${last_row.get('ema_21', 0):.2f}, EMA50=${last_row.get('ema_50', 0):.2f}")
+        logger.info(f"[{timeframe}] Volume: {last_row['volume']:,.0f} ({volume_ratio:.2f}x avg)")
+        logger.info(f"[{timeframe}] RSI: {last_row.get('rsi', 0):.1f}")
+    
+    def send_alert(ctx):
+        signal, timeframe = ctx.signal, ctx.timeframe
+        
+        logger.info(f"🚨 {signal.signal_type} SIGNAL on {timeframe}!")
+        logger.info(f"Strategy: {signal.strategy}")
+        logger.info(f"Entry: {signal.entry_price:.2f}, SL: {signal.stop_loss:.2f}, TP: {signal.take_profit:.2f}")
+        logger.info(f"R:R = {signal.risk_reward:.2f}")
         
-        candle_data[timeframe] = candles
+        # Send alert
+        if alerter:
+            alerter.send_signal_alert(signal)
+        
+        # Track trade
+        trade_tracker.add_trade(signal)
+    
+    scan_engine = ScanEngine(
+        config['exchange']['timeframes'],
+        fetch=fetch_candles,
+        indicators=add_indicators,
+        detect=detect_signal,
+        report=log_scan,
+        alert=send_alert,
+        name="us30-swing"
+    )
+    
+    # Fetch initial data
+    logger.info("Fetching initial data...")
+    scan_engine.prepare_all()
+    candle_data = scan_engine.candle_data
+    for timeframe in candle_data:
         logger.info(f"Loaded {timeframe} data with indicators")
     
     # Send startup notification
@@ -186,137 +280,13 @@ def main():
     
     logger.info("Scanner is now running. Press Ctrl+C to stop.")
     
-    # Track last check times to avoid duplicate signals
-    last_check_times = {tf: None for tf in config['exchange']['timeframes']}
     last_heartbeat = time.time()
     heartbeat_interval = 5400  # 90 minutes in seconds
     
     try:
         while True:
-            # Update data for each timeframe
-            for timeframe in config['exchange']['timeframes']:
-                try:
-                    # Always scan on each polling interval (let duplicate detection handle filtering)
-                    current_time = datetime.now()
-                    
-                    # Only check if we need to fetch new data (avoid excessive API calls)
-                    if True:
-                        # Fetch latest candles
-                        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
-                        
-                        # Calculate indicators
-                        candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
-                        candles['ema_21'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_fast'])
-                        candles['ema_50'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_momentum'])
-                        candles['ema_200'] = indicator_calc.calculate_ema(candles, config['indicators']['ema_trend'])
-                        candles['atr'] = indicator_calc.calculate_atr(candles, config['indicators']['atr_period'])
-                        candles['rsi'] = indicator_calc.calculate_rsi(candles, config['indicators']['rsi_period'])
-                        candles['rsi_7'] = indicator_calc.calculate_rsi(candles, 7)  # Add RSI(7) for faster momentum detection
-                        candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, config['indicators']['volume_ma_period'])
-                        
-                        # Calculate VWAP
-                        candles['vwap'] = indicator_calc.calculate_vwap(candles)
-                        
-                        # Calculate Stochastic
-                        stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
-                        candles['stoch_k'] = stoch_k
-                        candles['stoch_d'] = stoch_d
-                        
-                        # Calculate ADX
-                        candles['adx'] = indicator_calc.calculate_adx(candles, period=14)
-                        
-                        # Calculate MACD
-                        macd, macd_signal, macd_histogram = indicator_calc.calculate_macd(
-                            candles,
-                            config['indicators']['macd_fast'],
-                            config['indicators']['macd_slow'],
-                            config['indicators']['macd_signal']
-                        )
-                        candles['macd'] = macd
-                        candles['macd_signal'] = macd_signal
-                        candles['macd_histogram'] = macd_histogram
-                        
-                        candle_data[timeframe] = candles
-                        
-                        # Detect signals
-                        signal = signal_detector.detect_signals(candles, timeframe, symbol="US30")
-                        
-                        # Calculate volume ratio for logging
-                        last_row = candles.iloc[-1] if not candles.empty else None
-                        volume_ratio = last_row['volume'] / last_row['volume_ma'] if last_row is not None and 'volume_ma' in last_row.index else 0
-                        
-                        # Log scan result to Excel
-                        if excel_reporter and not candles.empty:
-                            # Determine scanner name based on strategy
-                            scanner_name = 'US30-Swing'
-                            if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
-                                scanner_name = 'US30-Swing-H4HVG'
-                            
-                            scan_data = {
-                                'timestamp': datetime.now(),
-                                'scanner': scanner_name,
-                                'symbol': config['exchange']['symbol'],
-                                'timeframe': timeframe,
-                                'price': last_row['close'],
-                                'volume': last_row['volume'],
-                                'indicators': {
-                                    'ema_9': last_row.get('ema_9', None),
-                                    'ema_21': last_row.get('ema_21', None),
-                                    'ema_50': last_row.get('ema_50', None),
-                                    'ema_100': last_row.get('ema_100', None),
-                                    'ema_200': last_row.get('ema_200', None),
-                                    'rsi': last_row.get('rsi', None),
-                                    'atr': last_row.get('atr', None),
-                                    'volume_ma': last_row.get('volume_ma', None),
-                                    'vwap': last_row.get('vwap', None),
-                                    'stoch_k': last_row.get('stoch_k', None),
-                                    'stoch_d': last_row.get('stoch_d', None)
-                                },
-                                'signal_detected': signal is not None,
-                                'signal_type': signal.signal_type if signal else None,
-                                'signal_details': {
-                                    'entry_price': signal.entry_price,
-                                    'stop_loss': signal.stop_loss,
-                                    'take_profit': signal.take_profit,
-                                    'risk_reward': signal.risk_reward,
-                                    'strategy': getattr(signal, 'strategy', 'EMA Crossover'),
-                                    'confidence': getattr(signal, 'confidence', None),
-                                    'market_bias': getattr(signal, 'market_bias', None),
-                                    'trend_direction': getattr(signal, 'trend_direction', None),
-                                    'swing_points': getattr(signal, 'swing_points', None),
-                                    'pullback_depth': getattr(signal, 'pullback_depth', None),
-                                    'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
-                                    'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
-                                    'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
-                                } if signal else {}
-                            }
-                            excel_reporter.log_scan_result(scan_data)
-                        
-                        if signal:
-                            logger.info(f"🚨 {signal.signal_type} SIGNAL on {timeframe}!")
-                            logger.info(f"Strategy: {signal.strategy}")
-                            logger.info(f"Entry: {signal.entry_price:.2f}, SL: {signal.stop_loss:.2f}, TP: {signal.take_profit:.2f}")
-                            logger.info(f"R:R = {signal.risk_reward:.2f}")
-                            
-                            # Send alert
-                            if alerter:
-                                alerter.send_signal_alert(signal)
-                            
-                            # Track trade
-                            trade_tracker.add_trade(signal)
-                        
-                        # Log scan completion with detailed indicators
-                        if not candles.empty and last_row is not None:
-                            logger.info(f"[{timeframe}] Scan complete - Price: ${last_row['close']:.2f}")
-                            logger.info(f"[{timeframe}] Trend: EMA9=${last_row.get('ema_9', 0):.2f}, EMA21=${last_row.get('ema_21', 0):.2f}, EMA50=${last_row.get('ema_50', 0):.2f}")
-                            logger.info(f"[{timeframe}] Volume: {last_row['volume']:,.0f} ({volume_ratio:.2f}x avg)")
-                            logger.info(f"[{timeframe}] RSI: {last_row.get('rsi', 0):.1f}")
-                        
-                        # Update last check time
-                        last_check_times[timeframe] = current_time
-                
-                except Exception as e:
-                    logger.error(f"Error processing {timeframe}: {e}")
+            # Fetch, compute indicators and detect across timeframes
+            scan_engine.run_cycle()
             
             # Check for trade updates
             try:
@@ -368,6 +338,8 @@ def main():
         logger.info("Scanner stopped by user")
         logger.info("=" * 60)
         
+        scan_engine.shutdown()
+        
         # Stop Excel reporter
         if excel_reporter:
             excel_reporter.stop()
@@ -3,7 +3,7 @@ US30 Swing Trading Signal Detector
 Implements "Trend Reversal & Continuation", "Moving Average Pullback", and "H4 HVG" strategies
 """
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict
 import pandas as pd
 import numpy as np
@@ -11,6 +11,7 @@ import logging
 
 from src.signal_detector import Signal
 from src.h4_hvg_detector import H4HVGDetector
+from src.duplicate_suppressor import DuplicateSuppressor
 
 logger = logging.getLogger(__name__)
 
@@ -50,8 +51,10 @@ class US30SwingDetector:
             logger.info("H4HVGDetector initialized for US30 swing with US30 market settings")
         
         # Signal history for duplicate prevention
-        self.recent_signals = []
-        self.duplicate_window_minutes = config.get('duplicate_time_window_minutes', 240)
+        self.duplicate_suppressor = DuplicateSuppressor(
+            window_minutes=config.get('duplicate_time_window_minutes', 240),
+            price_threshold_percent=config['duplicate_price_threshold_percent']
+        )
         
         strategy_count = 3 if self.h4_hvg_detector else 2
         logger.info(f"US30SwingDetector initialized with {strategy_count} strategies")
@@ -110,8 +113,8 @@ class US30SwingDetector:
             signal = self._detect_trend_reversal(data, timeframe)
         
         # Check for duplicates
-        if signal and not self._is_duplicate(signal):
-            self.recent_signals.append(signal)
+        if signal and not self.duplicate_suppressor.is_duplicate(signal):
+            self.duplicate_suppressor.record(signal)
             logger.info(f"🎯 {signal.signal_type} signal: {signal.strategy} on {timeframe}")
             return signal
         
@@ -1011,28 +1014,6 @@ class US30SwingDetector:
         
         return us30_signal
     
-    def _is_duplicate(self, signal: US30SwingSignal) -> bool:
-        """Check if signal is duplicate of recent signal."""
-        cutoff_time = signal.timestamp - timedelta(minutes=self.duplicate_window_minutes)
-        
-        for prev_signal in self.recent_signals:
-            if prev_signal.timestamp < cutoff_time:
-                continue
-            
-            if prev_signal.signal_type != signal.signal_type:
-                continue
-            
-            price_diff_pct = abs(signal.entry_price - prev_signal.entry_price) / prev_signal.entry_price * 100
-            time_diff_minutes = (signal.timestamp - prev_signal.timestamp).total_seconds() / 60
-            
-            if price_diff_pct < self.config['duplicate_price_threshold_percent']:
-                logger.info(f"[{signal.timeframe}] Duplicate signal blocked: {signal.signal_type} at ${signal.entry_price:.2f} "
-                           f"(previous: ${prev_signal.entry_price:.2f} at {time_diff_minutes:.0f}min ago, "
-                           f"price diff: {price_diff_pct:.2f}%)")
-                return True
-        
-        return False
-
     def _is_pin_bar(self, candle: pd.Series) -> bool:
         """
         Detect pin bar pattern (long wick, small body).
@@ -4,13 +4,15 @@ Implements Asian Range Breakout, EMA Cloud Breakout, Mean Reversion, Trend Follo
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import pandas as pd
 import logging
 
 from src.signal_detector import Signal
 from src.trend_analyzer import TrendAnalyzer
 from src.h4_hvg_detector import H4HVGDetector
+from src.duplicate_suppressor import DuplicateSuppressor
+from src.indicator_planner import required_columns
 from xauusd_scanner.strategy_selector import GoldStrategy, StrategySelector
 from xauusd_scanner.session_manager import SessionManager
 from xauusd_scanner.key_level_tracker import KeyLevelTracker
@@ -40,6 +42,22 @@ class GoldSignalDetector:
     5. H4 HVG - 4-Hour High Volume Gap detection
     """
     
+    # State kept across restarts by StateCheckpointer (the session manager is registered on its own)
+    CHECKPOINT_ATTRS = ('duplicate_suppressor', 'h4_hvg_detector')
+    
+    # Indicator columns each strategy reads, for IndicatorPlanner
+    STRATEGY_REQUIREMENTS = {
+        'momentum_shift': ('rsi_7', 'adx', 'ema_50', 'atr', 'volume_ma'),
+        'asian_range_breakout': ('atr', 'volume_ma'),
+        'ema_cloud_breakout': ('ema_21', 'ema_50', 'vwap', 'atr', 'rsi', 'volume_ma'),
+        'mean_reversion': ('vwap', 'atr', 'rsi', 'volume_ma'),
+        'trend_following': ('ema_21', 'ema_50', 'atr', 'rsi', 'volume_ma'),
+        'h4_hvg': ('ema_50', 'rsi', 'volume_ma'),
+    }
+    
+    # Read by strategy selection and by every created signal
+    SIGNAL_COLUMNS = ('ema_9', 'ema_21', 'ema_50', 'vwap', 'atr', 'rsi', 'volume_ma')
+    
     def __init__(self,
                  session_manager: SessionManager,
                  key_level_tracker: KeyLevelTracker,
@@ -65,12 +83,27 @@ class GoldSignalDetector:
             logger.info("H4HVGDetector initialized for Gold with XAU market settings")
         
         # Signal history for duplicate prevention
-        self.recent_signals = []
-        self.duplicate_window_minutes = 15
+        self.duplicate_suppressor = DuplicateSuppressor(
+            window_minutes=15,
+            atr_tolerance_multiplier=0.5
+        )
         
         strategy_count = 5 if self.h4_hvg_detector else 4
         logger.info(f"GoldSignalDetector initialized with {strategy_count} strategies")
     
+    def required_columns(self) -> List[str]:
+        """
+        Indicator columns needed to run detection.
+        
+        Returns:
+            Columns the strategies (H4 HVG only when enabled) and signal creation read
+        """
+        strategies = [
+            requires for name, requires in self.STRATEGY_REQUIREMENTS.items()
+            if name != 'h4_hvg' or self.h4_hvg_detector
+        ]
+        return required_columns(*strategies, self.SIGNAL_COLUMNS)
+    
     def detect_signals(self, data: pd.DataFrame, timeframe: str, symbol: str = "XAU/USD") -> Optional[GoldSignal]:
         """
         Detect trading signals using appropriate strategy.
@@ -122,8 +155,8 @@ class GoldSignalDetector:
             signal.strategy = "Momentum Shift"
             
             # Check for duplicates
-            if not self._is_duplicate(signal):
-                self.recent_signals.append(signal)
+            if not self.duplicate_suppressor.is_duplicate(signal):
+                self.duplicate_suppressor.record(signal)
                 logger.info(f"🎯 {signal.signal_type} signal: Momentum Shift on {timeframe}")
                 return signal
         
@@ -166,8 +199,8 @@ class GoldSignalDetector:
             signal.key_level_info = self.key_level_tracker.get_level_status(last_price)
             
             # Check for duplicates
-            if not self._is_duplicate(signal):
-                self.recent_signals.append(signal)
+            if not self.duplicate_suppressor.is_duplicate(signal):
+                self.duplicate_suppressor.record(signal)
                 logger.info(f"🎯 {signal.signal_type} signal: {strategy.value} on {timeframe}")
                 return signal
         
@@ -982,23 +1015,3 @@ class GoldSignalDetector:
         )
         
         return gold_signal
-    
-    def _is_duplicate(self, signal: GoldSignal) -> bool:
-        """Check if signal is duplicate of recent signal."""
-        from datetime import timedelta
-        
-        cutoff_time = signal.timestamp - timedelta(minutes=self.duplicate_window_minutes)
-        
-        for prev_signal in self.recent_signals:
-            if prev_signal.timestamp < cutoff_time:
-                continue
-            
-            if prev_signal.signal_type != signal.signal_type:
-                continue
-            
-            price_diff = abs(signal.entry_price - prev_signal.entry_price)
-            if price_diff < (signal.atr * 0.5):
-                logger.debug(f"Duplicate signal blocked: {signal.signal_type}")
-                return True
-        
-        return False
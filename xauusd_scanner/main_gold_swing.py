@@ -15,14 +15,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.market_data_client import MarketDataClient
 from src.yfinance_client import YFinanceClient
-from src.indicator_calculator import IndicatorCalculator
+from src.indicator_planner import IndicatorPlanner
 from src.alerter import TelegramAlerter
 from src.trade_tracker import TradeTracker
 from src.excel_reporter import ExcelReporter
+from src.scan_engine import ScanEngine
+from src.state_checkpoint import StateCheckpointer, warm_start_fetch
+from src.email_dispatcher import stop_all_dispatchers
 
 from xauusd_scanner.session_manager import SessionManager, TradingSession
 from xauusd_scanner.news_calendar import NewsCalendar
 from xauusd_scanner.spread_monitor import SpreadMonitor
+from xauusd_scanner.quote_feed import QuoteFeed, SimulatedQuoteSource
 from xauusd_scanner.key_level_tracker import KeyLevelTracker
 from xauusd_scanner.strategy_selector import StrategySelector
 from xauusd_scanner.gold_signal_detector import GoldSignalDetector
@@ -87,14 +91,15 @@ def main():
             buffer_size=200
         )
     
-    indicator_calc = IndicatorCalculator()
-    
     # Initialize Gold-specific components
     session_manager = SessionManager()
     news_calendar = NewsCalendar(config.get('news_calendar_file', 'xauusd_scanner/news_events.json'))
+    spread_config = config.get('spread_monitoring', {})
     spread_monitor = SpreadMonitor(
         acceptable_spread_pips=config['signal_rules']['acceptable_spread_pips'],
-        pause_spread_pips=config['signal_rules']['max_spread_pips']
+        pause_spread_pips=config['signal_rules']['max_spread_pips'],
+        window_minutes=spread_config.get('window_minutes', 5),
+        max_quote_age_seconds=spread_config.get('max_quote_age_seconds')
     )
     key_level_tracker = KeyLevelTracker()
     strategy_selector = StrategySelector(session_manager)
@@ -112,6 +117,11 @@ def main():
         h4_hvg_config=h4_hvg_config
     )
     
+    # Compute only the indicators the Gold strategies read: RSI(7) shares
+    # RSI(14)'s price moves and ADX reuses the ATR
+    indicator_plan = IndicatorPlanner().plan(signal_detector.required_columns())
+    logger.info(f"Indicator plan: {', '.join(indicator_plan.outputs)}")
+    
     # Initialize alerter
     alerter = None
     if config['telegram']['enabled']:
@@ -147,6 +157,14 @@ def main():
         except Exception as e:
             logger.error(f"Failed to initialize Excel reporter: {e}")
     
+    # Warm restarts: duplicate windows, open trades and candle buffers are checkpointed
+    checkpointer = StateCheckpointer.for_components(config.get('checkpoint'), {
+        'market_client': market_client,
+        'session_manager': session_manager,
+        'signal_detector': signal_detector,
+        'trade_tracker': trade_tracker
+    })
+    
     logger.info("All components initialized successfully")
     
     # Connect to exchange
@@ -157,34 +175,185 @@ def main():
     
     logger.info(f"Successfully connected to {config['exchange']['name']}")
     
-    # Fetch initial data
-    logger.info("Fetching initial candlestick data...")
-    candle_data = {}
-    for timeframe in config['exchange']['timeframes']:
-        candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
+    # Track state
+    current_session = None
+    last_spread_pause = False
+    last_check_times = {tf: None for tf in config['exchange']['timeframes']}
+    
+    # Determine check interval based on timeframe
+    check_intervals = {
+        '15m': 900,   # 15 minutes
+        '1h': 3600,   # 1 hour
+        '4h': 14400,  # 4 hours
+        '1d': 86400   # 1 day
+    }
+    
+    # Scan pipeline stages
+    def fetch_candles(timeframe):
+        candles, _ = market_client.get_latest_candles(timeframe, count=500)
+        return candles
+    
+    def check_market(ctx):
+        nonlocal last_spread_pause
+        
+        # Update key levels
+        last_candle = ctx.candles.iloc[-1]
+        key_level_tracker.update_levels(
+            high=last_candle['high'],
+            low=last_candle['low'],
+            close=last_candle['close'],
+            timestamp=last_candle['timestamp']
+        )
+        
+        # Update Asian range if in Asian session
+        if current_session == TradingSession.ASIAN:
+            session_manager.update_asian_range(
+                high=last_candle['high'],
+                low=last_candle['low']
+            )
+        
+        # Spread comes from the quote feed; keep the fallback quote current
+        simulated_quotes.set_price(last_candle['close'])
+        
+        # Check spread
+        should_pause_spread = not spread_monitor.is_spread_acceptable()
         
-        # Calculate indicators
-        candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
-        candles['ema_21'] = indicator_calc.calculate_ema(candles, 21)
-        candles['ema_50'] = indicator_calc.calculate_ema(candles, 50)
-        candles['vwap'] = indicator_calc.calculate_vwap(candles)
-        candles['atr'] = indicator_calc.calculate_atr(candles, 14)
-        candles['rsi'] = indicator_calc.calculate_rsi(candles, 14)
-        candles['rsi_7'] = indicator_calc.calculate_rsi(candles, 7)  # Add RSI(7) for faster momentum detection
-        candles['adx'] = indicator_calc.calculate_adx(candles, period=14)  # Add ADX for trend strength
-        candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, 20)
+        if should_pause_spread != last_spread_pause:
+            if should_pause_spread:
+                spread_status = spread_monitor.get_spread_status()
+                logger.warning(f"📊 Spread too wide: {spread_status['current_pips']:.1f} pips")
+            else:
+                logger.info("✅ Spread back to normal")
+            
+            last_spread_pause = should_pause_spread
+        
+        # Skip if spread too wide
+        if should_pause_spread:
+            return False
+        
+        # Check if we should scan this timeframe (avoid duplicate signals)
+        last_check = last_check_times[ctx.timeframe]
+        interval = check_intervals.get(ctx.timeframe, 900)
+        return last_check is None or (datetime.now() - last_check).total_seconds() >= interval
+    
+    def detect_signal(ctx):
+        signal = signal_detector.detect_signals(ctx.candles, ctx.timeframe, symbol="XAU/USD")
+        
+        # Update last check time
+        last_check_times[ctx.timeframe] = datetime.now()
+        return signal
+    
+    def log_scan(ctx):
+        # Log scan result to Excel
+        candles, timeframe, signal = ctx.candles, ctx.timeframe, ctx.signal
+        last_candle = candles.iloc[-1]
+        session_info = session_manager.get_session_info()
+        asian_range = session_manager.get_asian_range()
+        spread_status = spread_monitor.get_spread_status()
         
-        # Calculate Stochastic
-        stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
-        candles['stoch_k'] = stoch_k
-        candles['stoch_d'] = stoch_d
+        # Determine scanner name based on strategy
+        scanner_name = f"XAUUSD-Swing-{session_info['session']}"
+        if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
+            scanner_name = f"XAUUSD-Swing-H4HVG-{session_info['session']}"
         
-        # Calculate ADX
-        candles['adx'] = indicator_calc.calculate_adx(candles, period=14)
+        scan_data = {
+            'timestamp': datetime.now(),
+            'scanner': scanner_name,
+            'symbol': config['exchange']['symbol'],
+            'timeframe': timeframe,
+            'price': last_candle['close'],
+            'volume': last_candle['volume'],
+            'indicators': {
+                'ema_9': last_candle.get('ema_9', None),
+                'ema_21': last_candle.get('ema_21', None),
+                'ema_50': last_candle.get('ema_50', None),
+                'ema_100': last_candle.get('ema_100', None),
+                'ema_200': last_candle.get('ema_200', None),
+                'rsi': last_candle.get('rsi', None),
+                'atr': last_candle.get('atr', None),
+                'volume_ma': last_candle.get('volume_ma', None),
+                'vwap': last_candle.get('vwap', None)
+            },
+            'signal_detected': signal is not None,
+            'signal_type': signal.signal_type if signal else None,
+            'signal_details': {
+                'entry_price': signal.entry_price,
+                'stop_loss': signal.stop_loss,
+                'take_profit': signal.take_profit,
+                'risk_reward': signal.risk_reward,
+                'strategy': getattr(signal, 'strategy', 'N/A'),
+                'confidence': getattr(signal, 'confidence', None),
+                'market_bias': getattr(signal, 'market_bias', None),
+                'trend_direction': getattr(signal, 'trend_direction', None),
+                'swing_points': getattr(signal, 'swing_points', None),
+                'pullback_depth': getattr(signal, 'pullback_depth', None),
+                'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
+                'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
+                'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
+            } if signal else {},
+            'xauusd_specific': {
+                'session': session_info['session'],
+                'spread_pips': spread_status.get('current_pips', None),
+                'asian_range_high': asian_range.get('high', None) if asian_range else None,
+                'asian_range_low': asian_range.get('low', None) if asian_range else None
+            }
+        }
+        excel_reporter.log_scan_result(scan_data)
+    
+    def send_alert(ctx):
+        signal, timeframe = ctx.signal, ctx.timeframe
+        
+        # Add spread info
+        signal.spread_pips = spread_monitor.current_spread_pips
+        
+        logger.info(f"🚨 {signal.signal_type} SIGNAL on {timeframe}!")
+        logger.info(f"Strategy: {signal.strategy}")
+        logger.info(f"Entry: ${signal.entry_price:.2f}, SL: ${signal.stop_loss:.2f}, TP: ${signal.take_profit:.2f}")
+        logger.info(f"R:R = {signal.risk_reward:.2f}, Spread: {signal.spread_pips:.1f} pips")
+        
+        # Send alert
+        if alerter:
+            alerter.send_signal_alert(signal)
         
-        candle_data[timeframe] = candles
+        # Track trade
+        trade_tracker.add_trade(signal)
+    
+    scan_engine = ScanEngine(
+        config['exchange']['timeframes'],
+        fetch=fetch_candles,
+        indicators=indicator_plan.compute,
+        gate=check_market,
+        detect=detect_signal,
+        report=log_scan if excel_reporter else None,
+        alert=send_alert,
+        name="gold-swing"
+    )
+    
+    # Fetch initial data
+    logger.info("Fetching initial candlestick data...")
+    restored = checkpointer.restore() if checkpointer is not None else []
+    scan_engine.prepare_all(warm_start_fetch(market_client, fetch_candles) if 'market_client' in restored else None)
+    if checkpointer is not None:
+        checkpointer.start()
+    candle_data = scan_engine.candle_data
+    for timeframe in candle_data:
         logger.info(f"Loaded {timeframe} data with indicators")
     
+    # Start quote feed (falls back to a fixed spread around the last close
+    # while the provider publishes no bid/ask)
+    simulated_quotes = SimulatedQuoteSource(
+        spread_pips=spread_config.get('simulated_spread_pips', 1.0),
+        price=candle_data[config['exchange']['timeframes'][0]]['close'].iloc[-1]
+    )
+    quote_feed = QuoteFeed(
+        spread_monitor,
+        market_client.get_quote,
+        interval_seconds=spread_config.get('quote_interval_seconds', 5),
+        fallback_source=simulated_quotes
+    )
+    quote_feed.poll_once()
+    quote_feed.start()
+    
     # Send startup notification
     if alerter:
         session_info = session_manager.get_session_info()
@@ -201,11 +370,8 @@ def main():
     
     logger.info("Scanner is now running. Press Ctrl+C to stop.")
     
-    # Track state
     last_session = None
     last_news_pause = False
-    last_spread_pause = False
-    last_check_times = {tf: None for tf in config['exchange']['timeframes']}
     last_heartbeat = time.time()
     heartbeat_interval = 5400  # 90 minutes in seconds
     
@@ -255,166 +421,8 @@ def main():
                 time.sleep(60)
                 continue
             
-            # Update data for each timeframe
-            for timeframe in config['exchange']['timeframes']:
-                try:
-                    # Fetch latest candles
-                    candles, is_fresh = market_client.get_latest_candles(timeframe, count=500)
-                    
-                    # Calculate indicators
-                    candles['ema_9'] = indicator_calc.calculate_ema(candles, 9)
-                    candles['ema_21'] = indicator_calc.calculate_ema(candles, 21)
-                    candles['ema_50'] = indicator_calc.calculate_ema(candles, 50)
-                    candles['vwap'] = indicator_calc.calculate_vwap(candles)
-                    candles['atr'] = indicator_calc.calculate_atr(candles, 14)
-                    candles['rsi'] = indicator_calc.calculate_rsi(candles, 14)
-                    candles['rsi_7'] = indicator_calc.calculate_rsi(candles, 7)  # Add RSI(7) for faster momentum detection
-                    candles['adx'] = indicator_calc.calculate_adx(candles, period=14)  # Add ADX for trend strength
-                    candles['volume_ma'] = indicator_calc.calculate_volume_ma(candles, 20)
-                    
-                    # Calculate Stochastic
-                    stoch_k, stoch_d = indicator_calc.calculate_stochastic(candles, k_period=14, d_period=3, smooth_k=3)
-                    candles['stoch_k'] = stoch_k
-                    candles['stoch_d'] = stoch_d
-                    
-                    # Calculate ADX
-                    candles['adx'] = indicator_calc.calculate_adx(candles, period=14)
-                    
-                    candle_data[timeframe] = candles
-                    
-                    # Update key levels
-                    last_candle = candles.iloc[-1]
-                    key_level_tracker.update_levels(
-                        high=last_candle['high'],
-                        low=last_candle['low'],
-                        close=last_candle['close'],
-                        timestamp=last_candle['timestamp']
-                    )
-                    
-                    # Update Asian range if in Asian session
-                    if current_session == TradingSession.ASIAN:
-                        session_manager.update_asian_range(
-                            high=last_candle['high'],
-                            low=last_candle['low']
-                        )
-                    
-                    # Update spread (simulate with typical Gold spread)
-                    spread_pips = 0.5  # Typical Gold spread
-                    bid = last_candle['close'] - (spread_pips / 10)
-                    ask = last_candle['close'] + (spread_pips / 10)
-                    spread_monitor.update_spread(bid, ask)
-                    
-                    # Check spread
-                    should_pause_spread = not spread_monitor.is_spread_acceptable()
-                    
-                    if should_pause_spread != last_spread_pause:
-                        if should_pause_spread:
-                            spread_status = spread_monitor.get_spread_status()
-                            logger.warning(f"📊 Spread too wide: {spread_status['current_pips']:.1f} pips")
-                        else:
-                            logger.info("✅ Spread back to normal")
-                        
-                        last_spread_pause = should_pause_spread
-                    
-                    # Skip if spread too wide
-                    if should_pause_spread:
-                        continue
-                    
-                    # Check if we should scan this timeframe (avoid duplicate signals)
-                    current_time = datetime.now()
-                    last_check = last_check_times[timeframe]
-                    
-                    # Determine check interval based on timeframe
-                    check_intervals = {
-                        '15m': 900,   # 15 minutes
-                        '1h': 3600,   # 1 hour
-                        '4h': 14400,  # 4 hours
-                        '1d': 86400   # 1 day
-                    }
-                    
-                    interval = check_intervals.get(timeframe, 900)
-                    
-                    if last_check is None or (current_time - last_check).total_seconds() >= interval:
-                        # Detect signals
-                        signal = signal_detector.detect_signals(candles, timeframe, symbol="XAU/USD")
-                        
-                        # Log scan result to Excel
-                        if excel_reporter and not candles.empty:
-                            last_candle = candles.iloc[-1]
-                            session_info = session_manager.get_session_info()
-                            asian_range = session_manager.get_asian_range()
-                            spread_status = spread_monitor.get_spread_status()
-                            
-                            # Determine scanner name based on strategy
-                            scanner_name = f"XAUUSD-Swing-{session_info['session']}"
-                            if signal and getattr(signal, 'strategy', '') == 'H4 HVG':
-                                scanner_name = f"XAUUSD-Swing-H4HVG-{session_info['session']}"
-                            
-                            scan_data = {
-                                'timestamp': datetime.now(),
-                                'scanner': scanner_name,
-                                'symbol': config['exchange']['symbol'],
-                                'timeframe': timeframe,
-                                'price': last_candle['close'],
-                                'volume': last_candle['volume'],
-                                'indicators': {
-                                    'ema_9': last_candle.get('ema_9', None),
-                                    'ema_21': last_candle.get('ema_21', None),
-                                    'ema_50': last_candle.get('ema_50', None),
-                                    'ema_100': last_candle.get('ema_100', None),
-                                    'ema_200': last_candle.get('ema_200', None),
-                                    'rsi': last_candle.get('rsi', None),
-                                    'atr': last_candle.get('atr', None),
-                                    'volume_ma': last_candle.get('volume_ma', None),
-                                    'vwap': last_candle.get('vwap', None)
-                                },
-                                'signal_detected': signal is not None,
-                                'signal_type': signal.signal_type if signal else None,
-                                'signal_details': {
-                                    'entry_price': signal.entry_price,
-                                    'stop_loss': signal.stop_loss,
-                                    'take_profit': signal.take_profit,
-                                    'risk_reward': signal.risk_reward,
-                                    'strategy': getattr(signal, 'strategy', 'N/A'),
-                                    'confidence': getattr(signal, 'confidence', None),
-                                    'market_bias': getattr(signal, 'market_bias', None),
-                                    'trend_direction': getattr(signal, 'trend_direction', None),
-                                    'swing_points': getattr(signal, 'swing_points', None),
-                                    'pullback_depth': getattr(signal, 'pullback_depth', None),
-                                    'gap_size_percent': getattr(signal, 'gap_info', {}).gap_percent if signal and hasattr(signal, 'gap_info') and signal.gap_info else None,
-                                    'volume_spike_ratio': getattr(signal, 'volume_spike_ratio', None) if signal else None,
-                                    'confluence_factors': len(getattr(signal, 'confluence_factors', [])) if signal and hasattr(signal, 'confluence_factors') and signal.confluence_factors else None
-                                } if signal else {},
-                                'xauusd_specific': {
-                                    'session': session_info['session'],
-                                    'spread_pips': spread_status.get('current_pips', None),
-                                    'asian_range_high': asian_range.get('high', None) if asian_range else None,
-                                    'asian_range_low': asian_range.get('low', None) if asian_range else None
-                                }
-                            }
-                            excel_reporter.log_scan_result(scan_data)
-                        
-                        if signal:
-                            # Add spread info
-                            signal.spread_pips = spread_monitor.current_spread_pips
-                            
-                            logger.info(f"🚨 {signal.signal_type} SIGNAL on {timeframe}!")
-                            logger.info(f"Strategy: {signal.strategy}")
-                            logger.info(f"Entry: ${signal.entry_price:.2f}, SL: ${signal.stop_loss:.2f}, TP: ${signal.take_profit:.2f}")
-                            logger.info(f"R:R = {signal.risk_reward:.2f}, Spread: {signal.spread_pips:.1f} pips")
-                            
-                            # Send alert
-                            if alerter:
-                                alerter.send_signal_alert(signal)
-                            
-                            # Track trade
-                            trade_tracker.add_trade(signal)
-                        
-                        # Update last check time
-                        last_check_times[timeframe] = current_time
-                
-                except Exception as e:
-                    logger.error(f"Error processing {timeframe}: {e}")
+            # Fetch, compute indicators and detect across timeframes
+            scan_engine.run_cycle()
             
             # Check for trade updates
             try:
@@ -467,6 +475,9 @@ def main():
         logger.info("Scanner stopped by user")
         logger.info("=" * 60)
         
+        quote_feed.stop()
+        scan_engine.shutdown()
+        
         # Stop Excel reporter
         if excel_reporter:
             excel_reporter.stop()
@@ -482,6 +493,14 @@ def main():
             alerter.send_message(f"❌ <b>Scanner Error</b>\n\nFatal error occurred. Check logs.")
         
         sys.exit(1)
+    
+    finally:
+        # Write a final checkpoint
+        if checkpointer is not None:
+            checkpointer.stop()
+        
+        # Deliver queued emails before the process exits
+        stop_all_dispatchers()
 
 
 if __name__ == "__main__":
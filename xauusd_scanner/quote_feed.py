@@ -0,0 +1,150 @@
+"""
+Quote Feed for Gold Trading
+Polls top-of-book bid/ask on its own cadence and feeds the SpreadMonitor
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+import logging
+
+from xauusd_scanner.spread_monitor import SpreadMonitor
+
+logger = logging.getLogger(__name__)
+
+
+QuoteSource = Callable[[], Optional[Dict[str, float]]]
+
+
+class SimulatedQuoteSource:
+    """
+    Local stand-in quote source for feeds without a published order book.
+
+    Quotes a fixed spread around the latest known price, which the scan loop
+    updates from candle closes.
+    """
+
+    def __init__(self, spread_pips: float = 1.0, price: Optional[float] = None):
+        """
+        Initialize simulated quotes.
+
+        Args:
+            spread_pips: Spread to quote (Gold: 1 pip = 0.1)
+            price: Optional initial mid price
+        """
+        self.spread_pips = spread_pips
+        self.price = price
+
+    def set_price(self, price: float) -> None:
+        """Update the mid price quotes are built around."""
+        self.price = float(price)
+
+    def __call__(self) -> Optional[Dict[str, float]]:
+        if self.price is None:
+            return None
+        half_spread = self.spread_pips / 10 / 2
+        return {
+            'bid': self.price - half_spread,
+            'ask': self.price + half_spread,
+            'timestamp': time.time()
+        }
+
+
+class QuoteFeed:
+    """
+    Background quote poller.
+
+    Requests a quote from the primary source every ``interval_seconds`` and
+    pushes it into the SpreadMonitor. When the primary source returns
+    nothing, the optional fallback source is used and the monitor records
+    which source produced the current spread.
+    """
+
+    def __init__(self,
+                 spread_monitor: SpreadMonitor,
+                 quote_source: Optional[QuoteSource],
+                 interval_seconds: float = 2.0,
+                 fallback_source: Optional[QuoteSource] = None):
+        """
+        Initialize Quote Feed.
+
+        Args:
+            spread_monitor: Monitor receiving bid/ask updates
+            quote_source: Callable returning {'bid', 'ask', 'timestamp'} or None
+            interval_seconds: Polling cadence
+            fallback_source: Callable used when the primary source has no quote
+        """
+        self.spread_monitor = spread_monitor
+        self.quote_source = quote_source
+        self.fallback_source = fallback_source
+        self.interval_seconds = interval_seconds
+
+        self.active_source: Optional[str] = None
+        self.quotes_received = 0
+        self.errors = 0
+        self._last_quote_time: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch(self) -> tuple[Optional[Dict[str, float]], Optional[str]]:
+        for name, source in (('live', self.quote_source), ('simulated', self.fallback_source)):
+            if source is None:
+                continue
+            try:
+                quote = source()
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Quote source '{name}' failed: {e}")
+                continue
+            if quote:
+                return quote, name
+        return None, None
+
+    def poll_once(self) -> Optional[float]:
+        """
+        Fetch one quote and update the spread monitor.
+
+        Returns:
+            Spread in pips, or None if no source produced a quote
+        """
+        quote, source = self._fetch()
+        if quote is None:
+            return None
+
+        if source != self.active_source:
+            logger.info(f"Spread quotes now from {source} source")
+            self.active_source = source
+
+        timestamp = quote.get('timestamp')
+        if timestamp and timestamp == self._last_quote_time:
+            # Source served its cached quote again: nothing new to record
+            return self.spread_monitor.current_spread_pips
+        self._last_quote_time = timestamp
+        timestamp = datetime.fromtimestamp(timestamp, timezone.utc) if timestamp else None
+
+        self.quotes_received += 1
+        return self.spread_monitor.update_spread(quote['bid'], quote['ask'], timestamp, source=source)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            self.poll_once()
+            self._stop_event.wait(max(0.0, self.interval_seconds - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="QuoteFeed", daemon=True)
+        self._thread.start()
+        logger.info(f"Quote feed started (every {self.interval_seconds}s)")
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval_seconds + 5)
+            self._thread = None
+        logger.info("Quote feed stopped")
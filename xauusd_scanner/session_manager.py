@@ -30,6 +30,9 @@ class SessionManager:
     - Overlap: 13:00 - 16:00 GMT (London + NY)
     """
     
+    # State kept across restarts by StateCheckpointer
+    CHECKPOINT_ATTRS = ('asian_range_high', 'asian_range_low', 'asian_range_date', 'tracking_asian_range')
+    
     # Session time ranges in GMT
     ASIAN_START = time(0, 0)
     ASIAN_END = time(8, 0)
@@ -2,14 +2,179 @@
 Spread Monitor for Gold Trading
 Tracks bid-ask spread and pauses trading when spread is too wide
 """
+import threading
 from collections import deque
-from datetime import datetime, timezone
-from typing import Optional, Dict
+from datetime import datetime, timezone, timedelta
+from typing import Deque, Dict, Optional
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+class SpreadBucket:
+    """Aggregates of the spread readings that fell into one time bucket."""
+    
+    __slots__ = ('bucket_id', 'count', 'total', 'bins')
+    
+    def __init__(self, bucket_id: int):
+        self.bucket_id = bucket_id
+        self.count = 0
+        self.total = 0.0
+        self.bins: Dict[int, int] = {}
+
+
+class RollingSpreadStats:
+    """
+    Rolling spread statistics over a fixed time window.
+    
+    Readings are grouped into ``bucket_seconds`` buckets. Running count/sum
+    and a fixed-resolution histogram are adjusted as readings arrive and as
+    whole buckets leave the window, and monotonic queues track the window
+    max/min, so mean/max/min cost O(1) and a percentile costs one pass over
+    the fixed histogram regardless of how many quotes were received.
+    """
+    
+    def __init__(self,
+                 window_seconds: float = 300,
+                 bucket_seconds: float = 5,
+                 bin_width_pips: float = 0.1,
+                 max_pips: float = 200.0):
+        """
+        Initialize rolling statistics.
+        
+        Args:
+            window_seconds: Length of the rolling window
+            bucket_seconds: Time resolution of expiry
+            bin_width_pips: Percentile resolution
+            max_pips: Spreads above this share one overflow bin
+        """
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.bin_width_pips = bin_width_pips
+        self.n_bins = int(round(max_pips / bin_width_pips)) + 1
+        
+        self._buckets: Deque[SpreadBucket] = deque()
+        self._count = 0
+        self._total = 0.0
+        self._histogram = np.zeros(self.n_bins, dtype=np.int64)
+        # (bucket_id, value) with values decreasing / increasing from the front
+        self._max_queue: Deque[tuple] = deque()
+        self._min_queue: Deque[tuple] = deque()
+    
+    def _bucket_id(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+    
+    def _bin(self, value: float) -> int:
+        return min(max(int(round(value / self.bin_width_pips)), 0), self.n_bins - 1)
+    
+    def add(self, value: float, ts: float) -> None:
+        """
+        Add a spread reading.
+        
+        Args:
+            value: Spread in pips
+            ts: Reading time (epoch seconds)
+        """
+        bucket_id = self._bucket_id(ts)
+        if self._buckets and bucket_id < self._buckets[-1].bucket_id:
+            # Late reading: count it in the newest bucket so ordering holds
+            bucket_id = self._buckets[-1].bucket_id
+        if not self._buckets or self._buckets[-1].bucket_id != bucket_id:
+            self._buckets.append(SpreadBucket(bucket_id))
+        
+        bucket = self._buckets[-1]
+        bin_index = self._bin(value)
+        bucket.count += 1
+        bucket.total += value
+        bucket.bins[bin_index] = bucket.bins.get(bin_index, 0) + 1
+        
+        self._count += 1
+        self._total += value
+        self._histogram[bin_index] += 1
+        
+        while self._max_queue and self._max_queue[-1][1] <= value:
+            self._max_queue.pop()
+        self._max_queue.append((bucket_id, value))
+        while self._min_queue and self._min_queue[-1][1] >= value:
+            self._min_queue.pop()
+        self._min_queue.append((bucket_id, value))
+        
+        self.expire(ts)
+    
+    def expire(self, now: float) -> None:
+        """
+        Drop buckets that have left the window.
+        
+        Args:
+            now: Current time (epoch seconds)
+        """
+        oldest = self._bucket_id(now - self.window_seconds) + 1
+        while self._buckets and self._buckets[0].bucket_id < oldest:
+            bucket = self._buckets.popleft()
+            self._count -= bucket.count
+            self._total -= bucket.total
+            for bin_index, count in bucket.bins.items():
+                self._histogram[bin_index] -= count
+        if self._count == 0:
+            self._total = 0.0
+        
+        while self._max_queue and self._max_queue[0][0] < oldest:
+            self._max_queue.popleft()
+        while self._min_queue and self._min_queue[0][0] < oldest:
+            self._min_queue.popleft()
+    
+    @property
+    def count(self) -> int:
+        return self._count
+    
+    def mean(self) -> Optional[float]:
+        return self._total / self._count if self._count else None
+    
+    def max(self) -> Optional[float]:
+        return self._max_queue[0][1] if self._max_queue else None
+    
+    def min(self) -> Optional[float]:
+        return self._min_queue[0][1] if self._min_queue else None
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Spread percentile, rounded to the histogram resolution.
+        
+        Args:
+            q: Percentile in [0, 100]
+        
+        Returns:
+            Spread in pips or None without data
+        """
+        if not self._count:
+            return None
+        rank = max(1, int(np.ceil(q / 100 * self._count)))
+        bin_index = int(np.searchsorted(np.cumsum(self._histogram), rank))
+        return min(round(bin_index * self.bin_width_pips, 6), self.max())
+    
+    def mean_since(self, since: float) -> Optional[float]:
+        """
+        Mean over the buckets newer than ``since`` (bounded by the window).
+        
+        Args:
+            since: Start time (epoch seconds)
+        
+        Returns:
+            Mean spread in pips or None
+        """
+        first = self._bucket_id(since)
+        count = 0
+        total = 0.0
+        for bucket in reversed(self._buckets):
+            if bucket.bucket_id < first:
+                break
+            count += bucket.count
+            total += bucket.total
+        return total / count if count else None
+
+
 class SpreadMonitor:
     """
     Monitors bid-ask spread for Gold (XAU/USD).
@@ -23,29 +188,38 @@ class SpreadMonitor:
     def __init__(self, 
                  acceptable_spread_pips: float = 10.0,
                  pause_spread_pips: float = 15.0,
-                 history_size: int = 100):
+                 window_minutes: float = 5.0,
+                 bucket_seconds: float = 5.0,
+                 max_quote_age_seconds: Optional[float] = None):
         """
         Initialize Spread Monitor.
         
         Args:
             acceptable_spread_pips: Maximum acceptable spread in pips
             pause_spread_pips: Spread threshold to pause trading
-            history_size: Number of spread readings to keep
+            window_minutes: Rolling window for spread statistics
+            bucket_seconds: Time bucket size of the rolling window
+            max_quote_age_seconds: Pause trading when the last quote is older
+                than this (None disables the check)
         """
         self.acceptable_spread_pips = acceptable_spread_pips
         self.pause_spread_pips = pause_spread_pips
+        self.max_quote_age_seconds = max_quote_age_seconds
         
         self.current_spread_pips: Optional[float] = None
         self.current_bid: Optional[float] = None
         self.current_ask: Optional[float] = None
         self.last_update: Optional[datetime] = None
+        self.quote_source: Optional[str] = None
         
-        # Spread history for statistics
-        self.spread_history: deque = deque(maxlen=history_size)
+        # Rolling spread statistics (updated by the quote feed thread)
+        self.stats = RollingSpreadStats(window_seconds=window_minutes * 60, bucket_seconds=bucket_seconds)
+        self._lock = threading.Lock()
         
         logger.info(f"SpreadMonitor initialized (acceptable: {acceptable_spread_pips} pips, pause: {pause_spread_pips} pips)")
     
-    def update_spread(self, bid: float, ask: float, timestamp: Optional[datetime] = None) -> float:
+    def update_spread(self, bid: float, ask: float, timestamp: Optional[datetime] = None,
+                      source: Optional[str] = None) -> float:
         """
         Update current spread with bid/ask prices.
         
@@ -53,6 +227,7 @@ class SpreadMonitor:
             bid: Current bid price
             ask: Current ask price
             timestamp: Optional timestamp (defaults to now)
+            source: Optional name of the quote source
             
         Returns:
             Spread in pips
@@ -60,29 +235,47 @@ class SpreadMonitor:
         if timestamp is None:
             timestamp = datetime.now(timezone.utc)
         
-        self.current_bid = bid
-        self.current_ask = ask
-        self.last_update = timestamp
+        if bid is None or ask is None or bid <= 0 or ask < bid:
+            logger.warning(f"Ignoring invalid quote (bid: {bid}, ask: {ask})")
+            return self.current_spread_pips
         
         # Calculate spread in pips (Gold: 1 pip = 0.1)
-        spread_price = ask - bid
-        self.current_spread_pips = spread_price * 10
+        spread_pips = (ask - bid) * 10
         
-        # Add to history
-        self.spread_history.append({
-            'timestamp': timestamp,
-            'spread_pips': self.current_spread_pips,
-            'bid': bid,
-            'ask': ask
-        })
+        with self._lock:
+            self.current_bid = bid
+            self.current_ask = ask
+            self.last_update = timestamp
+            self.current_spread_pips = spread_pips
+            if source:
+                self.quote_source = source
+            self.stats.add(spread_pips, timestamp.timestamp())
         
         # Log warnings for wide spreads
-        if self.current_spread_pips > self.pause_spread_pips:
-            logger.warning(f"Spread too wide: {self.current_spread_pips:.1f} pips (bid: {bid:.2f}, ask: {ask:.2f})")
-        elif self.current_spread_pips > self.acceptable_spread_pips:
-            logger.info(f"Spread elevated: {self.current_spread_pips:.1f} pips")
+        if spread_pips > self.pause_spread_pips:
+            logger.warning(f"Spread too wide: {spread_pips:.1f} pips (bid: {bid:.2f}, ask: {ask:.2f})")
+        elif spread_pips > self.acceptable_spread_pips:
+            logger.info(f"Spread elevated: {spread_pips:.1f} pips")
         
-        return self.current_spread_pips
+        return spread_pips
+    
+    def quote_age_seconds(self, now: Optional[datetime] = None) -> Optional[float]:
+        """
+        Seconds since the last quote.
+        
+        Args:
+            now: Reference time (defaults to now)
+        
+        Returns:
+            Age in seconds or None without quotes
+        """
+        if self.last_update is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        last_update = self.last_update
+        if last_update.tzinfo is None:
+            last_update = last_update.replace(tzinfo=timezone.utc)
+        return (now - last_update).total_seconds()
     
     def is_spread_acceptable(self) -> bool:
         """
@@ -106,12 +299,21 @@ class SpreadMonitor:
         if self.current_spread_pips is None:
             return True, "No spread data available"
         
+        if self.max_quote_age_seconds is not None:
+            age = self.quote_age_seconds()
+            if age is not None and age > self.max_quote_age_seconds:
+                return True, f"Spread data stale: last quote {age:.0f}s ago (max: {self.max_quote_age_seconds:.0f}s)"
+        
         if self.current_spread_pips > self.pause_spread_pips:
             reason = f"Spread too wide: {self.current_spread_pips:.1f} pips (max: {self.pause_spread_pips} pips)"
             return True, reason
         
         return False, None
     
+    def _expire(self) -> None:
+        with self._lock:
+            self.stats.expire(datetime.now(timezone.utc).timestamp())
+    
     def get_spread_status(self) -> Dict[str, any]:
         """
         Get comprehensive spread status.
@@ -125,16 +327,12 @@ class SpreadMonitor:
                 'message': 'No spread data'
             }
         
-        # Calculate statistics from history
-        avg_spread = None
-        min_spread = None
-        max_spread = None
-        
-        if self.spread_history:
-            spreads = [s['spread_pips'] for s in self.spread_history]
-            avg_spread = sum(spreads) / len(spreads)
-            min_spread = min(spreads)
-            max_spread = max(spreads)
+        # Statistics over the rolling window
+        self._expire()
+        avg_spread = self.stats.mean()
+        min_spread = self.stats.min()
+        max_spread = self.stats.max()
+        p95_spread = self.stats.percentile(95)
         
         # Determine status
         if self.current_spread_pips <= self.acceptable_spread_pips:
@@ -152,6 +350,7 @@ class SpreadMonitor:
             'current_pips': round(self.current_spread_pips, 1),
             'bid': self.current_bid,
             'ask': self.current_ask,
+            'source': self.quote_source,
             'status': status,
             'status_emoji': status_emoji,
             'is_acceptable': self.is_spread_acceptable(),
@@ -161,38 +360,52 @@ class SpreadMonitor:
                 'pause': self.pause_spread_pips
             },
             'statistics': {
-                'average_pips': round(avg_spread, 1) if avg_spread else None,
-                'min_pips': round(min_spread, 1) if min_spread else None,
-                'max_pips': round(max_spread, 1) if max_spread else None,
-                'samples': len(self.spread_history)
+                'average_pips': round(avg_spread, 1) if avg_spread is not None else None,
+                'min_pips': round(min_spread, 1) if min_spread is not None else None,
+                'max_pips': round(max_spread, 1) if max_spread is not None else None,
+                'p95_pips': round(p95_spread, 1) if p95_spread is not None else None,
+                'samples': self.stats.count,
+                'window_minutes': self.stats.window_seconds / 60
             },
             'last_update': self.last_update.strftime('%H:%M:%S GMT') if self.last_update else None
         }
     
-    def get_average_spread(self, minutes: int = 5) -> Optional[float]:
+    def get_average_spread(self, minutes: Optional[float] = None) -> Optional[float]:
         """
         Get average spread over last N minutes.
         
         Args:
-            minutes: Number of minutes to average
+            minutes: Number of minutes to average (defaults to the rolling
+                window, which is O(1); shorter spans sum their buckets)
             
         Returns:
             Average spread in pips or None
         """
-        if not self.spread_history:
-            return None
-        
-        cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-        
-        recent_spreads = [
-            s['spread_pips'] for s in self.spread_history
-            if s['timestamp'] >= cutoff
-        ]
+        self._expire()
+        with self._lock:
+            if minutes is None or minutes * 60 >= self.stats.window_seconds:
+                return self.stats.mean()
+            since = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+            return self.stats.mean_since(since.timestamp())
+        
+    def get_max_spread(self) -> Optional[float]:
+        """Maximum spread in pips over the rolling window."""
+        self._expire()
+        return self.stats.max()
+        
+    def get_spread_percentile(self, percentile: float = 95) -> Optional[float]:
+        """
+        Spread percentile over the rolling window.
         
-        if not recent_spreads:
-            return None
+        Args:
+            percentile: Percentile in [0, 100]
         
-        return sum(recent_spreads) / len(recent_spreads)
+        Returns:
+            Spread in pips (0.1 pip resolution) or None
+        """
+        self._expire()
+        with self._lock:
+            return self.stats.percentile(percentile)
     
     def calculate_spread_cost(self, position_size: float) -> float:
         """
@@ -222,15 +435,9 @@ class SpreadMonitor:
         Returns:
             True if current spread is significantly wider than average
         """
-        if self.current_spread_pips is None or len(self.spread_history) < 10:
-            return False
-        
-        avg_spread = self.get_average_spread(minutes=5)
+        avg_spread = self.get_average_spread()
         
-        if avg_spread is None:
+        if self.current_spread_pips is None or self.stats.count < 10 or avg_spread is None:
             return False
         
         return self.current_spread_pips > (avg_spread + threshold_pips)
-
-
-from datetime import timedelta  # Add missing import